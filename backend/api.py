@@ -6,10 +6,11 @@ import psutil
 import os
 import shutil
 import sys
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import traceback
 import io
+import hashlib
 from threading import Lock
 from contextlib import asynccontextmanager
 import asyncio
@@ -72,14 +73,20 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from backend.services.importer import ImporterService
 from backend.services.classifier import ClassifierService
 from backend.services.auditor import AuditorService
-from backend.services.exporter import ExporterService
+from backend.services.exporter import ExporterService, EXPORT_FORMAT_VERSION
+from backend.logic.fa_export_streaming import XLSX_MEDIA_TYPE, iter_file_chunks
+from backend.logic.delimited_reader import DELIMITED_EXTENSIONS
+from backend.logic.export_cache import get_export_cache, export_content_key
+from backend.logic.upload_cache import get_upload_cache, upload_cache_key, encode_upload_result
+from backend.logic.tax_year_config import CONFIG_VERSION as TAX_RULES_VERSION
 from backend.models.asset import Asset
 
 # Import logic modules for new features
 from backend.logic.data_quality_score import calculate_data_quality_score, DataQualityScore
-from backend.logic.smart_tab_analyzer import analyze_tabs, TabAnalysisResult
+from backend.logic.smart_tab_analyzer import analyze_workbook, TabAnalysisResult
 from backend.logic.rollforward_reconciliation import reconcile_rollforward, RollforwardResult
 from backend.logic.depreciation_projection import project_portfolio_depreciation
+from backend.logic.session_asset_store import assets_frame
 import pandas as pd
 
 # Import scalability modules
@@ -198,6 +205,11 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down FA CS Automator API...")
     session_manager.stop_cleanup_task()
+
+    # Write sessions whose write-behind saves are still pending
+    flushed = await asyncio.to_thread(session_manager.flush_pending)
+    if flushed:
+        logger.info(f"Flushed {flushed} pending session write(s)")
     cleanup_manager.stop_scheduled_cleanup()
 
 app = FastAPI(
@@ -299,6 +311,18 @@ async def add_security_headers(request: Request, call_next):
 
     return response
 
+# ==============================================================================
+# SESSION WRITE BATCHING MIDDLEWARE
+# ==============================================================================
+# Endpoints save the session after each step (upload saves twice); within a
+# request those saves are folded into one write to the session backend.
+
+@app.middleware("http")
+async def batch_session_saves(request: Request, call_next):
+    """Persist each session saved during the request once, at the end."""
+    with get_session_manager().batch():
+        return await call_next(request)
+
 # ==============================================================================
 # RATE LIMITING MIDDLEWARE
 # ==============================================================================
@@ -1380,7 +1404,7 @@ async def set_tax_config(
     # ATOMICITY: Save original state for rollback on failure
     import copy
     original_tax_config = copy.deepcopy(session.tax_config)
-    original_assets = {k: copy.deepcopy(v) for k, v in session.assets.items()} if session.assets else {}
+    original_assets = copy.deepcopy(session.assets)
 
     try:
         # Update session tax config (isolated per user)
@@ -1728,16 +1752,87 @@ async def get_warnings(request: Request, response: Response):
 MAX_UPLOAD_SIZE_MB = 50
 MAX_UPLOAD_SIZE_BYTES = MAX_UPLOAD_SIZE_MB * 1024 * 1024
 
+# Uploads are copied to disk in chunks of this size, so a request never holds
+# the whole workbook in memory
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+async def spool_upload(
+    file: UploadFile,
+    prefix: str,
+    max_bytes: int = MAX_UPLOAD_SIZE_BYTES
+) -> Tuple[str, int, str]:
+    """
+    Stream an uploaded file into a secure temp file, hashing it on the way.
+
+    The size limit is checked per chunk, so an oversized upload is rejected
+    as soon as it passes the limit instead of after it has been read.
+    CSV/TSV uploads keep their extension (the readers dispatch on it);
+    anything else is saved as .xlsx.
+
+    Returns:
+        (temp file path, size in bytes, SHA-256 hex digest of the file).
+        The caller owns the temp file and must delete it.
+
+    Raises:
+        HTTPException 413 (FILE_TOO_LARGE) if the file exceeds max_bytes;
+        the partial temp file is removed.
+    """
+    max_mb = max_bytes // (1024 * 1024)
+
+    def too_large(file_size: Optional[int]) -> HTTPException:
+        details = {"max_size_mb": max_mb}
+        if file_size is not None:
+            details["file_size_mb"] = round(file_size / 1024 / 1024, 1)
+            message = f"File size ({file_size / 1024 / 1024:.1f}MB) exceeds maximum allowed size ({max_mb}MB)"
+        else:
+            message = f"File exceeds maximum allowed size ({max_mb}MB)"
+        return api_error(413, "FILE_TOO_LARGE", message, details)
+
+    # Multipart parsing already knows the size; reject before copying anything
+    if file.size is not None and file.size > max_bytes:
+        raise too_large(file.size)
+
+    # SECURITY: Use secure temporary file in system temp directory
+    # This prevents arbitrary file write vulnerabilities from CWD manipulation
+    # The file is created with restrictive permissions (0600) by default
+    suffix = os.path.splitext(file.filename or "")[1].lower()
+    if suffix not in DELIMITED_EXTENSIONS:
+        suffix = '.xlsx'
+    temp_fd, temp_file = tempfile.mkstemp(suffix=suffix, prefix=prefix)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(temp_fd, 'wb') as buffer:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise too_large(file.size)
+                digest.update(chunk)
+                buffer.write(chunk)
+    except BaseException:
+        try:
+            os.remove(temp_file)
+        except OSError:
+            pass
+        raise
+
+    return temp_file, size, digest.hexdigest()
+
 
 @app.post("/upload", response_model=List[Asset])
 async def upload_file(
     request: Request,
     response: Response,
     file: UploadFile = File(...),
+    force_reprocess: bool = False,
     user: AuthUser = Depends(optional_auth)
 ):
     """
-    Uploads an Excel file, parses it, and returns classified assets.
+    Uploads an Excel or CSV/TSV file, parses it, and returns classified assets.
     Uses session-based storage for user isolation.
 
     Authentication: Required when AUTH_ENABLED=true
@@ -1748,6 +1843,10 @@ async def upload_file(
     - Disposals
     - Transfers
 
+    Re-uploading the same file with the same tax settings reuses the stored
+    parse + classification result (X-Upload-Cache: hit). Pass
+    force_reprocess=true to parse and classify from scratch.
+
     SAFETY:
     - Uses per-session locking to prevent concurrent upload data corruption.
     - Enforces file size limit to prevent DoS attacks.
@@ -1756,101 +1855,112 @@ async def upload_file(
     session = await get_current_session(request)
     add_session_to_response(response, session.session_id)
 
-    # Check file size limit (security: prevent DoS via large files)
-    # Read file content to check size (UploadFile.size may not be available)
-    file_content = await file.read()
-    file_size = len(file_content)
-    await file.seek(0)  # Reset file position for later reading
-
-    if file_size > MAX_UPLOAD_SIZE_BYTES:
-        raise api_error(
-            413, "FILE_TOO_LARGE",
-            f"File size ({file_size / 1024 / 1024:.1f}MB) exceeds maximum allowed size ({MAX_UPLOAD_SIZE_MB}MB)",
-            {"max_size_mb": MAX_UPLOAD_SIZE_MB, "file_size_mb": round(file_size / 1024 / 1024, 1)}
-        )
+    # Stream to a secure temp file (security: file size limit prevents DoS
+    # via large files, enforced chunk by chunk)
+    temp_file, file_size, file_digest = await spool_upload(file, prefix='facs_upload_')
 
     # Acquire session lock to prevent concurrent upload corruption
     session_lock = get_session_lock(session.session_id)
     if not session_lock.acquire(blocking=False):
+        os.remove(temp_file)
         raise api_error(409, "UPLOAD_IN_PROGRESS",
             "Another upload is already in progress for this session. Please wait.")
 
-    # SECURITY: Use secure temporary file in system temp directory
-    # This prevents arbitrary file write vulnerabilities from CWD manipulation
-    # The file is created with restrictive permissions (0600) by default
-    temp_fd, temp_file = tempfile.mkstemp(suffix='.xlsx', prefix='facs_upload_')
-
     try:
         # Track import start time for metrics
         import_start_time = datetime.utcnow()
 
-        # Save uploaded file to secure temp location
-        with os.fdopen(temp_fd, 'wb') as buffer:
-            buffer.write(file_content)  # Use already-read content
-
         # Get tax year and fiscal year config from session (needed for both try and except paths)
         current_tax_year = session.tax_config.get("tax_year", TAX_CONFIG["tax_year"])
         current_fy_start_month = session.tax_config.get("fy_start_month", TAX_CONFIG.get("fy_start_month", 1))
 
-        # Perform tab analysis before processing
-        try:
-            import openpyxl
-            wb = openpyxl.load_workbook(temp_file, data_only=True)
-            sheets = {}
-            for sheet_name in wb.sheetnames:
-                ws = wb[sheet_name]
-                data = []
-                for row in ws.iter_rows(values_only=True):
-                    data.append(row)
-                sheets[sheet_name] = pd.DataFrame(data)
-            wb.close()
-
-            # Run tab analysis using session's tax year
-            session.tab_analysis_result = analyze_tabs(sheets, current_tax_year)
-            logger.info(f"Tab analysis: {len(session.tab_analysis_result.tabs)} tabs detected")
-
-            # AUTO-DETECT FISCAL YEAR: If detected from rollforward headers, apply it!
-            if session.tab_analysis_result.detected_fy_start_month:
-                detected_month = session.tab_analysis_result.detected_fy_start_month
-                if detected_month != current_fy_start_month:
-                    logger.info(f"[FY Auto-Detection] Updating fiscal year start from {current_fy_start_month} to {detected_month}")
-                    logger.info(f"[FY Auto-Detection] Source: {session.tab_analysis_result.fy_detection_source}")
-                    current_fy_start_month = detected_month
-                    session.tax_config["fy_start_month"] = detected_month
-                    # Update classifier's fiscal year config
-                    classifier.set_fiscal_year_config(current_tax_year, current_fy_start_month)
-
-            # PERFORMANCE: Pass pre-loaded sheets and tab analysis to importer
-            # This eliminates duplicate file I/O and redundant skip analysis
-            assets = importer.parse_excel(
-                temp_file,
-                target_tax_year=current_tax_year,
-                fy_start_month=current_fy_start_month,  # CRITICAL: Pass fiscal year config
-                preloaded_sheets=sheets,
-                tab_analysis_result=session.tab_analysis_result
-            )
-        except Exception as tab_err:
-            logger.warning(f"Tab analysis error (non-fatal): {tab_err}")
-            session.tab_analysis_result = None
-            # Fallback: parse without pre-loaded data
-            assets = importer.parse_excel(
-                temp_file,
-                target_tax_year=current_tax_year,
+        # DUPLICATE UPLOAD: Same file bytes + same tax settings -> reuse the
+        # stored parse/classify result. Keyed before FY auto-detection below
+        # changes session.tax_config.
+        upload_cache = get_upload_cache()
+        upload_key = upload_cache_key("upload", file_digest, session.tax_config)
+        cached_upload = None
+        if force_reprocess:
+            upload_cache.record_forced()
+        else:
+            cached_upload = upload_cache.get(upload_key)
+
+        if cached_upload is not None:
+            classified_assets = cached_upload["assets"]
+            tab_data = cached_upload["tab_analysis"]
+            session.tab_analysis_result = TabAnalysisResult.from_dict(tab_data) if tab_data else None
+            session.parse_warnings = cached_upload["parse_warnings"]
+            session.parse_stats = cached_upload["parse_stats"]
+
+            cached_fy_start_month = cached_upload["fy_start_month"]
+            if cached_fy_start_month and cached_fy_start_month != current_fy_start_month:
+                current_fy_start_month = cached_fy_start_month
+                session.tax_config["fy_start_month"] = cached_fy_start_month
+                classifier.set_fiscal_year_config(current_tax_year, current_fy_start_month)
+
+            logger.info(f"[Upload] Identical upload, reusing cached result: {len(classified_assets)} assets")
+        else:
+            # Perform tab analysis before processing
+            try:
+                # Two-phase load: tabs are analyzed from a preview of each sheet
+                # and only the tabs to process are read in full; the importer
+                # reuses these frames
+                session.tab_analysis_result, sheets = analyze_workbook(temp_file, current_tax_year)
+                logger.info(f"Tab analysis: {len(session.tab_analysis_result.tabs)} tabs detected")
+
+                # AUTO-DETECT FISCAL YEAR: If detected from rollforward headers, apply it!
+                if session.tab_analysis_result.detected_fy_start_month:
+                    detected_month = session.tab_analysis_result.detected_fy_start_month
+                    if detected_month != current_fy_start_month:
+                        logger.info(f"[FY Auto-Detection] Updating fiscal year start from {current_fy_start_month} to {detected_month}")
+                        logger.info(f"[FY Auto-Detection] Source: {session.tab_analysis_result.fy_detection_source}")
+                        current_fy_start_month = detected_month
+                        session.tax_config["fy_start_month"] = detected_month
+                        # Update classifier's fiscal year config
+                        classifier.set_fiscal_year_config(current_tax_year, current_fy_start_month)
+
+                # PERFORMANCE: Pass pre-loaded sheets and tab analysis to importer
+                # This eliminates duplicate file I/O and redundant skip analysis
+                assets = importer.parse_excel(
+                    temp_file,
+                    target_tax_year=current_tax_year,
+                    fy_start_month=current_fy_start_month,  # CRITICAL: Pass fiscal year config
+                    preloaded_sheets=sheets,
+                    tab_analysis_result=session.tab_analysis_result
+                )
+            except Exception as tab_err:
+                logger.warning(f"Tab analysis error (non-fatal): {tab_err}")
+                session.tab_analysis_result = None
+                # Fallback: parse without tab analysis. Skipped tabs were only
+                # previewed, so the importer reads the workbook itself
+                assets = importer.parse_excel(
+                    temp_file,
+                    target_tax_year=current_tax_year,
+                    fy_start_month=current_fy_start_month  # CRITICAL: Pass fiscal year config
+                )
+            parse_report = importer.get_last_parse_report()
+
+            # Store parse warnings in session for later retrieval
+            session.parse_warnings = parse_report.get('warnings', [])
+            session.parse_stats = parse_report.get('stats', {})
+
+            # 2. Classify Assets (MACRS + Transaction Types)
+            # Use already-extracted values for consistency
+            classified_assets = classifier.classify_batch(
+                assets,
+                tax_year=current_tax_year,
                 fy_start_month=current_fy_start_month  # CRITICAL: Pass fiscal year config
             )
-        parse_report = importer.get_last_parse_report()
 
-        # Store parse warnings in session for later retrieval
-        session.parse_warnings = parse_report.get('warnings', [])
-        session.parse_stats = parse_report.get('stats', {})
+            upload_cache.put(upload_key, encode_upload_result(
+                classified_assets,
+                tab_analysis=session.tab_analysis_result.to_dict() if session.tab_analysis_result else None,
+                parse_warnings=session.parse_warnings,
+                parse_stats=session.parse_stats,
+                fy_start_month=current_fy_start_month,
+            ))
 
-        # 2. Classify Assets (MACRS + Transaction Types)
-        # Use already-extracted values for consistency
-        classified_assets = classifier.classify_batch(
-            assets,
-            tax_year=current_tax_year,
-            fy_start_month=current_fy_start_month  # CRITICAL: Pass fiscal year config
-        )
+        response.headers["X-Upload-Cache"] = "hit" if cached_upload is not None else "miss"
 
         # 3. Store in session using unique IDs to prevent overwrites
         session.assets.clear()
@@ -1860,8 +1970,8 @@ async def upload_file(
 
         for asset in classified_assets:
             asset.unique_id = session.asset_id_counter
-            session.assets[session.asset_id_counter] = asset
             session.asset_id_counter += 1
+        session.assets.update((asset.unique_id, asset) for asset in classified_assets)
 
         # Save session
         manager = get_session_manager()
@@ -1899,6 +2009,7 @@ async def upload_file(
             "transaction_types": trans_types,
             "file_name": file.filename,
             "file_size_bytes": file_size,
+            "upload_cache_hit": cached_upload is not None,
         }
 
         # Save updated session with metrics
@@ -1947,6 +2058,7 @@ async def submit_upload_job(
     request: Request,
     response: Response,
     file: UploadFile = File(...),
+    force_reprocess: bool = False,
     user: AuthUser = Depends(optional_auth)
 ):
     """
@@ -1955,6 +2067,8 @@ async def submit_upload_job(
     Returns a job_id immediately. Client polls /jobs/{job_id} for status.
 
     This prevents HTTP timeouts for large files with many assets.
+    A repeat of an earlier upload (same file, same tax settings) completes
+    from the upload cache unless force_reprocess=true.
     """
     session = await get_current_session(request)
     add_session_to_response(response, session.session_id)
@@ -1963,24 +2077,14 @@ async def submit_upload_job(
     if not file.filename:
         raise api_error(400, "NO_FILE", "No file provided")
 
-    if not file.filename.lower().endswith(('.xlsx', '.xls')):
-        raise api_error(400, "INVALID_FILE_TYPE", "Only Excel files (.xlsx, .xls) are supported")
+    if not file.filename.lower().endswith(('.xlsx', '.xls') + DELIMITED_EXTENSIONS):
+        raise api_error(400, "INVALID_FILE_TYPE", "Only Excel (.xlsx, .xls) and CSV/TSV files are supported")
 
-    # Save to temp file
-    temp_fd, temp_file = tempfile.mkstemp(suffix='.xlsx', prefix='facs_job_')
+    # Stream to temp file (size checked per chunk); the job reads this file
+    # directly, it is not copied again
+    max_size = int(os.environ.get("MAX_UPLOAD_SIZE_MB", "50")) * 1024 * 1024
+    temp_file, _, file_digest = await spool_upload(file, prefix='facs_job_', max_bytes=max_size)
     try:
-        content = await file.read()
-
-        # Size check
-        max_size = int(os.environ.get("MAX_UPLOAD_SIZE_MB", "50")) * 1024 * 1024
-        if len(content) > max_size:
-            os.close(temp_fd)
-            os.remove(temp_file)
-            raise api_error(413, "FILE_TOO_LARGE", f"File exceeds maximum size of {max_size // (1024*1024)}MB")
-
-        os.write(temp_fd, content)
-        os.close(temp_fd)
-
         # Submit job
         processor = get_job_processor()
         job = processor.submit(
@@ -1989,6 +2093,8 @@ async def submit_upload_job(
                 "file_path": temp_file,
                 "filename": file.filename,
                 "tax_year": session.tax_config.get("tax_year"),
+                "cache_key": upload_cache_key("job_upload", file_digest, session.tax_config),
+                "force_reprocess": force_reprocess,
             },
             session_id=session.session_id,
             user_id=user.user_id if user else None
@@ -2074,9 +2180,8 @@ async def get_job_result(
         session.assets.clear()
         session.approved_assets.clear()
 
-        for asset_data in result["assets"]:
-            asset = Asset(**asset_data)
-            session.assets[asset.unique_id] = asset
+        job_assets = [Asset(**asset_data) for asset_data in result["assets"]]
+        session.assets.update((asset.unique_id, asset) for asset in job_assets)
 
         session.last_upload_filename = job.metadata.get("filename", "unknown")
 
@@ -2835,23 +2940,33 @@ async def auto_fix_compatibility_issues(
     }
 
 
-@app.get("/export")
-async def export_assets(
-    request: Request,
-    skip_approval_check: bool = Query(False, description="Skip approval validation (requires X-Admin-Key header)")
-):
-    """
-    Generates an Excel file for Fixed Assets CS import.
-    Uses session-based storage for user isolation.
-    Saves a copy to 'bot_handoff' folder for UiPath to pick up.
+def _export_cache_key(kind: str, session, assets: List[Asset], tax_config: Dict) -> str:
+    """Content hash for an export artifact; also used as its ETag."""
+    return export_content_key(
+        kind,
+        assets,
+        approved_ids=session.approved_assets,
+        tax_config={**tax_config, "rules_version": TAX_RULES_VERSION},
+        format_version=EXPORT_FORMAT_VERSION,
+    )
 
-    IMPORTANT: All actionable assets (additions, disposals, transfers) must be approved
-    before export. Existing assets are excluded from approval requirement.
 
-    SECURITY: skip_approval_check requires admin authentication via X-Admin-Key header.
+def _etag_matches(request: Request, cache_key: str) -> bool:
+    """True if the client's If-None-Match already names this artifact."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/").strip('"') == cache_key for tag in tags)
+
+
+def _export_ready_assets(session, skip_approval_check: bool) -> List[Asset]:
     """
-    session = await get_current_session(request)
+    Return the session's assets after the checks every FA CS export enforces.
 
+    Blocks the export when any asset has validation errors or, unless
+    skip_approval_check is set, when actionable assets are unapproved.
+    """
     if not session.assets:
         raise api_error(400, "NO_ASSETS", "No assets to export")
 
@@ -2896,17 +3011,50 @@ async def export_assets(
         # skip_approval_check requires admin - log a warning for audit trail
         logger.warning(f"Session {session.session_id}: Export with skip_approval_check=True")
 
-    # Generate FA CS Prep Workpaper (NEW method with proper sheets)
-    # - Addition Entry: ONLY Current Year Additions
-    # - Disposal Entry: With Disposal Method, Proceeds, Gain/Loss
-    # - Transfer Entry: With From/To locations
-    # - De Minimis Expenses: Items to expense
-    # - Items Requiring Review: QC flags
-    excel_file = exporter.generate_fa_cs_prep_workpaper(
-        assets,
-        tax_year=TAX_CONFIG["tax_year"],
-        de_minimis_limit=TAX_CONFIG["de_minimis_threshold"]
+    return assets
+
+
+@app.get("/export")
+async def export_assets(
+    request: Request,
+    skip_approval_check: bool = Query(False, description="Skip approval validation (requires X-Admin-Key header)")
+):
+    """
+    Generates an Excel file for Fixed Assets CS import.
+    Uses session-based storage for user isolation.
+    Saves a copy to 'bot_handoff' folder for UiPath to pick up.
+
+    IMPORTANT: All actionable assets (additions, disposals, transfers) must be approved
+    before export. Existing assets are excluded from approval requirement.
+
+    SECURITY: skip_approval_check requires admin authentication via X-Admin-Key header.
+    """
+    session = await get_current_session(request)
+    assets = _export_ready_assets(session, skip_approval_check)
+
+    # Serve the cached workbook when nothing that shapes it has changed
+    tax_year = TAX_CONFIG["tax_year"]
+    de_minimis_limit = TAX_CONFIG["de_minimis_threshold"]
+    export_cache = get_export_cache()
+    cache_key = _export_cache_key(
+        "prep_workpaper", session, assets,
+        {"tax_year": tax_year, "de_minimis_threshold": de_minimis_limit}
     )
+    excel_file = export_cache.open(cache_key, ".xlsx")
+    cache_status = "hit" if excel_file is not None else "miss"
+
+    if excel_file is None:
+        # Generate FA CS Prep Workpaper (NEW method with proper sheets)
+        # - Addition Entry: ONLY Current Year Additions
+        # - Disposal Entry: With Disposal Method, Proceeds, Gain/Loss
+        # - Transfer Entry: With From/To locations
+        # - De Minimis Expenses: Items to expense
+        # - Items Requiring Review: QC flags
+        excel_file = export_cache.store(cache_key, ".xlsx", exporter.generate_fa_cs_prep_workpaper(
+            assets,
+            tax_year=tax_year,
+            de_minimis_limit=de_minimis_limit
+        ))
 
     # Save to Bot Handoff Folder (use custom path if set)
     if FACS_CONFIG["export_path"]:
@@ -2920,79 +3068,118 @@ async def export_assets(
     filename = f"FA_CS_Prep_Workpaper_{session.session_id[:8]}_{timestamp}.xlsx"
     filepath = os.path.join(handoff_dir, filename)
 
-    with open(filepath, "wb") as f:
-        f.write(excel_file.getvalue())
+    # Link (or copy) the cached file under a temp name, then rename so
+    # UiPath never sees a partial file
+    try:
+        method = export_cache.link(excel_file, filepath)
+    except Exception:
+        excel_file.close()
+        raise
 
-    logger.info(f"Session {session.session_id}: Saved FA CS Prep Workpaper to {filepath}")
+    logger.info(f"Session {session.session_id}: Saved FA CS Prep Workpaper to {filepath} "
+                f"(cache {cache_status}, {method})")
 
-    # Reset stream position for StreamingResponse
-    excel_file.seek(0)
+    headers = {
+        "ETag": f'"{cache_key}"',
+        "Cache-Control": "private, no-cache",
+        "X-Export-Cache": cache_status,
+        "X-Session-ID": session.session_id
+    }
+    if _etag_matches(request, cache_key):
+        excel_file.close()
+        return Response(status_code=304, headers=headers)
 
+    # File is closed once sent
     return StreamingResponse(
-        excel_file,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        iter_file_chunks(excel_file),
+        media_type=XLSX_MEDIA_TYPE,
         headers={
             "Content-Disposition": "attachment; filename=FA_CS_Prep_Workpaper.xlsx",
-            "X-Session-ID": session.session_id
+            **headers
         }
     )
 
 
-@app.get("/export/audit")
-async def export_audit_documentation(
+def _text_export_response(request: Request, session, assets: List[Asset], delimiter: str,
+                          suffix: str, media_type: str, filename: str):
+    """Stream the FA CS import rows as delimited text, cached like /export."""
+    tax_year = TAX_CONFIG["tax_year"]
+    de_minimis_limit = TAX_CONFIG["de_minimis_threshold"]
+    export_cache = get_export_cache()
+    cache_key = _export_cache_key(
+        f"fa_cs_ascii{suffix}", session, assets,
+        {"tax_year": tax_year, "de_minimis_threshold": de_minimis_limit, "delimiter": delimiter}
+    )
+    headers = {
+        "ETag": f'"{cache_key}"',
+        "Cache-Control": "private, no-cache",
+        "X-Session-ID": session.session_id
+    }
+    # The key is derived from content, so a match holds even if the file was evicted
+    if _etag_matches(request, cache_key):
+        return Response(status_code=304, headers=headers)
+
+    headers["Content-Disposition"] = f"attachment; filename={filename}"
+    cached = export_cache.open(cache_key, suffix)
+    if cached is not None:
+        return StreamingResponse(
+            iter_file_chunks(cached), media_type=media_type,
+            headers={**headers, "X-Export-Cache": "hit"}
+        )
+
+    # build_fa runs here, before any bytes are sent; rows are then
+    # formatted and sent a chunk at a time while being written to the cache
+    chunks = exporter.generate_fa_cs_ascii(
+        assets, tax_year=tax_year, de_minimis_limit=de_minimis_limit, delimiter=delimiter
+    )
+    return StreamingResponse(
+        export_cache.store_stream(cache_key, suffix, chunks), media_type=media_type,
+        headers={**headers, "X-Export-Cache": "miss"}
+    )
+
+
+@app.get("/export/csv")
+async def export_assets_csv(
     request: Request,
-    skip_approval_check: bool = Query(False, description="Skip approval validation for draft reports")
+    skip_approval_check: bool = Query(False, description="Skip approval validation (requires X-Admin-Key header)")
 ):
     """
-    Generates a comprehensive audit documentation Excel file.
-    Includes ALL assets (additions, disposals, transfers, AND existing assets)
-    with full classification details, confidence scores, and reasoning.
-
-    This is separate from the FA CS export and is meant for:
-    - IRS audit documentation
-    - Internal compliance records
-    - Year-over-year reconciliation
+    Streams the FA CS import data as a comma-delimited CSV file.
 
-    IMPORTANT: All actionable assets must be approved before generating
-    official audit documentation. Use skip_approval_check=true for draft reports.
-
-    SECURITY: Uses session-based storage for user isolation.
+    Same assets and approval rules as /export; De Minimis items are
+    expensed and left out. Supports ETag/If-None-Match like /export.
     """
-    # FIX: Use session instead of global ASSET_STORE for user isolation
     session = await get_current_session(request)
+    assets = _export_ready_assets(session, skip_approval_check)
+    return _text_export_response(
+        request, session, assets, delimiter=",", suffix=".csv",
+        media_type="text/csv; charset=utf-8", filename="FA_CS_Import.csv"
+    )
 
-    if not session.assets:
-        raise api_error(400, "NO_ASSETS", "No assets to export")
 
-    assets = list(session.assets.values())
-
-    # Validate: All actionable assets must be approved for official audit documentation
-    if not skip_approval_check:
-        actionable_types = {"Addition", "Disposal", "Transfer"}
-        actionable_assets = [
-            a for a in assets
-            if getattr(a, 'transaction_type', None) in actionable_types
-        ]
-        unapproved = [
-            a for a in actionable_assets
-            if a.unique_id not in session.approved_assets
-        ]
+@app.get("/export/ascii")
+async def export_assets_ascii(
+    request: Request,
+    delimiter: str = Query("tab", pattern="^(tab|comma)$", description="Field delimiter: tab (default) or comma"),
+    skip_approval_check: bool = Query(False, description="Skip approval validation (requires X-Admin-Key header)")
+):
+    """
+    Streams the FA CS ASCII import file (File > Import > ASCII File in FA CS).
 
-        if unapproved:
-            unapproved_count = len(unapproved)
-            total_actionable = len(actionable_assets)
-            raise api_error(400, "UNAPPROVED_ASSETS",
-                f"Cannot generate audit report: {unapproved_count} of {total_actionable} actionable assets not approved. "
-                f"Review and approve all items before generating official audit documentation. "
-                f"Use skip_approval_check=true for draft reports.",
-                {
-                    "unapproved_count": unapproved_count,
-                    "total_actionable": total_actionable
-                }
-            )
+    Tab-delimited by default. Same assets and approval rules as /export;
+    De Minimis items are expensed and left out.
+    """
+    session = await get_current_session(request)
+    assets = _export_ready_assets(session, skip_approval_check)
+    return _text_export_response(
+        request, session, assets, delimiter="\t" if delimiter == "tab" else ",",
+        suffix=".txt", media_type="text/plain; charset=utf-8",
+        filename="FA_CS_Import.txt"
+    )
 
-    tax_year = session.tax_config.get("tax_year", TAX_CONFIG["tax_year"])
 
+def _generate_audit_documentation(assets: List[Asset], tax_year: int) -> io.BytesIO:
+    """Build the audit documentation workbook for /export/audit."""
     # Create comprehensive audit DataFrame
     audit_data = []
     for a in assets:
@@ -3141,14 +3328,87 @@ async def export_audit_documentation(
             errors_df.to_excel(writer, sheet_name='Validation_Errors', index=False)
 
     output.seek(0)
+    return output
+
+
+@app.get("/export/audit")
+async def export_audit_documentation(
+    request: Request,
+    skip_approval_check: bool = Query(False, description="Skip approval validation for draft reports")
+):
+    """
+    Generates a comprehensive audit documentation Excel file.
+    Includes ALL assets (additions, disposals, transfers, AND existing assets)
+    with full classification details, confidence scores, and reasoning.
+
+    This is separate from the FA CS export and is meant for:
+    - IRS audit documentation
+    - Internal compliance records
+    - Year-over-year reconciliation
+
+    IMPORTANT: All actionable assets must be approved before generating
+    official audit documentation. Use skip_approval_check=true for draft reports.
+
+    SECURITY: Uses session-based storage for user isolation.
+    """
+    # FIX: Use session instead of global ASSET_STORE for user isolation
+    session = await get_current_session(request)
+
+    if not session.assets:
+        raise api_error(400, "NO_ASSETS", "No assets to export")
+
+    assets = list(session.assets.values())
+
+    # Validate: All actionable assets must be approved for official audit documentation
+    if not skip_approval_check:
+        actionable_types = {"Addition", "Disposal", "Transfer"}
+        actionable_assets = [
+            a for a in assets
+            if getattr(a, 'transaction_type', None) in actionable_types
+        ]
+        unapproved = [
+            a for a in actionable_assets
+            if a.unique_id not in session.approved_assets
+        ]
+
+        if unapproved:
+            unapproved_count = len(unapproved)
+            total_actionable = len(actionable_assets)
+            raise api_error(400, "UNAPPROVED_ASSETS",
+                f"Cannot generate audit report: {unapproved_count} of {total_actionable} actionable assets not approved. "
+                f"Review and approve all items before generating official audit documentation. "
+                f"Use skip_approval_check=true for draft reports.",
+                {
+                    "unapproved_count": unapproved_count,
+                    "total_actionable": total_actionable
+                }
+            )
+
+    tax_year = session.tax_config.get("tax_year", TAX_CONFIG["tax_year"])
+
+    export_cache = get_export_cache()
+    cache_key = _export_cache_key("audit_documentation", session, assets, {"tax_year": tax_year})
+    excel_file = export_cache.open(cache_key, ".xlsx")
+    cache_status = "hit" if excel_file is not None else "miss"
+    if excel_file is None:
+        excel_file = export_cache.store(cache_key, ".xlsx", _generate_audit_documentation(assets, tax_year))
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"Audit_Documentation_{tax_year}_{timestamp}.xlsx"
 
+    headers = {
+        "ETag": f'"{cache_key}"',
+        "Cache-Control": "private, no-cache",
+        "X-Export-Cache": cache_status,
+    }
+    if _etag_matches(request, cache_key):
+        excel_file.close()
+        return Response(status_code=304, headers=headers)
+
     return StreamingResponse(
-        output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
+        iter_file_chunks(excel_file),
+        media_type=XLSX_MEDIA_TYPE,
+        headers={"Content-Disposition": f"attachment; filename={filename}", **headers}
     )
 
 
@@ -3180,23 +3440,18 @@ async def get_data_quality(request: Request, response: Response):
             "cross_sheet_duplicates": []
         }
 
-    # Convert assets to DataFrame for quality scoring
-    assets = list(session.assets.values())
-    df_data = []
-    for a in assets:
-        df_data.append({
-            "Asset ID": a.asset_id,
-            "Description": a.description,
-            "Cost": a.cost,
-            "In Service Date": a.in_service_date,
-            "Final Category": a.macrs_class,
-            "MACRS Life": a.macrs_life,
-            "Method": a.macrs_method,
-            "Transaction Type": a.transaction_type,
-            "Source Sheet": a.source_sheet,  # Include for cross-sheet duplicate detection
-        })
-
-    df = pd.DataFrame(df_data)
+    # Columnar view of the assets for quality scoring
+    df = assets_frame(session.assets, {
+        "asset_id": "Asset ID",
+        "description": "Description",
+        "cost": "Cost",
+        "in_service_date": "In Service Date",
+        "macrs_class": "Final Category",
+        "macrs_life": "MACRS Life",
+        "macrs_method": "Method",
+        "transaction_type": "Transaction Type",
+        "source_sheet": "Source Sheet",  # Include for cross-sheet duplicate detection
+    }, date_objects=True)
     tax_year = session.tax_config.get("tax_year", TAX_CONFIG["tax_year"])
 
     try:
@@ -3278,7 +3533,8 @@ async def get_tab_analysis(request: Request, response: Response):
             "should_process": tab.should_process,
             "skip_reason": tab.skip_reason,
             "confidence": round(tab.confidence, 2),
-            "detection_notes": tab.detection_notes
+            "detection_notes": tab.detection_notes,
+            "preview_only": tab.preview_only
         })
 
     efficiency = tab_result.get_efficiency_stats()
@@ -3319,30 +3575,20 @@ async def get_rollforward_status(request: Request, response: Response):
             "status_label": "No Data"
         }
 
-    # Convert assets to DataFrame
-    assets = list(session.assets.values())
-    df_data = []
-    de_minimis_total = 0.0
-    de_minimis_count = 0
-
-    for a in assets:
-        # Check if this is a De Minimis expensed item
-        election = getattr(a, 'depreciation_election', 'MACRS') or 'MACRS'
-        is_de_minimis = election == 'DeMinimis'
-
-        # Track De Minimis separately - they are expensed, not capitalized
-        if is_de_minimis and a.transaction_type == 'Current Year Addition':
-            de_minimis_total += a.cost or 0
-            de_minimis_count += 1
-            # Skip adding to rollforward - it's an expense, not a capital addition
-            continue
+    # Columnar view of the assets
+    df = assets_frame(session.assets, {
+        "cost": "Cost",
+        "transaction_type": "Transaction Type",
+        "depreciation_election": "Election",
+    })
 
-        df_data.append({
-            "Cost": a.cost,
-            "Transaction Type": a.transaction_type or "",
-        })
+    # Track De Minimis separately - they are expensed, not capitalized
+    is_de_minimis = ((df["Election"] == "DeMinimis") & (df["Transaction Type"] == "Current Year Addition")).to_numpy()
+    de_minimis_total = sum(df["Cost"].to_numpy()[is_de_minimis].tolist(), 0.0)
+    de_minimis_count = int(is_de_minimis.sum())
 
-    df = pd.DataFrame(df_data)
+    # Skip them in the rollforward - they are an expense, not a capital addition
+    df = df.loc[~is_de_minimis, ["Cost", "Transaction Type"]].reset_index(drop=True)
 
     try:
         result = reconcile_rollforward(df, cost_column="Cost", trans_type_column="Transaction Type")
@@ -3403,22 +3649,20 @@ async def get_depreciation_projection(request: Request, response: Response):
             "summary": "No assets loaded"
         }
 
-    # Convert assets to DataFrame with required columns
-    assets = list(session.assets.values())
-    df_data = []
-    for a in assets:
-        # Calculate depreciable basis (simplified - full calc in export)
-        depreciable_basis = a.cost or 0
-
-        df_data.append({
-            "Depreciable Basis": depreciable_basis,
-            "Recovery Period": a.macrs_life or 7,
-            "Method": a.macrs_method or "200DB",
-            "Convention": a.macrs_convention or "HY",
-            "In Service Date": a.in_service_date,
-        })
-
-    df = pd.DataFrame(df_data)
+    # Columnar view of the assets with required columns
+    # (depreciable basis simplified to cost - full calc in export)
+    df = assets_frame(session.assets, {
+        "cost": "Depreciable Basis",
+        "macrs_life": "Recovery Period",
+        "macrs_method": "Method",
+        "macrs_convention": "Convention",
+        "in_service_date": "In Service Date",
+    }, date_objects=True)
+    life = df["Recovery Period"]
+    df["Recovery Period"] = life.where(life.notna() & (life != 0), 7)
+    for column, default in (("Method", "200DB"), ("Convention", "HY")):
+        values = df[column].astype(object)
+        df[column] = values.where(values.notna() & (values != ""), default)
     current_year = session.tax_config.get("tax_year", TAX_CONFIG["tax_year"])
 
     try:
@@ -3435,7 +3679,7 @@ async def get_depreciation_projection(request: Request, response: Response):
             "depreciation": depreciation,
             "total_10_year": round(total_10_year, 2),
             "current_year": round(current_year_dep, 2),
-            "asset_count": len(assets),
+            "asset_count": len(df),
             "summary": f"${total_10_year:,.0f} total depreciation over 10 years"
         }
     except Exception as e:
@@ -3574,7 +3818,9 @@ def get_system_status():
         "backend": {
             "status": "Online",
             "version": "1.0.0"
-        }
+        },
+        "upload_cache": get_upload_cache().stats(),
+        "sessions": get_session_manager().cache_stats()
     }
 
 
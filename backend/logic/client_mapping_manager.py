@@ -10,6 +10,8 @@ Key Features:
 - Apply mappings to override auto-detection
 - Learn and save new mappings from user corrections
 - Preview detected mappings before processing
+- Remember detected sheet structures (header row, column map, sheet role)
+  so repeat uploads of the same layout skip detection
 
 Author: Fixed Asset AI Team
 """
@@ -33,6 +35,11 @@ logger = logging.getLogger(__name__)
 CONFIG_DIR = Path(__file__).parent / "config"
 CLIENT_MAPPINGS_FILE = CONFIG_DIR / "client_input_mappings.json"
 
+# Detected sheet structures keyed by structure fingerprint (see sheet_loader).
+# Runtime data, so kept out of CONFIG_DIR
+SHEET_STRUCTURE_CACHE_FILE = os.environ.get("SHEET_STRUCTURE_CACHE_FILE", "")  # Default: <cwd>/sheet_structure_cache.json
+SHEET_STRUCTURE_CACHE_MAX_ENTRIES = 2000
+
 
 class ClientMappingManager:
     """
@@ -43,17 +50,26 @@ class ClientMappingManager:
     - Matching clients by ID or filename patterns
     - Applying mappings to override detection
     - Learning and saving new mappings
+    - Caching detected sheet structures
     """
 
-    def __init__(self, config_path: Optional[Path] = None):
+    def __init__(self, config_path: Optional[Path] = None, structure_cache_path: Optional[Path] = None):
         """
         Initialize the mapping manager.
 
         Args:
             config_path: Optional path to config file. Defaults to client_input_mappings.json
+            structure_cache_path: Optional path to the sheet structure cache.
+                Defaults to SHEET_STRUCTURE_CACHE_FILE, or
+                sheet_structure_cache.json in the working directory
         """
         self.config_path = config_path or CLIENT_MAPPINGS_FILE
+        self.structure_cache_path = Path(
+            structure_cache_path or SHEET_STRUCTURE_CACHE_FILE
+            or os.path.join(os.getcwd(), "sheet_structure_cache.json")
+        )
         self.config: Dict[str, Any] = {}
+        self._sheet_structures: Optional[Dict[str, Dict[str, Any]]] = None  # Loaded on first use
         self._load_config()
 
     def _load_config(self) -> None:
@@ -339,6 +355,89 @@ class ClientMappingManager:
 
         return True  # Already exists
 
+    # ------------------------------------------------------------------
+    # Sheet structure cache
+    # ------------------------------------------------------------------
+
+    def get_sheet_structures(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get cached sheet structures, keyed by structure fingerprint.
+
+        Returns:
+            Dict of fingerprint -> structure entry (header_idx, headers,
+            col_map, sheet_role, ...). Empty if the cache file is missing
+            or unreadable.
+        """
+        if self._sheet_structures is None:
+            self._sheet_structures = {}
+            try:
+                if self.structure_cache_path.exists():
+                    with open(self.structure_cache_path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    self._sheet_structures = data.get("structures", {})
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable sheet structure cache {self.structure_cache_path}: {e}")
+        return self._sheet_structures
+
+    def save_sheet_structures(
+        self,
+        entries: Dict[str, Dict[str, Any]],
+        used_keys: Optional[List[str]] = None
+    ) -> bool:
+        """
+        Add detected sheet structures and mark cache hits as recently used.
+
+        The least recently used entries are dropped beyond
+        SHEET_STRUCTURE_CACHE_MAX_ENTRIES.
+
+        Args:
+            entries: Dict of fingerprint -> new structure entry
+            used_keys: Fingerprints that were served from the cache
+
+        Returns:
+            True if save was successful
+        """
+        structures = self.get_sheet_structures()
+        now = datetime.now().isoformat()
+
+        for key, entry in entries.items():
+            structures[key] = dict(entry, last_used=now)
+        for key in used_keys or []:
+            if key in structures:
+                structures[key]["last_used"] = now
+
+        if len(structures) > SHEET_STRUCTURE_CACHE_MAX_ENTRIES:
+            by_age = sorted(structures, key=lambda k: structures[k].get("last_used", ""))
+            for key in by_age[:len(structures) - SHEET_STRUCTURE_CACHE_MAX_ENTRIES]:
+                del structures[key]
+
+        try:
+            self.structure_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.structure_cache_path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"structures": structures}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.structure_cache_path)
+            return True
+        except Exception as e:
+            logger.error(f"Error saving sheet structure cache: {e}")
+            return False
+
+    def clear_sheet_structures(self) -> bool:
+        """
+        Forget all cached sheet structures.
+
+        Returns:
+            True if the cache was cleared
+        """
+        self._sheet_structures = {}
+        try:
+            self.structure_cache_path.unlink(missing_ok=True)
+            logger.info("Cleared sheet structure cache")
+            return True
+        except OSError as e:
+            logger.error(f"Error clearing sheet structure cache: {e}")
+            return False
+
 
 class MappingPreview:
     """
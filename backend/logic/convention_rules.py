@@ -11,7 +11,7 @@ Using HY when MQ is required = material depreciation overstatement.
 """
 
 from datetime import date
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, List, Optional
 import pandas as pd
 
 
@@ -78,42 +78,76 @@ def detect_mid_quarter_convention(
         - convention: "HY" (half-year) or "MQ" (mid-quarter)
         - details_dict: Breakdown by quarter with totals
     """
+    entries = [mid_quarter_basis(row, tax_year) for _, row in df.iterrows()]
+    return summarize_mid_quarter_test(entries, tax_year, verbose=verbose)
+
+
+def mid_quarter_basis(row, tax_year: int) -> Optional[Tuple[float, int]]:
+    """
+    Return one asset's contribution to the mid-quarter test.
+
+    Only current year additions of personal property with a positive cost
+    count toward the test (real property always uses MM).
+
+    Args:
+        row: Asset row (Series or dict)
+        tax_year: Current tax year
+
+    Returns:
+        (cost, quarter) if the asset counts toward the test, else None
+    """
     from .parse_utils import parse_date
 
-    # Filter to current year additions of personal property only
-    # (Real property always uses MM, so excluded from MQ test)
-    current_year_personal_property = []
+    # Skip disposals and transfers
+    trans_type = str(row.get("Transaction Type", "")).lower()
+    if "disposal" in trans_type or "transfer" in trans_type:
+        return None
 
-    for _, row in df.iterrows():
-        # Skip disposals and transfers
-        trans_type = str(row.get("Transaction Type", "")).lower()
-        if "disposal" in trans_type or "transfer" in trans_type:
-            continue
+    # Skip real property (always uses MM)
+    category = str(row.get("Final Category", ""))
+    if any(x in category for x in ["Residential", "Nonresidential", "Real Property"]):
+        return None
 
-        # Skip real property (always uses MM)
-        category = str(row.get("Final Category", ""))
-        if any(x in category for x in ["Residential", "Nonresidential", "Real Property"]):
-            continue
+    # Check if placed in service in current tax year
+    in_service = parse_date(row.get("In Service Date"))
+    if not in_service:
+        return None
 
-        # Check if placed in service in current tax year
-        in_service = parse_date(row.get("In Service Date"))
-        if not in_service:
-            continue
+    if in_service.year == tax_year:
+        cost = float(row.get("Cost") or 0.0)
+        if cost > 0:
+            return cost, get_quarter(in_service)
+
+    return None
+
+
+def summarize_mid_quarter_test(
+    entries: List[Optional[Tuple[float, int]]],
+    tax_year: int,
+    verbose: bool = True
+) -> Tuple[str, Dict]:
+    """
+    Apply the >40% Q4 test to per-asset contributions from mid_quarter_basis().
+
+    Split out of detect_mid_quarter_convention() so callers that cache the
+    per-asset contributions (incremental export builds) can re-run the
+    portfolio-wide test without re-reading every row.
 
-        if in_service.year == tax_year:
-            cost = float(row.get("Cost") or 0.0)
-            if cost > 0:
-                current_year_personal_property.append({
-                    "cost": cost,
-                    "in_service_date": in_service,
-                    "quarter": get_quarter(in_service)
-                })
+    Args:
+        entries: mid_quarter_basis() result for each asset, in row order
+        tax_year: Current tax year
+        verbose: If True, print detailed calculation
+
+    Returns:
+        Tuple of (convention, details_dict)
+    """
+    current_year_personal_property = [e for e in entries if e is not None]
 
     # Calculate totals by quarter
-    q1_total = sum(a["cost"] for a in current_year_personal_property if a["quarter"] == 1)
-    q2_total = sum(a["cost"] for a in current_year_personal_property if a["quarter"] == 2)
-    q3_total = sum(a["cost"] for a in current_year_personal_property if a["quarter"] == 3)
-    q4_total = sum(a["cost"] for a in current_year_personal_property if a["quarter"] == 4)
+    q1_total = sum(cost for cost, quarter in current_year_personal_property if quarter == 1)
+    q2_total = sum(cost for cost, quarter in current_year_personal_property if quarter == 2)
+    q3_total = sum(cost for cost, quarter in current_year_personal_property if quarter == 3)
+    q4_total = sum(cost for cost, quarter in current_year_personal_property if quarter == 4)
 
     total_basis = q1_total + q2_total + q3_total + q4_total
 
@@ -0,0 +1,303 @@
+# fixed_asset_ai/logic/delimited_reader.py
+"""
+Delimited Text Reader for Fixed Asset Schedules
+
+CSV/TSV ingestion for uploads that are not workbooks (ERP exports, the
+test_data sets). A delimited file is read as a one-sheet workbook in the
+raw layout workbook_reader produces (header=None: positional rows and
+columns, None for empty cells), so it goes through tab analysis and
+build_unified_dataframe unchanged.
+
+Key Features:
+- Encoding sniffed from the BOM, then UTF-8, falling back to cp1252/latin-1
+- Delimiter sniffed from a sample (comma, tab, semicolon, pipe)
+- Read in chunks with pandas' C parser, every cell as text
+- Money and date columns found by column_detector on the header row are
+  converted in bulk (floats, Timestamps), so they skip per-value parsing
+- Blank lines are kept, so row positions match the file's line numbers
+
+Author: Fixed Asset AI Team
+"""
+
+from __future__ import annotations
+
+import codecs
+import csv
+import io
+import logging
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .constants import EARLIEST_REASONABLE_DATE, MAX_FUTURE_YEARS
+
+logger = logging.getLogger(__name__)
+
+
+# File extensions read as delimited text instead of a workbook
+DELIMITED_EXTENSIONS = (".csv", ".tsv", ".txt")
+
+# A delimited file has one "sheet"; named like a new workbook's first tab
+DELIMITED_SHEET_NAME = "Sheet1"
+
+SNIFF_BYTES = 64 * 1024
+READ_CHUNK_ROWS = 100000
+CANDIDATE_DELIMITERS = ",\t;|"
+FALLBACK_ENCODINGS = ("cp1252", "latin-1")
+
+# Fields sheet_loader runs through parse_number; plain numeric text in these
+# columns parses to the same float, so it is converted up front
+NUMERIC_FIELDS = (
+    "cost", "business_use_pct", "accumulated_depreciation", "proceeds",
+    "net_book_value", "gain_loss", "section_179_taken", "bonus_taken",
+)
+
+# Fields sheet_loader runs through parse_date. Text in these columns that
+# matches one of these formats, with a year parse_date accepts, is converted
+# up front; anything else is left for parse_date.
+DATE_FIELDS = ("acquisition_date", "in_service_date", "disposal_date", "transfer_date")
+DATE_FORMATS = ("%m/%d/%Y", "%Y-%m-%d")
+
+
+def is_delimited_file(file_path: str) -> bool:
+    """True if the path has a CSV/TSV extension."""
+    return os.path.splitext(str(file_path))[1].lower() in DELIMITED_EXTENSIONS
+
+
+def _sniff_encoding(sample: bytes) -> str:
+    """Encoding from the BOM, else UTF-8 if the sample decodes, else cp1252."""
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    try:
+        # Incremental: the sample may end mid-character
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return FALLBACK_ENCODINGS[0]
+
+
+def _sniff_delimiter(text: str, file_path: str) -> str:
+    """Delimiter from csv.Sniffer, else the most common candidate in the sample."""
+    lines = text.splitlines()[:50]
+    try:
+        return csv.Sniffer().sniff("\n".join(lines), delimiters=CANDIDATE_DELIMITERS).delimiter
+    except csv.Error:
+        pass
+    if file_path.lower().endswith(".tsv"):
+        return "\t"
+    counts = {d: sum(line.count(d) for line in lines) for d in CANDIDATE_DELIMITERS}
+    best = max(counts, key=counts.get)
+    return best if counts[best] else ","
+
+
+def _field_count(file_path: str, encoding: str, delimiter: str) -> int:
+    """Widest row in the file (title lines above the header are often narrower)."""
+    with open(file_path, newline="", encoding=encoding) as f:
+        return max((len(row) for row in csv.reader(f, delimiter=delimiter)), default=0)
+
+
+def _read_frame(
+    file_path: str,
+    encoding: str,
+    delimiter: str,
+    width: int,
+    skiprows: int = 0,
+    nrows: Optional[int] = None,
+    float_columns: Sequence[int] = (),
+) -> pd.DataFrame:
+    """
+    Read rows with the C parser, in chunks: float_columns as float64, every
+    other cell as text, None where empty.
+
+    Raises:
+        ValueError: If a float column holds text that is not a plain number
+    """
+    reader = pd.read_csv(
+        file_path,
+        sep=delimiter,
+        header=None,
+        names=range(width),
+        dtype={c: ("float64" if c in float_columns else str) for c in range(width)},
+        keep_default_na=False,
+        na_values=[""],
+        skip_blank_lines=False,
+        skiprows=skiprows,
+        nrows=nrows,
+        encoding=encoding,
+        engine="c",
+        float_precision="round_trip",  # same floats as parse_number's float()
+        chunksize=READ_CHUNK_ROWS,
+    )
+    with reader:
+        chunks = list(reader)
+    if not chunks:
+        return pd.DataFrame(columns=range(width), dtype=object)
+    df = chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
+
+    # Raw sheet layout: object columns with None for empty cells
+    columns = {}
+    for c in range(width):
+        values = df[c].to_numpy(dtype=object)
+        values[pd.isna(values)] = None
+        columns[c] = values
+    return pd.DataFrame(columns, index=df.index, dtype=object)
+
+
+def _column_hints(head: pd.DataFrame) -> Tuple[int, List[int], List[int]]:
+    """
+    Detect the header row, and the columns column_detector maps to
+    NUMERIC_FIELDS and DATE_FIELDS.
+
+    Returns:
+        (header row index, numeric column positions, date column positions)
+    """
+    from .column_detector import detect_columns
+    from .sheet_loader import _detect_header_row
+
+    header_idx = _detect_header_row(head)
+    header = ["" if v is None else str(v).strip() for v in head.iloc[header_idx]]
+    col_map, _, _ = detect_columns([h for h in header if h])
+
+    def positions(fields):
+        return sorted(header.index(col_map[f]) for f in fields if col_map.get(f))
+
+    return header_idx, positions(NUMERIC_FIELDS), positions(DATE_FIELDS)
+
+
+def _apply_numeric_hints(df: pd.DataFrame, columns: Sequence[int]) -> None:
+    """Replace plain numeric text in the given columns with floats, in place."""
+    for col in columns:
+        values = df[col].to_numpy(dtype=object).copy()
+        numbers = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
+        ok = np.isfinite(numbers)
+        values[ok] = numbers[ok]
+        df[col] = pd.Series(values, index=df.index, dtype=object)
+
+
+def _apply_date_hints(df: pd.DataFrame, columns: Sequence[int]) -> None:
+    """Replace date text in DATE_FORMATS with Timestamps, in place (parsed once per distinct value)."""
+    first_year = EARLIEST_REASONABLE_DATE.year
+    last_year = datetime.now().year + MAX_FUTURE_YEARS
+    for col in columns:
+        values = df[col].to_numpy(dtype=object)
+        text = np.flatnonzero(pd.Series(values, dtype=object).map(type).to_numpy() == str)
+        if not len(text):
+            continue
+        codes, distinct = pd.factorize(values[text])
+        parsed = np.full(len(distinct), None, dtype=object)
+        for fmt in DATE_FORMATS:
+            pending = np.flatnonzero(parsed == None)  # noqa: E711
+            if not len(pending):
+                break
+            dates = pd.to_datetime(pd.Series(distinct[pending], dtype=object), format=fmt, errors="coerce")
+            ok = ((dates.dt.year >= first_year) & (dates.dt.year <= last_year)).to_numpy()
+            parsed[pending[ok]] = dates[ok].astype(object).to_numpy()
+        converted = parsed[codes]
+        hit = converted != None  # noqa: E711
+        if hit.any():
+            values = values.copy()
+            values[text[hit]] = converted[hit]
+            df[col] = pd.Series(values, index=df.index, dtype=object)
+
+
+def _read_sheet(
+    file_path: str,
+    encoding: str,
+    delimiter: str,
+    width: int,
+    nrows: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Read the rows above the data as text, then the data rows with the
+    column hints applied (numeric columns as C parser dtypes).
+    """
+    from .sheet_loader import HEADER_SCAN_MAX_ROWS
+
+    scan = HEADER_SCAN_MAX_ROWS if nrows is None else min(nrows, HEADER_SCAN_MAX_ROWS)
+    head = _read_frame(file_path, encoding, delimiter, width, nrows=scan)
+    if head.empty:
+        return head
+
+    header_idx, numeric, dates = _column_hints(head)
+    data_start = header_idx + 1
+    if len(head) < scan:
+        # The whole file fit in the header scan
+        data = head.iloc[data_start:].reset_index(drop=True)
+        _apply_numeric_hints(data, numeric)
+    else:
+        data_rows = None if nrows is None else nrows - data_start
+        try:
+            data = _read_frame(file_path, encoding, delimiter, width, data_start, data_rows, numeric)
+        except pd.errors.ParserError:
+            raise
+        except ValueError:
+            # e.g. "$1,250.00" or "(300)": convert the plain numbers here,
+            # parse_number handles the rest
+            data = _read_frame(file_path, encoding, delimiter, width, data_start, data_rows)
+            _apply_numeric_hints(data, numeric)
+    _apply_date_hints(data, dates)
+    return pd.concat([head.iloc[:data_start], data], ignore_index=True)
+
+
+def read_delimited_sheets(
+    file_path: str,
+    nrows: Optional[int] = None,
+    warnings: Optional[List[str]] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Read a CSV/TSV file as {DELIMITED_SHEET_NAME: raw DataFrame}.
+
+    Args:
+        file_path: Path to the delimited file
+        nrows: Read at most this many rows (default: all)
+        warnings: If given, read problems worth surfacing are appended here
+
+    Raises:
+        Exception: If the file cannot be read at all
+    """
+    with open(file_path, "rb") as f:
+        raw_sample = f.read(SNIFF_BYTES)
+    encoding = _sniff_encoding(raw_sample)
+    sample = raw_sample.decode(encoding, errors="ignore")
+    delimiter = _sniff_delimiter(sample, file_path)
+    width = max((len(r) for r in csv.reader(io.StringIO(sample), delimiter=delimiter)), default=0)
+    if not width:
+        return {DELIMITED_SHEET_NAME: pd.DataFrame()}
+
+    # The sample decoded, but a later byte may not; latin-1 always decodes
+    df = None
+    for attempt in [encoding] + [e for e in FALLBACK_ENCODINGS if e != encoding]:
+        try:
+            try:
+                df = _read_sheet(file_path, attempt, delimiter, width, nrows)
+            except pd.errors.ParserError:
+                # A row past the sample is wider than any in it
+                width = _field_count(file_path, attempt, delimiter)
+                df = _read_sheet(file_path, attempt, delimiter, width, nrows)
+        except UnicodeDecodeError:
+            continue
+        if attempt != encoding:
+            message = f"Delimited file is not valid {encoding}; read as {attempt}"
+            logger.warning(message)
+            if warnings is not None:
+                warnings.append(message)
+        break
+    if df is None:
+        raise ValueError(f"Could not decode delimited file as {encoding}")
+
+    # Rows after the last one with any cells are dropped, like a worksheet
+    last_row = len(df)
+    while last_row and all(v is None for v in df.iloc[last_row - 1]):
+        last_row -= 1
+    if not last_row:
+        return {DELIMITED_SHEET_NAME: pd.DataFrame()}
+    df = df.iloc[:last_row]
+
+    logger.info(f"Read delimited file: {len(df)} rows, {df.shape[1]} columns "
+                f"(encoding={attempt}, delimiter={delimiter!r})")
+    return {DELIMITED_SHEET_NAME: df}
@@ -0,0 +1,364 @@
+"""
+Export Artifact Cache for FA CS Automator
+
+Content-addressed, size-bounded on-disk cache for generated export files.
+
+Reviewers re-run /export and /export/audit many times while iterating on
+the same data; each call used to regenerate the workbook from scratch.
+Artifacts are keyed by a SHA-256 of everything that shapes the output
+(asset content, approvals, tax config, export format version), so an
+unchanged session is served straight from disk and the key doubles as the
+HTTP ETag.
+
+- Files are written to a temp name and renamed into place (never partial)
+- Least recently served files are evicted once the cache exceeds its
+  byte budget; FileCleanupManager also runs eviction on its schedule
+- Hand-off copies are hard links (or reflinks) of the cached file, not
+  another full write
+- Streamed text exports (CSV/ASCII) are written to the cache as they are
+  sent and only kept if the whole file went out
+
+Cached files are shared by every hand-off link, so they must be treated
+as read-only.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Runtime data, kept out of the checkout. link() hard-links artifacts into
+# the handoff folder only when both are on one filesystem; otherwise it copies
+EXPORT_CACHE_DIR = os.environ.get("EXPORT_CACHE_DIR", "")  # Default: <user cache dir>/export_cache
+EXPORT_CACHE_MAX_BYTES = int(os.environ.get("EXPORT_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))  # 256MB
+EXPORT_CACHE_RETENTION_HOURS = int(os.environ.get("EXPORT_CACHE_RETENTION_HOURS", "24"))
+
+# Linux FICLONE ioctl (copy-on-write clone on btrfs/XFS)
+_FICLONE = 0x40049409
+
+_COPY_CHUNK_SIZE = 64 * 1024
+
+
+def export_content_key(
+    kind: str,
+    assets: Iterable[Any],
+    approved_ids: Iterable[Any] = (),
+    tax_config: Optional[Dict[str, Any]] = None,
+    format_version: str = "",
+) -> str:
+    """
+    Hash everything that determines an export's bytes.
+
+    Args:
+        kind: Artifact name (e.g. "prep_workpaper"); different exports of
+            the same data get different keys
+        assets: Asset models in export order
+        approved_ids: Approved asset unique IDs
+        tax_config: Tax settings the export uses
+        format_version: Exporter format version (bump on layout changes)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    header = {
+        "kind": kind,
+        "format_version": format_version,
+        "tax_config": tax_config or {},
+        "approved": sorted(str(i) for i in approved_ids),
+    }
+    digest.update(json.dumps(header, sort_keys=True, default=str).encode("utf-8"))
+    for asset in assets:
+        digest.update(b"\0")
+        digest.update(asset.model_dump_json().encode("utf-8"))
+    return digest.hexdigest()
+
+
+def user_cache_dir() -> str:
+    """This app's per-user cache directory: $XDG_CACHE_HOME, else ~/.cache."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "fa_cs_automator")
+
+
+# ==============================================================================
+# CACHE
+# ==============================================================================
+
+class ExportArtifactCache:
+    """
+    On-disk export cache with a byte budget.
+
+    Usage:
+        cache = get_export_cache()
+        f = cache.open(key, ".xlsx")
+        if f is None:
+            f = cache.store(key, ".xlsx", generate_workbook())
+        cache.link(f, handoff_path)
+    """
+
+    def __init__(self, directory: str = None, max_bytes: int = EXPORT_CACHE_MAX_BYTES,
+                 retention_hours: float = EXPORT_CACHE_RETENTION_HOURS):
+        self.directory = directory or EXPORT_CACHE_DIR or os.path.join(user_cache_dir(), "export_cache")
+        self.max_bytes = max_bytes
+        self.retention_hours = retention_hours
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+
+    def path_for(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{key}{suffix}")
+
+    def open(self, key: str, suffix: str) -> Optional[BinaryIO]:
+        """Open a cached artifact for reading, or None on a miss."""
+        path = self.path_for(key, suffix)
+        try:
+            fileobj = open(path, "rb")
+        except FileNotFoundError:
+            with self._lock:
+                self._misses += 1
+            return None
+        try:
+            # Eviction is least-recently-served first
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self._hits += 1
+        return fileobj
+
+    def store(self, key: str, suffix: str, fileobj: BinaryIO) -> BinaryIO:
+        """
+        Copy a generated artifact into the cache.
+
+        Returns the cached file opened for reading. If the cache can't be
+        written (disk full, read-only), logs a warning and returns the
+        original file rewound so the export still goes out.
+        """
+        path = self.path_for(key, suffix)
+        partial_path = f"{path}.{os.getpid()}.{threading.get_ident()}.partial"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fileobj.seek(0)
+            with open(partial_path, "wb") as out:
+                shutil.copyfileobj(fileobj, out, _COPY_CHUNK_SIZE)
+            os.replace(partial_path, path)
+            cached = open(path, "rb")
+        except OSError as e:
+            logger.warning(f"Export cache write failed for {key[:12]}: {e}")
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            fileobj.seek(0)
+            return fileobj
+
+        fileobj.close()
+        with self._lock:
+            self._stores += 1
+        self.evict()
+        return cached
+
+    def store_stream(self, key: str, suffix: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Pass generated chunks through to the caller while caching them.
+
+        The artifact is only committed once every chunk has been consumed;
+        if the client disconnects or generation fails, the partial file is
+        discarded. Cache write errors never interrupt the stream.
+        """
+        path = self.path_for(key, suffix)
+        # Chunks may be pulled from different worker threads; use a unique name
+        partial_path = f"{path}.{uuid.uuid4().hex}.partial"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            out = open(partial_path, "wb")
+        except OSError as e:
+            logger.warning(f"Export cache write failed for {key[:12]}: {e}")
+            out = None
+
+        completed = False
+        try:
+            for chunk in chunks:
+                if out is not None:
+                    try:
+                        out.write(chunk)
+                    except OSError as e:
+                        logger.warning(f"Export cache write failed for {key[:12]}: {e}")
+                        out.close()
+                        os.remove(partial_path)
+                        out = None
+                yield chunk
+            completed = True
+        finally:
+            if out is not None:
+                out.close()
+                try:
+                    if completed:
+                        os.replace(partial_path, path)
+                    else:
+                        os.remove(partial_path)
+                except OSError as e:
+                    logger.warning(f"Export cache write failed for {key[:12]}: {e}")
+                    completed = False
+
+        if completed and out is not None:
+            with self._lock:
+                self._stores += 1
+            self.evict()
+
+    def link(self, fileobj: BinaryIO, dest: str) -> str:
+        """
+        Place an artifact at dest without rewriting it when possible.
+
+        Tries a hard link, then a reflink, then a chunked copy. The file
+        appears at dest atomically. fileobj is left at position 0.
+
+        Returns:
+            "hardlink", "reflink" or "copy"
+        """
+        src = getattr(fileobj, "name", None)
+        partial_path = f"{dest}.partial"
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        method = "copy"
+        try:
+            if isinstance(src, str) and os.path.exists(src):
+                try:
+                    os.link(src, partial_path)
+                    method = "hardlink"
+                except OSError:
+                    if self._reflink(src, partial_path):
+                        method = "reflink"
+            if method == "copy":
+                fileobj.seek(0)
+                with open(partial_path, "wb") as out:
+                    shutil.copyfileobj(fileobj, out, _COPY_CHUNK_SIZE)
+            os.replace(partial_path, dest)
+        except Exception:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+        finally:
+            fileobj.seek(0)
+        return method
+
+    @staticmethod
+    def _reflink(src: str, dest: str) -> bool:
+        if fcntl is None:
+            return False
+        try:
+            with open(src, "rb") as s, open(dest, "wb") as d:
+                fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+            return True
+        except OSError:
+            if os.path.exists(dest):
+                os.remove(dest)
+            return False
+
+    def _entries(self):
+        """(path, size, mtime) for cached artifacts, oldest first."""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            if name.endswith(".partial"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((path, st.st_size, st.st_mtime))
+        entries.sort(key=lambda e: e[2])
+        return entries
+
+    def evict(self, max_bytes: Optional[int] = None, dry_run: bool = False,
+              is_active: Optional[Callable[[str], bool]] = None) -> Tuple[int, int]:
+        """
+        Drop expired artifacts, then oldest ones until under the byte budget.
+
+        Args:
+            max_bytes: Budget override (0 empties the cache)
+            dry_run: Report what would be removed without deleting
+            is_active: Predicate for files that must be kept (in use)
+
+        Returns:
+            (files removed, bytes freed)
+        """
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        cutoff = time.time() - self.retention_hours * 3600
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        removed = freed = 0
+
+        for path, size, mtime in entries:
+            if mtime >= cutoff and total <= budget:
+                break
+            if is_active and is_active(path):
+                continue
+            if not dry_run:
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    # e.g. still open for download on Windows
+                    logger.debug(f"Export cache could not evict {path}: {e}")
+                    continue
+            total -= size
+            removed += 1
+            freed += size
+
+        if removed and not dry_run:
+            with self._lock:
+                self._evictions += removed
+            logger.info(f"Export cache evicted {removed} artifact(s), {freed} bytes")
+        return removed, freed
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._entries()
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "directory": self.directory,
+                "artifacts": len(entries),
+                "bytes": sum(size for _, size, _ in entries),
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else None,
+                "stores": self._stores,
+                "evictions": self._evictions,
+            }
+
+
+# ==============================================================================
+# GLOBAL INSTANCE
+# ==============================================================================
+
+_export_cache: Optional[ExportArtifactCache] = None
+
+
+def get_export_cache() -> ExportArtifactCache:
+    """Get or create global export artifact cache."""
+    global _export_cache
+    if _export_cache is None:
+        _export_cache = ExportArtifactCache()
+    return _export_cache
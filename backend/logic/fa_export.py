@@ -8,17 +8,18 @@ This module has been refactored with supporting modules:
 - fa_export_audit.py: Classification explanations, audit trail
 - fa_export_vehicles.py: Luxury auto rules, vehicle detection
 - fa_export_formatters.py: Excel formatting utilities
+- fa_export_matching.py: FA CS Asset # lookup, disposal/transfer matching
 - fa_cs_mappings.py: FA CS wizard category mappings
 
 Author: Fixed Asset AI Team
 """
 
-from io import BytesIO, StringIO
 from datetime import datetime, date
-from typing import Optional, Dict
+from typing import Optional, Dict, Iterator, List, Union
 import hashlib
 import re
 
+import numpy as np
 import pandas as pd
 
 # ==============================================================================
@@ -46,7 +47,10 @@ from .listed_property import (
 from .recapture import (
     calculate_section_1245_recapture,
     calculate_section_1250_recapture,
+    calculate_section_1245_recapture_array,
+    calculate_section_1250_recapture_array,
     determine_recapture_type,
+    determine_recapture_types,
 )
 from .convention_rules import (
     detect_mid_quarter_convention,
@@ -87,12 +91,18 @@ from .fa_export_vehicles import (
     _apply_luxury_auto_caps,
     _determine_asset_type,
 )
+from .fa_export_matching import (
+    build_fa_cs_asset_lookup,
+    match_disposals_to_fa_cs,
+    match_transfers_to_fa_cs,
+)
 from .fa_cs_mappings import _get_fa_cs_wizard_category
 from .fa_export_formatters import (
     _apply_professional_formatting,
     _apply_conditional_formatting,
     format_summary_sheet,
 )
+from .fa_export_streaming import StreamingWorkbook, TEXT_CHUNK_SIZE, iter_delimited_chunks
 
 
 # --------------------------------------------------------------
@@ -147,7 +157,18 @@ def _format_date_for_fa_cs(date_series: pd.Series) -> pd.Series:
         # Format without leading zeros: M/D/YYYY
         return f"{dt.month}/{dt.day}/{dt.year}"
 
-    return date_series.apply(format_single_date)
+    if not pd.api.types.is_datetime64_any_dtype(date_series):
+        return date_series.apply(format_single_date)
+
+    # datetime64 input (the build_fa path): format whole columns at once
+    formatted = pd.Series("", index=date_series.index, dtype=object)
+    valid = date_series.notna()
+    if valid.any():
+        dates = date_series[valid].dt
+        formatted[valid] = (
+            dates.month.astype(str) + "/" + dates.day.astype(str) + "/" + dates.year.astype(str)
+        )
+    return formatted
 
 
 def _fix_description(desc: str):
@@ -286,12 +307,11 @@ def _compute_materiality(df: pd.DataFrame) -> pd.DataFrame:
     max_val = base.max() or 1.0
     df["MaterialityScore"] = (base / max_val) * 100.0
 
-    def _priority(v):
-        if v >= 70: return "High"
-        if v >= 40: return "Medium"
-        return "Low"
-
-    df["ReviewPriority"] = df["MaterialityScore"].apply(_priority)
+    score = df["MaterialityScore"]
+    df["ReviewPriority"] = pd.Series(
+        np.select([score >= 70, score >= 40], ["High", "Medium"], default="Low"),
+        index=df.index,
+    )
     return df
 
 
@@ -458,52 +478,75 @@ def _get_fa_cs_wizard_category(row) -> str:
 # CLASSIFICATION EXPLANATION
 # --------------------------------------------------------------
 
+# Ordered (keywords, value) lookup tables keyed on the lower-cased Final
+# Category. The first entry with a matching keyword wins, exactly like the
+# if/elif chains they replaced, so table order is significant.
+RULES_EXPLANATIONS = [
+    (("land (non",), "land is non-depreciable under §167."),
+    (("improvement",), "IRS MACRS Table B-1 lists land improvements as 15-year property."),
+    (("qualified improvement",), "QIP is 15-year interior non-structural under §168(k)(3)."),
+    (("real property",), "nonresidential real property depreciates over 39-year MM."),
+    (("residential rental",), "residential rental is 27.5-year MM."),
+    (("machinery", "equipment"), "general machinery is 7-year GDS property."),
+    (("vehicle",), "vehicles fall under 5-year MACRS GDS."),
+    (("computer",), "computers are 5-year MACRS GDS."),
+    (("furniture",), "office furniture is 7-year MACRS GDS."),
+]
+GPT_EXPLANATION = "GPT MACRS reasoning using IRS mapping tables."
+FALLBACK_EXPLANATION = "fallback personal property rule."
+
+MACRS_REASON_CODES = [
+    (("land (non",), "L0"),
+    (("land improvement",), "LI15"),
+    (("qualified improvement",), "QIP15"),
+    (("real property",), "RP39"),
+    (("residential rental",), "RR27"),
+    (("vehicle",), "V5"),
+    (("computer",), "C5"),
+    (("furniture",), "F7"),
+    (("equipment", "machinery"), "M7"),
+]
+
+AUDIT_RULE_TRIGGERS = [
+    (("land (non",), "Land → Non-Depreciable"),
+    (("land improvement",), "Land Improvement (15-yr)"),
+    (("qualified improvement",), "QIP → 15-year"),
+    (("real property",), "Nonresidential Real Property (39-yr)"),
+    (("residential rental",), "Residential Rental (27.5-yr)"),
+    (("vehicle",), "Vehicle (5-yr)"),
+    (("equipment", "machinery"), "7-year Machinery"),
+]
+
+CONFIDENCE_COLUMNS = ["Rule Confidence", "Confidence", "Classification Confidence", "GPT Confidence"]
+
+
+def _match_category(cat: str, table: list, default: str) -> str:
+    """Resolve a lower-cased category against an ordered lookup table."""
+    for keywords, value in table:
+        if any(kw in cat for kw in keywords):
+            return value
+    return default
+
+
 def _classification_explanation(row):
     """Explain MACRS classification following IRS logic."""
     cat = row.get("Final Category", "")
-    life = row.get("Recovery Period", "")
+    life = row.get("Recovery Period", row.get("Tax Life", ""))
     src = str(row.get("Source", ""))  # Convert to string to handle NaN/float values
 
     base = f"Classified as {cat} ({life}-year) because "
 
     if src.startswith("gpt"):
-        return base + "GPT MACRS reasoning using IRS mapping tables."
+        return base + GPT_EXPLANATION
     if src == "rules":
-        lc = str(cat).lower()
-        if "land (non" in lc:
-            return base + "land is non-depreciable under §167."
-        if "improvement" in lc:
-            return base + "IRS MACRS Table B-1 lists land improvements as 15-year property."
-        if "qualified improvement" in lc:
-            return base + "QIP is 15-year interior non-structural under §168(k)(3)."
-        if "real property" in lc:
-            return base + "nonresidential real property depreciates over 39-year MM."
-        if "residential rental" in lc:
-            return base + "residential rental is 27.5-year MM."
-        if "machinery" in lc or "equipment" in lc:
-            return base + "general machinery is 7-year GDS property."
-        if "vehicle" in lc:
-            return base + "vehicles fall under 5-year MACRS GDS."
-        if "computer" in lc:
-            return base + "computers are 5-year MACRS GDS."
-        if "furniture" in lc:
-            return base + "office furniture is 7-year MACRS GDS."
-    return base + "fallback personal property rule."
+        return base + _match_category(str(cat).lower(), RULES_EXPLANATIONS, FALLBACK_EXPLANATION)
+    return base + FALLBACK_EXPLANATION
 
 
 def _macrs_reason_code(row) -> str:
     """Generate compact MACRS reason code for audit trail."""
     cat = str(row.get("Final Category", "")).lower()
-    if "land (non" in cat: return "L0"
-    if "land improvement" in cat: return "LI15"
-    if "qualified improvement" in cat: return "QIP15"
-    if "real property" in cat: return "RP39"
-    if "residential rental" in cat: return "RR27"
-    if "vehicle" in cat: return "V5"
-    if "computer" in cat: return "C5"
-    if "furniture" in cat: return "F7"
-    if "equipment" in cat or "machinery" in cat: return "M7"
-    return "PP7"
+    return _match_category(cat, MACRS_REASON_CODES, "PP7")
 
 
 def _confidence_grade(row) -> str:
@@ -514,7 +557,7 @@ def _confidence_grade(row) -> str:
     """
     # Check multiple possible confidence column names
     conf = None
-    for col_name in ["Rule Confidence", "Confidence", "Classification Confidence", "GPT Confidence"]:
+    for col_name in CONFIDENCE_COLUMNS:
         val = row.get(col_name, None)
         if val is not None and pd.notna(val):
             conf = val
@@ -564,22 +607,7 @@ def _audit_fields(row) -> dict:
 
     # Rule trigger summary
     cat = str(row.get("Final Category", "")).lower()
-    if "land (non" in cat:
-        audit["AuditRuleTriggers"] = "Land → Non-Depreciable"
-    elif "land improvement" in cat:
-        audit["AuditRuleTriggers"] = "Land Improvement (15-yr)"
-    elif "qualified improvement" in cat:
-        audit["AuditRuleTriggers"] = "QIP → 15-year"
-    elif "real property" in cat:
-        audit["AuditRuleTriggers"] = "Nonresidential Real Property (39-yr)"
-    elif "residential rental" in cat:
-        audit["AuditRuleTriggers"] = "Residential Rental (27.5-yr)"
-    elif "vehicle" in cat:
-        audit["AuditRuleTriggers"] = "Vehicle (5-yr)"
-    elif "equipment" in cat or "machinery" in cat:
-        audit["AuditRuleTriggers"] = "7-year Machinery"
-    else:
-        audit["AuditRuleTriggers"] = "Personal Property Fallback"
+    audit["AuditRuleTriggers"] = _match_category(cat, AUDIT_RULE_TRIGGERS, "Personal Property Fallback")
 
     # Warnings
     warnings = []
@@ -615,6 +643,60 @@ def _audit_fields(row) -> dict:
 # --------------------------------------------------------------
 
 
+def _keyword_pattern(keywords) -> re.Pattern:
+    """Compile keywords (matched literally) into one alternation regex."""
+    return re.compile("|".join(re.escape(kw) for kw in keywords))
+
+
+# Passenger vehicle indicators in descriptions
+# NOTE: Use space-bounded terms for short words to avoid false matches
+# - "car" alone matches "card", "carpet" - use "car ", " car"
+# - "van" alone matches "advantage", "canvas" - use " van", "van "
+PASSENGER_AUTO_INDICATORS = ["car ", " car", "sedan", "suv", "crossover", " van", "van ", "minivan"]
+
+# Heavy truck indicators that take a vehicle out of the passenger limits
+PASSENGER_AUTO_EXCLUSIONS = ["heavy duty", "f-250", "f-350", "2500", "3500", "commercial truck"]
+
+# Heavy SUV/truck indicators (>6,000 lbs GVWR)
+HEAVY_SUV_INDICATORS = [
+    # Explicit weight indicators
+    "gvwr 6", "6000 lbs", "6,000 lbs", "6000lbs", "6,000lbs",
+    "gross vehicle weight", "over 6000", "over 6,000",
+
+    # Common heavy SUV models
+    "suburban", "tahoe", "yukon", "expedition", "navigator",
+    "escalade", "land cruiser", "sequoia", "armada",
+    "gx 460", "lx 570", "lx 600", "gx 550",
+    "qx80", "range rover", "land rover defender",
+
+    # Heavy duty trucks
+    "f-250", "f-350", "f250", "f350",
+    "2500", "3500", "2500hd", "3500hd",
+    "heavy duty", "hd", "crew cab diesel",
+    "dually", "super duty",
+
+    # Commercial trucks
+    "commercial truck", "work truck", "cargo van",
+    "sprinter", "transit 250", "transit 350",
+    "promaster 2500", "promaster 3500",
+]
+
+# Light truck/SUV indicators (NOT heavy)
+LIGHT_TRUCK_INDICATORS = [
+    "f-150", "f150", "1500", "tacoma", "ranger",
+    "colorado", "canyon", "ridgeline", "maverick",
+    "cr-v", "rav4", "highlander", "pilot", "pathfinder"
+]
+
+# Compiled once; shared by the row checks and the column-wide masks
+_PASSENGER_AUTO_RE = _keyword_pattern(PASSENGER_AUTO_INDICATORS)
+_PASSENGER_AUTO_EXCLUSION_RE = _keyword_pattern(PASSENGER_AUTO_EXCLUSIONS)
+_HEAVY_SUV_RE = _keyword_pattern(HEAVY_SUV_INDICATORS)
+_LIGHT_TRUCK_RE = _keyword_pattern(LIGHT_TRUCK_INDICATORS)
+_EXPLICIT_WEIGHT_RE = _keyword_pattern(["gvwr", "gross vehicle weight"])
+_TRUCK_CATEGORY_RE = _keyword_pattern(["truck", "trailer"])
+
+
 def _is_passenger_auto(row) -> bool:
     """
     Check if asset is a passenger automobile subject to §280F limits.
@@ -628,22 +710,12 @@ def _is_passenger_auto(row) -> bool:
     if "passenger" in final_class and "auto" in final_class:
         return True
 
-    # Also check description for typical passenger vehicles
-    # NOTE: Use space-bounded terms for short words to avoid false matches
-    # - "car" alone matches "card", "carpet" - use "car ", " car"
-    # - "van" alone matches "advantage", "canvas" - use " van", "van "
-    passenger_indicators = ["car ", " car", "sedan", "suv", "crossover", " van", "van ", "minivan"]
-    heavy_indicators = ["heavy duty", "f-250", "f-350", "2500", "3500", "commercial truck"]
-
     # If heavy truck indicators, not subject to passenger limits
-    if any(h in desc for h in heavy_indicators):
+    if _PASSENGER_AUTO_EXCLUSION_RE.search(desc):
         return False
 
     # If passenger indicators, subject to limits
-    if any(p in desc for p in passenger_indicators):
-        return True
-
-    return False
+    return bool(_PASSENGER_AUTO_RE.search(desc))
 
 
 def _is_heavy_suv(row) -> bool:
@@ -663,55 +735,42 @@ def _is_heavy_suv(row) -> bool:
     final_class = str(row.get("Final Category", "")).lower()
     desc = str(row.get("Description", "")).lower()
 
-    # Must be in Trucks & Trailers category or have truck/suv indicators
-    is_truck_category = "truck" in final_class or "trailer" in final_class
-
-    # Check for heavy SUV/truck indicators in description
-    heavy_suv_indicators = [
-        # Explicit weight indicators
-        "gvwr 6", "6000 lbs", "6,000 lbs", "6000lbs", "6,000lbs",
-        "gross vehicle weight", "over 6000", "over 6,000",
-
-        # Common heavy SUV models
-        "suburban", "tahoe", "yukon", "expedition", "navigator",
-        "escalade", "land cruiser", "sequoia", "armada",
-        "gx 460", "lx 570", "lx 600", "gx 550",
-        "qx80", "range rover", "land rover defender",
-
-        # Heavy duty trucks
-        "f-250", "f-350", "f250", "f350",
-        "2500", "3500", "2500hd", "3500hd",
-        "heavy duty", "hd", "crew cab diesel",
-        "dually", "super duty",
-
-        # Commercial trucks
-        "commercial truck", "work truck", "cargo van",
-        "sprinter", "transit 250", "transit 350",
-        "promaster 2500", "promaster 3500",
-    ]
-
-    # Check if description contains heavy SUV/truck indicators
-    has_heavy_indicator = any(ind in desc for ind in heavy_suv_indicators)
+    # Heavy SUV if:
+    # 1. Has explicit GVWR >6,000 lbs
+    # 2. OR in truck category AND has heavy indicators AND NOT light indicators
+    if _EXPLICIT_WEIGHT_RE.search(desc):
+        return True  # Explicit weight spec
 
-    # Light truck/SUV indicators (NOT heavy)
-    light_indicators = [
-        "f-150", "f150", "1500", "tacoma", "ranger",
-        "colorado", "canyon", "ridgeline", "maverick",
-        "cr-v", "rav4", "highlander", "pilot", "pathfinder"
-    ]
+    return bool(
+        _TRUCK_CATEGORY_RE.search(final_class)
+        and _HEAVY_SUV_RE.search(desc)
+        and not _LIGHT_TRUCK_RE.search(desc)
+    )
 
-    has_light_indicator = any(ind in desc for ind in light_indicators)
 
-    # Heavy SUV if:
-    # 1. In truck category AND has heavy indicators AND NOT light indicators
-    # 2. OR has explicit GVWR >6,000 lbs
-    if "gvwr" in desc or "gross vehicle weight" in desc:
-        return True  # Explicit weight spec
+def _passenger_auto_mask(df: pd.DataFrame) -> pd.Series:
+    """Vectorized _is_passenger_auto."""
+    final_class = _text_column(df, "Final Category")
+    desc = _text_column(df, "Description")
+    explicit = (
+        final_class.str.contains("passenger", regex=False)
+        & final_class.str.contains("auto", regex=False)
+    )
+    by_description = (
+        desc.str.contains(_PASSENGER_AUTO_RE) & ~desc.str.contains(_PASSENGER_AUTO_EXCLUSION_RE)
+    )
+    return explicit | by_description
 
-    if is_truck_category and has_heavy_indicator and not has_light_indicator:
-        return True
 
-    return False
+def _heavy_suv_mask(df: pd.DataFrame) -> pd.Series:
+    """Vectorized _is_heavy_suv."""
+    final_class = _text_column(df, "Final Category")
+    desc = _text_column(df, "Description")
+    return desc.str.contains(_EXPLICIT_WEIGHT_RE) | (
+        final_class.str.contains(_TRUCK_CATEGORY_RE)
+        & desc.str.contains(_HEAVY_SUV_RE)
+        & ~desc.str.contains(_LIGHT_TRUCK_RE)
+    )
 
 
 def _apply_luxury_auto_caps(row, sec179: float, bonus: float, tax_year: int) -> tuple[float, float, str]:
@@ -819,6 +878,63 @@ def _apply_luxury_auto_caps(row, sec179: float, bonus: float, tax_year: int) ->
     return sec179, bonus, ""
 
 
+def _apply_luxury_auto_caps_frame(
+    df: pd.DataFrame, sec179, bonus, notes, tax_year: int
+) -> tuple[list, list, list]:
+    """
+    Vectorized _apply_luxury_auto_caps over whole incentive columns.
+
+    Caps are applied with masked array operations to passenger autos placed
+    in service in the tax year. A cap note leads the row's other notes, as
+    it did when capping ran inside the per-asset loop. That loop replaced
+    the row's note with the cap result, dropping a heavy SUV §179(b)(5)
+    note set just before; here notes already on the row are kept.
+
+    Returns:
+        (capped_sec179, capped_bonus, notes) as lists aligned with df
+    """
+    sec179 = np.asarray(sec179, dtype=float)
+    bonus = np.asarray(bonus, dtype=float)
+    notes = list(notes)
+
+    passenger = _passenger_auto_mask(df).to_numpy()
+    if not passenger.any():
+        return sec179.tolist(), bonus.tolist(), notes
+
+    # Only apply to current year additions
+    eligible = np.zeros(len(df), dtype=bool)
+    if "In Service Date" in df.columns:
+        in_service = df["In Service Date"].iloc[np.flatnonzero(passenger)]
+        eligible[passenger] = in_service.map(lambda d: _is_current_year(d, tax_year)).to_numpy(dtype=bool)
+
+    # Limit depends on whether bonus is being claimed
+    limits = get_luxury_auto_limits(tax_year, asset_year=1)
+    with_bonus = bonus > 0
+    year_1_limit = np.where(with_bonus, limits["year_1_with_bonus"], limits["year_1_without_bonus"])
+    total_requested = sec179 + bonus
+    capped = eligible & (total_requested > year_1_limit)
+
+    # PRIORITY ORDER: Bonus first, then Section 179 (see _apply_luxury_auto_caps)
+    capped_bonus = np.minimum(bonus, year_1_limit)
+    capped_sec179 = np.minimum(sec179, year_1_limit - capped_bonus)
+
+    for pos in np.flatnonzero(capped):
+        limit_type = "with bonus" if with_bonus[pos] else "without bonus"
+        cap_note = (
+            f"IRC §280F luxury auto limit applied: "
+            f"Year 1 {limit_type} = ${year_1_limit[pos]:,.0f} "
+            f"(requested ${total_requested[pos]:,.0f}, "
+            f"excess ${total_requested[pos] - year_1_limit[pos]:,.0f} not allowed)"
+        )
+        notes[pos] = f"{cap_note} | {notes[pos]}" if notes[pos] else cap_note
+
+    return (
+        np.where(capped, capped_sec179, sec179).tolist(),
+        np.where(capped, capped_bonus, bonus).tolist(),
+        notes,
+    )
+
+
 # --------------------------------------------------------------
 # Helpers
 # --------------------------------------------------------------
@@ -837,15 +953,19 @@ def _is_current_year(date_val: Optional[date], tax_year: int) -> bool:
     return date_val.year == tax_year
 
 
+# Markers matched against Transaction Type / Sheet Role (user-defined), not
+# descriptions, so "sold" is safe here
+DISPOSAL_MARKERS = ["dispos", "disposal", "disposed", "sold", "retire"]
+TRANSFER_MARKERS = ["transfer", "xfer", "reclass"]
+
+
 def _is_disposal(row) -> bool:
     """Determine if row represents a disposal."""
     # Check Transaction Type first (more reliable), then Sheet Role
     raw = str(row.get("Transaction Type", "")).lower()
     if raw == "":
         raw = str(row.get("Sheet Role", "")).lower()
-    # NOTE: These are checked against Transaction Type/Sheet Role (user-defined),
-    # not descriptions, so "sold" is safe here
-    return any(x in raw for x in ["dispos", "disposal", "disposed", "sold", "retire"])
+    return any(x in raw for x in DISPOSAL_MARKERS)
 
 
 def _is_transfer(row) -> bool:
@@ -854,7 +974,7 @@ def _is_transfer(row) -> bool:
     raw = str(row.get("Transaction Type", "")).lower()
     if raw == "":
         raw = str(row.get("Sheet Role", "")).lower()
-    return any(x in raw for x in ["transfer", "xfer", "reclass"])
+    return any(x in raw for x in TRANSFER_MARKERS)
 
 
 def _determine_asset_type(row) -> str:
@@ -899,34 +1019,260 @@ def _convert_method_to_fa_cs_format(uses_ads: bool) -> str:
 
 
 # --------------------------------------------------------------
-# Main export builder
+# Vectorized column derivations
 # --------------------------------------------------------------
+# Column-at-a-time equivalents of the row helpers above. build_fa() derives
+# its output columns with these instead of df.apply(..., axis=1), which
+# rebuilt a Series per row for every derived column.
 
-def build_fa(
-    df: pd.DataFrame,
-    tax_year: int,
-    strategy: str,
-    taxable_income: float,
-    use_acq_if_missing: bool = True,
-    de_minimis_limit: float = 0.0,  # Set to 2500 or 5000 to enable de minimis safe harbor
-    section_179_carryforward_from_prior_year: float = 0.0,  # Prior year Section 179 carryforward (from Form 4562)
-    asset_number_start: int = 1,  # Starting Asset # for FA CS (e.g., 1001 to continue from existing assets)
-) -> pd.DataFrame:
+def _text_column(df: pd.DataFrame, col: str) -> pd.Series:
+    """Lower-cased string view of a column ("" when the column is missing)."""
+    if col not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    return df[col].astype(str).str.lower()
 
-    # ----------------------------------------------------------------------
-    # CRITICAL: Validate non-empty DataFrame
-    # ----------------------------------------------------------------------
-    if df is None or df.empty or len(df) == 0:
-        raise ValueError(
-            "Cannot process empty asset list. Please provide at least one asset record. "
-            "If you're importing from Excel, verify the file contains data rows."
-        )
 
-    df = df.copy()
+def _first_present(df: pd.DataFrame, cols: list, default) -> pd.Series:
+    """Vectorized row.get(cols[0], row.get(cols[1], ..., default))."""
+    for col in cols:
+        if col in df.columns:
+            return df[col]
+    return pd.Series(default, index=df.index, dtype=object)
 
-    # ----------------------------------------------------------------------
-    # DATA VALIDATION - Catch errors before processing
-    # ----------------------------------------------------------------------
+
+def _contains_any(values: pd.Series, keywords) -> pd.Series:
+    """True where the (lower-cased) text contains any of the keywords."""
+    pattern = "|".join(re.escape(kw) for kw in keywords)
+    return values.str.contains(pattern, regex=True, na=False)
+
+
+def _category_lookup(categories: pd.Series, table: list, default: str) -> pd.Series:
+    """
+    Resolve a Final Category column against an ordered lookup table.
+
+    Categories are low-cardinality, so each distinct value is resolved once
+    and the result broadcast back through the factorized codes.
+    """
+    codes, uniques = pd.factorize(categories.astype(str).str.lower())
+    resolved = [_match_category(cat, table, default) for cat in uniques]
+    lookup = np.array(resolved + [default], dtype=object)  # code -1 (NaN) -> default
+    return pd.Series(lookup[codes], index=categories.index)
+
+
+def _transaction_masks(df: pd.DataFrame) -> tuple[pd.Series, pd.Series]:
+    """Vectorized _is_disposal / _is_transfer: returns (disposal, transfer) masks."""
+    raw = _text_column(df, "Transaction Type")
+    if "Sheet Role" in df.columns:
+        raw = raw.where(raw != "", _text_column(df, "Sheet Role"))
+    return _contains_any(raw, DISPOSAL_MARKERS), _contains_any(raw, TRANSFER_MARKERS)
+
+
+def _blank_inactive(values, active: pd.Series) -> pd.Series:
+    """Blank out values on disposal/transfer rows (no FA CS setup fields)."""
+    if not isinstance(values, pd.Series):
+        values = pd.Series(values, index=active.index, dtype=object)
+    return values.where(active, "")
+
+
+def _book_lives(tax_life: pd.Series) -> pd.Series:
+    """Book life bins by tax life (non-numeric tax life falls to the 10-year default)."""
+    life = pd.to_numeric(tax_life, errors="coerce")
+    book = np.select([(life > 7) & (life <= 15), life >= 27.5], [15, 40], default=10)
+    return pd.Series(book, index=tax_life.index)
+
+
+def _confidence_grades(df: pd.DataFrame) -> pd.Series:
+    """Vectorized _confidence_grade over the first populated confidence column."""
+    conf = pd.Series(None, index=df.index, dtype=object)
+    for col_name in CONFIDENCE_COLUMNS:
+        if col_name in df.columns:
+            conf = conf.where(conf.notna(), df[col_name])
+
+    c = pd.to_numeric(conf, errors="coerce")
+    # Normalize if stored as percentage (e.g., 85 instead of 0.85)
+    c = c.where(~(c > 1), c / 100.0)
+    grades = np.select(
+        [c >= 0.90, c >= 0.75, c >= 0.60, c.notna()],
+        ["A", "B", "C", "D"],
+        default="Unknown",
+    )
+    return pd.Series(grades, index=df.index)
+
+
+def _fa_cs_wizard_categories(df: pd.DataFrame, active: pd.Series) -> pd.Series:
+    """
+    Vectorized _get_fa_cs_wizard_category.
+
+    Each rule becomes a boolean mask, evaluated in the same order as the
+    scalar cascade; np.select picks the first matching rule per row.
+    """
+    desc = _text_column(df, "Description")
+    cat = _text_column(df, "Final Category")
+
+    def d(*keywords):
+        return _contains_any(desc, keywords)
+
+    def c(*keywords):
+        return _contains_any(cat, keywords)
+
+    machinery = "Machinery, equipment or fixture (an asset whose life is affected by activity's economic type)"
+    land_improvement = "Land improvement (imprvmts directly related to land - sidewalks,roads,fences,bridges,landscapg,shrubbery,radio & tv transmittg towers)"
+    airplane = "Airplane (including helicopters (doesn't include airplanes used in commercial or contract carrying of passengers or freight))"
+    furniture = d('furniture', 'desk', 'chair', 'table', 'cabinet', 'bookcase', 'credenza', 'sofa', 'couch')
+    truck = d('truck', 'pickup', 'f-150', 'f150', 'f-250', 'f250', 'silverado', 'ram ', 'tundra')
+    leasehold = d('leasehold')
+    organizational = d('organizational', 'org expense')
+    aircraft = d('air transport', 'aircraft')
+
+    rules = [
+        # ===== 5-YEAR PROPERTY =====
+        (d('computer', 'laptop', 'desktop', 'monitor', 'server', 'workstation', 'pc ', 'imac', 'macbook'),
+         "Computer, monitor, laptop, PDA or peripheral equip (incld aux mach undr ctrl of cpu/don't incld comp primrly for proc or prod ctrl,switchg,chanellg & POS)"),
+        (d('printer'), "Printer"),
+        (d('scanner'), "Scanner"),
+        (d('copier', 'copy machine'), "Copier"),
+        (d('fax'), "Fax machine"),
+        (d('phone', 'telephone', 'cell', 'iphone', 'android', 'radio'), "Telephone, cell phone or 2-way radio"),
+        (d('auto ', ' auto', 'automobile', 'car ', ' car', 'sedan', 'coupe', 'suv', 'vehicle'), "Auto"),
+        (truck & d('heavy', '13000', '13,000', 'hdtv'), "Truck - heavy general purpose (unloaded weight >= 13,000 lbs.)"),
+        (truck, "Truck - light general purpose (unloaded weight < 13,000 lbs)"),
+        (d('trailer'), "Trailer or trailer mounted container"),
+        (d('tractor'), "Tractor over the road"),
+        (d('bus ', ' bus', 'buses', 'shuttle bus', 'school bus', 'transit bus'), "Bus"),
+        (d('appliance') & c('rental'), "Appliance - rental"),
+        (d('carpet') & c('rental'), "Carpeting - rental"),
+        # ===== 7-YEAR PROPERTY =====
+        (furniture & c('rental'), "Furniture or fixture - rental (includes - desks, files, safes - no structural components)"),
+        (furniture, "Furniture or fixture - nonrentals (includes - desks, files, safes - no structural components)"),
+        (d('office equipment', 'office equip'), "Office equipment (does not include communication equip in other classes)"),
+        (d('machine', 'machinery', 'equipment', 'equip'), machinery),
+        (d('answering machine'), "Answering machine"),
+        (d('shredder'), "Shredder (includes shredders for DVDs, CDs, floppy disks, credit cards and paper)"),
+        (d('projector'), "Projector"),
+        (d('camera', 'camcorder'), "Camera or camcorder (includes digital or film cameras)"),
+        (d('calculator', 'typewriter', 'adding machine'),
+         "Data handling equipment (includes only- typewriters, calculators, adding & accounting machines & duplicating equipment)"),
+        # ===== 15-YEAR PROPERTY =====
+        (d('land improvement', 'parking lot', 'fence', 'sidewalk', 'road', 'landscap', 'paving'), land_improvement),
+        (c('qip', 'qualified improvement'), "Improvement property (qualified)"),
+        (d('restaurant') & d('improvement'), "Restaurant building improvement"),
+        (d('retail') & d('improvement'), "Retail improvement"),
+        (d('service station', 'car wash', 'carwash'), "Service station building (including land improvements & carwash buildings)"),
+        # ===== 27.5-YEAR PROPERTY =====
+        (c('residential') | d('rental property', 'apartment'), "Real property (residential rental)"),
+        # ===== 39-YEAR PROPERTY =====
+        (d('building', 'warehouse', 'office building', 'commercial'), "Real property (nonresidential)"),
+        (leasehold & c('qualified', 'qip'), "Leasehold improvement (qualified)"),
+        (leasehold, "Leasehold improvement (not qualified)"),
+        # ===== NON-DEPRECIABLE / SPECIAL =====
+        (c('land') & ~c('improvement'), "Land"),
+        (d('software'), "Computer software"),
+        (d('goodwill') | (c('intangible') & c('197')), "Intangible asset (IRS Code Sec 197 - goodwill & other intangibles)"),
+        (d('startup', 'start-up') | c('195'), "Intangible asset (IRS Code Sec 195 - start-up expenses)"),
+        (organizational & d('1065', 'partnership'), "Intangible asset (IRS Code Sec 709 - organizational expenses (1065 only))"),
+        (organizational, "Intangible asset (IRS Code Sec 248 - organizational expenses (1120, 990))"),
+        (c('intangible'), "Intangible asset"),
+        # ===== TRANSPORTATION =====
+        (aircraft & d('commercial'),
+         "Air transport (includes assets (except helicopters) used in commercial and contract carrying of passengers and freight by air)"),
+        (aircraft | d('airplane', 'helicopter'), airplane),
+        (d('railroad', 'locomotive'), "Railroad cars & locomotives (except those owned by railroad transportation companies)"),
+        (d('boat', ' ship', 'ship ', 'vessel', 'water transport', 'yacht', 'barge', 'ferry'),
+         "Water transportation equipment (except those used in marine construction)"),
+        (d('billboard'), "Billboard"),
+    ]
+
+    # ===== FALLBACK BY RECOVERY PERIOD =====
+    life = pd.to_numeric(_first_present(df, ["Recovery Period", "MACRS Life"], 0), errors="coerce")
+    rules += [
+        (life == 15, land_improvement),
+        (life == 27.5, "Real property (residential rental)"),
+        (life == 39, "Real property (nonresidential)"),
+    ]
+
+    wizard = np.select(
+        [mask.to_numpy(dtype=bool) for mask, _ in rules],
+        [value for _, value in rules],
+        default=machinery,
+    )
+    return _blank_inactive(pd.Series(wizard, index=df.index, dtype=object), active)
+
+
+def attach_audit_columns(fa: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add the text-only audit columns to a build_fa() result.
+
+    ClassificationExplanation, AuditSource, AuditRuleTriggers, AuditWarnings,
+    ClassificationHash and AuditTimestamp are only read by the review/audit
+    workbooks, so build_fa() leaves them out and the exporters attach them on
+    demand. Safe to call more than once (columns are recomputed).
+
+    Args:
+        fa: Fixed asset dataframe from build_fa()
+
+    Returns:
+        Copy of fa with the audit columns added
+    """
+    fa = fa.copy()
+
+    src = _first_present(fa, ["Source"], "").astype(str)
+    is_gpt = src.str.startswith("gpt", na=False)
+    is_rules = src == "rules"
+    cat = _first_present(fa, ["Final Category"], "")
+    life = _first_present(fa, ["Recovery Period", "Tax Life"], "")
+
+    # Classification explanation
+    reason = pd.Series(FALLBACK_EXPLANATION, index=fa.index, dtype=object)
+    reason = reason.mask(is_rules, _category_lookup(cat, RULES_EXPLANATIONS, FALLBACK_EXPLANATION))
+    reason = reason.mask(is_gpt, GPT_EXPLANATION)
+    fa["ClassificationExplanation"] = (
+        "Classified as " + cat.astype(str) + " (" + life.astype(str) + "-year) because " + reason
+    )
+
+    # Source
+    audit_source = pd.Series("Client / Fallback", index=fa.index, dtype=object)
+    audit_source = audit_source.mask(is_gpt, "GPT Classifier").mask(is_rules, "Rule Engine")
+    fa["AuditSource"] = audit_source
+
+    # Rule trigger summary
+    fa["AuditRuleTriggers"] = _category_lookup(cat, AUDIT_RULE_TRIGGERS, "Personal Property Fallback")
+
+    # Warnings
+    uses_ads = _first_present(fa, ["Uses ADS"], False).fillna(False).astype(bool)
+    warning_rules = [
+        (_first_present(fa, ["NBV_Reco"], "") == "CHECK", "NBV out of balance"),
+        (_first_present(fa, ["Desc_TypoFlag"], "") == "YES", "Description corrected for typos"),
+        (_first_present(fa, ["Cat_TypoFlag"], "") == "YES", "Client category corrected"),
+        (uses_ads, "ADS required per IRC §168(g)"),
+    ]
+    warnings = pd.Series("", index=fa.index, dtype=object)
+    for mask, message in warning_rules:
+        warnings = warnings + pd.Series(np.where(mask, message + "; ", ""), index=fa.index, dtype=object)
+    fa["AuditWarnings"] = warnings.str[:-2].where(warnings != "", "None")
+
+    # Hash for classification integrity
+    hash_input = _first_present(fa, ["Asset #"], "").astype(str)
+    for col in ["Final Category", "Tax Life", "Tax Method", "Convention"]:
+        hash_input = hash_input + "|" + _first_present(fa, [col], "").astype(str)
+    fa["ClassificationHash"] = [
+        hashlib.sha256(value.encode("utf-8")).hexdigest() for value in hash_input
+    ]
+
+    fa["AuditTimestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    return fa
+
+
+# --------------------------------------------------------------
+# build_fa stages
+# --------------------------------------------------------------
+# build_fa() runs these in order. Each per-row stage only reads the row it
+# is given (plus explicit shared inputs such as the global convention or
+# the Section 179 balance still available), so IncrementalFABuilder in
+# fa_export_incremental.py can rerun a stage for edited rows only.
+
+def _report_asset_validation(df: pd.DataFrame, tax_year: int) -> None:
+    """Print advisory data validation results (never stops processing)."""
     validation_errors, should_stop = validate_asset_data(df, tax_year)
 
     if validation_errors:
@@ -965,6 +1311,24 @@ def build_fa(
             print("    CPA must review flagged assets before finalizing export.")
             # Was: raise ValueError(...) - removed to allow CPA review
 
+
+def _prepare_assets(
+    df: pd.DataFrame,
+    tax_year: int,
+    use_acq_if_missing: bool = True,
+    de_minimis_limit: float = 0.0,
+    verbose: bool = True,
+) -> pd.DataFrame:
+    """
+    Classify transactions and clean up raw asset rows.
+
+    Parses cost and dates, fixes description/category typos and applies the
+    de minimis safe harbor. Every step is row-local; only the printed
+    counts look at the whole frame.
+
+    Raises:
+        ValueError: If transaction classification validation fails
+    """
     # ============================================================================
     # CRITICAL FIX: TRANSACTION TYPE CLASSIFICATION
     # ============================================================================
@@ -983,7 +1347,7 @@ def build_fa(
     # ✅ Disposal: Transaction type or disposal date indicates sale
     # ✅ Transfer: Transaction type indicates transfer/reclass
 
-    df = classify_all_transactions(df, tax_year, verbose=True)
+    df = classify_all_transactions(df, tax_year, verbose=verbose)
 
     # Validate that no existing assets are being treated as additions
     is_valid, classification_errors = validate_transaction_classification(df, tax_year)
@@ -1026,10 +1390,10 @@ def build_fa(
         df["In Service Date"] = None
 
     if use_acq_if_missing:
-        df["In Service Date"] = df.apply(
-            lambda r: r["In Service Date"] or r["Acquisition Date"],
-            axis=1
-        )
+        # Test for missing explicitly: NaT is truthy, so `in_service or acquisition`
+        # never fell back once any date parsed and the column became datetime64
+        in_service = df["In Service Date"]
+        df["In Service Date"] = in_service.where(in_service.notna(), df["Acquisition Date"]).infer_objects()
 
     # ----------------------------------------------------------------------
     # TYPO CORRECTION - Clean up data before classification
@@ -1046,7 +1410,7 @@ def build_fa(
         df["Desc_TypoFlag"] = df["Desc_TypoFlag"].apply(lambda x: "YES" if x else "NO")
 
         typo_count = (df["Desc_TypoFlag"] == "YES").sum()
-        if typo_count > 0:
+        if verbose and typo_count > 0:
             print(f"\n✓ Corrected {typo_count} description typos")
 
     if "Client Category" in df.columns:
@@ -1062,7 +1426,7 @@ def build_fa(
         df["Cat_TypoFlag"] = df["Cat_TypoFlag"].apply(lambda x: "YES" if x else "NO")
 
         cat_typo_count = (df["Cat_TypoFlag"] == "YES").sum()
-        if cat_typo_count > 0:
+        if verbose and cat_typo_count > 0:
             print(f"✓ Corrected {cat_typo_count} category typos")
 
     # ============================================================================
@@ -1103,7 +1467,7 @@ def build_fa(
         total_de_minimis = sum(de_minimis_expensed)
         count_de_minimis = sum(1 for x in de_minimis_expensed if x > 0)
 
-        if total_de_minimis > 0:
+        if verbose and total_de_minimis > 0:
             print("\n" + "=" * 80)
             print(f"DE MINIMIS SAFE HARBOR - Rev. Proc. 2015-20")
             print("=" * 80)
@@ -1116,74 +1480,45 @@ def build_fa(
         # No de minimis election
         df["De Minimis Expensed"] = 0.0
 
-    # ----------------------------------------------------------------------
-    # Depreciation classification only applies to ADDITIONS
-    # ----------------------------------------------------------------------
-
-    # Validate tax year configuration and warn if using estimated values
-    config_validation = validate_tax_year_config(tax_year)
-    for warning in config_validation.warnings:
-        print(f"TAX CONFIG WARNING: {warning}")
-
-    # ============================================================================
-    # TIER 3: MID-QUARTER CONVENTION DETECTION (IRC §168(d)(3))
-    # ============================================================================
-    # CRITICAL: If >40% of property placed in service in Q4, must use MQ convention
-    # This is one of the most common IRS audit adjustments
+    return df
 
-    global_convention, mq_details = detect_mid_quarter_convention(df, tax_year, verbose=True)
 
-    # Store mid-quarter test results for later use
-    df.attrs["mid_quarter_test"] = mq_details
-    df.attrs["global_convention"] = global_convention
+def _row_convention(row, global_convention: str) -> tuple:
+    """Return (convention, MQ quarter or None) for one asset."""
+    category = str(row.get("Final Category", ""))
+    in_service = row.get("In Service Date")
 
-    # Apply mid-quarter convention to all assets and add quarter column
-    conventions = []
-    quarters = []
+    # Check if real property (always uses MM)
+    is_real = any(x in category for x in ["Residential", "Nonresidential", "Real Property", "Building"])
 
-    for _, row in df.iterrows():
-        category = str(row.get("Final Category", ""))
-        in_service = row.get("In Service Date")
+    if is_real:
+        return "MM", None  # Mid-month for real property, no quarter needed
 
-        # Check if real property (always uses MM)
-        is_real = any(x in category for x in ["Residential", "Nonresidential", "Real Property", "Building"])
+    # Personal property uses global convention (HY or MQ)
+    # If MQ, store which quarter for depreciation calculation
+    # Must check for NaT before passing to get_quarter
+    if global_convention == "MQ" and in_service is not None and not pd.isna(in_service):
+        return global_convention, get_quarter(in_service)
+    return global_convention, None
 
-        if is_real:
-            conventions.append("MM")  # Mid-month for real property
-            quarters.append(None)  # No quarter needed for MM
-        else:
-            # Personal property uses global convention (HY or MQ)
-            conventions.append(global_convention)
-
-            # If MQ, store which quarter for depreciation calculation
-            # Must check for NaT before passing to get_quarter
-            if global_convention == "MQ" and in_service is not None and not pd.isna(in_service):
-                quarter = get_quarter(in_service)
-                quarters.append(quarter)
-            else:
-                quarters.append(None)
 
-    df["Convention"] = conventions
-    df["Quarter"] = quarters  # Used for MQ depreciation calculations
+def _section_179_eligible_cost(row) -> float:
+    """Cost this asset contributes to the IRC §179(b)(2) phase-out total."""
+    trans_type = str(row.get("Transaction Type", ""))
 
-    # Get tax year configuration
-    section_179_config = get_section_179_limits(tax_year)
-    # Note: bonus_percentage is now calculated per asset based on acquisition/in-service dates
-    # to handle OBBB Act 100% bonus eligibility
+    # Only current year additions are eligible for Section 179
+    if "Current Year Addition" in trans_type:
+        cost = float(row.get("Cost") or 0.0)
+        is_qip = row.get("qip", False) or "QIP" in str(row.get("Final Category", ""))
 
-    # Calculate total Section 179-eligible property cost for phase-out
-    # CRITICAL: Only count CURRENT YEAR ADDITIONS (not existing assets)
-    total_179_eligible_cost = 0.0
-    for _, row in df.iterrows():
-        trans_type = str(row.get("Transaction Type", ""))
+        if cost > 0 and not is_qip:
+            return cost
+    return 0.0
 
-        # Only current year additions are eligible for Section 179
-        if "Current Year Addition" in trans_type:
-            cost = float(row.get("Cost") or 0.0)
-            is_qip = row.get("qip", False) or "QIP" in str(row.get("Final Category", ""))
 
-            if cost > 0 and not is_qip:
-                total_179_eligible_cost += cost
+def _section_179_effective_limit(total_179_eligible_cost: float, tax_year: int, taxable_income: float) -> float:
+    """Section 179 limit after the phase-out and business income limitation."""
+    section_179_config = get_section_179_limits(tax_year)
 
     # Apply IRC §179(b)(2) phase-out
     # Dollar limit is reduced (but not below zero) by the amount by which the cost of
@@ -1192,473 +1527,476 @@ def build_fa(
     section_179_dollar_limit = max(0.0, section_179_config["max_deduction"] - phaseout_reduction)
 
     # Apply business income limitation
-    section_179_effective_limit = min(section_179_dollar_limit, max(float(taxable_income), 0.0))
+    return min(section_179_dollar_limit, max(float(taxable_income), 0.0))
 
-    section179_amounts = []
-    bonus_amounts = []
-    bonus_percentages_used = []  # Track which bonus % was applied (for audit trail)
-    luxury_auto_notes = []
-    ads_flags = []  # Track which assets use ADS
-    remaining_179 = section_179_effective_limit
 
-    for _, row in df.iterrows():
+def _row_incentive_eligibility(row, tax_year: int, strategy: str) -> Optional[dict]:
+    """
+    Section 179 / bonus eligibility facts for one asset.
 
-        # Skip depreciation for disposals and transfers
-        if _is_disposal(row) or _is_transfer(row):
-            section179_amounts.append(0.0)
-            bonus_amounts.append(0.0)
-            bonus_percentages_used.append(0.0)
-            luxury_auto_notes.append("")
-            ads_flags.append(False)
-            continue
+    Returns None for disposals and transfers (no incentives). Otherwise the
+    dict feeds _row_incentives(); "draws_section_179" marks assets whose
+    result depends on the Section 179 balance left by earlier assets.
+    """
+    # Skip depreciation for disposals and transfers
+    if _is_disposal(row) or _is_transfer(row):
+        return None
 
-        cost = float(row.get("Cost") or 0.0)
-        in_service = row.get("In Service Date")
-        acquisition = row.get("Acquisition Date")
-        is_current = _is_current_year(in_service, tax_year)
-
-        # ============================================================================
-        # CRITICAL FIX: Check transaction type for Section 179/Bonus eligibility
-        # ============================================================================
-        # ONLY "Current Year Addition" assets are eligible for Section 179/Bonus
-        # "Existing Asset" (prior year assets) are NOT eligible per IRC §179 and §168(k)
-        trans_type = str(row.get("Transaction Type", ""))
-        is_current_year_addition = "Current Year Addition" in trans_type
-
-        # ============================================================================
-        # TIER 2: ADS (Alternative Depreciation System) Detection
-        # ============================================================================
-        # CRITICAL: Check if asset requires ADS per IRC §168(g)
-        # ADS required for: listed property ≤50% business use, tax-exempt property, etc.
-
-        uses_ads, ads_reason = should_use_ads(row.to_dict())
-
-        # Validate business use for listed property (IRC §280F)
-        is_section179_eligible = True
-        bonus_eligible = True
-
-        # ============================================================================
-        # TIER 3: QIP Section 179 Eligibility (OBBB Act vs Pre-OBBB)
-        # ============================================================================
-        # CRITICAL TAX COMPLIANCE CHANGE (OBBB Act - July 4, 2025):
-        # - Pre-OBBB (before 1/1/2025): QIP NOT eligible for Section 179 per IRC §179(d)(1)
-        # - OBBB Act (1/1/2025+): QIP IS eligible for Section 179 (subject to $2.5M limit)
-        #
-        # NOTE: Buildings, land, and land improvements still NOT eligible
+    cost = float(row.get("Cost") or 0.0)
+    in_service = row.get("In Service Date")
+    acquisition = row.get("Acquisition Date")
+    is_current = _is_current_year(in_service, tax_year)
 
-        is_qip = row.get("qip", False) or "QIP" in str(row.get("Final Category", ""))
-        final_category = str(row.get("Final Category", ""))
-
-        if is_qip:
-            # Check if placed in service after 12/31/2024 (OBBB effective date)
-            # Must check for NaT before comparing dates
-            if in_service is not None and not pd.isna(in_service):
-                # Convert pandas Timestamp to date if necessary
-                in_service_date = in_service.date() if hasattr(in_service, 'date') else in_service
-                if in_service_date > date(2024, 12, 31):
-                    # OBBB Act: QIP IS eligible for Section 179
-                    is_section179_eligible = True
-                else:
-                    # Pre-OBBB: QIP NOT eligible for Section 179
-                    is_section179_eligible = False
+    # ============================================================================
+    # CRITICAL FIX: Check transaction type for Section 179/Bonus eligibility
+    # ============================================================================
+    # ONLY "Current Year Addition" assets are eligible for Section 179/Bonus
+    # "Existing Asset" (prior year assets) are NOT eligible per IRC §179 and §168(k)
+    trans_type = str(row.get("Transaction Type", ""))
+    is_current_year_addition = "Current Year Addition" in trans_type
+
+    # ============================================================================
+    # TIER 2: ADS (Alternative Depreciation System) Detection
+    # ============================================================================
+    # CRITICAL: Check if asset requires ADS per IRC §168(g)
+    # ADS required for: listed property ≤50% business use, tax-exempt property, etc.
+
+    uses_ads, ads_reason = should_use_ads(row.to_dict())
+
+    # Validate business use for listed property (IRC §280F)
+    is_section179_eligible = True
+    bonus_eligible = True
+
+    # ============================================================================
+    # TIER 3: QIP Section 179 Eligibility (OBBB Act vs Pre-OBBB)
+    # ============================================================================
+    # CRITICAL TAX COMPLIANCE CHANGE (OBBB Act - July 4, 2025):
+    # - Pre-OBBB (before 1/1/2025): QIP NOT eligible for Section 179 per IRC §179(d)(1)
+    # - OBBB Act (1/1/2025+): QIP IS eligible for Section 179 (subject to $2.5M limit)
+    #
+    # NOTE: Buildings, land, and land improvements still NOT eligible
+
+    is_qip = row.get("qip", False) or "QIP" in str(row.get("Final Category", ""))
+    final_category = str(row.get("Final Category", ""))
+
+    if is_qip:
+        # Check if placed in service after 12/31/2024 (OBBB effective date)
+        # Must check for NaT before comparing dates
+        if in_service is not None and not pd.isna(in_service):
+            # Convert pandas Timestamp to date if necessary
+            in_service_date = in_service.date() if hasattr(in_service, 'date') else in_service
+            if in_service_date > date(2024, 12, 31):
+                # OBBB Act: QIP IS eligible for Section 179
+                is_section179_eligible = True
             else:
-                # No in-service date: Pre-OBBB assumption
+                # Pre-OBBB: QIP NOT eligible for Section 179
                 is_section179_eligible = False
+        else:
+            # No in-service date: Pre-OBBB assumption
+            is_section179_eligible = False
+
+    # Buildings, land improvements, and land are NEVER eligible (even under OBBB)
+    if any(x in final_category for x in ["Nonresidential Real Property", "Residential", "Land"]):
+        if "Improvement" not in final_category and "QIP" not in final_category:
+            is_section179_eligible = False  # Building or land = no Section 179
+
+    # Check listed property business use requirements
+    is_section179_eligible, bonus_eligible, business_use_warnings = validate_business_use_for_incentives(
+        row.to_dict(),
+        allow_section_179=is_section179_eligible,
+        allow_bonus=True
+    )
+
+    # Calculate bonus percentage for this specific asset
+    # CURRENT LAW - OBBBA: 100% for property acquired AND placed in service after 1/19/2025
+    # Legacy property uses historical rates (2024=60%, 2025=40%, etc.)
+    asset_bonus_pct = get_bonus_percentage(tax_year, acquisition, in_service)
+
+    # Whether _row_incentives() draws on the Section 179 balance shared with
+    # later assets (the same conditions its Section 179 branch checks)
+    draws_section_179 = (
+        not uses_ads
+        and cost > 0
+        and is_current_year_addition
+        and is_section179_eligible
+        and get_strategy(strategy).apply_179
+    )
+
+    return {
+        "cost": cost,
+        "in_service": in_service,
+        "acquisition": acquisition,
+        "is_current": is_current,
+        "is_current_year_addition": is_current_year_addition,
+        "uses_ads": uses_ads,
+        "ads_reason": ads_reason,
+        "is_qip": is_qip,
+        "is_section179_eligible": is_section179_eligible,
+        "bonus_eligible": bonus_eligible,
+        "business_use_warnings": business_use_warnings,
+        "asset_bonus_pct": asset_bonus_pct,
+        "draws_section_179": draws_section_179,
+    }
 
-        # Buildings, land improvements, and land are NEVER eligible (even under OBBB)
-        if any(x in final_category for x in ["Nonresidential Real Property", "Residential", "Land"]):
-            if "Improvement" not in final_category and "QIP" not in final_category:
-                is_section179_eligible = False  # Building or land = no Section 179
 
-        # Check listed property business use requirements
-        is_section179_eligible, bonus_eligible, business_use_warnings = validate_business_use_for_incentives(
-            row.to_dict(),
-            allow_section_179=is_section179_eligible,
-            allow_bonus=True
-        )
+def _row_incentives(row, elig: Optional[dict], remaining_179: float, tax_year: int, strategy: str) -> tuple:
+    """
+    Section 179, bonus and notes for one asset.
 
-        # Calculate bonus percentage for this specific asset
-        # CURRENT LAW - OBBBA: 100% for property acquired AND placed in service after 1/19/2025
-        # Legacy property uses historical rates (2024=60%, 2025=40%, etc.)
-        asset_bonus_pct = get_bonus_percentage(tax_year, acquisition, in_service)
+    Returns (sec179, bonus, bonus_pct, note, uses_ads, drawn) where drawn is
+    the amount to subtract from the Section 179 balance shared by later
+    assets (taken before luxury auto caps, as IRC §179(b) ordering requires).
+    sec179 and bonus are before §280F caps; see _apply_luxury_auto_caps_frame.
+    """
+    if elig is None:
+        return 0.0, 0.0, 0.0, "", False, 0.0
+
+    cost = elig["cost"]
+    in_service = elig["in_service"]
+    acquisition = elig["acquisition"]
+    is_current = elig["is_current"]
+    is_current_year_addition = elig["is_current_year_addition"]
+    uses_ads = elig["uses_ads"]
+    ads_reason = elig["ads_reason"]
+    is_qip = elig["is_qip"]
+    is_section179_eligible = elig["is_section179_eligible"]
+    bonus_eligible = elig["bonus_eligible"]
+    business_use_warnings = elig["business_use_warnings"]
+    asset_bonus_pct = elig["asset_bonus_pct"]
+
+    sec179 = 0.0
+    bonus = 0.0
+    auto_note = ""
+    drawn = 0.0
 
+    # ============================================================================
+    # TIER 2: ADS Property - NO Section 179, NO Bonus (IRC §168(g))
+    # ============================================================================
+    if uses_ads:
+        # ADS property is NOT eligible for Section 179 or bonus depreciation
         sec179 = 0.0
         bonus = 0.0
-        auto_note = ""
-
-        # ============================================================================
-        # TIER 2: ADS Property - NO Section 179, NO Bonus (IRC §168(g))
-        # ============================================================================
-        if uses_ads:
-            # ADS property is NOT eligible for Section 179 or bonus depreciation
-            sec179 = 0.0
-            bonus = 0.0
-            asset_bonus_pct = 0.0
+        asset_bonus_pct = 0.0
 
-            # Add ADS note
-            auto_note = f"ADS REQUIRED: {ads_reason}. No Section 179/bonus allowed per IRC §168(g)"
-
-        # ============================================================================
-        # Standard MACRS with Section 179/Bonus (if eligible)
-        # ============================================================================
-        # CRITICAL: Only apply to CURRENT YEAR ADDITIONS (not existing assets)
-        elif cost > 0 and is_current_year_addition:
-
-            # Get strategy configuration
-            strat = get_strategy(strategy)
-
-            if strat.apply_179:
-                # Section 179 up to limit (ONLY for eligible property)
-                if remaining_179 > 0 and is_section179_eligible:
-                    sec179 = min(cost, remaining_179)
-
-                    # ============================================================================
-                    # TIER 3: Heavy SUV Special Section 179 Limit (IRC §179(b)(5))
-                    # ============================================================================
-                    # Heavy SUVs (>6,000 lbs GVWR) are NOT subject to luxury auto caps
-                    # BUT have a special reduced Section 179 limit ($28,900 for 2024)
-                    if _is_heavy_suv(row):
-                        heavy_suv_limit = get_heavy_suv_179_limit(tax_year)
-                        if sec179 > heavy_suv_limit:
-                            sec179 = heavy_suv_limit
-                            if auto_note:
-                                auto_note += " | "
-                            auto_note = f"Heavy SUV §179 limit applied: ${heavy_suv_limit:,.0f} (IRC §179(b)(5))"
-
-                    remaining_179 -= sec179
-
-            if strat.apply_bonus:
-                # Bonus for remainder (ONLY if eligible)
-                if bonus_eligible:
-                    # CURRENT LAW - OBBBA: 100% PERMANENT for new acquisitions (after 1/19/2025)
-                    # Legacy property (acquired before 1/20/2025) uses historical rates
-                    bonus = max(cost - sec179, 0.0) * asset_bonus_pct
-                else:
-                    bonus = 0.0
-                    asset_bonus_pct = 0.0
+        # Add ADS note
+        auto_note = f"ADS REQUIRED: {ads_reason}. No Section 179/bonus allowed per IRC §168(g)"
+
+    # ============================================================================
+    # Standard MACRS with Section 179/Bonus (if eligible)
+    # ============================================================================
+    # CRITICAL: Only apply to CURRENT YEAR ADDITIONS (not existing assets)
+    elif cost > 0 and is_current_year_addition:
+
+        # Get strategy configuration
+        strat = get_strategy(strategy)
+
+        if strat.apply_179:
+            # Section 179 up to limit (ONLY for eligible property)
+            if remaining_179 > 0 and is_section179_eligible:
+                sec179 = min(cost, remaining_179)
+
+                # ============================================================================
+                # TIER 3: Heavy SUV Special Section 179 Limit (IRC §179(b)(5))
+                # ============================================================================
+                # Heavy SUVs (>6,000 lbs GVWR) are NOT subject to luxury auto caps
+                # BUT have a special reduced Section 179 limit ($28,900 for 2024)
+                if _is_heavy_suv(row):
+                    heavy_suv_limit = get_heavy_suv_179_limit(tax_year)
+                    if sec179 > heavy_suv_limit:
+                        sec179 = heavy_suv_limit
+                        if auto_note:
+                            auto_note += " | "
+                        auto_note = f"Heavy SUV §179 limit applied: ${heavy_suv_limit:,.0f} (IRC §179(b)(5))"
+
+                drawn = sec179
+
+        if strat.apply_bonus:
+            # Bonus for remainder (ONLY if eligible)
+            if bonus_eligible:
+                # CURRENT LAW - OBBBA: 100% PERMANENT for new acquisitions (after 1/19/2025)
+                # Legacy property (acquired before 1/20/2025) uses historical rates
+                bonus = max(cost - sec179, 0.0) * asset_bonus_pct
             else:
-                # No bonus in conservative strategy
                 bonus = 0.0
                 asset_bonus_pct = 0.0
+        else:
+            # No bonus in conservative strategy
+            bonus = 0.0
+            asset_bonus_pct = 0.0
 
-            # CRITICAL: Apply IRC §280F luxury auto limits (for non-ADS property)
-            sec179, bonus, auto_note = _apply_luxury_auto_caps(row, sec179, bonus, tax_year)
+        # IRC §280F luxury auto limits (for non-ADS property) are applied
+        # afterwards across all rows by _apply_luxury_auto_caps_frame
 
-        # ============================================================================
-        # Compliance Notes
-        # ============================================================================
+    # ============================================================================
+    # Compliance Notes
+    # ============================================================================
 
-        # Add business use warnings
-        for warning in business_use_warnings:
-            if auto_note:
-                auto_note += " | "
-            auto_note += warning
+    # Add business use warnings
+    for warning in business_use_warnings:
+        if auto_note:
+            auto_note += " | "
+        auto_note += warning
+
+    # Add note if QIP was excluded from Section 179
+    if is_qip and cost > 0 and is_current and strategy == "Aggressive (179 + Bonus)" and not uses_ads:
+        if auto_note:
+            auto_note += " | "
+        auto_note += "QIP not eligible for §179 per IRC §179(d)(1)"
+
+    # Add note if OBBB 100% bonus applied
+    # Use tolerance-based comparison for float values
+    if abs(asset_bonus_pct - 1.0) < FLOAT_TOLERANCE and bonus > 0:
+        if auto_note:
+            auto_note += " | "
+        auto_note += f"OBBB Act: 100% bonus (acquired {acquisition}, in-service {in_service})"
+
+    return sec179, bonus, asset_bonus_pct, auto_note, uses_ads, drawn
+
+
+def _basis_sources(df: pd.DataFrame) -> dict:
+    """Which prior-year basis columns are available for existing assets."""
+    return {
+        "has_prior_179": "Prior Section 179" in df.columns or "Prior Sec 179" in df.columns,
+        "has_prior_bonus": "Prior Bonus" in df.columns or "Prior Bonus Depreciation" in df.columns,
+        "has_original_basis": "Original Depreciable Basis" in df.columns or "Tax Basis" in df.columns,
+        "has_accumulated_depreciation": "Accumulated Depreciation" in df.columns,
+    }
 
-        # Add note if QIP was excluded from Section 179
-        if is_qip and cost > 0 and is_current and strategy == "Aggressive (179 + Bonus)" and not uses_ads:
-            if auto_note:
-                auto_note += " | "
-            auto_note += "QIP not eligible for §179 per IRC §179(d)(1)"
 
-        # Add note if OBBB 100% bonus applied
-        # Use tolerance-based comparison for float values
-        if abs(asset_bonus_pct - 1.0) < FLOAT_TOLERANCE and bonus > 0:
-            if auto_note:
-                auto_note += " | "
-            auto_note += f"OBBB Act: 100% bonus (acquired {acquisition}, in-service {in_service})"
+def _row_depreciation(row, idx, tax_year: int, sources: dict) -> tuple:
+    """
+    Depreciable basis and current year MACRS depreciation for one asset.
 
-        section179_amounts.append(sec179)
-        bonus_amounts.append(bonus)
-        bonus_percentages_used.append(asset_bonus_pct)
-        luxury_auto_notes.append(auto_note)
-        ads_flags.append(uses_ads)
+    Returns (depreciable_basis, macrs_depreciation, basis_warnings).
+    """
+    warnings: List[str] = []
 
-    df["Section 179 Amount"] = section179_amounts
-    df["Bonus Amount"] = bonus_amounts
-    df["Bonus Percentage Used"] = bonus_percentages_used  # Track OBBB vs TCJA bonus %
-    df["Uses ADS"] = ads_flags  # Track which assets use Alternative Depreciation System
-    df["Auto Limit Notes"] = luxury_auto_notes
+    cost = float(row.get("Cost") or 0.0)
+    sec179 = float(row.get("Section 179 Amount") or 0.0)
+    bonus = float(row.get("Bonus Amount") or 0.0)
+    transaction_type = str(row.get("Transaction Type", ""))
+    in_service_date = row.get("In Service Date")
+    is_existing_asset = "Existing Asset" in transaction_type
 
     # ============================================================================
-    # PHASE 4: MACRS DEPRECIATION CALCULATION (IRS Publication 946 Tables)
+    # CRITICAL FIX: Calculate correct depreciable basis for existing assets
     # ============================================================================
-    # For CURRENT YEAR ADDITIONS: Calculate Year 1 MACRS depreciation
-    # For EXISTING ASSETS: Calculate current year depreciation based on depreciation year
-    # Basis for MACRS = Cost - Section 179 - Bonus Depreciation
-    #
-    # CRITICAL: For existing assets, we need the ORIGINAL depreciable basis
-    # (Cost - Prior Section 179 - Prior Bonus), not the current cost.
-    # If prior 179/bonus columns exist, use them; otherwise warn user.
-
-    macrs_year1_depreciation = []
-    depreciable_basis_list = []
-    existing_asset_basis_warnings = []
-
-    # Check if we have prior depreciation info columns
-    has_prior_179 = "Prior Section 179" in df.columns or "Prior Sec 179" in df.columns
-    has_prior_bonus = "Prior Bonus" in df.columns or "Prior Bonus Depreciation" in df.columns
-    has_original_basis = "Original Depreciable Basis" in df.columns or "Tax Basis" in df.columns
-
-    for idx, row in df.iterrows():
-        cost = float(row.get("Cost") or 0.0)
-        sec179 = float(row.get("Section 179 Amount") or 0.0)
-        bonus = float(row.get("Bonus Amount") or 0.0)
-        transaction_type = str(row.get("Transaction Type", ""))
-        in_service_date = row.get("In Service Date")
-        is_existing_asset = "Existing Asset" in transaction_type
-
-        # ============================================================================
-        # CRITICAL FIX: Calculate correct depreciable basis for existing assets
-        # ============================================================================
-        # For CURRENT YEAR ADDITIONS: depreciable_basis = cost - sec179 - bonus
-        # For EXISTING ASSETS: need ORIGINAL depreciable basis from when first placed in service
-
-        if is_existing_asset:
-            # Try to get original depreciable basis from input data
-            original_basis = None
-
-            # Priority 1: Explicit "Original Depreciable Basis" or "Tax Basis" column
-            if has_original_basis:
-                original_basis = float(row.get("Original Depreciable Basis") or row.get("Tax Basis") or 0.0)
-
-            # Priority 2: Calculate from Prior Section 179 and Prior Bonus columns
-            elif has_prior_179 or has_prior_bonus:
-                prior_179 = float(row.get("Prior Section 179") or row.get("Prior Sec 179") or 0.0)
-                prior_bonus = float(row.get("Prior Bonus") or row.get("Prior Bonus Depreciation") or 0.0)
-                original_basis = max(cost - prior_179 - prior_bonus, 0.0)
-
-            # Priority 3: Infer from accumulated depreciation (if recovery period known)
-            # If accumulated depreciation exists, we can estimate original basis
-            elif "Accumulated Depreciation" in df.columns:
-                accum_depr = float(row.get("Accumulated Depreciation") or 0.0)
-
-                # If accum_depr is close to cost, asset likely took 100% bonus
-                # This is an ESTIMATE - flag for review
-                if accum_depr > 0:
-                    # Assume the asset's depreciable basis was set such that
-                    # accumulated MACRS depreciation matches accumulated column
-                    # This is imperfect but better than using full cost
-                    recovery_period_check = row.get("Recovery Period") or row.get("MACRS Life")
-
-                    if recovery_period_check and in_service_date and not pd.isna(in_service_date):
+    # For CURRENT YEAR ADDITIONS: depreciable_basis = cost - sec179 - bonus
+    # For EXISTING ASSETS: need ORIGINAL depreciable basis from when first placed in service
+
+    if is_existing_asset:
+        # Try to get original depreciable basis from input data
+        original_basis = None
+
+        # Priority 1: Explicit "Original Depreciable Basis" or "Tax Basis" column
+        if sources["has_original_basis"]:
+            original_basis = float(row.get("Original Depreciable Basis") or row.get("Tax Basis") or 0.0)
+
+        # Priority 2: Calculate from Prior Section 179 and Prior Bonus columns
+        elif sources["has_prior_179"] or sources["has_prior_bonus"]:
+            prior_179 = float(row.get("Prior Section 179") or row.get("Prior Sec 179") or 0.0)
+            prior_bonus = float(row.get("Prior Bonus") or row.get("Prior Bonus Depreciation") or 0.0)
+            original_basis = max(cost - prior_179 - prior_bonus, 0.0)
+
+        # Priority 3: Infer from accumulated depreciation (if recovery period known)
+        # If accumulated depreciation exists, we can estimate original basis
+        elif sources["has_accumulated_depreciation"]:
+            accum_depr = float(row.get("Accumulated Depreciation") or 0.0)
+
+            # If accum_depr is close to cost, asset likely took 100% bonus
+            # This is an ESTIMATE - flag for review
+            if accum_depr > 0:
+                # Assume the asset's depreciable basis was set such that
+                # accumulated MACRS depreciation matches accumulated column
+                # This is imperfect but better than using full cost
+                recovery_period_check = row.get("Recovery Period") or row.get("MACRS Life")
+
+                if recovery_period_check and in_service_date and not pd.isna(in_service_date):
+                    try:
+                        if isinstance(in_service_date, date):
+                            in_service_year = in_service_date.year
+                        elif hasattr(in_service_date, 'year'):
+                            in_service_year = in_service_date.year
+                        else:
+                            in_service_year = int(str(in_service_date)[:4])
+
+                        years_depreciated = tax_year - in_service_year
+
+                        # Get cumulative MACRS percentage for years depreciated
                         try:
-                            if isinstance(in_service_date, date):
-                                in_service_year = in_service_date.year
-                            elif hasattr(in_service_date, 'year'):
-                                in_service_year = in_service_date.year
-                            else:
-                                in_service_year = int(str(in_service_date)[:4])
-
-                            years_depreciated = tax_year - in_service_year
-
-                            # Get cumulative MACRS percentage for years depreciated
-                            try:
-                                recovery_period_int = int(float(recovery_period_check))
-                                method = row.get("Method", "200DB")
-                                convention = row.get("Convention", "HY")
-                                table = get_macrs_table(recovery_period_int, method, convention)
-
-                                if years_depreciated > 0 and years_depreciated <= len(table):
-                                    cumulative_pct = sum(table[:years_depreciated])
-                                    if cumulative_pct > 0:
-                                        # Back-calculate original basis: basis = accum_depr / cumulative_pct
-                                        estimated_basis = accum_depr / cumulative_pct
-                                        # Sanity check: basis should not exceed cost
-                                        if estimated_basis <= cost * 1.01:  # Allow 1% tolerance
-                                            original_basis = estimated_basis
-                                            existing_asset_basis_warnings.append(
-                                                f"Asset {row.get('Asset ID', idx)}: Estimated basis ${original_basis:,.2f} "
-                                                f"from accumulated depreciation (review recommended)"
-                                            )
-                            except (ValueError, TypeError, IndexError) as e:
-                                # Log but continue - basis estimation is best-effort
-                                existing_asset_basis_warnings.append(
-                                    f"Asset {row.get('Asset ID', idx)}: Could not estimate basis from depreciation table ({type(e).__name__})"
-                                )
-                        except (ValueError, TypeError) as e:
-                            # Log but continue - date parsing failed
-                            existing_asset_basis_warnings.append(
-                                f"Asset {row.get('Asset ID', idx)}: Could not parse in-service date for basis estimation ({type(e).__name__})"
+                            recovery_period_int = int(float(recovery_period_check))
+                            method = row.get("Method", "200DB")
+                            convention = row.get("Convention", "HY")
+                            table = get_macrs_table(recovery_period_int, method, convention)
+
+                            if years_depreciated > 0 and years_depreciated <= len(table):
+                                cumulative_pct = sum(table[:years_depreciated])
+                                if cumulative_pct > 0:
+                                    # Back-calculate original basis: basis = accum_depr / cumulative_pct
+                                    estimated_basis = accum_depr / cumulative_pct
+                                    # Sanity check: basis should not exceed cost
+                                    if estimated_basis <= cost * 1.01:  # Allow 1% tolerance
+                                        original_basis = estimated_basis
+                                        warnings.append(
+                                            f"Asset {row.get('Asset ID', idx)}: Estimated basis ${original_basis:,.2f} "
+                                            f"from accumulated depreciation (review recommended)"
+                                        )
+                        except (ValueError, TypeError, IndexError) as e:
+                            # Log but continue - basis estimation is best-effort
+                            warnings.append(
+                                f"Asset {row.get('Asset ID', idx)}: Could not estimate basis from depreciation table ({type(e).__name__})"
                             )
+                    except (ValueError, TypeError) as e:
+                        # Log but continue - date parsing failed
+                        warnings.append(
+                            f"Asset {row.get('Asset ID', idx)}: Could not parse in-service date for basis estimation ({type(e).__name__})"
+                        )
+
+        # Fallback: Use full cost but warn (this may overstate depreciation!)
+        if original_basis is None or original_basis <= 0:
+            original_basis = cost
+            if cost > 0:
+                warnings.append(
+                    f"WARNING: Asset {row.get('Asset ID', idx)} (Existing Asset) using full cost ${cost:,.2f} as basis. "
+                    f"If this asset took Section 179 or Bonus in prior years, depreciation may be OVERSTATED. "
+                    f"Add 'Prior Section 179' and 'Prior Bonus' columns to fix."
+                )
+
+        depreciable_basis = max(original_basis, 0.0)
+    else:
+        # Current year addition: use current year 179/bonus
+        depreciable_basis = max(cost - sec179 - bonus, 0.0)
 
-            # Fallback: Use full cost but warn (this may overstate depreciation!)
-            if original_basis is None or original_basis <= 0:
-                original_basis = cost
-                if cost > 0:
-                    existing_asset_basis_warnings.append(
-                        f"WARNING: Asset {row.get('Asset ID', idx)} (Existing Asset) using full cost ${cost:,.2f} as basis. "
-                        f"If this asset took Section 179 or Bonus in prior years, depreciation may be OVERSTATED. "
-                        f"Add 'Prior Section 179' and 'Prior Bonus' columns to fix."
-                    )
-
-            depreciable_basis = max(original_basis, 0.0)
-        else:
-            # Current year addition: use current year 179/bonus
-            depreciable_basis = max(cost - sec179 - bonus, 0.0)
-
-        depreciable_basis_list.append(depreciable_basis)
-
-        # Skip MACRS calculation if no depreciable basis
-        if depreciable_basis <= 0:
-            macrs_year1_depreciation.append(0.0)
-            continue
-
-        # Get MACRS parameters
-        # Support both "Recovery Period" (preferred) and "MACRS Life" (fallback) column names
-        recovery_period = row.get("Recovery Period") or row.get("MACRS Life")
-
-        # Validate recovery_period - must be a positive number for depreciation
-        if recovery_period is None or recovery_period == 0:
-            asset_id = row.get("Asset ID", idx)
-            print(f"Warning: Asset {asset_id} has no valid Recovery Period or MACRS Life. Depreciation will be $0.00.")
-            macrs_year1_depreciation.append(0.0)
-            continue
-
-        # Convert to numeric if string
-        try:
-            recovery_period = float(recovery_period)
-            if recovery_period <= 0:
-                raise ValueError("Recovery period must be positive")
-        except (ValueError, TypeError) as e:
-            asset_id = row.get("Asset ID", idx)
-            print(f"Warning: Asset {asset_id} has invalid Recovery Period '{recovery_period}': {e}. Depreciation will be $0.00.")
-            macrs_year1_depreciation.append(0.0)
-            continue
-
-        method = row.get("Method", "200DB")
-        convention = row.get("Convention", "HY")
-        quarter = row.get("Quarter")  # For MQ convention
-
-        # Get month for MM convention (real property)
-        month = None
-        if convention == "MM" and in_service_date:
-            if isinstance(in_service_date, date):
-                month = in_service_date.month
-
-        # CRITICAL FIX: Handle disposals with partial year depreciation
-        # Per IRS Publication 946, disposal year gets partial depreciation based on convention
-        if _is_disposal(row):
-            # Calculate depreciation year for disposal
-            disposal_date = parse_date(row.get("Disposal Date"))
-
-            if in_service_date and not pd.isna(in_service_date) and recovery_period:
-                try:
-                    in_service_year = in_service_date.year if hasattr(in_service_date, 'year') else int(str(in_service_date)[:4])
-                    recovery_year = tax_year - in_service_year + 1
-                    max_year = int(float(recovery_period)) + 1
-                    recovery_year = max(1, min(recovery_year, max_year))
-
-                    # Get disposal quarter/month for convention calculations
-                    disposal_quarter = None
-                    disposal_month = None
-                    if disposal_date and not pd.isna(disposal_date):
-                        disposal_month = disposal_date.month if hasattr(disposal_date, 'month') else None
-                        disposal_quarter = get_quarter(disposal_date)
-
-                    # Calculate disposal year depreciation
-                    macrs_dep = calculate_disposal_year_depreciation(
-                        basis=depreciable_basis,
-                        recovery_period=int(float(recovery_period)),
-                        method=method,
-                        convention=convention,
-                        year_of_recovery=recovery_year,
-                        disposal_quarter=disposal_quarter,
-                        disposal_month=disposal_month,
-                        placed_in_service_quarter=quarter,
-                        placed_in_service_month=month
-                    )
-                except Exception as e:
-                    print(f"Warning: Disposal depreciation calculation failed for asset {row.get('Asset ID', idx)}: {e}")
-                    macrs_dep = 0.0
-            else:
-                macrs_dep = 0.0
+    # Skip MACRS calculation if no depreciable basis
+    if depreciable_basis <= 0:
+        return depreciable_basis, 0.0, warnings
 
-            macrs_year1_depreciation.append(macrs_dep)
-            continue
-
-        # Skip transfers (no depreciation for pure transfers)
-        if _is_transfer(row):
-            macrs_year1_depreciation.append(0.0)
-            continue
-
-        # CRITICAL FIX: Determine depreciation year based on transaction type
-        # For existing assets, calculate which year of depreciation schedule we're in
-        depreciation_year = 1  # Default for current year additions
-
-        if "Existing Asset" in transaction_type:
-            # Calculate depreciation year based on in-service date
-            if in_service_date and not pd.isna(in_service_date):
-                try:
-                    if isinstance(in_service_date, date):
-                        in_service_year = in_service_date.year
-                    elif hasattr(in_service_date, 'year'):
-                        in_service_year = in_service_date.year
-                    else:
-                        in_service_year = int(str(in_service_date)[:4])
-
-                    # Year of depreciation = current tax year - in service year + 1
-                    depreciation_year = tax_year - in_service_year + 1
-
-                    # Clamp to valid range (1 to recovery_period + 1 for final year)
-                    if recovery_period:
-                        max_year = int(float(recovery_period)) + 1
-                        depreciation_year = max(1, min(depreciation_year, max_year))
-                except (ValueError, TypeError):
-                    depreciation_year = 1  # Fallback
-
-        # Calculate MACRS depreciation for the appropriate year
-        try:
-            macrs_dep = calculate_macrs_depreciation(
-                basis=depreciable_basis,
-                recovery_period=recovery_period,
-                method=method,
-                convention=convention,
-                year=depreciation_year,  # Use calculated depreciation year
-                quarter=quarter,
-                month=month
-            )
-        except Exception as e:
-            # Fallback to 0 if calculation fails
-            print(f"Warning: MACRS calculation failed for asset {row.get('Asset ID', idx)}: {e}")
-            macrs_dep = 0.0
+    # Get MACRS parameters
+    # Support both "Recovery Period" (preferred) and "MACRS Life" (fallback) column names
+    recovery_period = row.get("Recovery Period") or row.get("MACRS Life")
 
-        macrs_year1_depreciation.append(macrs_dep)
+    # Validate recovery_period - must be a positive number for depreciation
+    if recovery_period is None or recovery_period == 0:
+        asset_id = row.get("Asset ID", idx)
+        print(f"Warning: Asset {asset_id} has no valid Recovery Period or MACRS Life. Depreciation will be $0.00.")
+        return depreciable_basis, 0.0, warnings
 
-    df["Depreciable Basis"] = depreciable_basis_list
-    df["MACRS Year 1 Depreciation"] = macrs_year1_depreciation
+    # Convert to numeric if string
+    try:
+        recovery_period = float(recovery_period)
+        if recovery_period <= 0:
+            raise ValueError("Recovery period must be positive")
+    except (ValueError, TypeError) as e:
+        asset_id = row.get("Asset ID", idx)
+        print(f"Warning: Asset {asset_id} has invalid Recovery Period '{recovery_period}': {e}. Depreciation will be $0.00.")
+        return depreciable_basis, 0.0, warnings
+
+    method = row.get("Method", "200DB")
+    convention = row.get("Convention", "HY")
+    quarter = row.get("Quarter")  # For MQ convention
+
+    # Get month for MM convention (real property)
+    month = None
+    if convention == "MM" and in_service_date:
+        if isinstance(in_service_date, date):
+            month = in_service_date.month
+
+    # CRITICAL FIX: Handle disposals with partial year depreciation
+    # Per IRS Publication 946, disposal year gets partial depreciation based on convention
+    if _is_disposal(row):
+        # Calculate depreciation year for disposal
+        disposal_date = parse_date(row.get("Disposal Date"))
+
+        if in_service_date and not pd.isna(in_service_date) and recovery_period:
+            try:
+                in_service_year = in_service_date.year if hasattr(in_service_date, 'year') else int(str(in_service_date)[:4])
+                recovery_year = tax_year - in_service_year + 1
+                max_year = int(float(recovery_period)) + 1
+                recovery_year = max(1, min(recovery_year, max_year))
+
+                # Get disposal quarter/month for convention calculations
+                disposal_quarter = None
+                disposal_month = None
+                if disposal_date and not pd.isna(disposal_date):
+                    disposal_month = disposal_date.month if hasattr(disposal_date, 'month') else None
+                    disposal_quarter = get_quarter(disposal_date)
+
+                # Calculate disposal year depreciation
+                macrs_dep = calculate_disposal_year_depreciation(
+                    basis=depreciable_basis,
+                    recovery_period=int(float(recovery_period)),
+                    method=method,
+                    convention=convention,
+                    year_of_recovery=recovery_year,
+                    disposal_quarter=disposal_quarter,
+                    disposal_month=disposal_month,
+                    placed_in_service_quarter=quarter,
+                    placed_in_service_month=month
+                )
+            except Exception as e:
+                print(f"Warning: Disposal depreciation calculation failed for asset {row.get('Asset ID', idx)}: {e}")
+                macrs_dep = 0.0
+        else:
+            macrs_dep = 0.0
 
-    # Print summary of depreciation
-    total_sec179 = sum(section179_amounts)
-    total_bonus = sum(bonus_amounts)
-    total_macrs_current = sum(macrs_year1_depreciation)
-    total_current_year_deduction = total_sec179 + total_bonus + total_macrs_current
+        return depreciable_basis, macrs_dep, warnings
 
-    print("\n" + "=" * 80)
-    print(f"DEPRECIATION SUMMARY - Tax Year {tax_year}")
-    print("=" * 80)
-    print(f"Section 179 Expensing:           ${total_sec179:>15,.2f}  (current year additions only)")
-    print(f"Bonus Depreciation:              ${total_bonus:>15,.2f}  (current year additions only)")
-    print(f"MACRS Current Year Depreciation: ${total_macrs_current:>15,.2f}  (all assets - correct year)")
-    print(f"{'─' * 80}")
-    print(f"Total Current Year Deduction:    ${total_current_year_deduction:>15,.2f}")
-    print("=" * 80)
-    print("NOTE: For existing assets, MACRS depreciation is calculated based on")
-    print("      which year of their depreciation schedule they are in.")
-    print("=" * 80 + "\n")
+    # Skip transfers (no depreciation for pure transfers)
+    if _is_transfer(row):
+        return depreciable_basis, 0.0, warnings
 
-    # Print warnings about existing asset basis if any
-    if existing_asset_basis_warnings:
-        print("\n" + "!" * 80)
-        print("EXISTING ASSET BASIS WARNINGS")
-        print("!" * 80)
-        for warning in existing_asset_basis_warnings[:10]:  # Show first 10
-            print(f"  * {warning}")
-        if len(existing_asset_basis_warnings) > 10:
-            print(f"  ... and {len(existing_asset_basis_warnings) - 10} more warnings")
-        print("\nTO FIX: Add 'Prior Section 179' and 'Prior Bonus' columns to your input data")
-        print("        for existing assets that took these deductions in prior years.")
-        print("!" * 80 + "\n")
+    # CRITICAL FIX: Determine depreciation year based on transaction type
+    # For existing assets, calculate which year of depreciation schedule we're in
+    depreciation_year = 1  # Default for current year additions
+
+    if "Existing Asset" in transaction_type:
+        # Calculate depreciation year based on in-service date
+        if in_service_date and not pd.isna(in_service_date):
+            try:
+                if isinstance(in_service_date, date):
+                    in_service_year = in_service_date.year
+                elif hasattr(in_service_date, 'year'):
+                    in_service_year = in_service_date.year
+                else:
+                    in_service_year = int(str(in_service_date)[:4])
+
+                # Year of depreciation = current tax year - in service year + 1
+                depreciation_year = tax_year - in_service_year + 1
 
+                # Clamp to valid range (1 to recovery_period + 1 for final year)
+                if recovery_period:
+                    max_year = int(float(recovery_period)) + 1
+                    depreciation_year = max(1, min(depreciation_year, max_year))
+            except (ValueError, TypeError):
+                depreciation_year = 1  # Fallback
+
+    # Calculate MACRS depreciation for the appropriate year
+    try:
+        macrs_dep = calculate_macrs_depreciation(
+            basis=depreciable_basis,
+            recovery_period=recovery_period,
+            method=method,
+            convention=convention,
+            year=depreciation_year,  # Use calculated depreciation year
+            quarter=quarter,
+            month=month
+        )
+    except Exception as e:
+        # Fallback to 0 if calculation fails
+        print(f"Warning: MACRS calculation failed for asset {row.get('Asset ID', idx)}: {e}")
+        macrs_dep = 0.0
+
+    return depreciable_basis, macrs_dep, warnings
+
+
+def _apply_section_179_income_limit(
+    df: pd.DataFrame,
+    taxable_income: float,
+    carryforward_from_prior_years: float,
+    total_sec179: float,
+    verbose: bool = True,
+) -> pd.DataFrame:
+    """Split Section 179 into allowed and carryforward (IRC §179(b)(3))."""
     # ============================================================================
     # PHASE 4: SECTION 179 CARRYFORWARD TRACKING (IRC §179(b)(3))
     # ============================================================================
@@ -1668,8 +2006,6 @@ def build_fa(
     # NOTE: carryforward_from_prior_years should come from prior year tax return
     # (Form 4562, Part I, Line 13). Value is passed as function parameter.
 
-    carryforward_from_prior_years = section_179_carryforward_from_prior_year
-
     if total_sec179 > 0 and taxable_income > 0:
         # Apply income limitation and allocate across assets
         df, sec179_summary = apply_section_179_carryforward_to_dataframe(
@@ -1679,25 +2015,26 @@ def build_fa(
         )
 
         # Print Section 179 carryforward report
-        sec179_report = generate_section_179_report(sec179_summary)
-        print(sec179_report)
+        if verbose:
+            print(generate_section_179_report(sec179_summary))
 
         # Store carryforward summary in dataframe metadata for export
         df.attrs["section_179_summary"] = sec179_summary
 
     elif total_sec179 > 0 and taxable_income <= 0:
         # No taxable income - entire Section 179 must be carried forward
-        print("\n" + "=" * 80)
-        print("⚠️  CRITICAL: SECTION 179 TAXABLE INCOME LIMITATION")
-        print("=" * 80)
-        print(f"Section 179 Elected: ${total_sec179:,.2f}")
-        print(f"Taxable Business Income: ${taxable_income:,.2f}")
-        print("")
-        print("ENTIRE Section 179 deduction disallowed due to insufficient taxable income.")
-        print(f"Carryforward to next year: ${total_sec179:,.2f}")
-        print("")
-        print("MUST disclose on Form 4562, Part I, Line 13 of next year's return.")
-        print("=" * 80 + "\n")
+        if verbose:
+            print("\n" + "=" * 80)
+            print("⚠️  CRITICAL: SECTION 179 TAXABLE INCOME LIMITATION")
+            print("=" * 80)
+            print(f"Section 179 Elected: ${total_sec179:,.2f}")
+            print(f"Taxable Business Income: ${taxable_income:,.2f}")
+            print("")
+            print("ENTIRE Section 179 deduction disallowed due to insufficient taxable income.")
+            print(f"Carryforward to next year: ${total_sec179:,.2f}")
+            print("")
+            print("MUST disclose on Form 4562, Part I, Line 13 of next year's return.")
+            print("=" * 80 + "\n")
 
         # Set all Section 179 to carryforward
         df["Section 179 Allowed"] = 0.0
@@ -1708,105 +2045,176 @@ def build_fa(
         df["Section 179 Allowed"] = df["Section 179 Amount"]
         df["Section 179 Carryforward"] = 0.0
 
-    # ============================================================================
-    # TIER 2: RECAPTURE CALCULATIONS (IRC §1245 / §1250)
-    # ============================================================================
-    # Calculate depreciation recapture for disposals
+    return df
 
-    recapture_1245 = []
-    recapture_1250_ordinary = []
-    recapture_1250_unrecaptured = []
-    recapture_capital_gain = []
-    recapture_capital_loss = []
-    recapture_adjusted_basis = []
 
-    for idx, row in df.iterrows():
-        if not _is_disposal(row):
-            # Not a disposal - no recapture
-            recapture_1245.append(0.0)
-            recapture_1250_ordinary.append(0.0)
-            recapture_1250_unrecaptured.append(0.0)
-            recapture_capital_gain.append(0.0)
-            recapture_capital_loss.append(0.0)
-            recapture_adjusted_basis.append(0.0)
-            continue
-
-        # Get disposal data
-        cost = float(row.get("Cost") or 0.0)
+# Working-frame columns filled from _recapture_frame() / _row_recapture(), in tuple order
+RECAPTURE_COLUMNS = [
+    "§1245 Recapture (Ordinary Income)",
+    "§1250 Recapture (Ordinary Income)",
+    "Unrecaptured §1250 Gain (25% rate)",
+    "Capital Gain",
+    "Capital Loss",
+    "Adjusted Basis at Disposal",
+]
+
 
-        # Get proceeds from multiple possible column names (supports both formats)
-        proceeds = float(row.get("Proceeds") or row.get("proceeds") or 0.0)
+def _row_recapture(row) -> tuple:
+    """
+    Recapture for one asset (IRC §1245 / §1250).
+
+    Returns (§1245, §1250 ordinary, unrecaptured §1250, capital gain,
+    capital loss, adjusted basis); all zero for non-disposals.
+    """
+    if not _is_disposal(row):
+        # Not a disposal - no recapture
+        return 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
 
-        final_category = str(row.get("Final Category", ""))
+    # Get disposal data
+    cost = float(row.get("Cost") or 0.0)
 
-        # Get depreciation taken (for disposed assets, this would come from historical data)
-        # Support both capitalized (from export) and lowercase (from sheet_loader) column names
-        accumulated_dep = float(
-            row.get("Accumulated Depreciation") or
-            row.get("accumulated_depreciation") or 0.0
+    # Get proceeds from multiple possible column names (supports both formats)
+    proceeds = float(row.get("Proceeds") or row.get("proceeds") or 0.0)
+
+    final_category = str(row.get("Final Category", ""))
+
+    # Get depreciation taken (for disposed assets, this would come from historical data)
+    # Support both capitalized (from export) and lowercase (from sheet_loader) column names
+    accumulated_dep = float(
+        row.get("Accumulated Depreciation") or
+        row.get("accumulated_depreciation") or 0.0
+    )
+    sec179_taken = float(
+        row.get("Section 179 Taken (Historical)") or
+        row.get("section_179_taken") or 0.0
+    )
+    bonus_taken = float(
+        row.get("Bonus Taken (Historical)") or
+        row.get("bonus_taken") or 0.0
+    )
+
+    # Determine recapture type
+    recapture_type = determine_recapture_type(final_category)
+
+    if recapture_type == "none":
+        # Land - no depreciation, no recapture
+        return (
+            0.0,
+            0.0,
+            0.0,
+            proceeds - cost if proceeds > cost else 0.0,
+            cost - proceeds if cost > proceeds else 0.0,
+            cost,
         )
-        sec179_taken = float(
-            row.get("Section 179 Taken (Historical)") or
-            row.get("section_179_taken") or 0.0
+
+    elif recapture_type == "1245":
+        # Section 1245 - Personal property
+        result = calculate_section_1245_recapture(
+            cost=cost,
+            accumulated_depreciation=accumulated_dep,
+            proceeds=proceeds,
+            section_179_taken=sec179_taken,
+            bonus_taken=bonus_taken
         )
-        bonus_taken = float(
-            row.get("Bonus Taken (Historical)") or
-            row.get("bonus_taken") or 0.0
+
+        return (
+            result["section_1245_recapture"],
+            0.0,
+            0.0,
+            result["capital_gain"],
+            result["capital_loss"],
+            result["adjusted_basis"],
         )
 
-        # Determine recapture type
-        recapture_type = determine_recapture_type(final_category)
-
-        if recapture_type == "none":
-            # Land - no depreciation, no recapture
-            recapture_1245.append(0.0)
-            recapture_1250_ordinary.append(0.0)
-            recapture_1250_unrecaptured.append(0.0)
-            recapture_capital_gain.append(proceeds - cost if proceeds > cost else 0.0)
-            recapture_capital_loss.append(cost - proceeds if cost > proceeds else 0.0)
-            recapture_adjusted_basis.append(cost)
-
-        elif recapture_type == "1245":
-            # Section 1245 - Personal property
-            result = calculate_section_1245_recapture(
-                cost=cost,
-                accumulated_depreciation=accumulated_dep,
-                proceeds=proceeds,
-                section_179_taken=sec179_taken,
-                bonus_taken=bonus_taken
-            )
+    elif recapture_type == "1250":
+        # Section 1250 - Real property
+        result = calculate_section_1250_recapture(
+            cost=cost,
+            accumulated_depreciation=accumulated_dep,
+            proceeds=proceeds,
+            accelerated_depreciation=0.0  # Post-1986 real property uses SL only
+        )
 
-            recapture_1245.append(result["section_1245_recapture"])
-            recapture_1250_ordinary.append(0.0)
-            recapture_1250_unrecaptured.append(0.0)
-            recapture_capital_gain.append(result["capital_gain"])
-            recapture_capital_loss.append(result["capital_loss"])
-            recapture_adjusted_basis.append(result["adjusted_basis"])
-
-        elif recapture_type == "1250":
-            # Section 1250 - Real property
-            result = calculate_section_1250_recapture(
-                cost=cost,
-                accumulated_depreciation=accumulated_dep,
-                proceeds=proceeds,
-                accelerated_depreciation=0.0  # Post-1986 real property uses SL only
-            )
+        return (
+            0.0,
+            result["section_1250_recapture"],
+            result["unrecaptured_1250_gain"],
+            result["capital_gain"],
+            result["capital_loss"],
+            result["adjusted_basis"],
+        )
+
+    return 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
 
-            recapture_1245.append(0.0)
-            recapture_1250_ordinary.append(result["section_1250_recapture"])
-            recapture_1250_unrecaptured.append(result["unrecaptured_1250_gain"])
-            recapture_capital_gain.append(result["capital_gain"])
-            recapture_capital_loss.append(result["capital_loss"])
-            recapture_adjusted_basis.append(result["adjusted_basis"])
-
-    # Add recapture columns to dataframe
-    df["§1245 Recapture (Ordinary Income)"] = recapture_1245
-    df["§1250 Recapture (Ordinary Income)"] = recapture_1250_ordinary
-    df["Unrecaptured §1250 Gain (25% rate)"] = recapture_1250_unrecaptured
-    df["Capital Gain"] = recapture_capital_gain
-    df["Capital Loss"] = recapture_capital_loss
-    df["Adjusted Basis at Disposal"] = recapture_adjusted_basis
 
+def _first_nonzero(df: pd.DataFrame, cols: list) -> np.ndarray:
+    """Vectorized float(row.get(cols[0]) or row.get(cols[1]) or ... or 0.0)."""
+    values = np.zeros(len(df))
+    for col in reversed(cols):
+        if col in df.columns:
+            col_values = pd.to_numeric(df[col], errors="coerce").fillna(0.0).to_numpy(dtype=float)
+            values = np.where(col_values != 0, col_values, values)
+    return values
+
+
+def _recapture_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vectorized _row_recapture: RECAPTURE_COLUMNS for every row in one pass.
+
+    Only disposal rows are computed; everything else is zero. Missing
+    amounts count as zero.
+    """
+    disposal = _transaction_masks(df)[0].to_numpy()
+    sold = df.loc[disposal]
+
+    cost = _first_nonzero(sold, ["Cost"])
+    proceeds = _first_nonzero(sold, ["Proceeds", "proceeds"])
+    accumulated_dep = _first_nonzero(sold, ["Accumulated Depreciation", "accumulated_depreciation"])
+    sec179_taken = _first_nonzero(sold, ["Section 179 Taken (Historical)", "section_179_taken"])
+    bonus_taken = _first_nonzero(sold, ["Bonus Taken (Historical)", "bonus_taken"])
+    categories = sold["Final Category"] if "Final Category" in sold.columns else pd.Series("", index=sold.index)
+    recapture_type = determine_recapture_types(categories)
+
+    r1245 = calculate_section_1245_recapture_array(
+        cost=cost,
+        accumulated_depreciation=accumulated_dep,
+        proceeds=proceeds,
+        section_179_taken=sec179_taken,
+        bonus_taken=bonus_taken
+    )
+    # Post-1986 real property uses SL only
+    r1250 = calculate_section_1250_recapture_array(
+        cost=cost,
+        accumulated_depreciation=accumulated_dep,
+        proceeds=proceeds,
+    )
+
+    is_land = recapture_type == "none"
+    is_1245 = recapture_type == "1245"
+    is_1250 = recapture_type == "1250"
+    zeros = np.zeros(len(sold))
+
+    # Land - no depreciation, no recapture; gain/loss is against cost
+    land_gain = np.where(proceeds > cost, proceeds - cost, 0.0)
+    land_loss = np.where(cost > proceeds, cost - proceeds, 0.0)
+
+    computed = [
+        np.where(is_1245, r1245["section_1245_recapture"], zeros),
+        np.where(is_1250, r1250["section_1250_recapture"], zeros),
+        np.where(is_1250, r1250["unrecaptured_1250_gain"], zeros),
+        np.select([is_land, is_1245, is_1250], [land_gain, r1245["capital_gain"], r1250["capital_gain"]], 0.0),
+        np.select([is_land, is_1245, is_1250], [land_loss, r1245["capital_loss"], r1250["capital_loss"]], 0.0),
+        np.select([is_land, is_1245, is_1250], [cost, r1245["adjusted_basis"], r1250["adjusted_basis"]], 0.0),
+    ]
+
+    recapture = pd.DataFrame(0.0, index=df.index, columns=RECAPTURE_COLUMNS)
+    for col, values in zip(RECAPTURE_COLUMNS, computed):
+        recapture.loc[disposal, col] = values
+    return recapture
+
+
+def _assemble_fa_export(df: pd.DataFrame, asset_number_start: int = 1) -> pd.DataFrame:
+    """Build the FA CS export frame from fully processed asset rows."""
     # ----------------------------------------------------------------------
     # Build FA CS Export - UPDATED FOR FA CS IMPORT COMPATIBILITY
     # ----------------------------------------------------------------------
@@ -1863,25 +2271,23 @@ def build_fa(
     # Use pd.to_numeric to handle any string values
     fa["Tax Cost"] = pd.to_numeric(df["Cost"], errors='coerce').fillna(0).round(2)  # FA CS uses "Tax Cost" not "Cost/Basis"
 
+    # Setup fields (method/life/convention/category) are blank for disposals
+    # and transfers - computed once here as column masks
+    is_disposal, is_transfer = _transaction_masks(df)
+    active = ~(is_disposal | is_transfer)
+    recovery_period = _first_present(df, ["Recovery Period", "MACRS Life"], "")
+
     # Tax Method: Convert to FA CS format
     # FA CS only accepts "MACRS" (not "MACRS GDS" or "200DB") per user testing
-    fa["Tax Method"] = df.apply(
-        lambda r: _convert_method_to_fa_cs_format(r.get("Uses ADS", False)) if not _is_disposal(r) and not _is_transfer(r) else "",
-        axis=1,
-    )
+    fa_cs_method = _convert_method_to_fa_cs_format(uses_ads=False)
+    fa["Tax Method"] = _blank_inactive(fa_cs_method, active)
 
     # Tax Life: Just numbers (5, 7, 15, 27.5, 39) - NOT "5-Year MACRS"
     # FA CS expects plain numbers for Tax Life field
-    fa["Tax Life"] = df.apply(
-        lambda r: r.get("Recovery Period", r.get("MACRS Life", "")) if not _is_disposal(r) and not _is_transfer(r) else "",
-        axis=1,
-    )
+    fa["Tax Life"] = _blank_inactive(recovery_period, active)
 
     # Convention: Same as before (HY, MQ, MM)
-    fa["Convention"] = df.apply(
-        lambda r: r["Convention"] if not _is_disposal(r) and not _is_transfer(r) else "",
-        axis=1,
-    )
+    fa["Convention"] = _blank_inactive(df["Convention"], active)
 
     # ============================================================================
     # SECTION 179 & BONUS DEPRECIATION
@@ -1891,7 +2297,8 @@ def build_fa(
     # Use pd.to_numeric to handle any string values
     fa["Tax Sec 179 Expensed"] = pd.to_numeric(df["Section 179 Amount"], errors='coerce').fillna(0).round(2)
     fa["Bonus Amount"] = pd.to_numeric(df["Bonus Amount"], errors='coerce').fillna(0).round(2)
-    fa["Bonus % Applied"] = pd.to_numeric(df["Bonus Percentage Used"], errors='coerce').fillna(0).apply(lambda x: f"{x:.0%}" if x > 0 else "")
+    bonus_pct = pd.to_numeric(df["Bonus Percentage Used"], errors='coerce').fillna(0)
+    fa["Bonus % Applied"] = bonus_pct.map({x: f"{x:.0%}" if x > 0 else "" for x in bonus_pct.unique()})
 
     # ============================================================================
     # PRIOR & CURRENT DEPRECIATION
@@ -1901,11 +2308,15 @@ def build_fa(
     # Tax Cur Depreciation = current year MACRS depreciation (for all assets)
 
     # Round to 2 decimal places for FA CS compatibility
-    fa["Tax Prior Depreciation"] = df.apply(
-        lambda r: round(float(r.get("Accumulated Depreciation") or r.get("accumulated_depreciation") or 0.0), 2)
-                  if "Existing Asset" in str(r.get("Transaction Type", "")) else 0.0,
-        axis=1
+    prior_depreciation = pd.Series(0.0, index=df.index)
+    for col in ["accumulated_depreciation", "Accumulated Depreciation"]:
+        if col in df.columns:
+            accum = pd.to_numeric(df[col], errors='coerce').astype(float)
+            prior_depreciation = accum.where(accum.notna() & (accum != 0), prior_depreciation)
+    is_existing = _first_present(df, ["Transaction Type"], "").astype(str).str.contains(
+        "Existing Asset", regex=False, na=False
     )
+    fa["Tax Prior Depreciation"] = prior_depreciation.round(2).where(is_existing, 0.0)
 
     fa["Tax Cur Depreciation"] = pd.to_numeric(df["MACRS Year 1 Depreciation"], errors='coerce').fillna(0).round(2)
 
@@ -1920,35 +2331,13 @@ def build_fa(
 
     # Book Method: Typically Straight Line (SL) for GAAP
     # FA CS accepts: SL, DB (declining balance), etc.
-    fa["Book Method"] = df.apply(
-        lambda r: "SL" if not _is_disposal(r) and not _is_transfer(r) else "",
-        axis=1,
-    )
+    fa["Book Method"] = _blank_inactive("SL", active)
 
     # Book Life: Typically longer than Tax life (e.g., 10 years for computers vs 5 for tax)
-    # Common Book lives: Computers=10, Furniture=10, Vehicles=5, Buildings=40
-    def _get_book_life(row):
-        if _is_disposal(row) or _is_transfer(row):
-            return ""
-        tax_life = row.get("Recovery Period", row.get("MACRS Life", 0))
-        try:
-            tax_life = float(tax_life)
-        except (ValueError, TypeError):
-            tax_life = 7  # Default
-
-        # Book life is typically longer than tax life
-        if tax_life <= 5:
-            return 10  # 5-year tax → 10-year book
-        elif tax_life <= 7:
-            return 10  # 7-year tax → 10-year book
-        elif tax_life <= 15:
-            return 15  # 15-year tax → 15-year book
-        elif tax_life >= 27.5:
-            return 40  # Real property → 40-year book
-        else:
-            return 10  # Default
-
-    fa["Book Life"] = df.apply(_get_book_life, axis=1)
+    # 5/7-year tax → 10-year book, 15-year → 15, real property → 40, default 10
+    fa["Book Life"] = _blank_inactive(
+        _book_lives(_first_present(df, ["Recovery Period", "MACRS Life"], 0)), active
+    )
 
     # ============================================================================
     # STATE DEPRECIATION COLUMNS (MI - Michigan)
@@ -1962,20 +2351,10 @@ def build_fa(
     fa["MI Cost"] = pd.to_numeric(df["Cost"], errors='coerce').fillna(0).round(2)
 
     # MI Method: Michigan follows federal MACRS
-    fa["MI Method"] = df.apply(
-        lambda r: _convert_method_to_fa_cs_format(r["Method"])
-        if not _is_disposal(r) and not _is_transfer(r)
-        else "",
-        axis=1,
-    )
+    fa["MI Method"] = _blank_inactive(fa_cs_method, active)
 
     # MI Life: Same as Tax Life
-    fa["MI Life"] = df.apply(
-        lambda r: r.get("Recovery Period", r.get("MACRS Life", ""))
-        if not _is_disposal(r) and not _is_transfer(r)
-        else "",
-        axis=1,
-    )
+    fa["MI Life"] = _blank_inactive(recovery_period, active)
 
     # ============================================================================
     # TRANSACTION TYPE & SHEET ROLE
@@ -2032,18 +2411,17 @@ def build_fa(
     fa["Client Category Original"] = df.get("Client Category Original", df.get("Client Category", ""))
 
     # Final Computed Category (for additions only)
-    fa["Final Category"] = df.apply(
-        lambda r: r["Final Category"] if not _is_disposal(r) and not _is_transfer(r) else "",
-        axis=1,
-    )
+    fa["Final Category"] = _blank_inactive(df["Final Category"], active)
 
     # FA CS Wizard Category - EXACT dropdown option text for UiPath RPA automation
     # This column tells UiPath which option to select in FA CS wizard dropdown
-    fa["FA_CS_Wizard_Category"] = df.apply(_get_fa_cs_wizard_category, axis=1)
+    fa["FA_CS_Wizard_Category"] = _fa_cs_wizard_categories(df, active)
 
     # Asset Type - General classification for FA CS folder organization
     # Added to help FA CS classify assets into "Business" folder instead of "Miscellaneous"
-    fa["Asset Type"] = fa.apply(_determine_asset_type, axis=1)
+    # (evaluated on fa, where Sheet Role is always "main")
+    fa_disposal, fa_transfer = _transaction_masks(fa)
+    fa["Asset Type"] = _blank_inactive("Business", ~(fa_disposal | fa_transfer))
 
     # ===========================================================================
     # CPA REVIEW ENHANCEMENTS - NBV, Materiality, Audit Trail
@@ -2054,19 +2432,17 @@ def build_fa(
     # Only set NBV to None if it doesn't already exist (preserve extracted values)
     if "NBV" not in fa.columns:
         fa["NBV"] = None
-    fa = _compute_nbv_reco(fa, tolerance=5.0)
+    fa = _compute_nbv_reco(fa)
 
     # Materiality Scoring - prioritize high-value assets for CPA review
     fa = _compute_materiality(fa)
 
-    # Classification Explanations - explain why each asset was classified as it was
-    fa["ClassificationExplanation"] = fa.apply(_classification_explanation, axis=1)
-    fa["MACRS_Reason_Code"] = fa.apply(_macrs_reason_code, axis=1)
-    fa["ConfidenceGrade"] = fa.apply(_confidence_grade, axis=1)
+    # Classification codes - compact reason code and confidence grade
+    fa["MACRS_Reason_Code"] = _category_lookup(fa["Final Category"], MACRS_REASON_CODES, "PP7")
+    fa["ConfidenceGrade"] = _confidence_grades(fa)
 
-    # Audit Trail - comprehensive audit fields with SHA256 integrity hash
-    audit_df = fa.apply(_audit_fields, axis=1, result_type="expand")
-    fa = pd.concat([fa, audit_df], axis=1)
+    # Classification explanations and the audit trail (SHA256 integrity hash)
+    # are text-only; exporters add them on demand via attach_audit_columns()
 
     # Typo tracking columns (if they exist)
     if "Desc_TypoFlag" in df.columns:
@@ -2076,6 +2452,182 @@ def build_fa(
         fa["Cat_TypoFlag"] = df["Cat_TypoFlag"]
         fa["Cat_TypoNote"] = df.get("Cat_TypoNote", "")
 
+    return fa
+
+
+# --------------------------------------------------------------
+# Main export builder
+# --------------------------------------------------------------
+
+def build_fa(
+    df: pd.DataFrame,
+    tax_year: int,
+    strategy: str,
+    taxable_income: float,
+    use_acq_if_missing: bool = True,
+    de_minimis_limit: float = 0.0,  # Set to 2500 or 5000 to enable de minimis safe harbor
+    section_179_carryforward_from_prior_year: float = 0.0,  # Prior year Section 179 carryforward (from Form 4562)
+    asset_number_start: int = 1,  # Starting Asset # for FA CS (e.g., 1001 to continue from existing assets)
+) -> pd.DataFrame:
+
+    # ----------------------------------------------------------------------
+    # CRITICAL: Validate non-empty DataFrame
+    # ----------------------------------------------------------------------
+    if df is None or df.empty or len(df) == 0:
+        raise ValueError(
+            "Cannot process empty asset list. Please provide at least one asset record. "
+            "If you're importing from Excel, verify the file contains data rows."
+        )
+
+    df = df.copy()
+
+    # ----------------------------------------------------------------------
+    # DATA VALIDATION - Catch errors before processing
+    # ----------------------------------------------------------------------
+    _report_asset_validation(df, tax_year)
+
+    # Transaction classification, cleanup, typo fixes and de minimis
+    df = _prepare_assets(df, tax_year, use_acq_if_missing, de_minimis_limit)
+
+    # ----------------------------------------------------------------------
+    # Depreciation classification only applies to ADDITIONS
+    # ----------------------------------------------------------------------
+
+    # Validate tax year configuration and warn if using estimated values
+    config_validation = validate_tax_year_config(tax_year)
+    for warning in config_validation.warnings:
+        print(f"TAX CONFIG WARNING: {warning}")
+
+    # ============================================================================
+    # TIER 3: MID-QUARTER CONVENTION DETECTION (IRC §168(d)(3))
+    # ============================================================================
+    # CRITICAL: If >40% of property placed in service in Q4, must use MQ convention
+    # This is one of the most common IRS audit adjustments
+
+    global_convention, mq_details = detect_mid_quarter_convention(df, tax_year, verbose=True)
+
+    # Store mid-quarter test results for later use
+    df.attrs["mid_quarter_test"] = mq_details
+    df.attrs["global_convention"] = global_convention
+
+    # Apply mid-quarter convention to all assets and add quarter column
+    conventions = []
+    quarters = []
+    for _, row in df.iterrows():
+        convention, quarter = _row_convention(row, global_convention)
+        conventions.append(convention)
+        quarters.append(quarter)
+
+    df["Convention"] = conventions
+    df["Quarter"] = quarters  # Used for MQ depreciation calculations
+
+    # Calculate total Section 179-eligible property cost for phase-out
+    # CRITICAL: Only count CURRENT YEAR ADDITIONS (not existing assets)
+    # Note: bonus_percentage is calculated per asset based on acquisition/in-service dates
+    # to handle OBBB Act 100% bonus eligibility
+    total_179_eligible_cost = sum(_section_179_eligible_cost(row) for _, row in df.iterrows())
+    remaining_179 = _section_179_effective_limit(total_179_eligible_cost, tax_year, taxable_income)
+
+    section179_amounts = []
+    bonus_amounts = []
+    bonus_percentages_used = []  # Track which bonus % was applied (for audit trail)
+    luxury_auto_notes = []
+    ads_flags = []  # Track which assets use ADS
+
+    for _, row in df.iterrows():
+        elig = _row_incentive_eligibility(row, tax_year, strategy)
+        sec179, bonus, bonus_pct, note, uses_ads, drawn = _row_incentives(
+            row, elig, remaining_179, tax_year, strategy
+        )
+        remaining_179 -= drawn
+
+        section179_amounts.append(sec179)
+        bonus_amounts.append(bonus)
+        bonus_percentages_used.append(bonus_pct)
+        luxury_auto_notes.append(note)
+        ads_flags.append(uses_ads)
+
+    # IRC §280F luxury auto caps, applied to every vehicle in one pass
+    section179_amounts, bonus_amounts, luxury_auto_notes = _apply_luxury_auto_caps_frame(
+        df, section179_amounts, bonus_amounts, luxury_auto_notes, tax_year
+    )
+
+    df["Section 179 Amount"] = section179_amounts
+    df["Bonus Amount"] = bonus_amounts
+    df["Bonus Percentage Used"] = bonus_percentages_used  # Track OBBB vs TCJA bonus %
+    df["Uses ADS"] = ads_flags  # Track which assets use Alternative Depreciation System
+    df["Auto Limit Notes"] = luxury_auto_notes
+
+    # ============================================================================
+    # PHASE 4: MACRS DEPRECIATION CALCULATION (IRS Publication 946 Tables)
+    # ============================================================================
+    # For CURRENT YEAR ADDITIONS: Calculate Year 1 MACRS depreciation
+    # For EXISTING ASSETS: Calculate current year depreciation based on depreciation year
+    # Basis for MACRS = Cost - Section 179 - Bonus Depreciation
+    #
+    # CRITICAL: For existing assets, we need the ORIGINAL depreciable basis
+    # (Cost - Prior Section 179 - Prior Bonus), not the current cost.
+    # If prior 179/bonus columns exist, use them; otherwise warn user.
+    macrs_year1_depreciation = []
+    depreciable_basis_list = []
+    existing_asset_basis_warnings = []
+    sources = _basis_sources(df)
+
+    for idx, row in df.iterrows():
+        basis, macrs_dep, warnings = _row_depreciation(row, idx, tax_year, sources)
+        depreciable_basis_list.append(basis)
+        macrs_year1_depreciation.append(macrs_dep)
+        existing_asset_basis_warnings.extend(warnings)
+
+    df["Depreciable Basis"] = depreciable_basis_list
+    df["MACRS Year 1 Depreciation"] = macrs_year1_depreciation
+
+    # Print summary of depreciation
+    total_sec179 = sum(section179_amounts)
+    total_bonus = sum(bonus_amounts)
+    total_macrs_current = sum(macrs_year1_depreciation)
+    total_current_year_deduction = total_sec179 + total_bonus + total_macrs_current
+
+    print("\n" + "=" * 80)
+    print(f"DEPRECIATION SUMMARY - Tax Year {tax_year}")
+    print("=" * 80)
+    print(f"Section 179 Expensing:           ${total_sec179:>15,.2f}  (current year additions only)")
+    print(f"Bonus Depreciation:              ${total_bonus:>15,.2f}  (current year additions only)")
+    print(f"MACRS Current Year Depreciation: ${total_macrs_current:>15,.2f}  (all assets - correct year)")
+    print(f"{'─' * 80}")
+    print(f"Total Current Year Deduction:    ${total_current_year_deduction:>15,.2f}")
+    print("=" * 80)
+    print("NOTE: For existing assets, MACRS depreciation is calculated based on")
+    print("      which year of their depreciation schedule they are in.")
+    print("=" * 80 + "\n")
+
+    # Print warnings about existing asset basis if any
+    if existing_asset_basis_warnings:
+        print("\n" + "!" * 80)
+        print("EXISTING ASSET BASIS WARNINGS")
+        print("!" * 80)
+        for warning in existing_asset_basis_warnings[:10]:  # Show first 10
+            print(f"  * {warning}")
+        if len(existing_asset_basis_warnings) > 10:
+            print(f"  ... and {len(existing_asset_basis_warnings) - 10} more warnings")
+        print("\nTO FIX: Add 'Prior Section 179' and 'Prior Bonus' columns to your input data")
+        print("        for existing assets that took these deductions in prior years.")
+        print("!" * 80 + "\n")
+
+    df = _apply_section_179_income_limit(
+        df, taxable_income, section_179_carryforward_from_prior_year, total_sec179
+    )
+
+    # ============================================================================
+    # TIER 2: RECAPTURE CALCULATIONS (IRC §1245 / §1250)
+    # ============================================================================
+    # Calculate depreciation recapture for disposals (all rows in one pass)
+    recapture = _recapture_frame(df)
+    for col in RECAPTURE_COLUMNS:
+        df[col] = recapture[col]
+
+    fa = _assemble_fa_export(df, asset_number_start)
+
     # Print CPA review summary
     high_priority = (fa["ReviewPriority"] == "High").sum()
     nbv_issues = (fa["NBV_Reco"] == "CHECK").sum()
@@ -2162,26 +2714,17 @@ def build_fa_minimal(
     # Use pd.to_numeric to handle any string values
     fa["Tax Cost"] = pd.to_numeric(df["Cost"], errors='coerce').fillna(0).round(2)
 
+    is_disposal, is_transfer = _transaction_masks(df)
+    active = ~(is_disposal | is_transfer)
+
     # Tax Method: Convert to FA CS format
-    fa["Tax Method"] = df.apply(
-        lambda r: _convert_method_to_fa_cs_format(r.get("Uses ADS", False))
-        if not _is_disposal(r) and not _is_transfer(r) else "",
-        axis=1,
-    )
+    fa["Tax Method"] = _blank_inactive(_convert_method_to_fa_cs_format(uses_ads=False), active)
 
     # Tax Life: Plain numbers only
-    fa["Tax Life"] = df.apply(
-        lambda r: r.get("Recovery Period", r.get("MACRS Life", ""))
-        if not _is_disposal(r) and not _is_transfer(r) else "",
-        axis=1,
-    )
+    fa["Tax Life"] = _blank_inactive(_first_present(df, ["Recovery Period", "MACRS Life"], ""), active)
 
     # Convention
-    fa["Convention"] = df.apply(
-        lambda r: r.get("Convention", "")
-        if not _is_disposal(r) and not _is_transfer(r) else "",
-        axis=1,
-    )
+    fa["Convention"] = _blank_inactive(_first_present(df, ["Convention"], ""), active)
 
     # Sheet Role - always "main"
     fa["Sheet Role"] = "main"
@@ -2245,426 +2788,381 @@ def export_fa_excel(fa_df: pd.DataFrame, audit_info: dict = None) -> bytes:
     Returns:
         Excel file bytes
     """
-    from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
-    from openpyxl.formatting.rule import CellIsRule
+    with export_fa_excel_stream(fa_df, audit_info) as spooled:
+        return spooled.read()
 
-    output = BytesIO()
 
-    with pd.ExcelWriter(output, engine="openpyxl") as writer:
+def export_fa_excel_stream(fa_df: pd.DataFrame, audit_info: dict = None):
+    """
+    Streaming variant of export_fa_excel.
+
+    Rows are written through a constant-memory StreamingWorkbook and the
+    workbook lands in a spooled temp file, so large exports can be copied
+    or sent to a client in chunks without holding the whole file in memory.
+
+    Returns:
+        SpooledTemporaryFile positioned at 0 (caller closes it)
+    """
+    book = StreamingWorkbook()
+
+    # ================================================================
+    # SEPARATE DE MINIMIS ITEMS FROM DEPRECIABLE ASSETS
+    # ================================================================
+    # De minimis items are expensed immediately (not depreciated)
+    # They should NOT go into FA CS - separate them for documentation
+    de_minimis_mask = (
+        (fa_df.get("De Minimis Expensed", pd.Series([0] * len(fa_df))) > 0) |
+        ((fa_df.get("Tax Cost", pd.Series([0] * len(fa_df))) == 0) &
+         (fa_df.get("De Minimis Expensed", pd.Series([0] * len(fa_df))) > 0))
+    )
+    de_minimis_df = fa_df[de_minimis_mask].copy()
+    depreciable_df = fa_df[~de_minimis_mask].copy()
+
+    # ================================================================
+    # TAB 1: FA_CS_Data - Main data for FA CS entry
+    # ================================================================
+    # Contains all fields needed for manual entry into FA CS
+    # Excludes de minimis items (they don't go into FA CS)
+    fa_data_cols = [
+        "Asset #",
+        "Description",
+        "Date In Service",
+        "Tax Cost",
+        "Tax Method",
+        "Tax Life",
+        "Tax Sec 179 Expensed",  # CRITICAL: Only way to set 179!
+        "Tax Cur Depreciation",  # BLANK for FA CS to calculate
+        "Tax Prior Depreciation",
+        "Book Cost",             # Book depreciation - FA CS imports these!
+        "Book Method",           # Typically "SL" for GAAP
+        "Book Life",             # Typically longer than Tax life
+        "MI Cost",               # Michigan state depreciation
+        "MI Method",             # MACRS (same as Tax)
+        "MI Life",               # Same as Tax Life
+        "Date Disposed",         # For disposals
+        "Gross Proceeds",        # For disposals
+        "FA_CS_Wizard_Category", # For UiPath RPA - wizard dropdown selection
+    ]
 
-        # ================================================================
-        # SEPARATE DE MINIMIS ITEMS FROM DEPRECIABLE ASSETS
-        # ================================================================
-        # De minimis items are expensed immediately (not depreciated)
-        # They should NOT go into FA CS - separate them for documentation
-        de_minimis_mask = (
-            (fa_df.get("De Minimis Expensed", pd.Series([0] * len(fa_df))) > 0) |
-            ((fa_df.get("Tax Cost", pd.Series([0] * len(fa_df))) == 0) &
-             (fa_df.get("De Minimis Expensed", pd.Series([0] * len(fa_df))) > 0))
+    # Add columns if they don't exist (on depreciable assets only)
+    if "Date Disposed" not in depreciable_df.columns:
+        depreciable_df["Date Disposed"] = ""
+    if "Gross Proceeds" not in depreciable_df.columns:
+        depreciable_df["Gross Proceeds"] = ""
+
+    # CRITICAL: Set Tax Cur Depreciation to blank (not 0) so FA CS calculates it
+    # If we put 0, FA CS treats it as an override and won't calculate!
+    # Save original values before blanking for use in calculations later
+    original_tax_cur_depreciation = fa_df["Tax Cur Depreciation"].copy() if "Tax Cur Depreciation" in fa_df.columns else pd.Series([0] * len(fa_df))
+    depreciable_df["Tax Cur Depreciation"] = ""
+
+    # Select only columns that exist (EXCLUDES de minimis items)
+    available_fa = [c for c in fa_data_cols if c in depreciable_df.columns]
+    fa_data_df = depreciable_df[available_fa].copy()
+
+    # Write FA_CS_Data tab
+    book.add_sheet("FA_CS_Data", fa_data_df, freeze_header=True, auto_filter=True)
+
+    # ================================================================
+    # TAB 2: RPA_Input - Minimal fields for UiPath RPA automation
+    # ================================================================
+    # Simple, clean data for RPA to:
+    # 1. Click "Add Asset" in FA CS
+    # 2. Enter these fields
+    # 3. Click Wizard → Select FA_CS_Wizard_Category
+    # 4. Optionally click "Max 179" if flagged
+    rpa_cols = [
+        "Asset #",
+        "Description",
+        "Date In Service",
+        "Tax Cost",
+        "FA_CS_Wizard_Category",  # Which wizard dropdown to select
+    ]
+
+    available_rpa = [c for c in rpa_cols if c in depreciable_df.columns]
+    rpa_df = depreciable_df[available_rpa].copy()
+
+    # Add Max_179 flag for RPA (CPA can review and modify before running RPA)
+    # Flag assets that are eligible for 179 (current year additions with cost > 0)
+    if "Tax Sec 179 Expensed" in depreciable_df.columns:
+        rpa_df["Max_179"] = depreciable_df["Tax Sec 179 Expensed"].apply(
+            lambda x: "YES" if pd.to_numeric(x, errors='coerce') and pd.to_numeric(x, errors='coerce') > 0 else ""
         )
-        de_minimis_df = fa_df[de_minimis_mask].copy()
-        depreciable_df = fa_df[~de_minimis_mask].copy()
-
-        # ================================================================
-        # TAB 1: FA_CS_Data - Main data for FA CS entry
-        # ================================================================
-        # Contains all fields needed for manual entry into FA CS
-        # Excludes de minimis items (they don't go into FA CS)
-        fa_data_cols = [
-            "Asset #",
-            "Description",
-            "Date In Service",
-            "Tax Cost",
-            "Tax Method",
-            "Tax Life",
-            "Tax Sec 179 Expensed",  # CRITICAL: Only way to set 179!
-            "Tax Cur Depreciation",  # BLANK for FA CS to calculate
-            "Tax Prior Depreciation",
-            "Book Cost",             # Book depreciation - FA CS imports these!
-            "Book Method",           # Typically "SL" for GAAP
-            "Book Life",             # Typically longer than Tax life
-            "MI Cost",               # Michigan state depreciation
-            "MI Method",             # MACRS (same as Tax)
-            "MI Life",               # Same as Tax Life
-            "Date Disposed",         # For disposals
-            "Gross Proceeds",        # For disposals
-            "FA_CS_Wizard_Category", # For UiPath RPA - wizard dropdown selection
-        ]
+    else:
+        rpa_df["Max_179"] = ""
+
+    book.add_sheet("RPA_Input", rpa_df, freeze_header=True, auto_filter=True)
+
+    # ================================================================
+    # TAB 3: Review - Items needing CPA attention (combines CPA_Review + Audit)
+    # ================================================================
+    # Key fields for CPA review: priorities, warnings, classification info
+
+    # Add eligibility reason columns for CPA verification
+    def get_179_eligibility(row):
+        """Explain why asset is/isn't eligible for Section 179."""
+        trans_type = str(row.get("Transaction Type", "")).lower()
+        cost = pd.to_numeric(row.get("Tax Cost", 0), errors='coerce') or 0
+        sec179 = pd.to_numeric(row.get("Tax Sec 179 Expensed", 0), errors='coerce') or 0
+
+        if "disposal" in trans_type:
+            return "No - Disposal (not eligible)"
+        if "existing" in trans_type:
+            return "No - Existing asset (must be new acquisition)"
+        if cost <= 0:
+            return "No - Zero/negative cost"
+        if sec179 > 0:
+            return f"Yes - ${sec179:,.0f} elected"
+        # Check if it could have been eligible
+        category = str(row.get("Final Category", "")).lower()
+        if "land" in category or "real property" in category:
+            return "No - Real property (not §179 eligible)"
+        return "Eligible but not elected"
+
+    def get_bonus_eligibility(row):
+        """Explain why asset is/isn't eligible for Bonus depreciation."""
+        trans_type = str(row.get("Transaction Type", "")).lower()
+        cost = pd.to_numeric(row.get("Tax Cost", 0), errors='coerce') or 0
+        bonus = pd.to_numeric(row.get("Bonus Amount", 0), errors='coerce') or 0
+
+        if "disposal" in trans_type:
+            return "No - Disposal"
+        if cost <= 0:
+            return "No - Zero cost"
+        if bonus > 0:
+            return f"Yes - ${bonus:,.0f} (after §179)"
+        # Check why no bonus
+        category = str(row.get("Final Category", "")).lower()
+        if "land" in category:
+            return "No - Land (not depreciable)"
+        if "used" in trans_type.lower():
+            return "Check - Used property (verify eligibility)"
+        return "No bonus applied"
+
+    fa_df["§179_Eligibility"] = fa_df.apply(get_179_eligibility, axis=1)
+    fa_df["Bonus_Eligibility"] = fa_df.apply(get_bonus_eligibility, axis=1)
+
+    review_cols = [
+        "Asset #",
+        "Description",
+        "Tax Cost",
+        "Final Category",
+        "Transaction Type",
+        "ReviewPriority",
+        "ConfidenceGrade",
+        "NBV_Reco",
+        "AuditWarnings",
+        "ClassificationExplanation",
+        "Tax Sec 179 Expensed",
+        "§179_Eligibility",
+        "Bonus Amount",
+        "Bonus_Eligibility",
+    ]
 
-        # Add columns if they don't exist (on depreciable assets only)
-        if "Date Disposed" not in depreciable_df.columns:
-            depreciable_df["Date Disposed"] = ""
-        if "Gross Proceeds" not in depreciable_df.columns:
-            depreciable_df["Gross Proceeds"] = ""
-
-        # CRITICAL: Set Tax Cur Depreciation to blank (not 0) so FA CS calculates it
-        # If we put 0, FA CS treats it as an override and won't calculate!
-        # Save original values before blanking for use in calculations later
-        original_tax_cur_depreciation = fa_df["Tax Cur Depreciation"].copy() if "Tax Cur Depreciation" in fa_df.columns else pd.Series([0] * len(fa_df))
-        depreciable_df["Tax Cur Depreciation"] = ""
-
-        # Select only columns that exist (EXCLUDES de minimis items)
-        available_fa = [c for c in fa_data_cols if c in depreciable_df.columns]
-        fa_data_df = depreciable_df[available_fa].copy()
-
-        # Write FA_CS_Data tab
-        fa_data_df.to_excel(writer, sheet_name="FA_CS_Data", index=False)
-
-        # Format the FA_CS_Data worksheet
-        ws_fa = writer.sheets["FA_CS_Data"]
-        ws_fa.freeze_panes = "A2"
-        if ws_fa.max_row > 0:
-            ws_fa.auto_filter.ref = ws_fa.dimensions
-
-        _apply_professional_formatting(ws_fa, fa_data_df)
-
-        # ================================================================
-        # TAB 2: RPA_Input - Minimal fields for UiPath RPA automation
-        # ================================================================
-        # Simple, clean data for RPA to:
-        # 1. Click "Add Asset" in FA CS
-        # 2. Enter these fields
-        # 3. Click Wizard → Select FA_CS_Wizard_Category
-        # 4. Optionally click "Max 179" if flagged
-        rpa_cols = [
-            "Asset #",
-            "Description",
-            "Date In Service",
-            "Tax Cost",
-            "FA_CS_Wizard_Category",  # Which wizard dropdown to select
-        ]
+    # Select available columns (explanation/audit text is attached on demand)
+    review_source = attach_audit_columns(fa_df)
+    available_review = [c for c in review_cols if c in review_source.columns]
+    review_df = review_source[available_review].copy()
+
+    # Add calculated total deduction column
+    if all(c in review_df.columns for c in ["Tax Sec 179 Expensed", "Bonus Amount"]):
+        review_df["Total Year 1 Deduction"] = (
+            pd.to_numeric(review_df["Tax Sec 179 Expensed"], errors='coerce').fillna(0) +
+            pd.to_numeric(review_df["Bonus Amount"], errors='coerce').fillna(0) +
+            pd.to_numeric(original_tax_cur_depreciation, errors='coerce').fillna(0)
+        )
 
-        available_rpa = [c for c in rpa_cols if c in depreciable_df.columns]
-        rpa_df = depreciable_df[available_rpa].copy()
+    book.add_sheet("Review", review_df, freeze_header=True, auto_filter=True, highlight_status=True)
+
+    # ================================================================
+    # TAB 4: Summary - Totals, verification, sample calculations
+    # ================================================================
+
+    # Calculate summary statistics
+    # CRITICAL FIX: Convert to numeric before summing to avoid UFuncTypeError
+    # Some columns may contain strings (e.g., "" or "N/A") instead of numbers
+    def safe_sum(series_or_default):
+        """Safely sum a series, converting to numeric first to handle mixed types."""
+        if isinstance(series_or_default, pd.Series):
+            return pd.to_numeric(series_or_default, errors='coerce').fillna(0).sum()
+        return 0
+
+    total_sec179 = safe_sum(fa_df.get("Tax Sec 179 Expensed", pd.Series([0])))
+    total_sec179_allowed = safe_sum(fa_df.get("Section 179 Allowed", pd.Series([0])))
+    total_sec179_carryforward = safe_sum(fa_df.get("Section 179 Carryforward", pd.Series([0])))
+    total_bonus = safe_sum(fa_df.get("Bonus Amount", pd.Series([0])))
+    total_macrs = safe_sum(original_tax_cur_depreciation)
+    total_de_minimis = safe_sum(fa_df.get("De Minimis Expensed", pd.Series([0])))
+
+    # Count by priority
+    high_priority = len(fa_df[fa_df.get("ReviewPriority", "") == "High"]) if "ReviewPriority" in fa_df.columns else 0
+    medium_priority = len(fa_df[fa_df.get("ReviewPriority", "") == "Medium"]) if "ReviewPriority" in fa_df.columns else 0
+    low_priority = len(fa_df[fa_df.get("ReviewPriority", "") == "Low"]) if "ReviewPriority" in fa_df.columns else 0
+
+    # Count NBV issues
+    nbv_issues = len(fa_df[fa_df.get("NBV_Reco", "") == "CHECK"]) if "NBV_Reco" in fa_df.columns else 0
+
+    # Count luxury auto adjustments
+    luxury_auto_count = 0
+    if "Auto Limit Notes" in fa_df.columns:
+        luxury_auto_count = len(fa_df[fa_df["Auto Limit Notes"].astype(str).str.contains("§280F", na=False)])
+
+    # Count transaction types
+    total_assets = len(fa_df)
+    current_year_additions = 0
+    existing_assets = 0
+    disposals = 0
+
+    if "Transaction Type" in fa_df.columns:
+        current_year_additions = len(fa_df[fa_df["Transaction Type"].astype(str).str.contains("Current Year", na=False)])
+        existing_assets = len(fa_df[fa_df["Transaction Type"].astype(str).str.contains("Existing", na=False)])
+        disposals = len(fa_df[fa_df["Transaction Type"].astype(str).str.contains("Disposal", na=False)])
+
+    # Create summary dataframe
+    summary_data = [
+        ["", ""],
+        ["FIXED ASSET DEPRECIATION SUMMARY", ""],
+        ["", ""],
+
+        ["SECTION 179 EXPENSING", ""],
+        ["Total Section 179 Elected", f"${total_sec179:,.2f}"],
+        ["Allowed - Current Year", f"${total_sec179_allowed:,.2f}"],
+        ["Carryforward - Next Year", f"${total_sec179_carryforward:,.2f}"],
+        ["", ""],
+
+        ["BONUS DEPRECIATION", ""],
+        ["Total Bonus Depreciation", f"${total_bonus:,.2f}"],
+        ["", ""],
+
+        ["MACRS DEPRECIATION", ""],
+        ["Total MACRS Year 1", f"${total_macrs:,.2f}"],
+        ["", ""],
+
+        ["DE MINIMIS SAFE HARBOR", ""],
+        ["Total De Minimis Expensed", f"${total_de_minimis:,.2f}"],
+        ["", ""],
+
+        ["TOTAL YEAR 1 DEDUCTION", f"${total_sec179_allowed + total_bonus + total_macrs + total_de_minimis:,.2f}"],
+        ["", ""],
+        ["", ""],
+
+        ["CPA REVIEW ITEMS", ""],
+        ["High Priority Assets", str(high_priority)],
+        ["Medium Priority Assets", str(medium_priority)],
+        ["Low Priority Assets", str(low_priority)],
+        ["", ""],
+
+        ["ISSUES REQUIRING ATTENTION", ""],
+        ["NBV Reconciliation Issues", str(nbv_issues)],
+        ["Luxury Auto Limit Adjustments", str(luxury_auto_count)],
+        ["", ""],
+
+        ["ASSET COUNTS", ""],
+        ["Total Assets", str(total_assets)],
+        ["Current Year Additions", str(current_year_additions)],
+        ["Existing Assets", str(existing_assets)],
+        ["Disposals", str(disposals)],
+    ]
 
-        # Add Max_179 flag for RPA (CPA can review and modify before running RPA)
-        # Flag assets that are eligible for 179 (current year additions with cost > 0)
-        if "Tax Sec 179 Expensed" in depreciable_df.columns:
-            rpa_df["Max_179"] = depreciable_df["Tax Sec 179 Expensed"].apply(
-                lambda x: "YES" if pd.to_numeric(x, errors='coerce') and pd.to_numeric(x, errors='coerce') > 0 else ""
-            )
-        else:
-            rpa_df["Max_179"] = ""
-
-        rpa_df.to_excel(writer, sheet_name="RPA_Input", index=False)
-
-        # Format RPA_Input worksheet
-        ws_rpa = writer.sheets["RPA_Input"]
-        ws_rpa.freeze_panes = "A2"
-        if ws_rpa.max_row > 0:
-            ws_rpa.auto_filter.ref = ws_rpa.dimensions
-
-        _apply_professional_formatting(ws_rpa, rpa_df)
-
-        # ================================================================
-        # TAB 3: Review - Items needing CPA attention (combines CPA_Review + Audit)
-        # ================================================================
-        # Key fields for CPA review: priorities, warnings, classification info
-
-        # Add eligibility reason columns for CPA verification
-        def get_179_eligibility(row):
-            """Explain why asset is/isn't eligible for Section 179."""
-            trans_type = str(row.get("Transaction Type", "")).lower()
-            cost = pd.to_numeric(row.get("Tax Cost", 0), errors='coerce') or 0
-            sec179 = pd.to_numeric(row.get("Tax Sec 179 Expensed", 0), errors='coerce') or 0
-
-            if "disposal" in trans_type:
-                return "No - Disposal (not eligible)"
-            if "existing" in trans_type:
-                return "No - Existing asset (must be new acquisition)"
-            if cost <= 0:
-                return "No - Zero/negative cost"
-            if sec179 > 0:
-                return f"Yes - ${sec179:,.0f} elected"
-            # Check if it could have been eligible
-            category = str(row.get("Final Category", "")).lower()
-            if "land" in category or "real property" in category:
-                return "No - Real property (not §179 eligible)"
-            return "Eligible but not elected"
-
-        def get_bonus_eligibility(row):
-            """Explain why asset is/isn't eligible for Bonus depreciation."""
-            trans_type = str(row.get("Transaction Type", "")).lower()
-            cost = pd.to_numeric(row.get("Tax Cost", 0), errors='coerce') or 0
-            bonus = pd.to_numeric(row.get("Bonus Amount", 0), errors='coerce') or 0
-
-            if "disposal" in trans_type:
-                return "No - Disposal"
-            if cost <= 0:
-                return "No - Zero cost"
-            if bonus > 0:
-                return f"Yes - ${bonus:,.0f} (after §179)"
-            # Check why no bonus
-            category = str(row.get("Final Category", "")).lower()
-            if "land" in category:
-                return "No - Land (not depreciable)"
-            if "used" in trans_type.lower():
-                return "Check - Used property (verify eligibility)"
-            return "No bonus applied"
-
-        fa_df["§179_Eligibility"] = fa_df.apply(get_179_eligibility, axis=1)
-        fa_df["Bonus_Eligibility"] = fa_df.apply(get_bonus_eligibility, axis=1)
-
-        review_cols = [
+    # Calculate confidence breakdown percentages
+    grade_a = len(fa_df[fa_df.get("ConfidenceGrade", pd.Series(dtype=str)) == "A"]) if "ConfidenceGrade" in fa_df.columns else 0
+    grade_b = len(fa_df[fa_df.get("ConfidenceGrade", pd.Series(dtype=str)) == "B"]) if "ConfidenceGrade" in fa_df.columns else 0
+    grade_c = len(fa_df[fa_df.get("ConfidenceGrade", pd.Series(dtype=str)) == "C"]) if "ConfidenceGrade" in fa_df.columns else 0
+    grade_d = len(fa_df[fa_df.get("ConfidenceGrade", pd.Series(dtype=str)) == "D"]) if "ConfidenceGrade" in fa_df.columns else 0
+
+    pct_a = (grade_a / total_assets * 100) if total_assets > 0 else 0
+    pct_b = (grade_b / total_assets * 100) if total_assets > 0 else 0
+    pct_c = (grade_c / total_assets * 100) if total_assets > 0 else 0
+    pct_d = (grade_d / total_assets * 100) if total_assets > 0 else 0
+
+    summary_data.extend([
+        ["", ""],
+        ["CLASSIFICATION CONFIDENCE", ""],
+        ["Grade A (High)", f"{grade_a} ({pct_a:.0f}%)"],
+        ["Grade B (Medium)", f"{grade_b} ({pct_b:.0f}%)"],
+        ["Grade C (Low)", f"{grade_c} ({pct_c:.0f}%)"],
+        ["Grade D (Manual Review)", f"{grade_d} ({pct_d:.0f}%)"],
+    ])
+
+    # Add processing info section (always shown)
+    summary_data.extend([
+        ["", ""],
+        ["", ""],
+        ["PROCESSING INFORMATION", ""],
+        ["Tool Version", audit_info.get("tool_version", "1.0.0") if audit_info else "1.0.0"],
+        ["Processing Date", audit_info.get("processing_timestamp", datetime.now().strftime("%Y-%m-%d %H:%M:%S")) if audit_info else datetime.now().strftime("%Y-%m-%d %H:%M:%S")],
+        ["Tax Year", audit_info.get("tax_year", "") if audit_info else ""],
+        ["Strategy", audit_info.get("strategy", "") if audit_info else ""],
+        ["Source File", audit_info.get("source_file", "") if audit_info else ""],
+        ["File Checksum", audit_info.get("source_file_checksum", "") if audit_info else ""],
+    ])
+
+    # Add audit protection information if provided
+    if audit_info:
+        preparer = audit_info.get("preparer_name", "")
+        reviewer = audit_info.get("reviewer_name", "")
+        if preparer or reviewer:
+            summary_data.extend([
+                ["", ""],
+                ["AUDIT PROTECTION DOCUMENTATION", ""],
+                ["Preparer", preparer],
+                ["Firm", audit_info.get("preparer_firm", "")],
+                ["Reviewer", reviewer],
+                ["Preparation Date", audit_info.get("preparation_date", "")],
+            ])
+
+        # Add confirmations if any are set
+        if any([audit_info.get("client_approved"), audit_info.get("reconciled_prior"),
+                audit_info.get("source_docs_on_file"), audit_info.get("reviewed_by_manager")]):
+            summary_data.extend([
+                ["", ""],
+                ["CONFIRMATIONS", ""],
+                ["Client Approved", "Yes" if audit_info.get("client_approved") else "No"],
+                ["Reconciled to Prior Year", "Yes" if audit_info.get("reconciled_prior") else "No"],
+                ["Source Documents on File", "Yes" if audit_info.get("source_docs_on_file") else "No"],
+                ["Manager/Partner Review", "Yes" if audit_info.get("reviewed_by_manager") else "No"],
+            ])
+
+        # Add pre-export checklist if completed
+        if audit_info.get("pre_export_checklist_completed"):
+            checklist_items = audit_info.get("checklist_items", {})
+            summary_data.extend([
+                ["", ""],
+                ["PRE-EXPORT CHECKLIST (Completed)", ""],
+                ["Reviewed Critical Issues", "Yes" if checklist_items.get("reviewed_critical_issues") else "No"],
+                ["Verified Export Totals", "Yes" if checklist_items.get("verified_export_totals") else "No"],
+                ["Noted 179 Carryforward", "Yes" if checklist_items.get("noted_179_carryforward") else "No"],
+                ["Reviewed High Materiality", "Yes" if checklist_items.get("reviewed_high_materiality") else "No"],
+                ["Ready for Approval", "Yes" if checklist_items.get("ready_for_approval") else "No"],
+            ])
+
+    book.add_summary_sheet("Summary", summary_data, widths=(40, 20))
+
+    # ================================================================
+    # TAB 5: De_Minimis - Items expensed under safe harbor (only if any)
+    # ================================================================
+    # De minimis items are expensed immediately (not depreciated)
+    # They should NOT be entered into FA CS
+    # This tab documents them for the tax return deduction
+
+    if len(de_minimis_df) > 0:
+        de_min_cols = [
             "Asset #",
             "Description",
-            "Tax Cost",
+            "Date In Service",
+            "De Minimis Expensed",  # Original cost before zeroing
             "Final Category",
             "Transaction Type",
-            "ReviewPriority",
-            "ConfidenceGrade",
-            "NBV_Reco",
-            "AuditWarnings",
-            "ClassificationExplanation",
-            "Tax Sec 179 Expensed",
-            "§179_Eligibility",
-            "Bonus Amount",
-            "Bonus_Eligibility",
-        ]
-
-        # Select available columns
-        available_review = [c for c in review_cols if c in fa_df.columns]
-        review_df = fa_df[available_review].copy()
-
-        # Add calculated total deduction column
-        if all(c in review_df.columns for c in ["Tax Sec 179 Expensed", "Bonus Amount"]):
-            review_df["Total Year 1 Deduction"] = (
-                pd.to_numeric(review_df["Tax Sec 179 Expensed"], errors='coerce').fillna(0) +
-                pd.to_numeric(review_df["Bonus Amount"], errors='coerce').fillna(0) +
-                pd.to_numeric(original_tax_cur_depreciation, errors='coerce').fillna(0)
-            )
-
-        review_df.to_excel(writer, sheet_name="Review", index=False)
-
-        # Format Review worksheet
-        ws_review = writer.sheets["Review"]
-        ws_review.freeze_panes = "A2"
-        if ws_review.max_row > 0:
-            ws_review.auto_filter.ref = ws_review.dimensions
-
-        _apply_professional_formatting(ws_review, review_df)
-        _apply_conditional_formatting(ws_review, review_df)
-
-        # ================================================================
-        # TAB 4: Summary - Totals, verification, sample calculations
-        # ================================================================
-
-        # Calculate summary statistics
-        # CRITICAL FIX: Convert to numeric before summing to avoid UFuncTypeError
-        # Some columns may contain strings (e.g., "" or "N/A") instead of numbers
-        def safe_sum(series_or_default):
-            """Safely sum a series, converting to numeric first to handle mixed types."""
-            if isinstance(series_or_default, pd.Series):
-                return pd.to_numeric(series_or_default, errors='coerce').fillna(0).sum()
-            return 0
-
-        total_sec179 = safe_sum(fa_df.get("Tax Sec 179 Expensed", pd.Series([0])))
-        total_sec179_allowed = safe_sum(fa_df.get("Section 179 Allowed", pd.Series([0])))
-        total_sec179_carryforward = safe_sum(fa_df.get("Section 179 Carryforward", pd.Series([0])))
-        total_bonus = safe_sum(fa_df.get("Bonus Amount", pd.Series([0])))
-        total_macrs = safe_sum(original_tax_cur_depreciation)
-        total_de_minimis = safe_sum(fa_df.get("De Minimis Expensed", pd.Series([0])))
-
-        # Count by priority
-        high_priority = len(fa_df[fa_df.get("ReviewPriority", "") == "High"]) if "ReviewPriority" in fa_df.columns else 0
-        medium_priority = len(fa_df[fa_df.get("ReviewPriority", "") == "Medium"]) if "ReviewPriority" in fa_df.columns else 0
-        low_priority = len(fa_df[fa_df.get("ReviewPriority", "") == "Low"]) if "ReviewPriority" in fa_df.columns else 0
-
-        # Count NBV issues
-        nbv_issues = len(fa_df[fa_df.get("NBV_Reco", "") == "CHECK"]) if "NBV_Reco" in fa_df.columns else 0
-
-        # Count luxury auto adjustments
-        luxury_auto_count = 0
-        if "Auto Limit Notes" in fa_df.columns:
-            luxury_auto_count = len(fa_df[fa_df["Auto Limit Notes"].astype(str).str.contains("§280F", na=False)])
-
-        # Count transaction types
-        total_assets = len(fa_df)
-        current_year_additions = 0
-        existing_assets = 0
-        disposals = 0
-
-        if "Transaction Type" in fa_df.columns:
-            current_year_additions = len(fa_df[fa_df["Transaction Type"].astype(str).str.contains("Current Year", na=False)])
-            existing_assets = len(fa_df[fa_df["Transaction Type"].astype(str).str.contains("Existing", na=False)])
-            disposals = len(fa_df[fa_df["Transaction Type"].astype(str).str.contains("Disposal", na=False)])
-
-        # Create summary dataframe
-        summary_data = [
-            ["", ""],
-            ["FIXED ASSET DEPRECIATION SUMMARY", ""],
-            ["", ""],
-
-            ["SECTION 179 EXPENSING", ""],
-            ["Total Section 179 Elected", f"${total_sec179:,.2f}"],
-            ["Allowed - Current Year", f"${total_sec179_allowed:,.2f}"],
-            ["Carryforward - Next Year", f"${total_sec179_carryforward:,.2f}"],
-            ["", ""],
-
-            ["BONUS DEPRECIATION", ""],
-            ["Total Bonus Depreciation", f"${total_bonus:,.2f}"],
-            ["", ""],
-
-            ["MACRS DEPRECIATION", ""],
-            ["Total MACRS Year 1", f"${total_macrs:,.2f}"],
-            ["", ""],
-
-            ["DE MINIMIS SAFE HARBOR", ""],
-            ["Total De Minimis Expensed", f"${total_de_minimis:,.2f}"],
-            ["", ""],
-
-            ["TOTAL YEAR 1 DEDUCTION", f"${total_sec179_allowed + total_bonus + total_macrs + total_de_minimis:,.2f}"],
-            ["", ""],
-            ["", ""],
-
-            ["CPA REVIEW ITEMS", ""],
-            ["High Priority Assets", str(high_priority)],
-            ["Medium Priority Assets", str(medium_priority)],
-            ["Low Priority Assets", str(low_priority)],
-            ["", ""],
-
-            ["ISSUES REQUIRING ATTENTION", ""],
-            ["NBV Reconciliation Issues", str(nbv_issues)],
-            ["Luxury Auto Limit Adjustments", str(luxury_auto_count)],
-            ["", ""],
-
-            ["ASSET COUNTS", ""],
-            ["Total Assets", str(total_assets)],
-            ["Current Year Additions", str(current_year_additions)],
-            ["Existing Assets", str(existing_assets)],
-            ["Disposals", str(disposals)],
         ]
+        available_de_min = [c for c in de_min_cols if c in de_minimis_df.columns]
+        de_min_export_df = de_minimis_df[available_de_min].copy()
 
-        # Calculate confidence breakdown percentages
-        grade_a = len(fa_df[fa_df.get("ConfidenceGrade", pd.Series(dtype=str)) == "A"]) if "ConfidenceGrade" in fa_df.columns else 0
-        grade_b = len(fa_df[fa_df.get("ConfidenceGrade", pd.Series(dtype=str)) == "B"]) if "ConfidenceGrade" in fa_df.columns else 0
-        grade_c = len(fa_df[fa_df.get("ConfidenceGrade", pd.Series(dtype=str)) == "C"]) if "ConfidenceGrade" in fa_df.columns else 0
-        grade_d = len(fa_df[fa_df.get("ConfidenceGrade", pd.Series(dtype=str)) == "D"]) if "ConfidenceGrade" in fa_df.columns else 0
-
-        pct_a = (grade_a / total_assets * 100) if total_assets > 0 else 0
-        pct_b = (grade_b / total_assets * 100) if total_assets > 0 else 0
-        pct_c = (grade_c / total_assets * 100) if total_assets > 0 else 0
-        pct_d = (grade_d / total_assets * 100) if total_assets > 0 else 0
-
-        summary_data.extend([
-            ["", ""],
-            ["CLASSIFICATION CONFIDENCE", ""],
-            ["Grade A (High)", f"{grade_a} ({pct_a:.0f}%)"],
-            ["Grade B (Medium)", f"{grade_b} ({pct_b:.0f}%)"],
-            ["Grade C (Low)", f"{grade_c} ({pct_c:.0f}%)"],
-            ["Grade D (Manual Review)", f"{grade_d} ({pct_d:.0f}%)"],
-        ])
-
-        # Add processing info section (always shown)
-        summary_data.extend([
-            ["", ""],
-            ["", ""],
-            ["PROCESSING INFORMATION", ""],
-            ["Tool Version", audit_info.get("tool_version", "1.0.0") if audit_info else "1.0.0"],
-            ["Processing Date", audit_info.get("processing_timestamp", datetime.now().strftime("%Y-%m-%d %H:%M:%S")) if audit_info else datetime.now().strftime("%Y-%m-%d %H:%M:%S")],
-            ["Tax Year", audit_info.get("tax_year", "") if audit_info else ""],
-            ["Strategy", audit_info.get("strategy", "") if audit_info else ""],
-            ["Source File", audit_info.get("source_file", "") if audit_info else ""],
-            ["File Checksum", audit_info.get("source_file_checksum", "") if audit_info else ""],
-        ])
-
-        # Add audit protection information if provided
-        if audit_info:
-            preparer = audit_info.get("preparer_name", "")
-            reviewer = audit_info.get("reviewer_name", "")
-            if preparer or reviewer:
-                summary_data.extend([
-                    ["", ""],
-                    ["AUDIT PROTECTION DOCUMENTATION", ""],
-                    ["Preparer", preparer],
-                    ["Firm", audit_info.get("preparer_firm", "")],
-                    ["Reviewer", reviewer],
-                    ["Preparation Date", audit_info.get("preparation_date", "")],
-                ])
-
-            # Add confirmations if any are set
-            if any([audit_info.get("client_approved"), audit_info.get("reconciled_prior"),
-                    audit_info.get("source_docs_on_file"), audit_info.get("reviewed_by_manager")]):
-                summary_data.extend([
-                    ["", ""],
-                    ["CONFIRMATIONS", ""],
-                    ["Client Approved", "Yes" if audit_info.get("client_approved") else "No"],
-                    ["Reconciled to Prior Year", "Yes" if audit_info.get("reconciled_prior") else "No"],
-                    ["Source Documents on File", "Yes" if audit_info.get("source_docs_on_file") else "No"],
-                    ["Manager/Partner Review", "Yes" if audit_info.get("reviewed_by_manager") else "No"],
-                ])
-
-            # Add pre-export checklist if completed
-            if audit_info.get("pre_export_checklist_completed"):
-                checklist_items = audit_info.get("checklist_items", {})
-                summary_data.extend([
-                    ["", ""],
-                    ["PRE-EXPORT CHECKLIST (Completed)", ""],
-                    ["Reviewed Critical Issues", "Yes" if checklist_items.get("reviewed_critical_issues") else "No"],
-                    ["Verified Export Totals", "Yes" if checklist_items.get("verified_export_totals") else "No"],
-                    ["Noted 179 Carryforward", "Yes" if checklist_items.get("noted_179_carryforward") else "No"],
-                    ["Reviewed High Materiality", "Yes" if checklist_items.get("reviewed_high_materiality") else "No"],
-                    ["Ready for Approval", "Yes" if checklist_items.get("ready_for_approval") else "No"],
-                ])
-
-        summary_df = pd.DataFrame(summary_data, columns=["Category", "Amount"])
-        summary_df.to_excel(writer, sheet_name="Summary", index=False, header=False)
-
-        # Format summary
-        ws_summary = writer.sheets["Summary"]
-        ws_summary.column_dimensions['A'].width = 40
-        ws_summary.column_dimensions['B'].width = 20
-
-        # Bold section headers
-        bold_font = Font(bold=True, size=12)
-        for row_num in range(1, ws_summary.max_row + 1):
-            cell_value = str(ws_summary[f'A{row_num}'].value or "")
-            if cell_value and cell_value.isupper() and not cell_value.startswith(" "):
-                ws_summary[f'A{row_num}'].font = bold_font
-
-        # Highlight total deduction row
-        total_fill = PatternFill(start_color='FFD966', end_color='FFD966', fill_type='solid')
-        for row_num in range(1, ws_summary.max_row + 1):
-            cell_value = str(ws_summary[f'A{row_num}'].value or "")
-            if "TOTAL YEAR 1 DEDUCTION" in cell_value:
-                ws_summary[f'A{row_num}'].fill = total_fill
-                ws_summary[f'B{row_num}'].fill = total_fill
-                ws_summary[f'A{row_num}'].font = Font(bold=True, size=14)
-                ws_summary[f'B{row_num}'].font = Font(bold=True, size=14)
-
-        # ================================================================
-        # TAB 5: De_Minimis - Items expensed under safe harbor (only if any)
-        # ================================================================
-        # De minimis items are expensed immediately (not depreciated)
-        # They should NOT be entered into FA CS
-        # This tab documents them for the tax return deduction
-
-        if len(de_minimis_df) > 0:
-            de_min_cols = [
-                "Asset #",
-                "Description",
-                "Date In Service",
-                "De Minimis Expensed",  # Original cost before zeroing
-                "Final Category",
-                "Transaction Type",
-            ]
-            available_de_min = [c for c in de_min_cols if c in de_minimis_df.columns]
-            de_min_export_df = de_minimis_df[available_de_min].copy()
-
-            # Add note column
-            de_min_export_df["Note"] = "Expensed under de minimis safe harbor - DO NOT enter in FA CS"
+        # Add note column
+        de_min_export_df["Note"] = "Expensed under de minimis safe harbor - DO NOT enter in FA CS"
 
-            de_min_export_df.to_excel(writer, sheet_name="De_Minimis", index=False)
+        book.add_sheet("De_Minimis", de_min_export_df, freeze_header=True, auto_filter=True)
 
-            ws_de_min = writer.sheets["De_Minimis"]
-            ws_de_min.freeze_panes = "A2"
-            if ws_de_min.max_row > 0:
-                ws_de_min.auto_filter.ref = ws_de_min.dimensions
-
-            _apply_professional_formatting(ws_de_min, de_min_export_df)
-
-    output.seek(0)
-    return output.getvalue()
+    return book.save()
 
 
 def export_asset_number_crossref(fa_df: pd.DataFrame) -> bytes:
@@ -2747,49 +3245,6 @@ def export_asset_number_crossref(fa_df: pd.DataFrame) -> bytes:
     return output.getvalue()
 
 
-def build_fa_cs_asset_lookup(fa_cs_export_df: pd.DataFrame) -> Dict[str, int]:
-    """
-    Build lookup table from FA CS export to map Original Asset ID → FA CS Asset #.
-
-    CRITICAL FOR DISPOSALS/TRANSFERS:
-    When processing disposals or transfers, you need to reference the EXISTING
-    FA CS Asset # (not generate a new one). This function creates the mapping.
-
-    Usage:
-        1. Export existing assets from FA CS (or use prior year's export)
-        2. Call this function to build lookup
-        3. Use lookup when processing disposals/transfers
-
-    Args:
-        fa_cs_export_df: DataFrame exported from FA CS or prior year export
-                         Must have "Asset #" and "Original Asset ID" columns
-
-    Returns:
-        Dict mapping Original Asset ID (str) → FA CS Asset # (int)
-
-    Example:
-        lookup = build_fa_cs_asset_lookup(prior_year_export_df)
-        # lookup = {"FA-001": 1, "FA-002": 2, "COMP-100": 3, ...}
-    """
-    lookup = {}
-
-    if "Asset #" not in fa_cs_export_df.columns:
-        raise ValueError("FA CS export must have 'Asset #' column")
-
-    if "Original Asset ID" not in fa_cs_export_df.columns:
-        raise ValueError("FA CS export must have 'Original Asset ID' column")
-
-    for _, row in fa_cs_export_df.iterrows():
-        asset_num = row["Asset #"]
-        original_id = str(row["Original Asset ID"]).strip()
-
-        if original_id and pd.notna(asset_num):
-            # Store as string key → int value
-            lookup[original_id] = int(asset_num)
-
-    return lookup
-
-
 def separate_by_transaction_type(fa_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
     """
     Separate FA CS export into separate DataFrames by transaction type.
@@ -2829,89 +3284,9 @@ def separate_by_transaction_type(fa_df: pd.DataFrame) -> Dict[str, pd.DataFrame]
     return result
 
 
-def match_disposals_to_fa_cs(
-    disposals_df: pd.DataFrame,
-    fa_cs_lookup: Dict[str, int]
-) -> pd.DataFrame:
-    """
-    Match disposal records to their existing FA CS Asset #s.
-
-    CRITICAL: Disposals must reference the ORIGINAL FA CS Asset # to update
-    the correct asset. This function:
-    1. Looks up each disposal's Original Asset ID in the FA CS lookup
-    2. Replaces the generated Asset # with the correct FA CS Asset #
-    3. Flags any disposals that couldn't be matched
-
-    Args:
-        disposals_df: DataFrame of disposal records (from separate_by_transaction_type)
-        fa_cs_lookup: Dict from build_fa_cs_asset_lookup()
-
-    Returns:
-        DataFrame with:
-        - "FA CS Asset #" column (the correct existing Asset #)
-        - "Match Status" column ("Matched", "NOT FOUND", etc.)
-        - Original columns preserved
-    """
-    if disposals_df.empty:
-        return disposals_df
-
-    result_df = disposals_df.copy()
-
-    fa_cs_asset_nums = []
-    match_statuses = []
-
-    for _, row in result_df.iterrows():
-        original_id = str(row.get("Original Asset ID", "")).strip()
-
-        if original_id in fa_cs_lookup:
-            fa_cs_asset_nums.append(fa_cs_lookup[original_id])
-            match_statuses.append("Matched")
-        else:
-            # Try fuzzy matching (case insensitive, strip spaces)
-            found = False
-            for lookup_id, asset_num in fa_cs_lookup.items():
-                if lookup_id.lower().strip() == original_id.lower():
-                    fa_cs_asset_nums.append(asset_num)
-                    match_statuses.append(f"Matched (fuzzy: {lookup_id})")
-                    found = True
-                    break
-
-            if not found:
-                fa_cs_asset_nums.append(None)
-                match_statuses.append(f"NOT FOUND - '{original_id}' not in FA CS")
-
-    result_df["FA CS Asset #"] = fa_cs_asset_nums
-    result_df["Match Status"] = match_statuses
-
-    # Report unmatched
-    unmatched = result_df[result_df["FA CS Asset #"].isna()]
-    if len(unmatched) > 0:
-        print(f"\n⚠️  WARNING: {len(unmatched)} disposal(s) could not be matched to FA CS assets:")
-        for _, row in unmatched.head(5).iterrows():
-            print(f"   - Original ID: {row.get('Original Asset ID', 'N/A')}, "
-                  f"Description: {str(row.get('Description', ''))[:40]}")
-        if len(unmatched) > 5:
-            print(f"   ... and {len(unmatched) - 5} more")
-        print("   FIX: Import FA CS asset list or manually enter Asset #s\n")
-
-    return result_df
-
-
-def match_transfers_to_fa_cs(
-    transfers_df: pd.DataFrame,
-    fa_cs_lookup: Dict[str, int]
-) -> pd.DataFrame:
-    """
-    Match transfer records to their existing FA CS Asset #s.
-
-    Same as match_disposals_to_fa_cs but for transfers.
-    """
-    return match_disposals_to_fa_cs(transfers_df, fa_cs_lookup)
-
-
 def export_separated_fa_cs(
     fa_df: pd.DataFrame,
-    fa_cs_lookup: Optional[Dict[str, int]] = None
+    fa_cs_lookup: Optional[Union[Dict[str, int], pd.DataFrame]] = None
 ) -> bytes:
     """
     Export FA CS data with separate sheets for each transaction type.
@@ -2927,7 +3302,8 @@ def export_separated_fa_cs(
 
     Args:
         fa_df: Full FA CS export DataFrame
-        fa_cs_lookup: Optional lookup from build_fa_cs_asset_lookup()
+        fa_cs_lookup: Optional lookup from build_fa_cs_asset_lookup(), or the
+                      FA CS export DataFrame (also matches by description)
                       Required for matching disposals/transfers
 
     Returns:
@@ -2941,7 +3317,7 @@ def export_separated_fa_cs(
     separated = separate_by_transaction_type(fa_df)
 
     # Match disposals and transfers if lookup provided
-    if fa_cs_lookup:
+    if fa_cs_lookup is not None and len(fa_cs_lookup) > 0:
         if not separated["disposals"].empty:
             separated["disposals"] = match_disposals_to_fa_cs(
                 separated["disposals"], fa_cs_lookup
@@ -3069,6 +3445,58 @@ def export_separated_fa_cs(
     return output.getvalue()
 
 
+# FA CS ASCII import columns (same as Excel export)
+FA_CS_ASCII_COLUMNS = [
+    "Asset #",
+    "Description",
+    "Date In Service",
+    "Tax Cost",
+    "Tax Method",
+    "Tax Life",
+    "Tax Sec 179 Expensed",
+    "Tax Cur Depreciation",
+    "Tax Prior Depreciation",
+    "Book Cost",
+    "Book Method",
+    "Book Life",
+    "MI Cost",
+    "MI Method",
+    "MI Life",
+    "Date Disposed",
+    "Gross Proceeds",
+    "FA_CS_Wizard_Category",  # For UiPath RPA - wizard dropdown selection
+]
+
+
+def _fa_cs_ascii_frame(fa_df: pd.DataFrame) -> pd.DataFrame:
+    """Select the FA CS ASCII import columns without modifying fa_df."""
+    columns = {}
+    for col in FA_CS_ASCII_COLUMNS:
+        if col == "Tax Cur Depreciation":
+            # CRITICAL: Tax Cur Depreciation must be blank for FA CS to calculate
+            columns[col] = ""
+        elif col in fa_df.columns:
+            columns[col] = fa_df[col]
+        elif col in ("Date Disposed", "Gross Proceeds"):
+            columns[col] = ""
+    return pd.DataFrame(columns, index=fa_df.index)
+
+
+def export_fa_ascii_stream(fa_df: pd.DataFrame, delimiter: str = "\t",
+                           chunk_size: int = TEXT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Streaming variant of export_fa_ascii.
+
+    The import columns are selected up front; rows are then formatted a
+    chunk at a time, so the header and first rows can be sent before the
+    rest of the file exists and memory stays flat as the export grows.
+
+    Returns:
+        Iterator of UTF-8 encoded text blocks
+    """
+    return iter_delimited_chunks(_fa_cs_ascii_frame(fa_df), delimiter, chunk_size)
+
+
 def export_fa_ascii(fa_df: pd.DataFrame, delimiter: str = "\t") -> bytes:
     """
     Export Fixed Asset data to ASCII (text) format for FA CS import.
@@ -3088,69 +3516,7 @@ def export_fa_ascii(fa_df: pd.DataFrame, delimiter: str = "\t") -> bytes:
         - Select delimiter type (Tab or Comma)
         - Map columns to FA CS fields
     """
-    import io
-
-    # FA CS Import columns (same as Excel export)
-    fa_cs_cols = [
-        "Asset #",
-        "Description",
-        "Date In Service",
-        "Tax Cost",
-        "Tax Method",
-        "Tax Life",
-        "Tax Sec 179 Expensed",
-        "Tax Cur Depreciation",
-        "Tax Prior Depreciation",
-        "Book Cost",
-        "Book Method",
-        "Book Life",
-        "MI Cost",
-        "MI Method",
-        "MI Life",
-        "Date Disposed",
-        "Gross Proceeds",
-        "FA_CS_Wizard_Category",  # For UiPath RPA - wizard dropdown selection
-    ]
-
-    # Add columns if they don't exist
-    if "Date Disposed" not in fa_df.columns:
-        fa_df["Date Disposed"] = ""
-    if "Gross Proceeds" not in fa_df.columns:
-        fa_df["Gross Proceeds"] = ""
-
-    # CRITICAL: Tax Cur Depreciation must be blank for FA CS to calculate
-    fa_df["Tax Cur Depreciation"] = ""
-
-    # Select only columns that exist
-    available_cols = [c for c in fa_cs_cols if c in fa_df.columns]
-    ascii_df = fa_df[available_cols].copy()
-
-    # Convert to CSV/TSV format
-    output = StringIO()
-
-    # Determine separator name for file extension hint
-    sep_name = "tab" if delimiter == "\t" else "comma"
-
-    # Write header row
-    output.write(delimiter.join(available_cols) + "\n")
-
-    # Write data rows
-    for _, row in ascii_df.iterrows():
-        values = []
-        for col in available_cols:
-            val = row[col]
-            # Handle None/NaN
-            if pd.isna(val):
-                val = ""
-            else:
-                val = str(val)
-            # Quote values containing delimiter or newlines
-            if delimiter in val or "\n" in val or '"' in val:
-                val = '"' + val.replace('"', '""') + '"'
-            values.append(val)
-        output.write(delimiter.join(values) + "\n")
-
-    return output.getvalue().encode('utf-8')
+    return b"".join(export_fa_ascii_stream(fa_df, delimiter))
 
 
 def export_fa_csv(fa_df: pd.DataFrame) -> bytes:
@@ -3163,157 +3529,6 @@ def export_fa_tsv(fa_df: pd.DataFrame) -> bytes:
     return export_fa_ascii(fa_df, delimiter="\t")
 
 
-def _apply_professional_formatting(ws, df):
-    """Apply professional Excel formatting to worksheet."""
-    from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
-
-    # Header row formatting
-    header_font = Font(bold=True, color="FFFFFF", size=11)
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-
-    for cell in ws[1]:
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_alignment
-
-    # Auto-size columns
-    for column in ws.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-
-        for cell in column:
-            try:
-                if cell.value and len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except (TypeError, AttributeError):
-                pass
-
-        adjusted_width = min(max_length + 2, 50)  # Cap at 50
-        ws.column_dimensions[column_letter].width = max(adjusted_width, 12)
-
-    # Apply borders
-    thin_border = Border(
-        left=Side(style='thin', color='CCCCCC'),
-        right=Side(style='thin', color='CCCCCC'),
-        top=Side(style='thin', color='CCCCCC'),
-        bottom=Side(style='thin', color='CCCCCC')
-    )
-
-    for row in ws.iter_rows(min_row=1, max_row=min(ws.max_row, 10000), min_col=1, max_col=ws.max_column):
-        for cell in row:
-            cell.border = thin_border
-
-    # Format currency columns
-    currency_cols = [
-        "Tax Cost", "Depreciable Basis", "Tax Sec 179 Expensed",
-        "Bonus Amount", "Tax Cur Depreciation", "Tax Prior Depreciation",
-        "De Minimis Expensed", "Section 179 Allowed", "Section 179 Carryforward",
-        "Capital Gain", "Capital Loss", "§1245 Recapture (Ordinary Income)",
-        "§1250 Recapture (Ordinary Income)", "Unrecaptured §1250 Gain (25%)",
-        "Total Year 1 Deduction", "MaterialityScore"
-    ]
-
-    for col_name in currency_cols:
-        if col_name in df.columns:
-            col_idx = list(df.columns).index(col_name) + 1
-            col_letter = chr(64 + col_idx) if col_idx <= 26 else chr(64 + col_idx // 26) + chr(64 + col_idx % 26)
-
-            for row in range(2, min(ws.max_row + 1, 10001)):
-                try:
-                    cell = ws[f'{col_letter}{row}']
-                    if col_name == "MaterialityScore":
-                        cell.number_format = '0.00'
-                    else:
-                        cell.number_format = '$#,##0.00'
-                except (KeyError, AttributeError):
-                    pass
-
-    # Format date columns
-    date_cols = ["Date In Service", "Acquisition Date", "Disposal Date"]
-
-    for col_name in date_cols:
-        if col_name in df.columns:
-            col_idx = list(df.columns).index(col_name) + 1
-            col_letter = chr(64 + col_idx) if col_idx <= 26 else chr(64 + col_idx // 26) + chr(64 + col_idx % 26)
-
-            for row in range(2, min(ws.max_row + 1, 10001)):
-                try:
-                    cell = ws[f'{col_letter}{row}']
-                    cell.number_format = 'M/D/YYYY'
-                except (KeyError, AttributeError):
-                    pass
-
-
-def _apply_conditional_formatting(ws, df):
-    """Apply conditional formatting to highlight issues."""
-    from openpyxl.styles import PatternFill
-    from openpyxl.formatting.rule import CellIsRule
-
-    # Red fill for critical issues
-    red_fill = PatternFill(start_color='FFCCCC', end_color='FFCCCC', fill_type='solid')
-
-    # Orange fill for high priority
-    orange_fill = PatternFill(start_color='FFCC99', end_color='FFCC99', fill_type='solid')
-
-    # Yellow fill for medium priority
-    yellow_fill = PatternFill(start_color='FFFFCC', end_color='FFFFCC', fill_type='solid')
-
-    # Green fill for OK status
-    green_fill = PatternFill(start_color='CCFFCC', end_color='CCFFCC', fill_type='solid')
-
-    # Apply to NBV_Reco column
-    if "NBV_Reco" in df.columns:
-        col_idx = list(df.columns).index("NBV_Reco") + 1
-        col_letter = chr(64 + col_idx) if col_idx <= 26 else chr(64 + col_idx // 26) + chr(64 + col_idx % 26)
-
-        # Red for CHECK
-        ws.conditional_formatting.add(
-            f'{col_letter}2:{col_letter}10000',
-            CellIsRule(operator='equal', formula=['"CHECK"'], fill=red_fill)
-        )
-
-        # Green for OK
-        ws.conditional_formatting.add(
-            f'{col_letter}2:{col_letter}10000',
-            CellIsRule(operator='equal', formula=['"OK"'], fill=green_fill)
-        )
-
-    # Apply to ReviewPriority column
-    if "ReviewPriority" in df.columns:
-        col_idx = list(df.columns).index("ReviewPriority") + 1
-        col_letter = chr(64 + col_idx) if col_idx <= 26 else chr(64 + col_idx // 26) + chr(64 + col_idx % 26)
-
-        # Orange for High
-        ws.conditional_formatting.add(
-            f'{col_letter}2:{col_letter}10000',
-            CellIsRule(operator='equal', formula=['"High"'], fill=orange_fill)
-        )
-
-        # Yellow for Medium
-        ws.conditional_formatting.add(
-            f'{col_letter}2:{col_letter}10000',
-            CellIsRule(operator='equal', formula=['"Medium"'], fill=yellow_fill)
-        )
-
-    # Apply to ConfidenceGrade column
-    if "ConfidenceGrade" in df.columns:
-        col_idx = list(df.columns).index("ConfidenceGrade") + 1
-        col_letter = chr(64 + col_idx) if col_idx <= 26 else chr(64 + col_idx // 26) + chr(64 + col_idx % 26)
-
-        # Red for D grade
-        ws.conditional_formatting.add(
-            f'{col_letter}2:{col_letter}10000',
-            CellIsRule(operator='equal', formula=['"D"'], fill=red_fill)
-        )
-
-        # Yellow for C grade
-        ws.conditional_formatting.add(
-            f'{col_letter}2:{col_letter}10000',
-            CellIsRule(operator='equal', formula=['"C"'], fill=yellow_fill)
-        )
-
-
 # ==============================================================================
 # PHASE 4: MULTI-YEAR DEPRECIATION PROJECTION EXPORT
 # ==============================================================================
@@ -9,10 +9,152 @@ Author: Fixed Asset AI Team
 
 from __future__ import annotations
 
+from copy import copy
 from typing import List, Optional
 import pandas as pd
 
 
+# Columns that get each Excel number format
+CURRENCY_COLUMNS = [
+    "Tax Cost", "Depreciable Basis", "Tax Sec 179 Expensed",
+    "Bonus Amount", "Tax Cur Depreciation", "Tax Prior Depreciation",
+    "De Minimis Expensed", "Section 179 Allowed", "Section 179 Carryforward",
+    "Capital Gain", "Capital Loss", "§1245 Recapture (Ordinary Income)",
+    "§1250 Recapture (Ordinary Income)", "Unrecaptured §1250 Gain (25%)",
+    "Total Year 1 Deduction", "Gross Proceeds", "Book Cost", "MI Cost",
+    "NBV", "NBV_Computed",
+]
+DECIMAL_COLUMNS = ["MaterialityScore", "Bonus % Applied"]
+DATE_COLUMNS = ["Date In Service", "Acquisition Date", "Date Disposed", "Disposal Date"]
+
+CURRENCY_FORMAT = '$#,##0.00'
+DECIMAL_FORMAT = '0.00'
+DATE_FORMAT = 'M/D/YYYY'
+
+# Review status highlights: column -> [(cell value, fill color)]
+STATUS_HIGHLIGHTS = {
+    "NBV_Reco": [("CHECK", "FFCCCC"), ("OK", "CCFFCC")],
+    "ReviewPriority": [("High", "FFCC99"), ("Medium", "FFFFCC"), ("Low", "CCFFCC")],
+    "ConfidenceGrade": [("D", "FFCCCC"), ("C", "FFFFCC"), ("A", "CCFFCC")],
+}
+
+# Named styles registered once per workbook
+HEADER_STYLE = "fa_header"
+CELL_STYLE = "fa_cell"
+CURRENCY_STYLE = "fa_currency"
+DECIMAL_STYLE = "fa_decimal"
+DATE_STYLE = "fa_date"
+
+MIN_COLUMN_WIDTH = 12
+MAX_COLUMN_WIDTH = 50
+
+
+def _thin_border():
+    from openpyxl.styles import Border, Side
+
+    side = Side(style='thin', color='CCCCCC')
+    return Border(left=side, right=side, top=side, bottom=side)
+
+
+def named_styles() -> list:
+    """Build the named styles used by professional formatting."""
+    from openpyxl.styles import Font, Alignment, NamedStyle, PatternFill
+
+    header = NamedStyle(name=HEADER_STYLE)
+    header.font = Font(bold=True, color="FFFFFF", size=11)
+    header.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    header.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+    header.border = _thin_border()
+
+    styles = [header]
+    for name, number_format in (
+        (CELL_STYLE, None),
+        (CURRENCY_STYLE, CURRENCY_FORMAT),
+        (DECIMAL_STYLE, DECIMAL_FORMAT),
+        (DATE_STYLE, DATE_FORMAT),
+    ):
+        style = NamedStyle(name=name)
+        style.border = _thin_border()
+        if number_format:
+            style.number_format = number_format
+        styles.append(style)
+    return styles
+
+
+def register_named_styles(wb):
+    """Add the named styles to a workbook (no-op if already registered)."""
+    existing = set(wb.named_styles)
+    for style in named_styles():
+        if style.name not in existing:
+            wb.add_named_style(style)
+
+
+def column_style(column_name: str) -> str:
+    """Return the named style used for a data column."""
+    if column_name in CURRENCY_COLUMNS:
+        return CURRENCY_STYLE
+    if column_name in DECIMAL_COLUMNS:
+        return DECIMAL_STYLE
+    if column_name in DATE_COLUMNS:
+        return DATE_STYLE
+    return CELL_STYLE
+
+
+def column_widths(df: pd.DataFrame, header: bool = True) -> List[int]:
+    """
+    Compute column widths from the longest rendered value per column.
+
+    Longest value + 2, clamped to 12-50, using vectorized string lengths
+    on the DataFrame instead of reading back every worksheet cell.
+
+    Args:
+        df: DataFrame being written
+        header: Whether the column names are written as a header row
+
+    Returns:
+        Width for each column, in column order
+    """
+    widths = []
+    for position, column in enumerate(df.columns):
+        values = df.iloc[:, position]
+        values = values[values.notna()]
+        # Falsy cells (0, "", False) never set the width
+        values = values[values.astype(bool)]
+        longest = int(values.astype(str).str.len().max()) if len(values) else 0
+        if header:
+            longest = max(longest, len(str(column)))
+        widths.append(max(min(longest + 2, MAX_COLUMN_WIDTH), MIN_COLUMN_WIDTH))
+    return widths
+
+
+def add_status_highlights(ws, columns: List[str], last_row: int):
+    """
+    Add STATUS_HIGHLIGHTS conditional formats over rows 2..last_row.
+
+    Args:
+        ws: openpyxl worksheet (regular or write-only)
+        columns: Column names in sheet order
+        last_row: Last data row on the sheet
+    """
+    from openpyxl.styles import PatternFill
+    from openpyxl.formatting.rule import CellIsRule
+    from openpyxl.utils import get_column_letter
+
+    if last_row < 2:
+        return
+    for column, rules in STATUS_HIGHLIGHTS.items():
+        if column not in columns:
+            continue
+        letter = get_column_letter(columns.index(column) + 1)
+        cell_range = f'{letter}2:{letter}{last_row}'
+        for value, color in rules:
+            fill = PatternFill(start_color=color, end_color=color, fill_type='solid')
+            ws.conditional_formatting.add(
+                cell_range,
+                CellIsRule(operator='equal', formula=[f'"{value}"'], fill=fill)
+            )
+
+
 def _apply_professional_formatting(ws, df: pd.DataFrame):
     """
     Apply professional Excel formatting to worksheet.
@@ -23,102 +165,48 @@ def _apply_professional_formatting(ws, df: pd.DataFrame):
     - Cell borders
     - Currency and date formatting
 
+    Styles are resolved once per column: each column's named style is
+    applied to its first data cell and that style is copied down the rest
+    of the column. Widths come from the DataFrame, not the written cells.
+
     Args:
         ws: openpyxl worksheet object
         df: DataFrame used to create the worksheet
     """
-    from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
+    from openpyxl.styles.cell_style import StyleArray
+    from openpyxl.utils import get_column_letter
 
-    # Header row formatting
-    header_font = Font(bold=True, color="FFFFFF", size=11)
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+    register_named_styles(ws.parent)
 
     for cell in ws[1]:
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_alignment
-
-    # Auto-size columns based on content
-    for column in ws.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-
-        for cell in column:
-            try:
-                if cell.value and len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except (TypeError, AttributeError):
-                pass
-
-        adjusted_width = min(max_length + 2, 50)  # Cap at 50 characters
-        ws.column_dimensions[column_letter].width = max(adjusted_width, 12)
-
-    # Apply thin borders to all cells
-    thin_border = Border(
-        left=Side(style='thin', color='CCCCCC'),
-        right=Side(style='thin', color='CCCCCC'),
-        top=Side(style='thin', color='CCCCCC'),
-        bottom=Side(style='thin', color='CCCCCC')
-    )
-
-    # Limit formatting to first 10,000 rows for performance
-    max_rows = min(ws.max_row, 10000)
-
-    for row in ws.iter_rows(min_row=1, max_row=max_rows, min_col=1, max_col=ws.max_column):
-        for cell in row:
-            cell.border = thin_border
-
-    # Format currency columns
-    currency_cols = [
-        "Tax Cost", "Depreciable Basis", "Tax Sec 179 Expensed",
-        "Bonus Amount", "Tax Cur Depreciation", "Tax Prior Depreciation",
-        "De Minimis Expensed", "Section 179 Allowed", "Section 179 Carryforward",
-        "Capital Gain", "Capital Loss", "§1245 Recapture (Ordinary Income)",
-        "§1250 Recapture (Ordinary Income)", "Unrecaptured §1250 Gain (25%)",
-        "Total Year 1 Deduction", "Gross Proceeds", "Book Cost", "MI Cost",
-        "NBV", "NBV_Computed",
-    ]
-
-    _apply_number_format(ws, df, currency_cols, '$#,##0.00')
-
-    # Format percentage columns
-    pct_cols = ["MaterialityScore", "Bonus % Applied"]
-    _apply_number_format(ws, df, pct_cols, '0.00')
-
-    # Format date columns
-    date_cols = ["Date In Service", "Acquisition Date", "Date Disposed", "Disposal Date"]
-    _apply_number_format(ws, df, date_cols, 'M/D/YYYY')
-
-
-def _apply_number_format(ws, df: pd.DataFrame, columns: List[str], format_str: str):
-    """
-    Apply number format to specific columns.
-
-    Args:
-        ws: openpyxl worksheet
-        df: DataFrame with column names
-        columns: List of column names to format
-        format_str: Excel number format string
-    """
-    max_rows = min(ws.max_row + 1, 10001)
-
-    for col_name in columns:
-        if col_name in df.columns:
-            col_idx = list(df.columns).index(col_name) + 1
-
-            # Handle column letters beyond Z (AA, AB, etc.)
-            if col_idx <= 26:
-                col_letter = chr(64 + col_idx)
-            else:
-                col_letter = chr(64 + col_idx // 26) + chr(64 + col_idx % 26)
-
-            for row in range(2, max_rows):
-                try:
-                    cell = ws[f'{col_letter}{row}']
-                    cell.number_format = format_str
-                except (KeyError, AttributeError):
-                    pass
+        cell.style = HEADER_STYLE
+
+    for position, width in enumerate(column_widths(df), start=1):
+        ws.column_dimensions[get_column_letter(position)].width = width
+
+    if ws.max_row < 2:
+        return
+
+    border = _thin_border()
+    for position, column in enumerate(df.columns, start=1):
+        cells = next(ws.iter_cols(min_col=position, max_col=position, min_row=2, max_row=ws.max_row))
+        style_name = column_style(column)
+        first = cells[0]
+        if style_name == CELL_STYLE:
+            # Border only: keep number formats pandas set (e.g. datetimes)
+            first.border = border
+            border_only = StyleArray()
+            border_only.borderId = first._style.borderId
+            for cell in cells[1:]:
+                if cell._style is None:
+                    cell._style = copy(border_only)
+                else:
+                    cell._style.borderId = border_only.borderId
+        else:
+            first.style = style_name
+            template = first._style
+            for cell in cells[1:]:
+                cell._style = copy(template)
 
 
 def _apply_conditional_formatting(ws, df: pd.DataFrame):
@@ -135,69 +223,7 @@ def _apply_conditional_formatting(ws, df: pd.DataFrame):
         ws: openpyxl worksheet
         df: DataFrame with column names
     """
-    from openpyxl.styles import PatternFill
-    from openpyxl.formatting.rule import CellIsRule
-
-    # Define fill colors
-    red_fill = PatternFill(start_color='FFCCCC', end_color='FFCCCC', fill_type='solid')
-    orange_fill = PatternFill(start_color='FFCC99', end_color='FFCC99', fill_type='solid')
-    yellow_fill = PatternFill(start_color='FFFFCC', end_color='FFFFCC', fill_type='solid')
-    green_fill = PatternFill(start_color='CCFFCC', end_color='CCFFCC', fill_type='solid')
-
-    # NBV_Reco column
-    if "NBV_Reco" in df.columns:
-        col_letter = _get_column_letter(df, "NBV_Reco")
-        if col_letter:
-            # Red for CHECK
-            ws.conditional_formatting.add(
-                f'{col_letter}2:{col_letter}10000',
-                CellIsRule(operator='equal', formula=['"CHECK"'], fill=red_fill)
-            )
-            # Green for OK
-            ws.conditional_formatting.add(
-                f'{col_letter}2:{col_letter}10000',
-                CellIsRule(operator='equal', formula=['"OK"'], fill=green_fill)
-            )
-
-    # ReviewPriority column
-    if "ReviewPriority" in df.columns:
-        col_letter = _get_column_letter(df, "ReviewPriority")
-        if col_letter:
-            # Orange for High
-            ws.conditional_formatting.add(
-                f'{col_letter}2:{col_letter}10000',
-                CellIsRule(operator='equal', formula=['"High"'], fill=orange_fill)
-            )
-            # Yellow for Medium
-            ws.conditional_formatting.add(
-                f'{col_letter}2:{col_letter}10000',
-                CellIsRule(operator='equal', formula=['"Medium"'], fill=yellow_fill)
-            )
-            # Green for Low (optional)
-            ws.conditional_formatting.add(
-                f'{col_letter}2:{col_letter}10000',
-                CellIsRule(operator='equal', formula=['"Low"'], fill=green_fill)
-            )
-
-    # ConfidenceGrade column
-    if "ConfidenceGrade" in df.columns:
-        col_letter = _get_column_letter(df, "ConfidenceGrade")
-        if col_letter:
-            # Red for D grade
-            ws.conditional_formatting.add(
-                f'{col_letter}2:{col_letter}10000',
-                CellIsRule(operator='equal', formula=['"D"'], fill=red_fill)
-            )
-            # Yellow for C grade
-            ws.conditional_formatting.add(
-                f'{col_letter}2:{col_letter}10000',
-                CellIsRule(operator='equal', formula=['"C"'], fill=yellow_fill)
-            )
-            # Green for A grade
-            ws.conditional_formatting.add(
-                f'{col_letter}2:{col_letter}10000',
-                CellIsRule(operator='equal', formula=['"A"'], fill=green_fill)
-            )
+    add_status_highlights(ws, list(df.columns), max(ws.max_row, len(df) + 1))
 
 
 def _get_column_letter(df: pd.DataFrame, column_name: str) -> Optional[str]:
@@ -211,15 +237,12 @@ def _get_column_letter(df: pd.DataFrame, column_name: str) -> Optional[str]:
     Returns:
         Column letter (A, B, ..., AA, AB, ...) or None if not found
     """
+    from openpyxl.utils import get_column_letter
+
     if column_name not in df.columns:
         return None
 
-    col_idx = list(df.columns).index(column_name) + 1
-
-    if col_idx <= 26:
-        return chr(64 + col_idx)
-    else:
-        return chr(64 + col_idx // 26) + chr(64 + col_idx % 26)
+    return get_column_letter(list(df.columns).index(column_name) + 1)
 
 
 def format_summary_sheet(ws, summary_df: pd.DataFrame):
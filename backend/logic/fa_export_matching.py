@@ -0,0 +1,369 @@
+"""
+Fixed Asset AI - FA CS Asset Matching Module
+
+Maps disposal and transfer rows to the EXISTING FA CS Asset # they update,
+extracted from fa_export.py.
+
+Matching is a sequence of joins, each run only on the rows the previous
+stages left unmatched:
+1. Exact Original Asset ID
+2. Normalized ID (case, separators, leading zeros; unambiguous IDs only)
+3. Normalized description + in-service date (unambiguous pairs only)
+4. Fuzzy description similarity (rapidfuzz cdist), blocked by category
+
+Stages 3-4 need descriptions, so they only run when the FA CS export
+DataFrame is passed instead of the Asset # dict. An FA CS asset claimed
+by one stage is not offered to later stages.
+
+Author: Fixed Asset AI Team
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    from rapidfuzz import fuzz, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+
+# Minimum token_sort_ratio (0-100) for a fuzzy description match
+FUZZY_MATCH_THRESHOLD = 90
+
+# Score matrix cells computed per cdist batch (uint8 scores: 1 byte each)
+FUZZY_MAX_CELLS = 20_000_000
+
+# Columns used to block fuzzy matching; both sides must have the same one
+CATEGORY_COLUMNS = ("FA_CS_Wizard_Category", "Final Category", "Category")
+
+DATE_COLUMNS = ("Date In Service", "In Service Date")
+
+# str() of missing IDs; never valid lookup keys
+_MISSING_IDS = {"", "nan", "none", "nat"}
+
+
+# ==============================================================================
+# LOOKUP
+# ==============================================================================
+
+def _require_lookup_columns(fa_cs_export_df: pd.DataFrame):
+    if "Asset #" not in fa_cs_export_df.columns:
+        raise ValueError("FA CS export must have 'Asset #' column")
+
+    if "Original Asset ID" not in fa_cs_export_df.columns:
+        raise ValueError("FA CS export must have 'Original Asset ID' column")
+
+
+def build_fa_cs_asset_lookup(fa_cs_export_df: pd.DataFrame) -> Dict[str, int]:
+    """
+    Build lookup table from FA CS export to map Original Asset ID → FA CS Asset #.
+
+    CRITICAL FOR DISPOSALS/TRANSFERS:
+    When processing disposals or transfers, you need to reference the EXISTING
+    FA CS Asset # (not generate a new one). This function creates the mapping.
+
+    Usage:
+        1. Export existing assets from FA CS (or use prior year's export)
+        2. Call this function to build lookup
+        3. Use lookup when processing disposals/transfers
+
+    Args:
+        fa_cs_export_df: DataFrame exported from FA CS or prior year export
+                         Must have "Asset #" and "Original Asset ID" columns
+
+    Returns:
+        Dict mapping Original Asset ID (str) → FA CS Asset # (int)
+
+    Example:
+        lookup = build_fa_cs_asset_lookup(prior_year_export_df)
+        # lookup = {"FA-001": 1, "FA-002": 2, "COMP-100": 3, ...}
+    """
+    _require_lookup_columns(fa_cs_export_df)
+
+    ids = fa_cs_export_df["Original Asset ID"]
+    asset_nums = fa_cs_export_df["Asset #"]
+    keys = ids.astype(str).str.strip()
+    keep = ids.notna() & asset_nums.notna() & ~keys.str.lower().isin(_MISSING_IDS)
+
+    # Later rows win on duplicate IDs, as with one-by-one dict assignment
+    return dict(zip(keys[keep].tolist(), [int(n) for n in asset_nums[keep].tolist()]))
+
+
+# ==============================================================================
+# NORMALIZATION
+# ==============================================================================
+
+def _normalize_ids(ids: pd.Series) -> pd.Series:
+    """
+    Lowercase letter and digit groups, separated by single spaces, with
+    leading zeros dropped from each digit group ("FA-001" → "fa 1").
+
+    Groups stay apart, so IDs that differ only in where their digits split
+    ("FA-1-01" / "FA-10-1", "12-3" / "123") stay different.
+    """
+    text = ids.astype(str).str.lower()
+    groups = text.str.replace(r"(?<=[a-z])(?=\d)|(?<=\d)(?=[a-z])", " ", regex=True)
+    groups = groups.str.replace(r"[^0-9a-z]+", " ", regex=True).str.strip()
+    groups = groups.str.replace(r"(?<!\d)0+(?=\d)", "", regex=True)
+    return groups.where(~text.isin(_MISSING_IDS) & ids.notna() & (groups != ""), None)
+
+
+def _normalize_text(values: pd.Series) -> pd.Series:
+    """Lowercase alphanumeric words separated by single spaces."""
+    text = values.fillna("").astype(str).str.lower()
+    return text.str.replace(r"[^0-9a-z]+", " ", regex=True).str.strip()
+
+
+def _normalize_dates(values: pd.Series) -> pd.Series:
+    """Calendar date as "YYYY-MM-DD" (None if unparseable)."""
+    dates = pd.to_datetime(values, errors="coerce", format="mixed")
+    return dates.dt.strftime("%Y-%m-%d").where(dates.notna(), None)
+
+
+def _first_column(df: pd.DataFrame, candidates: Sequence[str]) -> Optional[str]:
+    return next((c for c in candidates if c in df.columns), None)
+
+
+def _reference_frame(fa_cs_lookup: Union[Dict[str, int], pd.DataFrame]) -> pd.DataFrame:
+    """
+    FA CS assets as one row each: id, asset_num, and (from a DataFrame)
+    desc, date and category for the description stages.
+    """
+    if not isinstance(fa_cs_lookup, pd.DataFrame):
+        return pd.DataFrame({
+            "id": list(fa_cs_lookup.keys()),
+            "asset_num": list(fa_cs_lookup.values()),
+        })
+
+    _require_lookup_columns(fa_cs_lookup)
+    asset_nums = pd.to_numeric(fa_cs_lookup["Asset #"], errors="coerce")
+    ids = fa_cs_lookup["Original Asset ID"]
+    ref = pd.DataFrame({
+        "id": ids.astype(str).str.strip().where(ids.notna(), ""),
+        "asset_num": asset_nums,
+    })
+    if "Description" in fa_cs_lookup.columns:
+        ref["desc"] = _normalize_text(fa_cs_lookup["Description"])
+    date_col = _first_column(fa_cs_lookup, DATE_COLUMNS)
+    if date_col:
+        ref["date"] = _normalize_dates(fa_cs_lookup[date_col])
+    category_col = _first_column(fa_cs_lookup, CATEGORY_COLUMNS)
+    if category_col:
+        ref["category"] = fa_cs_lookup[category_col].fillna("").astype(str)
+
+    ref = ref[ref["asset_num"].notna()].reset_index(drop=True)
+    ref["asset_num"] = ref["asset_num"].astype("int64")
+    return ref
+
+
+# ==============================================================================
+# MATCHING
+# ==============================================================================
+
+def _unique_key_join(query_keys: pd.Series, ref_keys: pd.Series) -> pd.Series:
+    """
+    Join query rows to reference rows on a key, keeping only keys that
+    occur exactly once on each side.
+
+    Returns:
+        Reference row position for each query row (index of query_keys),
+        for matched rows only
+    """
+    query_keys = query_keys.dropna()
+    ref_keys = ref_keys.dropna()
+    query_keys = query_keys[~query_keys.duplicated(keep=False)]
+    ref_keys = ref_keys[~ref_keys.duplicated(keep=False)]
+    ref_positions = pd.Series(ref_keys.index, index=ref_keys.to_numpy())
+    return query_keys.map(ref_positions).dropna().astype("int64")
+
+
+def _fuzzy_join(queries: pd.Series, choices: pd.Series, threshold: float) -> pd.DataFrame:
+    """
+    Best description match per query via batched rapidfuzz cdist.
+
+    Queries whose best score is shared by several reference rows are left
+    unmatched, and each reference row goes to at most one query (the
+    highest scoring).
+
+    Returns:
+        DataFrame indexed like queries with "ref" (reference position) and
+        "score" columns, for matched rows only
+    """
+    queries = queries[queries != ""]
+    choices = choices[choices != ""]
+    if queries.empty or choices.empty:
+        return pd.DataFrame({"ref": [], "score": []}, dtype="int64")
+
+    choice_list = choices.tolist()
+    batch_size = max(1, FUZZY_MAX_CELLS // len(choice_list))
+    best_pos = np.empty(len(queries), dtype=np.int64)
+    best_score = np.empty(len(queries), dtype=np.int64)
+    query_list = queries.tolist()
+
+    for start in range(0, len(query_list), batch_size):
+        scores = process.cdist(
+            query_list[start:start + batch_size], choice_list,
+            scorer=fuzz.token_sort_ratio, processor=None,
+            score_cutoff=threshold, dtype=np.uint8, workers=-1,
+        )
+        positions = scores.argmax(axis=1)
+        top = scores[np.arange(len(positions)), positions]
+        # A best score shared by several FA CS assets is ambiguous: don't guess
+        tied = (scores == top[:, None]).sum(axis=1) > 1
+        best_pos[start:start + len(positions)] = positions
+        best_score[start:start + len(positions)] = np.where(tied, 0, top)
+
+    found = pd.DataFrame({
+        "ref": choices.index.to_numpy()[best_pos],
+        "score": best_score,
+    }, index=queries.index)
+    found = found[found["score"] >= threshold]
+    found = found.sort_values("score", ascending=False, kind="stable")
+    return found[~found["ref"].duplicated(keep="first")]
+
+
+def match_disposals_to_fa_cs(
+    disposals_df: pd.DataFrame,
+    fa_cs_lookup: Union[Dict[str, int], pd.DataFrame],
+    fuzzy_threshold: float = FUZZY_MATCH_THRESHOLD,
+) -> pd.DataFrame:
+    """
+    Match disposal records to their existing FA CS Asset #s.
+
+    CRITICAL: Disposals must reference the ORIGINAL FA CS Asset # to update
+    the correct asset. This function:
+    1. Joins each disposal's Original Asset ID to the FA CS assets (exact,
+       then normalized)
+    2. With an FA CS export DataFrame, matches the rest on description +
+       in-service date, then by fuzzy description within the same category
+    3. Replaces the generated Asset # with the correct FA CS Asset #
+    4. Flags any disposals that couldn't be matched
+
+    Args:
+        disposals_df: DataFrame of disposal records (from separate_by_transaction_type)
+        fa_cs_lookup: Dict from build_fa_cs_asset_lookup(), or the FA CS
+                      export DataFrame itself (enables description matching)
+        fuzzy_threshold: Minimum description similarity (0-100) for stage 4
+
+    Returns:
+        DataFrame with:
+        - "FA CS Asset #" column (the correct existing Asset #)
+        - "Match Status" column ("Matched", "NOT FOUND", etc.)
+        - Original columns preserved
+    """
+    if disposals_df.empty:
+        return disposals_df
+
+    result_df = disposals_df.copy()
+    ref = _reference_frame(fa_cs_lookup)
+    n = len(result_df)
+
+    if "Original Asset ID" in result_df.columns:
+        raw_ids = result_df["Original Asset ID"]
+        original_ids = pd.Series(raw_ids.astype(str).str.strip().to_numpy())
+        query_norm_ids = _normalize_ids(pd.Series(raw_ids.to_numpy()))
+    else:
+        original_ids = pd.Series([""] * n)
+        query_norm_ids = pd.Series([None] * n, dtype=object)
+
+    asset_nums = np.full(n, None, dtype=object)
+    statuses = np.full(n, None, dtype=object)
+    matched = np.zeros(n, dtype=bool)
+    claimed = np.zeros(len(ref), dtype=bool)
+    ref_ids = ref["id"].to_numpy()
+    ref_nums = ref["asset_num"].to_numpy()
+    # Shown in Match Status: the FA CS row's ID, or its Asset # if it has none
+    ref_labels = [i if i else f"Asset #{num}" for i, num in zip(ref_ids, ref_nums)]
+
+    def assign(positions: pd.Series, labels):
+        rows = positions.index.to_numpy()
+        refs = positions.to_numpy()
+        asset_nums[rows] = [int(ref_nums[r]) for r in refs]
+        statuses[rows] = list(labels)
+        matched[rows] = True
+        claimed[refs] = True
+
+    # Stage 1: exact Original Asset ID (last FA CS row wins, as in the lookup dict)
+    exact_ref = pd.Series(np.arange(len(ref)), index=ref_ids)
+    exact_ref = exact_ref[~exact_ref.index.duplicated(keep="last")
+                          & ~exact_ref.index.str.lower().isin(_MISSING_IDS)]
+    hits = original_ids.map(exact_ref).dropna().astype("int64")
+    assign(hits, ["Matched"] * len(hits))
+
+    # Stage 2: normalized ID, only where it is unique on both sides (an FA CS
+    # ID that collides with another after normalizing is ambiguous even if
+    # the other was matched exactly)
+    if not matched.all():
+        ref_norm = _normalize_ids(ref["id"]).dropna()
+        ref_norm = ref_norm[~ref_norm.duplicated(keep=False)]
+        ref_norm = ref_norm[~claimed[ref_norm.index.to_numpy()]]
+        hits = _unique_key_join(query_norm_ids[~matched], ref_norm)
+        assign(hits, [f"Matched (normalized ID: {ref_labels[r]})" for r in hits])
+
+    has_desc = "desc" in ref.columns and "Description" in result_df.columns
+    if has_desc and not matched.all():
+        query_desc = pd.Series(_normalize_text(result_df["Description"]).to_numpy())
+
+        # Stage 3: description + in-service date
+        query_date_col = _first_column(result_df, DATE_COLUMNS)
+        if "date" in ref.columns and query_date_col:
+            query_dates = pd.Series(_normalize_dates(result_df[query_date_col]).to_numpy())
+            query_keys = (query_desc + "|" + query_dates)[~matched & (query_desc != "").to_numpy()]
+            ref_keys = (ref["desc"] + "|" + ref["date"])[~claimed & (ref["desc"] != "").to_numpy()]
+            hits = _unique_key_join(query_keys, ref_keys)
+            assign(hits, [f"Matched (description + date: {ref_labels[r]})" for r in hits])
+
+        # Stage 4: fuzzy description, blocked by category
+        if RAPIDFUZZ_AVAILABLE and not matched.all():
+            category_col = None
+            if "category" in ref.columns:
+                category_col = _first_column(fa_cs_lookup, CATEGORY_COLUMNS)
+            if category_col and category_col in result_df.columns:
+                query_blocks = pd.Series(result_df[category_col].fillna("").astype(str).to_numpy())
+                ref_blocks = ref["category"]
+            else:
+                query_blocks = pd.Series([""] * n)
+                ref_blocks = pd.Series([""] * len(ref))
+
+            pending = pd.Series(~matched)
+            for block, query_idx in query_blocks[pending].groupby(query_blocks[pending]).groups.items():
+                choice_mask = (ref_blocks == block).to_numpy() & ~claimed
+                found = _fuzzy_join(query_desc[query_idx], ref["desc"][choice_mask], fuzzy_threshold)
+                assign(found["ref"], [f"Matched (fuzzy {score}%: {ref_labels[r]})"
+                                      for r, score in zip(found["ref"], found["score"])])
+
+    for row in np.flatnonzero(~matched):
+        statuses[row] = f"NOT FOUND - '{original_ids[row]}' not in FA CS"
+
+    result_df["FA CS Asset #"] = asset_nums.tolist()
+    result_df["Match Status"] = statuses.tolist()
+
+    # Report unmatched
+    unmatched = result_df[result_df["FA CS Asset #"].isna()]
+    if len(unmatched) > 0:
+        print(f"\n⚠️  WARNING: {len(unmatched)} disposal(s) could not be matched to FA CS assets:")
+        for _, row in unmatched.head(5).iterrows():
+            print(f"   - Original ID: {row.get('Original Asset ID', 'N/A')}, "
+                  f"Description: {str(row.get('Description', ''))[:40]}")
+        if len(unmatched) > 5:
+            print(f"   ... and {len(unmatched) - 5} more")
+        print("   FIX: Import FA CS asset list or manually enter Asset #s\n")
+
+    return result_df
+
+
+def match_transfers_to_fa_cs(
+    transfers_df: pd.DataFrame,
+    fa_cs_lookup: Union[Dict[str, int], pd.DataFrame]
+) -> pd.DataFrame:
+    """
+    Match transfer records to their existing FA CS Asset #s.
+
+    Same as match_disposals_to_fa_cs but for transfers.
+    """
+    return match_disposals_to_fa_cs(transfers_df, fa_cs_lookup)
@@ -0,0 +1,281 @@
+"""
+Fixed Asset AI - Streaming Excel Writer
+
+Constant-memory workbook writer for large exports. Rows are serialized
+as they are appended (openpyxl write-only mode) and the finished file is
+spooled to disk once it outgrows SPOOL_MAX_SIZE, so peak memory does not
+grow with the number of assets.
+
+Styles come from fa_export_formatters: they are registered once per
+workbook as named styles and assigned per column as cells are created.
+
+Delimited text exports (CSV/TSV/ASCII) are produced the same way: each
+chunk of rows is formatted column-wise with pandas string operations and
+yielded as bytes, so the first bytes go out before the last row is read.
+
+Author: Fixed Asset AI Team
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import date, datetime, time, timedelta
+from tempfile import SpooledTemporaryFile
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill
+from openpyxl.utils import get_column_letter
+
+from .fa_export_formatters import (
+    DATE_STYLE,
+    HEADER_STYLE,
+    add_status_highlights,
+    column_style,
+    column_widths,
+    register_named_styles,
+)
+
+
+# Workbooks smaller than this stay in memory; larger ones roll over to disk
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# Rows converted from the DataFrame per batch while writing a sheet
+ROW_CHUNK_SIZE = 5000
+
+# Bytes per chunk when streaming the finished file to a client
+STREAM_CHUNK_SIZE = 64 * 1024
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Rows formatted per yielded block in delimited text exports
+TEXT_CHUNK_SIZE = 10000
+
+# Values that make openpyxl pick a date number format on assignment
+_TIME_TYPES = (datetime, date, time, timedelta)
+
+
+def _iter_value_rows(df: pd.DataFrame, chunk_size: int) -> Iterator[tuple]:
+    """Yield row tuples with missing values as None, one chunk at a time."""
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size]
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        yield from chunk.itertuples(index=False, name=None)
+
+
+class StreamingWorkbook:
+    """
+    Write-only workbook that streams sheets to a spooled temp file.
+
+    Usage:
+        book = StreamingWorkbook()
+        book.add_sheet("FA_CS_Data", fa_data_df, freeze_header=True, auto_filter=True)
+        book.add_summary_sheet("Summary", summary_rows)
+        spooled = book.save()
+    """
+
+    def __init__(self, spool_max_size: int = SPOOL_MAX_SIZE):
+        self.spool_max_size = spool_max_size
+        self._wb = Workbook(write_only=True)
+        register_named_styles(self._wb)
+
+    def add_sheet(
+        self,
+        title: str,
+        df: pd.DataFrame,
+        header: bool = True,
+        formatted: bool = True,
+        freeze_header: bool = False,
+        auto_filter: bool = False,
+        highlight_status: bool = False,
+        footer: Optional[Dict[str, object]] = None,
+    ):
+        """
+        Append a DataFrame as a new sheet.
+
+        Args:
+            title: Sheet name
+            df: Data to write (index is not written)
+            header: Write column names as the first row
+            formatted: Apply header/border/number styles and column widths
+            freeze_header: Freeze the header row
+            auto_filter: Add an auto filter over the written range
+            highlight_status: Add STATUS_HIGHLIGHTS conditional formats
+            footer: Optional {column: value} totals row written directly
+                under the data; the first column's value is the bold label
+
+        Returns:
+            The write-only worksheet
+        """
+        ws = self._wb.create_sheet(title=title)
+        columns = list(df.columns)
+        n_rows = len(df) + (1 if header else 0)
+
+        # Sheet-level settings must be in place before the first row is written
+        if formatted and columns:
+            for position, width in enumerate(column_widths(df, header=header), start=1):
+                ws.column_dimensions[get_column_letter(position)].width = width
+        if freeze_header and header:
+            ws.freeze_panes = "A2"
+        if auto_filter and columns and n_rows > 0:
+            ws.auto_filter.ref = f"A1:{get_column_letter(len(columns))}{max(n_rows, 1)}"
+        if highlight_status and formatted and len(df) > 0:
+            add_status_highlights(ws, columns, n_rows)
+
+        if header:
+            ws.append([self._cell(ws, column, HEADER_STYLE if formatted else None)
+                       for column in columns])
+
+        if formatted:
+            self._append_styled_rows(ws, df, [column_style(c) for c in columns])
+        else:
+            for values in _iter_value_rows(df, ROW_CHUNK_SIZE):
+                ws.append(values)
+
+        if footer:
+            self._append_footer(ws, columns, footer)
+
+        return ws
+
+    def add_summary_sheet(self, title: str, rows: Sequence[Sequence[object]], widths=(40, 20)):
+        """
+        Append a two-column label/value summary sheet without a header row.
+
+        All-caps labels are bold section headers and the TOTAL YEAR 1
+        DEDUCTION row is highlighted, as in format_summary_sheet.
+        """
+        ws = self._wb.create_sheet(title=title)
+        for position, width in enumerate(widths, start=1):
+            ws.column_dimensions[get_column_letter(position)].width = width
+
+        section_font = Font(bold=True, size=12)
+        total_font = Font(bold=True, size=14)
+        total_fill = PatternFill(start_color='FFD966', end_color='FFD966', fill_type='solid')
+
+        for row in rows:
+            label = str(row[0] if row[0] is not None else "")
+            cells = []
+            for position, value in enumerate(row):
+                cell = WriteOnlyCell(ws, value=value)
+                if "TOTAL YEAR 1 DEDUCTION" in label:
+                    cell.font = total_font
+                    cell.fill = total_fill
+                elif position == 0 and label and label.isupper() and not label.startswith(" "):
+                    cell.font = section_font
+                cells.append(cell)
+            ws.append(cells)
+        return ws
+
+    def save(self) -> SpooledTemporaryFile:
+        """Serialize the workbook and return the spooled file rewound to 0."""
+        output = SpooledTemporaryFile(max_size=self.spool_max_size, suffix=".xlsx")
+        self._wb.save(output)
+        output.seek(0)
+        return output
+
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _cell(ws, value, style: Optional[str]) -> WriteOnlyCell:
+        cell = WriteOnlyCell(ws)
+        if style:
+            # Style first so a date value keeps the column's number format
+            cell.style = style
+        cell.value = value
+        return cell
+
+    def _append_styled_rows(self, ws, df: pd.DataFrame, styles: List[str]):
+        # One reusable cell per column: write-only sheets serialize each row
+        # inside append(), so the cells can be refilled for the next row.
+        prototypes = [self._cell(ws, None, style) for style in styles]
+        for values in _iter_value_rows(df, ROW_CHUNK_SIZE):
+            cells = []
+            for prototype, style, value in zip(prototypes, styles, values):
+                if isinstance(value, _TIME_TYPES) and style != DATE_STYLE:
+                    # Date assignment rewrites number_format; keep it off the prototype
+                    cells.append(self._cell(ws, value, style))
+                else:
+                    prototype.value = value
+                    cells.append(prototype)
+            ws.append(cells)
+
+    def _append_footer(self, ws, columns: List[str], footer: Dict[str, object]):
+        # Totals sit directly under the data; only the label is styled
+        cells = [footer.get(column) for column in columns]
+        if cells:
+            label = WriteOnlyCell(ws, value=cells[0])
+            label.font = Font(bold=True)
+            cells[0] = label
+        ws.append(cells)
+
+
+def _text_column(values: pd.Series, quote_pattern: str) -> pd.Series:
+    """
+    Render one column as delimited-text fields.
+
+    Matches str() of each value: missing values become "", datetimes
+    print as "YYYY-MM-DD HH:MM:SS", and fields containing the delimiter,
+    a newline or a quote are quoted with embedded quotes doubled.
+    """
+    missing = values.isna()
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        text = values.dt.strftime("%Y-%m-%d %H:%M:%S")
+    else:
+        text = values.astype(object).astype(str)
+    text = text.where(~missing, "")
+
+    needs_quotes = text.str.contains(quote_pattern, regex=True)
+    if needs_quotes.any():
+        quoted = '"' + text[needs_quotes].str.replace('"', '""', regex=False) + '"'
+        text = text.where(~needs_quotes, quoted)
+    return text
+
+
+def iter_delimited_chunks(
+    df: pd.DataFrame,
+    delimiter: str = "\t",
+    chunk_size: int = TEXT_CHUNK_SIZE,
+    encoding: str = "utf-8",
+) -> Iterator[bytes]:
+    """
+    Yield a DataFrame as delimited text: the header line, then one block
+    of lines per chunk of rows.
+
+    Args:
+        df: Data to write (index is not written)
+        delimiter: Field separator (tab or comma)
+        chunk_size: Rows formatted per yielded block
+        encoding: Output encoding
+
+    Yields:
+        Encoded text blocks, each ending in a newline
+    """
+    yield (delimiter.join(str(c) for c in df.columns) + "\n").encode(encoding)
+    if df.shape[1] == 0:
+        return
+
+    quote_pattern = "|".join(re.escape(c) for c in (delimiter, "\n", '"'))
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size]
+        fields = [_text_column(chunk.iloc[:, i], quote_pattern) for i in range(chunk.shape[1])]
+        lines = fields[0].str.cat(fields[1:], sep=delimiter) if len(fields) > 1 else fields[0]
+        yield ("\n".join(lines.tolist()) + "\n").encode(encoding)
+
+
+def iter_file_chunks(fileobj, chunk_size: int = STREAM_CHUNK_SIZE, close: bool = True) -> Iterator[bytes]:
+    """
+    Yield a file's contents in fixed-size chunks (for StreamingResponse).
+
+    The file is closed when iteration ends or the consumer disconnects.
+    """
+    try:
+        while True:
+            chunk = fileobj.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        if close:
+            fileobj.close()
@@ -53,6 +53,44 @@ HEAVY_SUV_KEYWORDS = [
 ]
 
 
+# Vehicle types exempt from §280F (not personal-use vehicles)
+EXEMPT_VEHICLE_KEYWORDS = [
+    "ambulance", "hearse", "taxi", "limousine", "limo",
+    "bus", "modified", "wheelchair", "handicap",
+]
+
+
+def _keyword_pattern(keywords) -> re.Pattern:
+    """Compile keywords (matched literally) into one alternation regex."""
+    return re.compile("|".join(re.escape(kw) for kw in keywords))
+
+
+# Compiled once; shared by the row checks and the column-wide masks
+_PASSENGER_AUTO_RE = _keyword_pattern(PASSENGER_AUTO_KEYWORDS)
+_HEAVY_VEHICLE_RE = _keyword_pattern(HEAVY_VEHICLE_KEYWORDS)
+_HEAVY_SUV_RE = _keyword_pattern(HEAVY_SUV_KEYWORDS)
+_ANY_VEHICLE_RE = _keyword_pattern(PASSENGER_AUTO_KEYWORDS + HEAVY_SUV_KEYWORDS)
+_EXEMPT_VEHICLE_RE = _keyword_pattern(EXEMPT_VEHICLE_KEYWORDS)
+
+
+def _vehicle_text(row) -> Tuple[str, str]:
+    """Lower-cased (category, "category description") for keyword checks."""
+    category = str(row.get("Final Category", "")).lower()
+    description = str(row.get("Description", "")).lower()
+    return category, f"{category} {description}"
+
+
+def _vehicle_text_columns(df: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+    """Column-wise _vehicle_text."""
+    def text(col):
+        if col not in df.columns:
+            return pd.Series("", index=df.index, dtype=object)
+        return df[col].astype(str).str.lower()
+
+    category = text("Final Category")
+    return category, category + " " + text("Description")
+
+
 def _is_passenger_auto(row) -> bool:
     """
     Determine if asset is a passenger automobile subject to IRC §280F limits.
@@ -74,26 +112,16 @@ def _is_passenger_auto(row) -> bool:
     Returns:
         True if subject to §280F luxury auto limits
     """
-    category = str(row.get("Final Category", "")).lower()
-    description = str(row.get("Description", "")).lower()
-    combined = f"{category} {description}"
+    category, combined = _vehicle_text(row)
 
     # Check if explicitly a vehicle category
     if "vehicle" not in category and "auto" not in category:
         # Check description for vehicle keywords
-        if not any(kw in combined for kw in PASSENGER_AUTO_KEYWORDS):
+        if not _PASSENGER_AUTO_RE.search(combined):
             return False
 
-    # Check for heavy vehicle exclusion
-    if any(kw in combined for kw in HEAVY_VEHICLE_KEYWORDS):
-        return False
-
-    # Check for exempt vehicle types
-    exempt_keywords = [
-        "ambulance", "hearse", "taxi", "limousine", "limo",
-        "bus", "modified", "wheelchair", "handicap",
-    ]
-    if any(kw in combined for kw in exempt_keywords):
+    # Check for heavy vehicle exclusion and exempt vehicle types
+    if _HEAVY_VEHICLE_RE.search(combined) or _EXEMPT_VEHICLE_RE.search(combined):
         return False
 
     return True
@@ -114,18 +142,14 @@ def _is_heavy_suv(row) -> bool:
     Returns:
         True if heavy SUV subject to §179(b)(5) limit
     """
-    category = str(row.get("Final Category", "")).lower()
-    description = str(row.get("Description", "")).lower()
-    combined = f"{category} {description}"
+    category, combined = _vehicle_text(row)
 
     # Must be a vehicle
-    if "vehicle" not in category and not any(
-        kw in combined for kw in PASSENGER_AUTO_KEYWORDS + HEAVY_SUV_KEYWORDS
-    ):
+    if "vehicle" not in category and not _ANY_VEHICLE_RE.search(combined):
         return False
 
     # Check for heavy SUV indicators
-    return any(kw in combined for kw in HEAVY_SUV_KEYWORDS)
+    return bool(_HEAVY_SUV_RE.search(combined))
 
 
 def _is_heavy_truck(row) -> bool:
@@ -143,12 +167,38 @@ def _is_heavy_truck(row) -> bool:
     Returns:
         True if heavy truck with no special limits
     """
-    category = str(row.get("Final Category", "")).lower()
-    description = str(row.get("Description", "")).lower()
-    combined = f"{category} {description}"
+    _, combined = _vehicle_text(row)
 
     # Check for heavy duty truck indicators
-    return any(kw in combined for kw in HEAVY_VEHICLE_KEYWORDS)
+    return bool(_HEAVY_VEHICLE_RE.search(combined))
+
+
+def _passenger_auto_mask(df: pd.DataFrame) -> pd.Series:
+    """Vectorized _is_passenger_auto: one regex pass per column."""
+    category, combined = _vehicle_text_columns(df)
+    is_vehicle = (
+        category.str.contains("vehicle", regex=False)
+        | category.str.contains("auto", regex=False)
+        | combined.str.contains(_PASSENGER_AUTO_RE)
+    )
+    return (
+        is_vehicle
+        & ~combined.str.contains(_HEAVY_VEHICLE_RE)
+        & ~combined.str.contains(_EXEMPT_VEHICLE_RE)
+    )
+
+
+def _heavy_suv_mask(df: pd.DataFrame) -> pd.Series:
+    """Vectorized _is_heavy_suv."""
+    category, combined = _vehicle_text_columns(df)
+    is_vehicle = category.str.contains("vehicle", regex=False) | combined.str.contains(_ANY_VEHICLE_RE)
+    return is_vehicle & combined.str.contains(_HEAVY_SUV_RE)
+
+
+def _heavy_truck_mask(df: pd.DataFrame) -> pd.Series:
+    """Vectorized _is_heavy_truck."""
+    _, combined = _vehicle_text_columns(df)
+    return combined.str.contains(_HEAVY_VEHICLE_RE)
 
 
 # ==============================================================================
@@ -3,6 +3,7 @@ File Cleanup Utility for FA CS Automator
 
 Manages cleanup of temporary and export files:
 - Removes old export files from bot_handoff
+- Evicts the export artifact cache (age and size bound)
 - Cleans up temporary upload files
 - Monitors disk usage
 - Prevents unbounded file growth
@@ -256,6 +257,47 @@ class FileCleanupManager:
             dry_run=dry_run
         )
 
+    def cleanup_export_cache(self, dry_run: bool = False) -> CleanupStats:
+        """
+        Evict expired and over-budget export cache artifacts.
+
+        Empties the cache entirely when disk usage is critical. Hand-off
+        files linked from the cache are unaffected (they are separate links).
+        """
+        from .export_cache import get_export_cache
+
+        stats = CleanupStats()
+        start_time = datetime.now()
+        cache = get_export_cache()
+        max_bytes = 0 if self.get_disk_usage().is_critical else None
+
+        stats.files_deleted, stats.bytes_freed = cache.evict(
+            max_bytes=max_bytes, dry_run=dry_run, is_active=self._is_file_active
+        )
+        stats.directories_cleaned.append(cache.directory)
+        stats.duration_seconds = (datetime.now() - start_time).total_seconds()
+        return stats
+
+    def cleanup_upload_cache(self, dry_run: bool = False) -> CleanupStats:
+        """
+        Evict expired and over-budget upload cache entries.
+
+        Empties the cache entirely when disk usage is critical.
+        """
+        from .upload_cache import get_upload_cache
+
+        stats = CleanupStats()
+        start_time = datetime.now()
+        cache = get_upload_cache()
+        max_bytes = 0 if self.get_disk_usage().is_critical else None
+
+        stats.files_deleted, stats.bytes_freed = cache.evict(
+            max_bytes=max_bytes, dry_run=dry_run, is_active=self._is_file_active
+        )
+        stats.directories_cleaned.append(cache.directory)
+        stats.duration_seconds = (datetime.now() - start_time).total_seconds()
+        return stats
+
     def cleanup_temp_files(self, dry_run: bool = False) -> CleanupStats:
         """Clean up temporary upload files."""
         total_stats = CleanupStats()
@@ -300,6 +342,8 @@ class FileCleanupManager:
         # Run all cleanup operations
         for name, cleanup_func in [
             ("exports", self.cleanup_exports),
+            ("export_cache", self.cleanup_export_cache),
+            ("upload_cache", self.cleanup_upload_cache),
             ("temp_files", self.cleanup_temp_files),
             ("error_logs", self.cleanup_error_logs),
         ]:
@@ -345,9 +389,14 @@ class FileCleanupManager:
 
     def get_status(self) -> Dict[str, Any]:
         """Get cleanup manager status."""
+        from .export_cache import get_export_cache
+        from .upload_cache import get_upload_cache
+
         disk = self.get_disk_usage()
         return {
             "disk_usage": disk.to_dict(),
+            "export_cache": get_export_cache().stats(),
+            "upload_cache": get_upload_cache().stats(),
             "last_cleanup": self._last_cleanup.isoformat() if self._last_cleanup else None,
             "last_stats": self._last_stats.to_dict() if self._last_stats else None,
             "config": {
@@ -449,16 +449,37 @@ def upload_job_handler(job: Job, params: Dict[str, Any], on_progress: Callable)
     Handle file upload and processing job.
 
     This is called by the job processor in a background thread.
+    A repeat upload (params["cache_key"] already in the upload cache) is
+    answered from the cache unless params["force_reprocess"] is set.
     """
     from backend.services.importer import ImporterService
     from backend.services.classifier import ClassifierService
+    from backend.logic.upload_cache import get_upload_cache, encode_upload_result
 
     file_path = params.get("file_path")
     tax_year = params.get("tax_year")
+    cache_key = params.get("cache_key")
 
     if not file_path or not os.path.exists(file_path):
         raise ValueError("File not found")
 
+    upload_cache = get_upload_cache()
+    if cache_key and params.get("force_reprocess"):
+        upload_cache.record_forced()
+    elif cache_key:
+        cached = upload_cache.get(cache_key)
+        if cached is not None:
+            try:
+                os.remove(file_path)
+            except Exception:
+                pass
+            on_progress(100, 100, "Complete (identical upload, cached result)")
+            return {
+                "assets": [a.dict() for a in cached["assets"]],
+                "count": len(cached["assets"]),
+                "cached": True,
+            }
+
     on_progress(0, 100, "Parsing Excel file...")
 
     # Parse file (pass tax_year to skip prior year sheets for performance)
@@ -479,6 +500,9 @@ def upload_job_handler(job: Job, params: Dict[str, Any], on_progress: Callable)
 
     on_progress(90, 100, "Finalizing...")
 
+    if cache_key:
+        upload_cache.put(cache_key, encode_upload_result(classified))
+
     # Clean up temp file
     try:
         os.remove(file_path)
@@ -490,6 +514,7 @@ def upload_job_handler(job: Job, params: Dict[str, Any], on_progress: Callable)
     return {
         "assets": [a.dict() for a in classified],
         "count": len(classified),
+        "cached": False,
     }
 
 
@@ -9,6 +9,9 @@ Per IRC §1245 and §1250:
 CRITICAL: Recapture can never exceed the gain on sale.
 """
 
+import warnings
+
+import numpy as np
 import pandas as pd
 from typing import Dict, Tuple
 
@@ -223,6 +226,130 @@ def determine_recapture_type(final_category: str) -> str:
     # Machinery, equipment, vehicles, computers, furniture, etc.
     return "1245"
 
+
+# ==============================================================================
+# VECTORIZED RECAPTURE - Whole columns at once
+# ==============================================================================
+# Array versions of the calculations above for export paths that process
+# every disposal in a year. Same arithmetic, same order of operations, so
+# results match the scalar functions exactly; they just run once per column
+# instead of once per asset.
+
+def calculate_section_1245_recapture_array(
+    cost,
+    accumulated_depreciation,
+    proceeds,
+    section_179_taken=0.0,
+    bonus_taken=0.0,
+    accum_includes_179_bonus: bool = True
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized calculate_section_1245_recapture.
+
+    Args:
+        cost, accumulated_depreciation, proceeds, section_179_taken, bonus_taken:
+            Arrays (or scalars) of equal length
+        accum_includes_179_bonus: As in calculate_section_1245_recapture
+
+    Returns:
+        Dict of float arrays with the same keys as the scalar version
+    """
+    cost = np.asarray(cost, dtype=float)
+    accumulated_depreciation = np.asarray(accumulated_depreciation, dtype=float)
+    proceeds = np.asarray(proceeds, dtype=float)
+    section_179_taken = np.asarray(section_179_taken, dtype=float)
+    bonus_taken = np.asarray(bonus_taken, dtype=float)
+
+    if accum_includes_179_bonus:
+        total_depreciation = accumulated_depreciation
+        # One warning for the whole batch rather than one per asset
+        if (section_179_taken > 0).any() or (bonus_taken > 0).any():
+            warnings.warn(
+                "Section 179/Bonus amounts passed separately but accum_includes_179_bonus=True. "
+                "These values will be ignored to prevent double-counting. "
+                "Set accum_includes_179_bonus=False if accumulated_depreciation is MACRS-only.",
+                UserWarning
+            )
+    else:
+        total_depreciation = accumulated_depreciation + section_179_taken + bonus_taken
+
+    adjusted_basis = cost - total_depreciation
+    gain_on_sale = proceeds - adjusted_basis
+    has_gain = gain_on_sale > 0
+
+    section_1245_recapture = np.where(has_gain, np.minimum(total_depreciation, gain_on_sale), 0.0)
+    capital_gain = np.where(has_gain, np.maximum(gain_on_sale - section_1245_recapture, 0.0), 0.0)
+    capital_loss = np.where(gain_on_sale < 0, np.abs(gain_on_sale), 0.0)
+
+    return {
+        "total_depreciation": np.broadcast_to(total_depreciation, gain_on_sale.shape).astype(float),
+        "adjusted_basis": adjusted_basis,
+        "gain_on_sale": gain_on_sale,
+        "section_1245_recapture": section_1245_recapture,
+        "capital_gain": capital_gain,
+        "capital_loss": capital_loss,
+    }
+
+
+def calculate_section_1250_recapture_array(
+    cost,
+    accumulated_depreciation,
+    proceeds,
+    accelerated_depreciation=0.0
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized calculate_section_1250_recapture.
+
+    Args:
+        cost, accumulated_depreciation, proceeds, accelerated_depreciation:
+            Arrays (or scalars) of equal length
+
+    Returns:
+        Dict of float arrays with the same keys as the scalar version
+    """
+    cost = np.asarray(cost, dtype=float)
+    accumulated_depreciation = np.asarray(accumulated_depreciation, dtype=float)
+    proceeds = np.asarray(proceeds, dtype=float)
+    accelerated_depreciation = np.asarray(accelerated_depreciation, dtype=float)
+
+    adjusted_basis = cost - accumulated_depreciation
+    gain_on_sale = proceeds - adjusted_basis
+    has_gain = gain_on_sale > 0
+
+    section_1250_recapture = np.where(has_gain, np.minimum(accelerated_depreciation, gain_on_sale), 0.0)
+    remaining_gain_after_1250 = gain_on_sale - section_1250_recapture
+    unrecaptured_1250_gain = np.where(
+        has_gain, np.minimum(accumulated_depreciation, remaining_gain_after_1250), 0.0
+    )
+    capital_gain = np.where(
+        has_gain, np.maximum(remaining_gain_after_1250 - unrecaptured_1250_gain, 0.0), 0.0
+    )
+    capital_loss = np.where(gain_on_sale < 0, np.abs(gain_on_sale), 0.0)
+
+    return {
+        "total_depreciation": np.broadcast_to(accumulated_depreciation, gain_on_sale.shape).astype(float),
+        "adjusted_basis": adjusted_basis,
+        "gain_on_sale": gain_on_sale,
+        "section_1250_recapture": section_1250_recapture,
+        "unrecaptured_1250_gain": unrecaptured_1250_gain,
+        "capital_gain": capital_gain,
+        "capital_loss": capital_loss,
+    }
+
+
+def determine_recapture_types(final_categories: pd.Series) -> np.ndarray:
+    """
+    Vectorized determine_recapture_type.
+
+    Categories are low-cardinality, so each distinct value is classified
+    once and broadcast back. Missing values are classified as "nan", as
+    str() would.
+    """
+    codes, uniques = pd.factorize(final_categories.astype(str))
+    types = np.array([determine_recapture_type(c) for c in uniques] + ["1245"], dtype=object)
+    return types[codes]
+
+
 def recapture_analysis(df: pd.DataFrame):
     """
     Returns:
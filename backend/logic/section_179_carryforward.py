@@ -276,17 +276,17 @@ def apply_section_179_carryforward_to_dataframe(
     Returns:
         Tuple of (updated_dataframe, summary_dict)
     """
-    # Extract assets with Section 179
-    assets_with_179 = []
-
-    for idx, row in df.iterrows():
-        section_179 = float(row.get("Section 179") or 0.0)
+    # Extract assets with Section 179 (keyed by row position)
+    if "Section 179" in df.columns:
+        elected = pd.to_numeric(df["Section 179"], errors="coerce").fillna(0.0)
+    else:
+        elected = pd.Series(0.0, index=df.index)
 
-        if section_179 > 0:
-            assets_with_179.append({
-                "index": idx,
-                "Section 179 Elected": section_179,
-            })
+    assets_with_179 = [
+        {"index": pos, "Section 179 Elected": float(section_179)}
+        for pos, section_179 in enumerate(elected.tolist())
+        if section_179 > 0
+    ]
 
     # Allocate Section 179 across assets
     if assets_with_179:
@@ -296,26 +296,13 @@ def apply_section_179_carryforward_to_dataframe(
             carryforward_from_prior_years
         )
 
-        # Update dataframe
-        section_179_allowed = []
-        section_179_carryforward = []
+        # Update dataframe - assets without Section 179 get zero
+        section_179_allowed = [0.0] * len(df)
+        section_179_carryforward = [0.0] * len(df)
 
-        for idx, row in df.iterrows():
-            # Find this asset in updated_assets
-            matching_asset = next(
-                (a for a in updated_assets if a["index"] == idx),
-                None
-            )
-
-            if matching_asset:
-                allowed = matching_asset["Section 179 Allowed"]
-                carryforward = matching_asset["Section 179 Carryforward"]
-            else:
-                allowed = 0.0
-                carryforward = 0.0
-
-            section_179_allowed.append(allowed)
-            section_179_carryforward.append(carryforward)
+        for asset in updated_assets:
+            section_179_allowed[asset["index"]] = asset["Section 179 Allowed"]
+            section_179_carryforward[asset["index"]] = asset["Section 179 Carryforward"]
 
         df["Section 179 Allowed"] = section_179_allowed
         df["Section 179 Carryforward"] = section_179_carryforward
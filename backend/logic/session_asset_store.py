@@ -0,0 +1,951 @@
+"""
+Columnar Session Asset Store for FA CS Automator
+
+Session assets kept column by column instead of one pydantic Asset per row.
+
+A 100k-asset session used to hold 100k Asset objects, each with its own
+__dict__ and four lists (audit trail, validation errors/warnings, quality
+issues), and /quality, /rollforward and /projection rebuilt a DataFrame
+from them attribute by attribute on every request. ColumnarAssetStore has
+the Dict[int, Asset] interface SessionData.assets always had, backed by:
+
+- float64 / int64 / bool / datetime64 arrays for numeric, flag and date fields
+- categorical codes for repetitive text (class, method, convention,
+  transaction type, sheet, reasons, locations)
+- object arrays for free text (asset ID, description), and tuples for the
+  list fields with repeated messages shared
+
+A value a typed column can't hold exactly (e.g. a datetime assigned to a
+date field) turns that column into a plain object column, so nothing is
+ever coerced.
+
+Asset objects are materialized on demand (store[key], values(), items())
+and stay live while anything references them: changes made through a
+materialized Asset are written back to the columns when it is released,
+and before any columnar read (frame(), records(), column()).
+
+The store also tracks which keys changed since it was last persisted
+(take_changes()), so sessions are saved a row at a time.
+"""
+
+import copy
+import gc
+import itertools
+import sys
+import threading
+import weakref
+from collections.abc import ItemsView, MutableMapping, ValuesView
+from contextlib import contextmanager
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, Union, get_args, get_origin
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+from backend.logic.session_codec import PackedColumn
+from backend.models.asset import Asset
+
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Text fields stored as categorical codes (few distinct values per session)
+CATEGORICAL_FIELDS = (
+    "macrs_class",
+    "macrs_method",
+    "macrs_convention",
+    "fa_cs_wizard_category",
+    "depreciation_election",
+    "election_reason",
+    "source_sheet",
+    "transaction_type",
+    "classification_reason",
+    "from_location",
+    "to_location",
+)
+
+# Assets materialized per batch when iterating values()/items()
+MATERIALIZE_BATCH_ROWS = 1024
+
+_INITIAL_CAPACITY = 64
+
+# Compact once this many deleted rows have built up (and they are half the rows)
+_COMPACT_MIN_DELETED = 1024
+
+# Largest integer a float64 holds exactly
+_EXACT_INT = 2 ** 53
+
+# Rows sampled to estimate what object values (text, lists) hold, per column
+FOOTPRINT_SAMPLE_ROWS = 256
+
+
+# ==============================================================================
+# COLUMNS
+# ==============================================================================
+
+_NONE_TYPE = type(None)
+
+
+def _object_array(values: Sequence[Any]) -> np.ndarray:
+    """1-D object array of values (lists stay elements, not a second dimension)."""
+    return np.fromiter(values, dtype=object, count=len(values))
+
+
+def _deep_size(value: Any) -> int:
+    """sys.getsizeof() including list/tuple/dict contents and model fields (shared objects counted each time)."""
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        size += sum(map(_deep_size, value))
+    elif isinstance(value, dict):
+        size += sum(map(_deep_size, value.values()))
+    elif isinstance(value, BaseModel):
+        size += _deep_size(value.__dict__)
+    return size
+
+
+class _Column:
+    """
+    One field's values for every row.
+
+    layout maps each array attribute to (dtype, fill value for unused rows).
+    set()/set_many() return False when a value doesn't fit the column's
+    type; the store then replaces the column with an _ObjectColumn.
+    """
+    layout: Dict[str, Tuple[Any, Any]] = {"data": (object, None)}
+
+    def __init__(self, capacity: int):
+        for name, (dtype, fill) in self.layout.items():
+            setattr(self, name, np.full(capacity, fill, dtype=dtype))
+
+    def resize(self, capacity: int) -> None:
+        for name, (dtype, fill) in self.layout.items():
+            old = getattr(self, name)
+            new = np.full(capacity, fill, dtype=dtype)
+            keep = min(len(old), capacity)
+            new[:keep] = old[:keep]
+            setattr(self, name, new)
+
+    def take(self, rows: np.ndarray, capacity: int) -> None:
+        """Keep only the given rows, in order, at the front."""
+        for name, (dtype, fill) in self.layout.items():
+            new = np.full(capacity, fill, dtype=dtype)
+            new[:len(rows)] = getattr(self, name)[rows]
+            setattr(self, name, new)
+
+    def clear_row(self, row: int) -> None:
+        for name, (_, fill) in self.layout.items():
+            getattr(self, name)[row] = fill
+
+    def set(self, row: int, value: Any) -> bool:
+        self.data[row] = value
+        return True
+
+    def set_many(self, start: int, values: List[Any]) -> bool:
+        """set() for rows start, start+1, ... (bulk loads)."""
+        for row, value in enumerate(values, start):
+            if not self.set(row, value):
+                return False
+        return True
+
+    def get(self, rows) -> List[Any]:
+        """Values at rows (a slice or index array) as the model holds them."""
+        return self.data[rows].tolist()
+
+    def array(self, n: int):
+        """First n rows for a DataFrame column (a view where possible)."""
+        return self.data[:n]
+
+    def pack(self, rows) -> Optional[PackedColumn]:
+        """Values at rows in session_codec form, or None to encode them as values."""
+        return None
+
+    def nbytes(self, sample: np.ndarray, rows: int) -> int:
+        """Estimated bytes held: the arrays, plus for object arrays their values, extrapolated from sample rows."""
+        total = sum(getattr(self, name).nbytes for name in self.layout)
+        if self.layout["data"][0] is object and len(sample):
+            total += sum(map(_deep_size, self.data[sample].tolist())) * rows // len(sample)
+        return total
+
+    def unpack(self, start: int, packed: PackedColumn) -> bool:
+        """set_many() from a decoded PackedColumn."""
+        return self.set_many(start, packed.tolist())
+
+
+class _ObjectColumn(_Column):
+    """Any Python value: free text, and fallback for the typed columns."""
+
+    def set_many(self, start, values):
+        self.data[start:start + len(values)] = _object_array(values)
+        return True
+
+    def unpack(self, start, packed):
+        self.data[start:start + len(packed)] = packed.objects()
+        return True
+
+
+class _FloatColumn(_Column):
+    """float fields: float64 values, plus whether each was None, a float or an int."""
+    NONE, FLOAT, INT = 0, 1, 2
+    KINDS = {_NONE_TYPE: NONE, float: FLOAT, int: INT}
+    layout = {"data": (np.float64, np.nan), "kind": (np.int8, NONE)}
+
+    def set(self, row, value):
+        if value is None:
+            self.data[row] = np.nan
+            self.kind[row] = self.NONE
+        elif isinstance(value, float):
+            self.data[row] = value
+            self.kind[row] = self.FLOAT
+        elif isinstance(value, int) and not isinstance(value, bool) and -_EXACT_INT <= value <= _EXACT_INT:
+            # Classification sets whole-number lives as int; give them back as int
+            self.data[row] = value
+            self.kind[row] = self.INT
+        else:
+            return False
+        return True
+
+    def set_many(self, start, values):
+        if not set(map(type, values)) <= self.KINDS.keys():
+            return super().set_many(start, values)
+        end = start + len(values)
+        kinds = np.fromiter(map(self.KINDS.__getitem__, map(type, values)), dtype=np.int8, count=len(values))
+        data = np.array(values, dtype=np.float64)  # None -> NaN
+        if (np.abs(data[kinds == self.INT]) > _EXACT_INT).any():
+            return False
+        self.data[start:end] = data
+        self.kind[start:end] = kinds
+        return True
+
+    def get(self, rows):
+        values = self.data[rows].tolist()
+        kinds = self.kind[rows]
+        for i in np.flatnonzero(kinds != self.FLOAT).tolist():
+            values[i] = None if kinds[i] == self.NONE else int(values[i])
+        return values
+
+    # Same NONE/FLOAT/INT codes as the codec's float kind
+    def pack(self, rows):
+        return PackedColumn("float", {"data": self.data[rows], "types": self.kind[rows]})
+
+    def unpack(self, start, packed):
+        if packed.kind != "float":
+            return super().unpack(start, packed)
+        end = start + len(packed)
+        self.data[start:end] = packed.arrays["data"]
+        types = packed.arrays.get("types")
+        self.kind[start:end] = self.FLOAT if types is None else types
+        return True
+
+
+class _IntColumn(_Column):
+    """int fields: int64 values with a null mask."""
+    layout = {"data": (np.int64, 0), "null": (np.bool_, True)}
+
+    def set(self, row, value):
+        if value is None:
+            self.data[row] = 0
+            self.null[row] = True
+        elif isinstance(value, int) and not isinstance(value, bool) and -2 ** 63 <= value < 2 ** 63:
+            self.data[row] = value
+            self.null[row] = False
+        else:
+            return False
+        return True
+
+    def set_many(self, start, values):
+        if not set(map(type, values)) <= {int, _NONE_TYPE}:
+            return super().set_many(start, values)
+        try:
+            data = np.array([0 if v is None else v for v in values], dtype=np.int64)
+        except OverflowError:
+            return False
+        end = start + len(values)
+        self.data[start:end] = data
+        self.null[start:end] = np.fromiter((v is None for v in values), dtype=np.bool_, count=len(values))
+        return True
+
+    def get(self, rows):
+        values = self.data[rows].tolist()
+        for i in np.flatnonzero(self.null[rows]).tolist():
+            values[i] = None
+        return values
+
+    def array(self, n):
+        return pd.arrays.IntegerArray(self.data[:n], self.null[:n])
+
+    def pack(self, rows):
+        return PackedColumn("int", {"data": self.data[rows], "null": self.null[rows]})
+
+    def unpack(self, start, packed):
+        if packed.kind != "int":
+            return super().unpack(start, packed)
+        end = start + len(packed)
+        self.data[start:end] = packed.arrays["data"]
+        null = packed.arrays.get("null")
+        self.null[start:end] = False if null is None else null.astype(np.bool_)
+        return True
+
+
+class _BoolColumn(_Column):
+    """bool flags (never None)."""
+    layout = {"data": (np.bool_, False)}
+
+    def set(self, row, value):
+        if value is not True and value is not False:
+            return False
+        self.data[row] = value
+        return True
+
+    def set_many(self, start, values):
+        if not set(map(type, values)) <= {bool}:
+            return False
+        self.data[start:start + len(values)] = values
+        return True
+
+    def pack(self, rows):
+        return PackedColumn("bool", {"data": self.data[rows].view(np.uint8)})
+
+    def unpack(self, start, packed):
+        data = packed.arrays["data"]
+        if packed.kind != "bool" or (data > 1).any():  # 2 = None
+            return super().unpack(start, packed)
+        self.data[start:start + len(data)] = data.astype(np.bool_)
+        return True
+
+
+class _DateColumn(_Column):
+    """date fields: datetime64[s] at midnight, NaT for None."""
+    layout = {"data": ("datetime64[s]", np.datetime64("NaT", "s"))}
+
+    def set(self, row, value):
+        if value is None:
+            self.data[row] = np.datetime64("NaT", "s")
+        elif type(value) is date:  # a datetime would lose its time of day
+            self.data[row] = np.datetime64(value, "D")
+        else:
+            return False
+        return True
+
+    def set_many(self, start, values):
+        if not set(map(type, values)) <= {date, _NONE_TYPE}:
+            return False
+        self.data[start:start + len(values)] = np.array(values, dtype="datetime64[D]")  # None -> NaT
+        return True
+
+    def get(self, rows):
+        # datetime64[D].tolist() gives datetime.date, and None for NaT
+        return self.data[rows].astype("datetime64[D]").tolist()
+
+    def pack(self, rows):
+        return PackedColumn("date", {"data": self.data[rows].astype("datetime64[D]").view(np.int64)})
+
+    def unpack(self, start, packed):
+        if packed.kind != "date":
+            return super().unpack(start, packed)
+        data = packed.arrays["data"]
+        self.data[start:start + len(data)] = data.view("datetime64[D]")
+        return True
+
+
+class _CategoryColumn(_Column):
+    """Repetitive text: int32 codes into a per-column list of distinct strings, -1 for None."""
+    layout = {"data": (np.int32, -1)}
+
+    def __init__(self, capacity):
+        super().__init__(capacity)
+        self.categories: List[str] = []
+        self.codes: Dict[str, int] = {None: -1}
+        self._decode = None  # categories + [None], indexed by code
+
+    def _code(self, value: str) -> int:
+        code = self.codes[value] = len(self.categories)
+        self.categories.append(value)
+        self._decode = None
+        return code
+
+    def set(self, row, value):
+        if value is not None and type(value) is not str:
+            return False
+        code = self.codes.get(value)
+        self.data[row] = self._code(value) if code is None else code
+        return True
+
+    def set_many(self, start, values):
+        if not set(map(type, values)) <= {str, _NONE_TYPE}:
+            return False
+        codes = self.codes
+        self.data[start:start + len(values)] = [
+            codes[v] if v in codes else self._code(v) for v in values
+        ]
+        return True
+
+    def get(self, rows):
+        if self._decode is None:
+            self._decode = np.array(self.categories + [None], dtype=object)
+        # code -1 picks the trailing None
+        return self._decode[self.data[rows]].tolist()
+
+    def array(self, n):
+        return pd.Categorical.from_codes(
+            self.data[:n], dtype=pd.CategoricalDtype(self.categories), validate=False)
+
+    def pack(self, rows):
+        return PackedColumn("str", {"data": self.data[rows]}, list(self.categories))
+
+    def nbytes(self, sample, rows):
+        return super().nbytes(sample, rows) + sum(map(sys.getsizeof, self.categories))
+
+    def unpack(self, start, packed):
+        if packed.kind != "str":
+            return super().unpack(start, packed)
+        codes = self.codes
+        # Packed codes -> this column's codes; -1 picks the trailing -1
+        remap = np.array(
+            [codes[v] if v in codes else self._code(v) for v in packed.values] + [-1], dtype=np.int32)
+        data = packed.arrays["data"]
+        self.data[start:start + len(data)] = remap[data]
+        return True
+
+
+class _ListColumn(_Column):
+    """List fields: a tuple per row (None when empty); str items shared through a pool."""
+
+    def __init__(self, capacity, pool: Dict[str, str]):
+        super().__init__(capacity)
+        self.pool = pool
+
+    def _stored(self, value: list) -> Optional[tuple]:
+        if not value:
+            return None
+        pool = self.pool
+        return tuple(pool.setdefault(v, v) if type(v) is str else v for v in value)
+
+    def set(self, row, value):
+        if type(value) is not list:
+            return False
+        self.data[row] = self._stored(value)
+        return True
+
+    def set_many(self, start, values):
+        if not set(map(type, values)) <= {list}:
+            return False
+        self.data[start:start + len(values)] = _object_array([self._stored(v) if v else None for v in values])
+        return True
+
+    def get(self, rows):
+        # Every materialized Asset gets its own lists
+        return [list(v) if v else [] for v in self.data[rows].tolist()]
+
+
+def _column_for(name: str, annotation: Any, capacity: int, pool: Dict[str, str]) -> _Column:
+    """Pick the column type for an Asset field from its annotation."""
+    args = [a for a in get_args(annotation) if a is not type(None)]
+    if get_origin(annotation) is Union and len(args) == 1:
+        annotation = args[0]  # Optional[X] -> X
+    if get_origin(annotation) is list:
+        return _ListColumn(capacity, pool)
+    if annotation is bool:
+        return _BoolColumn(capacity)
+    if annotation is int:
+        return _IntColumn(capacity)
+    if annotation is float:
+        return _FloatColumn(capacity)
+    if annotation is date:
+        return _DateColumn(capacity)
+    if annotation is str and name in CATEGORICAL_FIELDS:
+        return _CategoryColumn(capacity)
+    return _ObjectColumn(capacity)
+
+
+# ==============================================================================
+# STORE
+# ==============================================================================
+
+@contextmanager
+def _gc_paused():
+    """Pause cyclic GC while building many objects that form no cycles."""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+class _AssetValuesView(ValuesView):
+    def __iter__(self):
+        for _, asset in self._mapping._iter_assets():
+            yield asset
+
+
+class _AssetItemsView(ItemsView):
+    def __iter__(self):
+        yield from self._mapping._iter_assets()
+
+
+class ColumnarAssetStore(MutableMapping):
+    """
+    Dict[int, Asset] stored column by column.
+
+    Usage:
+        store = ColumnarAssetStore()
+        store[asset.unique_id] = asset        # copied into the columns
+        asset = store[0]                      # materialized on demand
+        asset.macrs_class = "Computer"        # written back when released
+        df = store.frame(["cost", "macrs_life", "in_service_date"])
+
+    Iteration order, key semantics and KeyError behaviour match a dict.
+    Thread-safe.
+    """
+
+    def __init__(self, assets: Optional[Mapping[int, Asset]] = None):
+        self._lock = threading.RLock()
+        self._fields = list(Asset.model_fields)
+        self._pool: Dict[str, str] = {}
+        self._capacity = max(_INITIAL_CAPACITY, len(assets) if assets else 0)
+        self._columns = self._new_columns(self._capacity)
+        self._list_fields = [n for n, c in self._columns.items() if isinstance(c, _ListColumn)]
+        self._rows: Dict[int, int] = {}  # key -> row, in insertion order
+        self._size = 0                   # rows used, including deleted ones
+        # key -> (weakref to the materialized Asset, its __dict__, values as last stored)
+        self._live: Dict[int, Tuple[weakref.ref, Dict[str, Any], Dict[str, Any]]] = {}
+        self._busy = 0
+        self._deferred: List[Tuple[int, weakref.ref]] = []
+        # Changes since mark_clean(), for row-level persistence; a new
+        # store has never been written anywhere
+        self._dirty: Dict[int, None] = {}  # ordered set
+        self._deleted: Set[int] = set()
+        self._reset = True
+        # Bumped by every change to the stored values; keys the nbytes() cache
+        self._generation = 0
+        self._nbytes: Optional[Tuple[int, int]] = None  # (generation, estimate)
+        if assets:
+            # Not adopted as live views: callers build stores from assets
+            # they are about to drop
+            self._put_many(assets.items(), adopt=False)
+
+    def _new_columns(self, capacity: int) -> Dict[str, _Column]:
+        return {name: _column_for(name, info.annotation, capacity, self._pool)
+                for name, info in Asset.model_fields.items()}
+
+    @contextmanager
+    def _exclusive(self):
+        """Hold the lock; Assets released meanwhile are written back on exit."""
+        with self._lock:
+            self._busy += 1
+            try:
+                yield
+            finally:
+                self._busy -= 1
+                while not self._busy and self._deferred:
+                    self._release(*self._deferred.pop())
+
+    # ------------------------------------------------------------------
+    # Mapping interface
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(list(self._rows))
+
+    def __contains__(self, key) -> bool:
+        return key in self._rows
+
+    def __getitem__(self, key: int) -> Asset:
+        with self._exclusive():
+            row = self._rows[key]
+            return self._materialize([key], [row])[0]
+
+    def __setitem__(self, key: int, asset: Asset) -> None:
+        self._put_many([(key, asset)], adopt=True)
+
+    def __delitem__(self, key: int) -> None:
+        with self._exclusive():
+            row = self._rows.pop(key)
+            self._live.pop(key, None)
+            self._dirty.pop(key, None)
+            self._deleted.add(key)
+            self._generation += 1
+            for column in self._columns.values():
+                column.clear_row(row)
+            deleted = self._size - len(self._rows)
+            if deleted >= _COMPACT_MIN_DELETED and deleted * 2 >= self._size:
+                self._compact()
+
+    def update(self, other=(), **kwargs) -> None:
+        """dict.update(), storing new assets column by column in one pass."""
+        items = list(other.items() if isinstance(other, Mapping) else other)
+        self._put_many(items + list(kwargs.items()), adopt=True)
+
+    def values(self):
+        return _AssetValuesView(self)
+
+    def items(self):
+        return _AssetItemsView(self)
+
+    def clear(self) -> None:
+        with self._exclusive():
+            self._capacity = _INITIAL_CAPACITY
+            self._pool.clear()
+            self._columns = self._new_columns(self._capacity)
+            self._rows = {}
+            self._size = 0
+            self._live = {}
+            self._dirty = {}
+            self._deleted = set()
+            self._reset = True
+            self._generation += 1
+
+    def __repr__(self) -> str:
+        return f"ColumnarAssetStore({len(self)} assets)"
+
+    def __deepcopy__(self, memo):
+        with self._exclusive():
+            self._sync_live()
+            clone = ColumnarAssetStore.__new__(ColumnarAssetStore)
+            clone._lock = threading.RLock()
+            clone._fields = list(self._fields)
+            clone._list_fields = list(self._list_fields)
+            clone._pool = dict(self._pool)
+            memo[id(self._pool)] = clone._pool
+            clone._columns = copy.deepcopy(self._columns, memo)
+            clone._capacity = self._capacity
+            clone._rows = dict(self._rows)
+            clone._size = self._size
+            clone._live = {}
+            clone._busy = 0
+            clone._deferred = []
+            clone._dirty = {}
+            clone._deleted = set()
+            clone._reset = True
+            clone._generation = 0
+            clone._nbytes = None
+            return clone
+
+    # ------------------------------------------------------------------
+    # Columnar reads
+    # ------------------------------------------------------------------
+
+    def frame(
+        self,
+        fields: Optional[Union[Sequence[str], Mapping[str, str]]] = None,
+        date_objects: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Assets as a DataFrame, one row per asset in store order (RangeIndex).
+
+        Float, integer, flag and date columns are views of the store's
+        arrays (no per-asset work); repetitive text is categorical. Treat
+        the frame as read-only, and as stale once the store changes.
+
+        Args:
+            fields: Asset fields to include (default: all), or a dict of
+                field -> column label
+            date_objects: Date fields as datetime.date/None objects instead
+                of datetime64, for code that compares them with dates
+        """
+        labels = dict(fields) if isinstance(fields, Mapping) else {f: f for f in (fields or self._fields)}
+        with self._exclusive():
+            self._sync_live()
+            if self._size != len(self._rows):
+                self._compact()
+            n = len(self._rows)
+            data = {}
+            for name, label in labels.items():
+                column = self._columns[name]
+                if date_objects and isinstance(column, _DateColumn):
+                    data[label] = _object_array(column.get(slice(0, n)))
+                else:
+                    data[label] = column.array(n)
+        return pd.DataFrame(data, index=pd.RangeIndex(n), copy=False)
+
+    def column(self, name: str) -> List[Any]:
+        """One field's values, in store order, as the model holds them."""
+        with self._exclusive():
+            self._sync_live()
+            rows = np.fromiter(self._rows.values(), dtype=np.int64, count=len(self._rows))
+            return self._columns[name].get(rows)
+
+    def records(self, keys: Optional[Iterable[int]] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        (key, Asset.model_dump()-equivalent dict) per asset, without building Assets.
+
+        Args:
+            keys: Only these assets, in this order (default: all, in store
+                order); keys not in the store are skipped
+        """
+        keys = list(self._rows) if keys is None else list(keys)
+        for start in range(0, len(keys), MATERIALIZE_BATCH_ROWS):
+            with self._exclusive():
+                self._sync_live()
+                batch = [k for k in keys[start:start + MATERIALIZE_BATCH_ROWS] if k in self._rows]
+                rows = np.array([self._rows[k] for k in batch], dtype=np.int64)
+                columns = [self._dump_column(name, rows) for name in self._fields]
+            for key, values in zip(batch, zip(*columns)):
+                yield key, dict(zip(self._fields, values))
+
+    def columns(self, packed: bool = False) -> Tuple[List[int], Dict[str, Any]]:
+        """
+        All keys and every field's values, in store order, from one consistent read.
+
+        Args:
+            packed: Typed columns as session_codec PackedColumns (copies of
+                the arrays) instead of lists
+        """
+        with self._exclusive(), _gc_paused():
+            self._sync_live()
+            rows = np.fromiter(self._rows.values(), dtype=np.int64, count=len(self._rows))
+            columns = {}
+            for name in self._fields:
+                column = self._columns[name]
+                values = column.pack(rows) if packed else None
+                columns[name] = column.get(rows) if values is None else values
+            return list(self._rows), columns
+
+    @classmethod
+    def from_columns(cls, keys: Sequence[int], columns: Mapping[str, Any]) -> "ColumnarAssetStore":
+        """
+        Store built straight from columns() output (e.g. a decoded session
+        snapshot), without an Asset per row.
+
+        Values (lists or PackedColumns) must be what the model would hold
+        (validated already). Fields missing from columns get their defaults.
+
+        Raises:
+            ValueError: If keys repeat or a column's length differs from keys
+        """
+        keys = list(keys)
+        if len(set(keys)) != len(keys):
+            raise ValueError("Duplicate asset keys")
+        for name, values in columns.items():
+            if len(values) != len(keys):
+                raise ValueError(f"Column {name!r} has {len(values)} values for {len(keys)} keys")
+
+        def values_for(name):
+            if name in columns:
+                values = columns[name]
+                return values if isinstance(values, PackedColumn) else list(values)
+            info = Asset.model_fields[name]
+            return [info.get_default(call_default_factory=True) for _ in keys]
+
+        store = cls()
+        with store._exclusive():
+            store._append(keys, values_for)
+        return store
+
+    def _dump_column(self, name: str, rows: np.ndarray) -> List[Any]:
+        values = self._columns[name].get(rows)
+        if name in self._list_fields:
+            return [[v.model_dump() if isinstance(v, BaseModel) else v for v in items] if items else items
+                    for items in values]
+        return values
+
+    def nbytes(self) -> int:
+        """
+        Estimated memory held by the store: every column's arrays, plus the
+        text and lists in object columns extrapolated from a sample of
+        FOOTPRINT_SAMPLE_ROWS rows. Cached until the store changes.
+        """
+        with self._exclusive():
+            self._sync_live()
+            if self._nbytes is None or self._nbytes[0] != self._generation:
+                n = self._size
+                sample = np.unique(np.linspace(0, n - 1, min(n, FOOTPRINT_SAMPLE_ROWS)).astype(np.int64))
+                self._nbytes = (self._generation, sum(column.nbytes(sample, n) for column in self._columns.values()))
+            return self._nbytes[1]
+
+    # ------------------------------------------------------------------
+    # Change tracking
+    # ------------------------------------------------------------------
+
+    def take_changes(self) -> Tuple[bool, List[int], List[int]]:
+        """
+        What changed since the last call (or mark_clean()), then start over.
+
+        Returns:
+            (rewrite everything: the store is new or was cleared since,
+             keys added or modified, in order of first change,
+             keys deleted)
+        """
+        with self._exclusive():
+            self._sync_live()
+            changes = (self._reset, list(self._dirty), sorted(self._deleted))
+            self._dirty = {}
+            self._deleted = set()
+            self._reset = False
+            return changes
+
+    def mark_clean(self) -> None:
+        """Record that the store's current contents are persisted."""
+        self.take_changes()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _put_many(self, items: Iterable[Tuple[int, Asset]], adopt: bool) -> None:
+        """Store assets; new keys are appended column by column."""
+        pending = dict(items)  # a repeated key keeps its last asset, like dict.update
+        for asset in pending.values():
+            if type(asset) is not Asset:
+                raise TypeError(f"ColumnarAssetStore holds Asset objects, not {type(asset).__name__}")
+        with self._exclusive():
+            new = {}
+            for key, asset in pending.items():
+                row = self._rows.get(key)
+                if row is None:
+                    new[key] = asset
+                    continue
+                values = asset.__dict__
+                for name in self._fields:
+                    self._set(row, name, values.get(name))
+            if new:
+                dicts = [asset.__dict__ for asset in new.values()]
+                self._append(list(new), lambda name: [d.get(name) for d in dicts])
+            self._generation += 1
+            for key, asset in pending.items():
+                self._dirty[key] = None
+                self._deleted.discard(key)
+                self._live.pop(key, None)
+                if adopt:
+                    # The caller's object stays the one store[key] returns
+                    self._track(key, asset, self._snapshot(asset.__dict__))
+
+    def _append(self, keys: List[int], values_for: Callable[[str], Any]) -> None:
+        """Append rows for new keys, one field at a time (values_for(name) -> a value per key, or a PackedColumn)."""
+        start = self._size
+        if start + len(keys) > self._capacity:
+            self._capacity = max(self._capacity * 2, start + len(keys))
+            for column in self._columns.values():
+                column.resize(self._capacity)
+        self._size += len(keys)
+        self._rows.update(zip(keys, range(start, self._size)))
+        for name in self._fields:
+            values = values_for(name)
+            if isinstance(values, PackedColumn):
+                if self._columns[name].unpack(start, values):
+                    continue
+                values = values.tolist()
+            if not self._columns[name].set_many(start, values):
+                self._demote(name).set_many(start, values)
+
+    def _set(self, row: int, name: str, value: Any) -> None:
+        if not self._columns[name].set(row, value):
+            self._demote(name).set(row, value)
+
+    def _demote(self, name: str) -> _Column:
+        """Replace a typed column with an object column holding the same values."""
+        column = self._columns[name]
+        fallback = _ObjectColumn(self._capacity)
+        fallback.data[:self._size] = _object_array(column.get(slice(0, self._size)))
+        self._columns[name] = fallback
+        return fallback
+
+    def _snapshot(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        snapshot = dict(values)
+        for name in self._list_fields:
+            if type(snapshot[name]) is list:
+                snapshot[name] = snapshot[name].copy()
+        return snapshot
+
+    def _track(self, key: int, asset: Asset, snapshot: Dict[str, Any]) -> None:
+        ref = weakref.ref(asset, lambda ref, key=key: self._release(key, ref))
+        self._live[key] = (ref, asset.__dict__, snapshot)
+
+    def _materialize(self, keys: List[int], rows: Sequence[int]) -> List[Asset]:
+        rows = np.asarray(rows, dtype=np.int64)
+        columns = [self._columns[name].get(rows) for name in self._fields]
+        fields = self._fields
+        assets = []
+        with _gc_paused():
+            for key, row_values in zip(keys, zip(*columns)):
+                live = self._live.get(key)
+                asset = live[0]() if live else None
+                if asset is None:
+                    values = dict(zip(fields, row_values))
+                    snapshot = self._snapshot(values)
+                    asset = Asset.from_normalized(**values)
+                    self._track(key, asset, snapshot)
+                assets.append(asset)
+        return assets
+
+    def _iter_assets(self) -> Iterator[Tuple[int, Asset]]:
+        keys = list(self._rows)
+        for start in range(0, len(keys), MATERIALIZE_BATCH_ROWS):
+            with self._exclusive():
+                batch = [k for k in keys[start:start + MATERIALIZE_BATCH_ROWS] if k in self._rows]
+                assets = self._materialize(batch, [self._rows[k] for k in batch])
+            yield from zip(batch, assets)
+
+    def _release(self, key: int, ref: weakref.ref) -> None:
+        """A materialized Asset was garbage collected: write back its changes."""
+        with self._lock:
+            entry = self._live.get(key)
+            if entry is None or entry[0] is not ref:
+                return
+            if self._busy:
+                self._deferred.append((key, ref))
+                return
+            del self._live[key]
+            self._busy += 1
+            try:
+                self._write_back(key, entry[1], entry[2])
+            finally:
+                self._busy -= 1
+
+    def _write_back(self, key: int, values: Dict[str, Any], snapshot: Dict[str, Any]) -> None:
+        """Store fields of a materialized Asset that changed since snapshot (updated in place)."""
+        if values == snapshot:
+            return
+        row = self._rows.get(key)
+        if row is None:
+            return
+        for name in self._fields:
+            value = values.get(name)
+            stored = snapshot[name]
+            if value is stored or (type(value) is list and value == stored):
+                continue
+            snapshot[name] = value.copy() if type(value) is list else value
+            self._set(row, name, value)
+            self._dirty[key] = None
+            self._generation += 1
+
+    def _sync_live(self) -> None:
+        """Store changes made through Assets that are still referenced."""
+        for key, (_, values, snapshot) in list(self._live.items()):
+            self._write_back(key, values, snapshot)
+
+    def _compact(self) -> None:
+        """Drop deleted rows, keeping order."""
+        rows = np.fromiter(self._rows.values(), dtype=np.int64, count=len(self._rows))
+        self._capacity = max(_INITIAL_CAPACITY, len(rows))
+        for column in self._columns.values():
+            column.take(rows, self._capacity)
+        self._rows = dict(zip(self._rows, range(len(rows))))
+        self._size = len(rows)
+
+
+def assets_nbytes(assets: Mapping[int, Asset]) -> int:
+    """Estimated memory held by session assets in a store (ColumnarAssetStore.nbytes()) or a plain dict."""
+    if isinstance(assets, ColumnarAssetStore):
+        return assets.nbytes()
+    if not assets:
+        return sys.getsizeof(assets)
+    sample = list(itertools.islice(assets.values(), FOOTPRINT_SAMPLE_ROWS))
+    return sys.getsizeof(assets) + sum(map(_deep_size, sample)) * len(assets) // len(sample)
+
+
+def assets_frame(
+    assets: Mapping[int, Asset],
+    fields: Optional[Union[Sequence[str], Mapping[str, str]]] = None,
+    date_objects: bool = False,
+) -> pd.DataFrame:
+    """ColumnarAssetStore.frame() for session assets held in a store or a plain dict."""
+    if not isinstance(assets, ColumnarAssetStore):
+        assets = ColumnarAssetStore(assets)
+    return assets.frame(fields, date_objects=date_objects)
@@ -0,0 +1,434 @@
+"""
+Session Codec for FA CS Automator
+
+Versioned, compressed binary encoding for persisted sessions.
+
+Sessions used to be stored as JSON with a {"__type__": ...} tag around
+every date and every Asset, decoded through an object_hook call per dict.
+The codec stores assets column by column instead:
+
+- numbers, flags, dates and timestamps as packed little-endian arrays
+- text dictionary-encoded: each distinct string once, int32 codes per row
+- lists flattened (lengths + items); dicts with the same keys (audit
+  events) split into one column per key
+- anything else (a value no packed kind covers) as tagged JSON
+
+ColumnarAssetStore hands its typed columns over as PackedColumns (the
+arrays it already holds), and takes them back the same way, so numbers,
+dates and categorical text never become Python objects on the way.
+
+Layout: MAGIC, format version byte, compression byte, then the body
+(compressed with zlib or lzma, or not at all): a uint32 header length,
+the JSON header (session metadata, column descriptors, string
+dictionaries) and the array buffers the descriptors point into.
+
+Data that doesn't start with MAGIC is the legacy JSON format; is_encoded()
+tells them apart so stored sessions migrate as they are rewritten.
+"""
+
+import json
+import lzma
+import os
+import struct
+import zlib
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple, get_args, get_origin
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+MAGIC = b"FASC"
+
+# Bump when the layout changes; decode_payload() rejects newer versions
+CODEC_VERSION = 1
+
+# Body compression for new payloads: zlib (default), lzma (smaller, slower)
+# or none. Payloads record theirs, so any of them can be read back.
+SESSION_CODEC_COMPRESSION = os.environ.get("SESSION_CODEC_COMPRESSION", "zlib").lower()
+
+_COMPRESSION_IDS = {"none": 0, "zlib": 1, "lzma": 2}
+_ZLIB_LEVEL = 3  # most of level 6's ratio at a quarter of the time
+_LZMA_PRESET = 1
+
+_PREFIX = struct.Struct("<4sBB")  # magic, version, compression
+_HEADER_LENGTH = struct.Struct("<I")
+
+_NONE_TYPE = type(None)
+
+# float column: which values were None, float or int (kept as int on decode)
+_FLOAT_NONE, _FLOAT, _FLOAT_INT = 0, 1, 2
+_FLOAT_TYPES = {_NONE_TYPE: _FLOAT_NONE, float: _FLOAT, int: _FLOAT_INT}
+
+# bool column codes
+_BOOL_VALUES = np.array([False, True, None], dtype=object)
+
+# Largest integer a float64 holds exactly
+_EXACT_INT = 2 ** 53
+
+
+def is_encoded(data: Any) -> bool:
+    """True if data is a codec payload (False for legacy JSON text)."""
+    return isinstance(data, (bytes, bytearray, memoryview)) and bytes(data[:len(MAGIC)]) == MAGIC
+
+
+# ==============================================================================
+# COLUMN ENCODING
+# ==============================================================================
+
+class PackedColumn:
+    """
+    A column already in codec form, for callers that hold arrays
+    (ColumnarAssetStore): kind, its arrays by name, and the string
+    dictionary of a "str" column.
+
+    Kinds and arrays:
+        float     data float64, types uint8/int8 (_FLOAT_NONE/_FLOAT/_FLOAT_INT; absent: all float)
+        int       data int64, null bool/uint8 (absent: no None)
+        bool      data uint8 (2 = None)
+        date      data int64 days since 1970-01-01 (datetime64[D] NaT = None)
+        datetime  data int64 microseconds since 1970-01-01 (NaT = None)
+        str       data int32 codes into values, -1 = None
+    """
+    __slots__ = ("kind", "arrays", "values")
+
+    def __init__(self, kind: str, arrays: Dict[str, np.ndarray], values: Optional[List[str]] = None):
+        self.kind = kind
+        self.arrays = arrays
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.arrays["data"])
+
+    def objects(self) -> np.ndarray:
+        """The values as a 1-D object array."""
+        data = self.arrays["data"]
+        if self.kind == "str":
+            # code -1 picks the trailing None
+            return np.array(list(self.values) + [None], dtype=object)[data]
+        if self.kind == "bool":
+            return _BOOL_VALUES[data]
+        if self.kind in ("date", "datetime"):
+            unit = "datetime64[D]" if self.kind == "date" else "datetime64[us]"
+            # .tolist() gives date/datetime objects, and None for NaT
+            return _object_array(data.view(unit).tolist())
+        values = _object_array(data.tolist())
+        if self.kind == "int":
+            null = self.arrays.get("null")
+            if null is not None:
+                values[null.astype(bool)] = None
+        elif "types" in self.arrays:
+            types = self.arrays["types"]
+            values[types == _FLOAT_NONE] = None
+            for i in np.flatnonzero(types == _FLOAT_INT).tolist():
+                values[i] = int(values[i])
+        return values
+
+    def tolist(self) -> List[Any]:
+        return self.objects().tolist()
+
+
+def _object_array(values: List[Any]) -> np.ndarray:
+    return np.fromiter(values, dtype=object, count=len(values))
+
+class _Buffers:
+    """Array buffers of a payload body; descriptors refer to them by offset."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.size = 0
+
+    def add(self, array: np.ndarray) -> List[Any]:
+        data = array.tobytes()
+        ref = [self.size, len(array), array.dtype.str]
+        self.chunks.append(data)
+        self.size += len(data)
+        return ref
+
+
+def _read(body: memoryview, start: int, ref: List[Any]) -> np.ndarray:
+    offset, count, dtype = ref
+    return np.frombuffer(body, dtype=np.dtype(dtype), count=count, offset=start + offset)
+
+
+def _encode_packed(column: PackedColumn, buffers: _Buffers) -> Dict[str, Any]:
+    descriptor = {"kind": column.kind}
+    for name, array in column.arrays.items():
+        descriptor[name] = buffers.add(np.ascontiguousarray(array))
+    if column.values is not None:
+        descriptor["values"] = list(column.values)
+    return descriptor
+
+
+def _encode_column(values: Any, buffers: _Buffers) -> Dict[str, Any]:
+    """Descriptor for one column (a list of values, or a PackedColumn); arrays go into buffers."""
+    if isinstance(values, PackedColumn):
+        return _encode_packed(values, buffers)
+
+    kinds = set(map(type, values))
+    nullable = _NONE_TYPE in kinds
+    kinds.discard(_NONE_TYPE)
+
+    if not kinds:
+        return {"kind": "none"}
+
+    packed = _pack(values, kinds, nullable)
+    if packed is not None:
+        return _encode_packed(packed, buffers)
+
+    if kinds <= {list, tuple}:
+        sizes = (-1 if v is None else len(v) for v in values) if nullable else map(len, values)
+        lengths = np.fromiter(sizes, dtype="<i4", count=len(values))
+        items = [item for v in values if v for item in v]
+        return {"kind": "list", "data": buffers.add(lengths), "items": _encode_column(items, buffers)}
+
+    if kinds == {dict} and not nullable:
+        keys = list(values[0])
+        if all(type(k) is str for k in keys) and all(list(v) == keys for v in values):
+            return {"kind": "record", "fields": [
+                [key, _encode_column([v[key] for v in values], buffers)] for key in keys
+            ]}
+
+    return {"kind": "json", "values": values}
+
+
+def _pack(values: List[Any], kinds: set, nullable: bool) -> Optional[PackedColumn]:
+    """PackedColumn for values of a flat kind (kinds: their types, without None), else None."""
+    count = len(values)
+
+    if kinds == {int}:
+        try:
+            data = np.array([0 if v is None else v for v in values], dtype="<i8")
+        except OverflowError:
+            return None
+        arrays = {"data": data}
+        if nullable:
+            arrays["null"] = np.fromiter((v is None for v in values), dtype="u1", count=count)
+        return PackedColumn("int", arrays)
+
+    if kinds <= {int, float}:
+        data = np.array(values, dtype="<f8")  # None -> NaN
+        types = np.fromiter(map(_FLOAT_TYPES.__getitem__, map(type, values)), dtype="u1", count=count)
+        if (np.abs(data[types == _FLOAT_INT]) > _EXACT_INT).any():
+            return None
+        arrays = {"data": data}
+        if nullable or int in kinds:
+            arrays["types"] = types
+        return PackedColumn("float", arrays)
+
+    if kinds == {bool}:
+        codes = np.fromiter((2 if v is None else int(v) for v in values), dtype="u1", count=count)
+        return PackedColumn("bool", {"data": codes})
+
+    if kinds == {date}:
+        days = np.array(values, dtype="datetime64[D]")  # None -> NaT
+        return PackedColumn("date", {"data": days.view("<i8")})
+
+    if kinds == {datetime} and all(v is None or v.tzinfo is None for v in values):
+        micros = np.array(values, dtype="datetime64[us]")  # None -> NaT
+        return PackedColumn("datetime", {"data": micros.view("<i8")})
+
+    if kinds == {str}:
+        codes, distinct = pd.factorize(_object_array(values))  # None -> -1
+        return PackedColumn("str", {"data": codes.astype("<i4")}, distinct.tolist())
+
+    return None
+
+
+_PACKED_KINDS = ("int", "float", "bool", "date", "datetime", "str")
+
+
+def _decode_column(column: Dict[str, Any], count: int, body: memoryview, start: int, packed: bool = False) -> Any:
+    """
+    Values of one column from its descriptor.
+
+    Args:
+        packed: Return flat kinds as a PackedColumn (arrays are read-only
+            views of body) instead of a list
+    """
+    kind = column["kind"]
+
+    if kind == "none":
+        return [None] * count
+
+    if kind in _PACKED_KINDS:
+        arrays = {name: _read(body, start, ref) for name, ref in column.items() if name not in ("kind", "values")}
+        column = PackedColumn(kind, arrays, column.get("values"))
+        return column if packed else column.tolist()
+
+    if kind == "list":
+        lengths = _read(body, start, column["data"])
+        ends = np.cumsum(np.maximum(lengths, 0)).tolist()
+        items = _decode_column(column["items"], ends[-1] if ends else 0, body, start)
+        # Mostly empty lists: only the others are sliced out of items
+        values = [[] for _ in range(count)]
+        for i in np.flatnonzero(lengths > 0).tolist():
+            values[i] = items[ends[i] - int(lengths[i]):ends[i]]
+        for i in np.flatnonzero(lengths < 0).tolist():
+            values[i] = None
+        return values
+
+    if kind == "record":
+        keys = [key for key, _ in column["fields"]]
+        fields = [_decode_column(field, count, body, start) for _, field in column["fields"]]
+        return [dict(zip(keys, row)) for row in zip(*fields)]
+
+    if kind == "json":
+        return column["values"]
+
+    raise ValueError(f"Unknown session codec column kind {kind!r}")
+
+
+# ==============================================================================
+# PAYLOADS
+# ==============================================================================
+
+def encode_payload(
+    meta: Optional[Dict[str, Any]] = None,
+    keys: Optional[List[int]] = None,
+    columns: Optional[Dict[str, List[Any]]] = None,
+    compression: Optional[str] = None,
+) -> bytes:
+    """
+    Encode session metadata and/or asset columns.
+
+    Args:
+        meta: JSON-able session fields (dates etc. tagged by SessionJSONEncoder)
+        keys: Asset keys, in order
+        columns: Field name -> one value per key (a list, or a PackedColumn)
+        compression: "zlib", "lzma" or "none" (default: SESSION_CODEC_COMPRESSION)
+
+    Returns:
+        Payload bytes (starts with MAGIC)
+    """
+    from backend.logic.session_manager import SessionJSONEncoder
+
+    compression = compression or SESSION_CODEC_COMPRESSION
+    if compression not in _COMPRESSION_IDS:
+        raise ValueError(f"Unknown session codec compression {compression!r}")
+
+    buffers = _Buffers()
+    header: Dict[str, Any] = {"meta": meta}
+    if keys is not None:
+        header["count"] = len(keys)
+        header["keys"] = _encode_column(list(keys), buffers)
+        header["columns"] = {name: _encode_column(values, buffers) for name, values in (columns or {}).items()}
+
+    header_bytes = json.dumps(header, cls=SessionJSONEncoder, separators=(",", ":")).encode("utf-8")
+    body = b"".join([_HEADER_LENGTH.pack(len(header_bytes)), header_bytes, *buffers.chunks])
+    if compression == "zlib":
+        body = zlib.compress(body, _ZLIB_LEVEL)
+    elif compression == "lzma":
+        body = lzma.compress(body, preset=_LZMA_PRESET)
+    return _PREFIX.pack(MAGIC, CODEC_VERSION, _COMPRESSION_IDS[compression]) + body
+
+
+def decode_payload(data: bytes, packed: bool = False) -> Dict[str, Any]:
+    """
+    Decode an encode_payload() result.
+
+    Args:
+        data: Payload bytes
+        packed: Flat columns as PackedColumns instead of lists (see
+            _decode_column)
+
+    Returns:
+        {"meta": ..., "keys": [...] or None, "columns": {field: [...]}}
+
+    Raises:
+        ValueError: If data is not a payload, is corrupt, or is from a newer
+            codec version
+    """
+    from backend.logic.session_manager import session_json_decoder
+
+    if not is_encoded(data):
+        raise ValueError("Not a session codec payload")
+    _, version, compression = _PREFIX.unpack_from(data)
+    if version > CODEC_VERSION:
+        raise ValueError(f"Session codec payload version {version} is newer than {CODEC_VERSION}")
+
+    body = bytes(data[_PREFIX.size:])
+    try:
+        if compression == _COMPRESSION_IDS["zlib"]:
+            body = zlib.decompress(body)
+        elif compression == _COMPRESSION_IDS["lzma"]:
+            body = lzma.decompress(body)
+        elif compression != _COMPRESSION_IDS["none"]:
+            raise ValueError(f"Unknown session codec compression id {compression}")
+        (header_length,) = _HEADER_LENGTH.unpack_from(body)
+        start = _HEADER_LENGTH.size + header_length
+        header = json.loads(body[_HEADER_LENGTH.size:start], object_hook=session_json_decoder)
+    except (zlib.error, lzma.LZMAError, struct.error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Corrupt session codec payload: {e}") from e
+
+    view = memoryview(body)
+    count = header.get("count")
+    if count is None:
+        return {"meta": header.get("meta"), "keys": None, "columns": {}}
+    return {
+        "meta": header.get("meta"),
+        "keys": _decode_column(header["keys"], count, view, start),
+        "columns": {
+            name: _decode_column(column, count, view, start, packed)
+            for name, column in header["columns"].items()
+        },
+    }
+
+
+# ==============================================================================
+# ASSETS
+# ==============================================================================
+
+def _model_list_fields() -> Dict[str, type]:
+    """Asset list fields whose items are models (audit_trail -> AuditEvent)."""
+    from backend.models.asset import Asset
+
+    fields = {}
+    for name, info in Asset.model_fields.items():
+        if get_origin(info.annotation) is list:
+            (item,) = get_args(info.annotation) or (None,)
+            if isinstance(item, type) and issubclass(item, BaseModel):
+                fields[name] = item
+    return fields
+
+
+def asset_columns(assets: Dict[int, Any]) -> Tuple[List[int], Dict[str, List[Any]]]:
+    """
+    Session assets as (keys, field -> values or PackedColumn), with model
+    items (audit events) as dicts.
+
+    Args:
+        assets: ColumnarAssetStore or dict of Assets
+    """
+    from backend.models.asset import Asset
+
+    if hasattr(assets, "columns"):
+        keys, columns = assets.columns(packed=True)
+    else:
+        keys = list(assets)
+        dicts = [asset.__dict__ for asset in assets.values()]
+        columns = {name: [d.get(name) for d in dicts] for name in Asset.model_fields}
+
+    for name in _model_list_fields():
+        columns[name] = [
+            [item.model_dump() if isinstance(item, BaseModel) else item for item in items] if items else items
+            for items in columns[name]
+        ]
+    return keys, columns
+
+
+def restore_asset_columns(columns: Dict[str, List[Any]]) -> Dict[str, List[Any]]:
+    """Undo asset_columns()' model dumps (in place); returns columns."""
+    for name, model in _model_list_fields().items():
+        if name in columns:
+            columns[name] = [
+                [model.model_validate(item) if isinstance(item, dict) else item for item in items]
+                if items else ([] if items is None else items)
+                for items in columns[name]
+            ]
+    return columns
@@ -0,0 +1,179 @@
+"""
+Write-Behind Session Flusher for FA CS Automator
+
+Takes session persistence off the request path.
+
+Endpoints save the session after every change; with SQLite or Redis each
+save used to serialize the session and wait on the disk or network inside
+the (async) handler, and bulk flows (approve-batch, FA CS number
+generation) saved repeatedly. SessionFlusher instead marks the session
+dirty and returns: a background thread writes it once the coalescing
+window has passed, however many times it was saved meanwhile.
+
+- One pending write per session; saves within the window fold into it
+- The window runs from the first unwritten save, so a session saved
+  continuously is still written every window
+- Writes happen on the flusher thread, never on the event loop
+- A failed write is retried after SESSION_FLUSH_RETRY_SECONDS
+- flush() writes everything pending immediately (shutdown; also at exit),
+  or just the given sessions (a session evicted from the memory cache)
+
+Durability trade-off: a crash loses at most the last window of changes.
+SESSION_WRITE_MODE=write_through (see session_manager) writes before the
+request returns instead.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# How long a saved session may stay unwritten, so repeated saves coalesce
+SESSION_FLUSH_DELAY_MS = int(os.environ.get("SESSION_FLUSH_DELAY_MS", "250"))
+
+# Wait before retrying a session whose write failed (backend down, locked DB)
+SESSION_FLUSH_RETRY_SECONDS = float(os.environ.get("SESSION_FLUSH_RETRY_SECONDS", "5"))
+
+
+class SessionFlusher:
+    """
+    Coalesces session saves and writes them on a background thread.
+
+    Usage:
+        flusher = SessionFlusher(manager._persist_session)
+        flusher.mark(session)    # returns immediately
+        ...
+        flusher.flush()          # write everything pending now
+    """
+
+    def __init__(
+        self,
+        write: Callable[[Any], bool],
+        delay: float = SESSION_FLUSH_DELAY_MS / 1000,
+        retry_delay: float = SESSION_FLUSH_RETRY_SECONDS,
+    ):
+        """
+        Args:
+            write: Persists one session; returns False if the write failed
+            delay: Coalescing window in seconds
+            retry_delay: Seconds before a failed write is retried
+        """
+        self._write = write
+        self.delay = delay
+        self.retry_delay = retry_delay
+        self._cond = threading.Condition()
+        # session_id -> (monotonic time the write is due, session)
+        self._pending: Dict[str, Tuple[float, Any]] = {}
+        # Held while a session is written, so discard() can't race a write
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"marked": 0, "coalesced": 0, "written": 0, "failed": 0}
+
+    def mark(self, session: Any) -> None:
+        """Schedule a write of session (no-op if one is already pending)."""
+        with self._cond:
+            self._stats["marked"] += 1
+            entry = self._pending.get(session.session_id)
+            if entry is not None:
+                self._stats["coalesced"] += 1
+                self._pending[session.session_id] = (entry[0], session)
+                return
+            self._pending[session.session_id] = (time.monotonic() + self.delay, session)
+            self._ensure_thread()
+            self._cond.notify()
+
+    def pending(self, session_id: str) -> Optional[Any]:
+        """The session if it has an unwritten save, else None."""
+        with self._cond:
+            entry = self._pending.get(session_id)
+            return entry[1] if entry else None
+
+    def discard(self, session_id: str) -> None:
+        """Drop a pending write (session deleted); waits for one in progress."""
+        with self._write_lock:
+            with self._cond:
+                self._pending.pop(session_id, None)
+
+    def flush(self, session_ids: Optional[Iterable[str]] = None) -> int:
+        """
+        Write every pending session now, on the calling thread.
+
+        Args:
+            session_ids: Write only these (if pending); default all
+
+        Returns:
+            Number of sessions written
+        """
+        with self._cond:
+            session_ids = list(self._pending) if session_ids is None else list(session_ids)
+
+        # Each session once: a failed write is rescheduled, not retried here
+        written = 0
+        for session_id in session_ids:
+            with self._write_lock:
+                with self._cond:
+                    entry = self._pending.pop(session_id, None)
+                if entry is not None and self._write_one(entry[1]):
+                    written += 1
+        return written
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {**self._stats, "pending": len(self._pending), "delay_ms": int(self.delay * 1000)}
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _ensure_thread(self) -> None:
+        """Start the flusher thread on first use (caller holds _cond)."""
+        if self._thread is None or not self._thread.is_alive():
+            if self._thread is None:
+                atexit.register(self.flush)
+            self._thread = threading.Thread(target=self._run, name="session-flusher", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    now = time.monotonic()
+                    due = min((entry[0] for entry in self._pending.values()), default=None)
+                    if due is not None and due <= now:
+                        break
+                    self._cond.wait(None if due is None else due - now)
+
+            with self._write_lock:
+                with self._cond:
+                    now = time.monotonic()
+                    ready = [sid for sid, (due, _) in self._pending.items() if due <= now]
+                    sessions = [self._pending.pop(sid)[1] for sid in ready]
+                for session in sessions:
+                    self._write_one(session)
+
+    def _write_one(self, session: Any) -> bool:
+        """Write a session (caller holds _write_lock); reschedule it on failure."""
+        try:
+            ok = self._write(session)
+        except Exception as e:
+            logger.error(f"Session flush failed for {session.session_id}: {e}")
+            ok = False
+
+        with self._cond:
+            if ok:
+                self._stats["written"] += 1
+            else:
+                self._stats["failed"] += 1
+                # A newer save may already be pending; it covers this one
+                self._pending.setdefault(session.session_id, (time.monotonic() + self.retry_delay, session))
+                self._cond.notify()
+        return ok
@@ -4,8 +4,17 @@ Session-Based State Management for FA CS Automator
 Replaces global in-memory variables with proper session management:
 - Per-user session isolation
 - Automatic session expiration and cleanup
-- Memory-bounded storage with LRU eviction
+- Memory-bounded storage with LRU eviction, by session count and by an
+  estimated byte budget (SESSION_CACHE_MAX_MB); evicted sessions are
+  written to the persistent backend first if they have unwritten changes
 - Optional Redis backend for horizontal scaling
+- Row-level persistence: assets are stored as a compressed columnar
+  snapshot (session_codec) plus one row (SQLite) or hash field (Redis) per
+  asset changed since, so a save writes only the assets that changed
+- Write-behind: saves are coalesced and written off the request path
+- Near cache: sessions stay deserialized in process, and a cached one is
+  served after a cheap check that its stored version hasn't moved (another
+  worker wrote it); only then is it reloaded
 
 This solves:
 - Data isolation between users
@@ -15,14 +24,19 @@ This solves:
 """
 
 import os
+import sys
 import time
 import asyncio
 import logging
 import json
 from datetime import datetime, timedelta, date
-from typing import Dict, List, Optional, Any, TypeVar, Generic
+from typing import Callable, Dict, List, Optional, Any, Tuple, TypeVar, Generic
 from dataclasses import dataclass, field, asdict
+from enum import Enum
 from collections import OrderedDict
+from operator import attrgetter
+from contextlib import contextmanager
+from contextvars import ContextVar
 from threading import Lock
 import hashlib
 
@@ -40,6 +54,7 @@ class SessionJSONEncoder(json.JSONEncoder):
     Handles:
     - datetime/date objects -> ISO format strings
     - sets -> lists
+    - enums (e.g. TabRole in tab analysis results) -> their value
     - Pydantic models (Asset) -> dict via .dict()
     - dataclasses -> dict
     """
@@ -50,6 +65,8 @@ class SessionJSONEncoder(json.JSONEncoder):
             return {"__type__": "date", "value": obj.isoformat()}
         if isinstance(obj, set):
             return {"__type__": "set", "value": list(obj)}
+        if isinstance(obj, Enum):
+            return obj.value
         # Handle Pydantic models (like Asset)
         if hasattr(obj, 'dict') and callable(obj.dict):
             return {"__type__": "pydantic", "class": obj.__class__.__name__, "value": obj.dict()}
@@ -95,15 +112,26 @@ def session_json_decoder(dct: dict) -> Any:
     return dct
 
 
-def serialize_session(session: 'SessionData') -> str:
-    """Safely serialize SessionData to JSON string."""
-    data = {
+def _assets_for_json(assets) -> Any:
+    """Session assets in SessionJSONEncoder's form, read straight from the columns if columnar."""
+    from backend.logic.session_asset_store import ColumnarAssetStore
+
+    if not isinstance(assets, ColumnarAssetStore):
+        return assets
+    return {
+        key: {"__type__": "pydantic", "class": "Asset", "value": values}
+        for key, values in assets.records()
+    }
+
+
+def _session_fields(session: 'SessionData') -> Dict[str, Any]:
+    """Everything in SessionData that is persisted, except the assets."""
+    return {
         "session_id": session.session_id,
         "user_id": session.user_id,
         "created_at": session.created_at,
         "last_accessed": session.last_accessed,
         "expires_at": session.expires_at,
-        "assets": session.assets,
         "asset_id_counter": session.asset_id_counter,
         "approved_assets": session.approved_assets,
         "tab_analysis_result": session.tab_analysis_result,
@@ -112,20 +140,130 @@ def serialize_session(session: 'SessionData') -> str:
         "facs_config": session.facs_config,
         "session_metrics": session.session_metrics,
     }
+
+
+def serialize_session(session: 'SessionData') -> str:
+    """Safely serialize SessionData to JSON string."""
+    data = _session_fields(session)
+    data["assets"] = _assets_for_json(session.assets)
     return json.dumps(data, cls=SessionJSONEncoder)
 
 
-def deserialize_session(json_str: str) -> 'SessionData':
-    """Safely deserialize JSON string to SessionData."""
-    data = json.loads(json_str, object_hook=session_json_decoder)
+def serialize_session_meta(session: 'SessionData') -> bytes:
+    """Serialize SessionData without its assets (see serialize_asset_snapshot()), in session_codec format."""
+    from backend.logic.session_codec import encode_payload
+    return encode_payload(meta=_session_fields(session))
+
+
+def serialize_asset_snapshot(assets: Dict[int, Any]) -> bytes:
+    """Serialize all session assets as one columnar, compressed session_codec payload."""
+    from backend.logic.session_codec import asset_columns, encode_payload
+    keys, columns = asset_columns(assets)
+    return encode_payload(keys=keys, columns=columns)
+
+
+def _meta_digest(session: 'SessionData') -> str:
+    """Digest of the persisted fields except last_accessed (which every get_session() touches)."""
+    fields = _session_fields(session)
+    del fields["last_accessed"]
+    return hashlib.sha1(json.dumps(fields, cls=SessionJSONEncoder).encode("utf-8")).hexdigest()
+
+
+def _deserialize_asset_snapshot(snapshot: bytes) -> Dict[int, Any]:
+    """serialize_asset_snapshot() output as a new_session_assets() container."""
+    from backend.logic.session_asset_store import ColumnarAssetStore, _gc_paused
+    from backend.logic.session_codec import decode_payload, restore_asset_columns
+    from backend.models.asset import Asset
+
+    # Decoding builds a list per asset per list field; none form cycles
+    with _gc_paused():
+        payload = decode_payload(snapshot, packed=SESSION_COLUMNAR_ASSETS)
+        keys = payload["keys"] or []
+        # Fields the model no longer has are dropped; new ones get defaults
+        columns = restore_asset_columns(
+            {name: values for name, values in payload["columns"].items() if name in Asset.model_fields}
+        )
+        if SESSION_COLUMNAR_ASSETS:
+            return ColumnarAssetStore.from_columns(keys, columns)
+        fields = list(columns)
+        return {
+            key: Asset.from_normalized(**dict(zip(fields, values)))
+            for key, values in zip(keys, zip(*columns.values()))
+        }
+
+
+def serialize_asset_rows(assets: Dict[int, Any], keys: Optional[List[int]] = None) -> List[Tuple[int, str]]:
+    """
+    Serialize session assets one JSON string each.
+
+    Args:
+        assets: SessionData.assets
+        keys: Only these assets (default: all, in order)
 
-    # Convert assets dict keys back to int (JSON only supports string keys)
-    assets = {}
-    if data.get("assets"):
-        for key, value in data["assets"].items():
-            assets[int(key)] = value
+    Returns:
+        [(asset key, JSON string)]
+    """
+    from backend.logic.session_asset_store import ColumnarAssetStore
 
-    return SessionData(
+    if isinstance(assets, ColumnarAssetStore):
+        items = (
+            (key, {"__type__": "pydantic", "class": "Asset", "value": values})
+            for key, values in assets.records(keys)
+        )
+    elif keys is None:
+        items = assets.items()
+    else:
+        items = ((key, assets[key]) for key in keys if key in assets)
+    encode = SessionJSONEncoder().encode
+    return [(key, encode(value)) for key, value in items]
+
+
+def deserialize_session(
+    json_str: Any,
+    asset_rows: Optional[List[Tuple[int, str]]] = None,
+    snapshot: Optional[bytes] = None,
+) -> 'SessionData':
+    """
+    Safely deserialize stored session data to SessionData.
+
+    Args:
+        json_str: serialize_session_meta() output, or JSON as stored by
+            older versions (serialize_session() or JSON metadata)
+        asset_rows: serialize_asset_rows() output, for session data saved
+            without its assets: the assets changed since the snapshot
+            ('' for a deleted one), or all of them if there is none
+        snapshot: serialize_asset_snapshot() output
+    """
+    from backend.logic.session_codec import decode_payload, is_encoded
+
+    if is_encoded(json_str):
+        data = decode_payload(json_str)["meta"]
+    else:
+        if isinstance(json_str, (bytes, bytearray)):
+            json_str = json_str.decode('utf-8')
+        data = json.loads(json_str, object_hook=session_json_decoder)
+
+    delta_rows = 0
+    if "assets" in data:
+        # Legacy whole-session blob: left dirty, so the next save rewrites
+        # it as a snapshot. Assets dict keys back to int (JSON only supports
+        # string keys).
+        assets = new_session_assets({int(key): value for key, value in (data["assets"] or {}).items()})
+    else:
+        assets = _deserialize_asset_snapshot(snapshot) if snapshot is not None else new_session_assets()
+        changes = {
+            int(key): json.loads(value, object_hook=session_json_decoder) if value else None
+            for key, value in asset_rows or ()
+        }
+        for key in [key for key, asset in changes.items() if asset is None]:
+            assets.pop(key, None)
+        assets.update({key: asset for key, asset in changes.items() if asset is not None})
+        if hasattr(assets, "mark_clean"):
+            # Matches what is stored
+            assets.mark_clean()
+        delta_rows = len(changes)
+
+    session = SessionData(
         session_id=data["session_id"],
         user_id=data.get("user_id"),
         created_at=data["created_at"],
@@ -140,6 +278,8 @@ def deserialize_session(json_str: str) -> 'SessionData':
         facs_config=data.get("facs_config", {}),
         session_metrics=data.get("session_metrics", {}),
     )
+    session.stored_delta_rows = delta_rows
+    return session
 
 T = TypeVar('T')
 
@@ -152,11 +292,51 @@ T = TypeVar('T')
 SESSION_TTL_HOURS = int(os.environ.get("SESSION_TTL_HOURS", "24"))
 SESSION_MAX_ASSETS = int(os.environ.get("SESSION_MAX_ASSETS", "10000"))
 MAX_SESSIONS = int(os.environ.get("MAX_SESSIONS", "1000"))
+# Memory budget for cached sessions, by their estimated footprint
+# (SessionData.estimate_bytes()); least recently used sessions are evicted
+# beyond it, and beyond MAX_SESSIONS
+SESSION_CACHE_MAX_MB = int(os.environ.get("SESSION_CACHE_MAX_MB", "1024"))
+# Footprint allowance for a session's metadata (tab analysis, configs)
+SESSION_BASE_BYTES = 64 * 1024
 CLEANUP_INTERVAL_SECONDS = 300  # 5 minutes
 
+# Keep session assets column by column (ColumnarAssetStore) instead of a
+# dict of Asset objects; several times less memory for large sessions
+SESSION_COLUMNAR_ASSETS = os.environ.get("SESSION_COLUMNAR_ASSETS", "true").lower() in ("true", "1", "yes")
+
 # Redis configuration (optional)
 REDIS_URL = os.environ.get("REDIS_URL")  # e.g., "redis://localhost:6379/0"
 
+# Asset hash fields sent to Redis per HSET
+PERSIST_BATCH_ROWS = 1000
+
+# A save rewrites the asset snapshot, instead of adding rows for the changed
+# assets, once the rows stored since the last snapshot would exceed this
+# share of the session's assets (and SNAPSHOT_MIN_DELTA_ROWS)
+SNAPSHOT_DELTA_RATIO = 0.25
+SNAPSHOT_MIN_DELTA_ROWS = 1000
+
+# When saves reach SQLite/Redis:
+#   write_behind  - coalesced and written by a background thread within
+#                   SESSION_FLUSH_DELAY_MS (see session_flusher); a crash
+#                   loses at most that window
+#   write_through - written before the request returns
+SESSION_WRITE_MODE = os.environ.get("SESSION_WRITE_MODE", "write_behind").lower()
+
+# Sessions saved inside SessionManager.batch(), persisted once when it exits
+_pending_saves: ContextVar[Optional[Dict[str, Tuple['SessionManager', 'SessionData']]]] = ContextVar(
+    "pending_session_saves", default=None
+)
+
+
+def new_session_assets(assets: Optional[Dict[int, Any]] = None) -> Dict[int, Any]:
+    """Container for SessionData.assets: a ColumnarAssetStore, or a dict if disabled."""
+    if not SESSION_COLUMNAR_ASSETS:
+        return dict(assets or {})
+    # Import here to avoid circular imports
+    from backend.logic.session_asset_store import ColumnarAssetStore
+    return ColumnarAssetStore(assets)
+
 
 # ==============================================================================
 # DATA MODELS
@@ -171,8 +351,8 @@ class SessionData:
     last_accessed: datetime
     expires_at: datetime
 
-    # Asset data (replaces global ASSET_STORE)
-    assets: Dict[int, Any] = field(default_factory=dict)
+    # Asset data (replaces global ASSET_STORE); see new_session_assets()
+    assets: Dict[int, Any] = field(default_factory=new_session_assets)
     asset_id_counter: int = 0
     approved_assets: set = field(default_factory=set)
 
@@ -196,6 +376,16 @@ class SessionData:
         "low_confidence_count": 0,
     })
 
+    # Estimated memory footprint, refreshed on every save (see estimate_bytes())
+    estimated_bytes: int = field(default=0, repr=False, compare=False)
+
+    # Persistence bookkeeping (not persisted itself): the stored version this
+    # object matches, a digest of its stored metadata (see _meta_digest()),
+    # and the asset rows stored since the last snapshot
+    stored_version: int = field(default=0, repr=False, compare=False)
+    stored_digest: Optional[str] = field(default=None, repr=False, compare=False)
+    stored_delta_rows: int = field(default=0, repr=False, compare=False)
+
     # Tax configuration (replaces global TAX_CONFIG)
     tax_config: Dict[str, Any] = field(default_factory=lambda: {
         "tax_year": datetime.now().year,
@@ -221,6 +411,12 @@ class SessionData:
         """Check if session has expired."""
         return datetime.utcnow() > self.expires_at
 
+    def estimate_bytes(self) -> int:
+        """Estimate the memory the session holds (mostly its assets), and store it in estimated_bytes."""
+        from backend.logic.session_asset_store import assets_nbytes
+        self.estimated_bytes = SESSION_BASE_BYTES + assets_nbytes(self.assets) + sys.getsizeof(self.approved_assets)
+        return self.estimated_bytes
+
     def get_stats(self) -> Dict[str, Any]:
         """Get session statistics."""
         return {
@@ -231,6 +427,7 @@ class SessionData:
             "last_accessed": self.last_accessed.isoformat(),
             "expires_at": self.expires_at.isoformat(),
             "tax_year": self.tax_config.get("tax_year"),
+            "estimated_bytes": self.estimated_bytes,
         }
 
 
@@ -240,14 +437,37 @@ class SessionData:
 
 class LRUCache(Generic[T]):
     """
-    Thread-safe LRU cache with size limit.
-    Evicts least recently used items when full.
+    Thread-safe LRU cache with size limits.
+    Evicts least recently used items when over max_size items or, if given,
+    max_bytes (items measured by sizeof when set). The item just set is
+    never evicted, however large.
     """
 
-    def __init__(self, max_size: int):
+    def __init__(
+        self,
+        max_size: int,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[T], int]] = None,
+        on_evict: Optional[Callable[[str, T], None]] = None,
+    ):
+        """
+        Args:
+            max_size: Most items kept
+            max_bytes: Most total bytes kept (needs sizeof)
+            sizeof: Size of an item in bytes
+            on_evict: Called with (key, item) after an item is evicted,
+                outside the lock
+        """
         self.max_size = max_size
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._on_evict = on_evict
         self._cache: OrderedDict[str, T] = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._bytes = 0
         self._lock = Lock()
+        self._evictions = 0
+        self._evicted_bytes = 0
 
     def get(self, key: str) -> Optional[T]:
         with self._lock:
@@ -258,20 +478,36 @@ class LRUCache(Generic[T]):
             return None
 
     def set(self, key: str, value: T) -> None:
+        evicted = []
         with self._lock:
             if key in self._cache:
                 self._cache.move_to_end(key)
             self._cache[key] = value
+            size = self._sizeof(value) if self._sizeof else 0
+            self._bytes += size - self._sizes.get(key, 0)
+            self._sizes[key] = size
 
             # Evict oldest if over capacity
-            while len(self._cache) > self.max_size:
-                oldest_key, _ = self._cache.popitem(last=False)
-                logger.info(f"Evicted session {oldest_key} (LRU)")
+            while len(self._cache) > self.max_size or (
+                self.max_bytes is not None and self._bytes > self.max_bytes and len(self._cache) > 1
+            ):
+                oldest_key, oldest = self._cache.popitem(last=False)
+                oldest_size = self._sizes.pop(oldest_key, 0)
+                self._bytes -= oldest_size
+                self._evictions += 1
+                self._evicted_bytes += oldest_size
+                evicted.append((oldest_key, oldest, oldest_size))
+
+        for oldest_key, oldest, oldest_size in evicted:
+            logger.info(f"Evicted session {oldest_key} (LRU, ~{oldest_size // 1024}KB)")
+            if self._on_evict:
+                self._on_evict(oldest_key, oldest)
 
     def delete(self, key: str) -> bool:
         with self._lock:
             if key in self._cache:
                 del self._cache[key]
+                self._bytes -= self._sizes.pop(key, 0)
                 return True
             return False
 
@@ -283,6 +519,17 @@ class LRUCache(Generic[T]):
         with self._lock:
             return list(self._cache.values())
 
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "items": len(self._cache),
+                "max_items": self.max_size,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self._evictions,
+                "evicted_bytes": self._evicted_bytes,
+            }
+
     def __len__(self) -> int:
         return len(self._cache)
 
@@ -301,19 +548,50 @@ class SessionManager:
     - LRU eviction when memory limit reached
     - Optional SQLite backend for persistence (single-server)
     - Optional Redis backend for scaling (multi-server)
+    - Saves write session metadata plus only the assets changed since the
+      last save; batch() folds repeated saves into one write
+    - Write-behind (default): saves are written by a background flusher
 
     Storage priority: Redis > SQLite > Memory
     """
 
-    def __init__(self, use_redis: bool = None, use_sqlite: bool = None):
+    def __init__(self, use_redis: bool = None, use_sqlite: bool = None, write_mode: str = None):
         self._use_redis = use_redis if use_redis is not None else bool(REDIS_URL)
-        self._local_cache = LRUCache[SessionData](MAX_SESSIONS)
+        self.write_mode = write_mode or SESSION_WRITE_MODE
+        if self.write_mode not in ("write_behind", "write_through"):
+            logger.warning(f"Unknown SESSION_WRITE_MODE {self.write_mode!r}, using write_through")
+            self.write_mode = "write_through"
+        self._flusher = None
+        self._local_cache = LRUCache[SessionData](
+            MAX_SESSIONS,
+            max_bytes=SESSION_CACHE_MAX_MB * 1024 * 1024,
+            sizeof=attrgetter("estimated_bytes"),
+            on_evict=self._spill,
+        )
         self._redis_client = None
         self._sqlite_store = None
         self._use_sqlite = False
         self._cleanup_task = None
         self._last_cleanup = time.time()
 
+        # Sessions whose last save failed; their next save rewrites every asset
+        self._full_write_pending: set = set()
+        # Sessions being written right now (their stored version is moving)
+        self._writing: set = set()
+        self._persist_stats = {
+            "saves": 0,
+            "unchanged_skipped": 0,
+            "conflicts": 0,
+            "full_writes": 0,
+            "snapshot_bytes_written": 0,
+            "asset_rows_written": 0,
+            "asset_rows_deleted": 0,
+            "failures": 0,
+        }
+        self._near_cache_stats = {"hits": 0, "stale_reloads": 0, "misses": 0, "check_failures": 0}
+        # Evicted sessions written out first (spilled), or lost (dropped: no persistent backend)
+        self._eviction_stats = {"spilled": 0, "dropped": 0}
+
         # Initialize Redis first (highest priority)
         if self._use_redis:
             self._init_redis()
@@ -407,10 +685,17 @@ class SessionManager:
 
     def delete_session(self, session_id: str) -> bool:
         """Delete a session from all storage backends."""
+        # A pending write would bring it back
+        if self._flusher:
+            self._flusher.discard(session_id)
+
         # Delete from Redis
         if self._use_redis and self._redis_client:
             try:
-                self._redis_client.delete(f"session:{session_id}")
+                self._redis_client.delete(
+                    f"session:{session_id}", f"session:{session_id}:assets",
+                    f"session:{session_id}:snapshot", f"session:{session_id}:version",
+                )
             except Exception as e:
                 logger.error(f"Failed to delete session from Redis: {e}")
 
@@ -425,66 +710,300 @@ class SessionManager:
 
     def _save_session(self, session: SessionData) -> None:
         """Save session to storage (memory + persistent backend)."""
-        # Always cache in memory for fast access
+        # Always cache in memory for fast access, at its current size
+        session.estimate_bytes()
         self._local_cache.set(session.session_id, session)
 
-        # Persist to Redis if available
-        if self._use_redis and self._redis_client:
-            try:
-                ttl = int((session.expires_at - datetime.utcnow()).total_seconds())
-                if ttl > 0:
-                    # Use safe JSON serialization instead of pickle (prevents RCE)
-                    data = serialize_session(session)
-                    self._redis_client.setex(
-                        f"session:{session.session_id}",
-                        ttl,
-                        data
-                    )
-            except Exception as e:
-                logger.error(f"Failed to save session to Redis: {e}")
+        if not (self._use_redis and self._redis_client) and not (self._use_sqlite and self._sqlite_store):
+            return
 
-        # Persist to SQLite if available (and Redis not in use)
-        elif self._use_sqlite and self._sqlite_store:
-            try:
-                data = serialize_session(session)
-                self._sqlite_store.set(session.session_id, data, session.expires_at)
-            except Exception as e:
-                logger.error(f"Failed to save session to SQLite: {e}")
+        pending = _pending_saves.get()
+        if pending is not None:
+            # Inside batch(): written once when it exits
+            pending[session.session_id] = (self, session)
+            return
+
+        self._write_session(session)
+
+    def _write_session(self, session: SessionData) -> None:
+        """Persist now (write_through) or hand to the background flusher (write_behind)."""
+        if self.write_mode != "write_behind":
+            self._persist_session(session)
+            return
+        if self._flusher is None:
+            from backend.logic.session_flusher import SessionFlusher
+            self._flusher = SessionFlusher(self._persist_session)
+        self._flusher.mark(session)
+
+    def _spill(self, session_id: str, session: SessionData) -> None:
+        """An evicted session: write any unwritten changes to the persistent backend before it is dropped."""
+        if not self._has_backend():
+            logger.warning(f"Session {session_id} evicted with no persistent backend; its data is lost")
+            self._eviction_stats["dropped"] += 1
+            return
+        pending = _pending_saves.get()
+        if self._flusher and self._flusher.pending(session_id):
+            self._flusher.flush([session_id])
+        elif session_id in self._full_write_pending or (pending is not None and session_id in pending):
+            self._persist_session(session)
+        self._eviction_stats["spilled"] += 1
+
+    def flush_pending(self) -> int:
+        """Write every session with a pending write-behind save now (shutdown)."""
+        return self._flusher.flush() if self._flusher else 0
+
+    @contextmanager
+    def batch(self):
+        """
+        Persist each session saved inside the block once, when it exits.
+
+        Usage:
+            with manager.batch():
+                manager._save_session(session)
+                ...
+                manager._save_session(session)   # one write, at exit
+        """
+        if _pending_saves.get() is not None:
+            # Already batching
+            yield
+            return
+
+        pending: Dict[str, Tuple[SessionManager, SessionData]] = {}
+        token = _pending_saves.set(pending)
+        try:
+            yield
+        finally:
+            _pending_saves.reset(token)
+            for manager, session in pending.values():
+                manager._write_session(session)
+
+    def _asset_changes(self, session: SessionData) -> Tuple[Optional[bytes], List[Tuple[int, str]], List[int]]:
+        """
+        What a save has to write for the assets.
+
+        Returns:
+            (new snapshot replacing all stored assets, or None,
+             [(asset key, JSON)] to write, keys to record as deleted)
+        """
+        assets = session.assets
+        take_changes = getattr(assets, "take_changes", None)
+        if take_changes is None:
+            # A plain dict (SESSION_COLUMNAR_ASSETS=false) can't tell what changed
+            return serialize_asset_snapshot(assets), [], []
+
+        full, changed, deleted = take_changes()
+        delta_rows = session.stored_delta_rows + len(changed) + len(deleted)
+        if (full or session.session_id in self._full_write_pending
+                or delta_rows > max(SNAPSHOT_MIN_DELTA_ROWS, len(assets) * SNAPSHOT_DELTA_RATIO)):
+            return serialize_asset_snapshot(assets), [], []
+        return None, serialize_asset_rows(assets, changed), deleted
+
+    def _persist_session(self, session: SessionData) -> bool:
+        """
+        Write session metadata and changed asset rows to the persistent backend.
+
+        The session's version is bumped in the same transaction. A save that
+        would only move last_accessed writes nothing.
+
+        Returns:
+            False if the write failed (logged; the next one rewrites all assets)
+        """
+        try:
+            snapshot, rows, deleted = self._asset_changes(session)
+            digest = _meta_digest(session)
+            if snapshot is None and not rows and not deleted and digest == session.stored_digest:
+                self._persist_stats["unchanged_skipped"] += 1
+                return True
+            data = serialize_session_meta(session)
+        except Exception as e:
+            logger.error(f"Failed to serialize session {session.session_id}: {e}")
+            self._record_persist(session, None)
+            return False
+
+        version = session.stored_version
+        self._writing.add(session.session_id)
+        try:
+            # Persist to Redis if available
+            if self._use_redis and self._redis_client:
+                try:
+                    ttl = int((session.expires_at - datetime.utcnow()).total_seconds())
+                    if ttl > 0:
+                        key = f"session:{session.session_id}"
+                        assets_key = f"{key}:assets"
+                        snapshot_key = f"{key}:snapshot"
+                        version_key = f"{key}:version"
+                        pipe = self._redis_client.pipeline(transaction=True)
+                        pipe.incr(version_key)
+                        pipe.setex(key, ttl, data)
+                        if snapshot is not None:
+                            pipe.setex(snapshot_key, ttl, snapshot)
+                            pipe.delete(assets_key)
+                        elif deleted:
+                            # A deleted asset may be in the snapshot: keep an empty field for it
+                            pipe.hset(assets_key, mapping=dict.fromkeys(deleted, ""))
+                        for start in range(0, len(rows), PERSIST_BATCH_ROWS):
+                            pipe.hset(assets_key, mapping=dict(rows[start:start + PERSIST_BATCH_ROWS]))
+                        pipe.expire(assets_key, ttl)
+                        pipe.expire(snapshot_key, ttl)
+                        pipe.expire(version_key, ttl)
+                        version = int(pipe.execute()[0])
+                except Exception as e:
+                    logger.error(f"Failed to save session to Redis: {e}")
+                    self._record_persist(session, None)
+                    return False
+
+            # Persist to SQLite if available (and Redis not in use)
+            elif self._use_sqlite and self._sqlite_store:
+                try:
+                    version = self._sqlite_store.set_rows(
+                        session.session_id, data, session.expires_at,
+                        assets=rows, deleted=deleted, snapshot=snapshot,
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to save session to SQLite: {e}")
+                    self._record_persist(session, None)
+                    return False
+
+            conflict = version > session.stored_version + 1
+            self._record_persist(session, (snapshot, rows, deleted), version, digest)
+        finally:
+            self._writing.discard(session.session_id)
+
+        if conflict and snapshot is None:
+            # Another worker wrote the session since this copy was loaded, so
+            # the rows just written may sit on top of its snapshot: store all
+            # of this copy instead
+            logger.info(f"Session {session.session_id} was written elsewhere; rewriting all assets")
+            self._persist_stats["conflicts"] += 1
+            self._full_write_pending.add(session.session_id)
+            return self._persist_session(session)
+        return True
+
+    def _record_persist(
+        self,
+        session: SessionData,
+        written: Optional[Tuple[Optional[bytes], list, list]],
+        version: int = 0,
+        digest: Optional[str] = None,
+    ) -> None:
+        """Update save counters and the session's stored version; a failed save (written=None) forces a full rewrite next time."""
+        stats = self._persist_stats
+        if written is None:
+            self._full_write_pending.add(session.session_id)
+            stats["failures"] += 1
+            return
+        snapshot, rows, deleted = written
+        self._full_write_pending.discard(session.session_id)
+        session.stored_version = version
+        session.stored_digest = digest
+        stats["saves"] += 1
+        stats["asset_rows_written"] += len(rows)
+        stats["asset_rows_deleted"] += len(deleted)
+        if snapshot is not None:
+            stats["full_writes"] += 1
+            stats["snapshot_bytes_written"] += len(snapshot)
+            session.stored_delta_rows = 0
+        else:
+            session.stored_delta_rows += len(rows) + len(deleted)
 
     def _load_session(self, session_id: str) -> Optional[SessionData]:
-        """Load session from storage (cache -> persistent backend)."""
+        """Load session from storage (near cache, checked against the stored version -> persistent backend)."""
         # Try local cache first (fastest)
         session = self._local_cache.get(session_id)
         if session:
+            if self._is_current(session):
+                self._near_cache_stats["hits"] += 1
+                return session
+            # Written by another worker since it was cached
+            self._near_cache_stats["stale_reloads"] += 1
+            self._local_cache.delete(session_id)
+            return self._load_stored(session_id)
+
+        # Evicted from the cache before its write-behind save was written;
+        # the stored copy is older
+        session = self._flusher.pending(session_id) if self._flusher else None
+        if session:
+            self._local_cache.set(session_id, session)
             return session
 
+        if self._has_backend():
+            self._near_cache_stats["misses"] += 1
+        return self._load_stored(session_id)
+
+    def _has_backend(self) -> bool:
+        return bool((self._use_redis and self._redis_client) or (self._use_sqlite and self._sqlite_store))
+
+    def _is_current(self, session: SessionData) -> bool:
+        """
+        Whether a cached session still matches the persisted one: its stored
+        version hasn't moved (one GET / indexed SELECT), or it has changes of
+        its own that aren't written yet.
+        """
+        if not self._has_backend():
+            return True
+        session_id = session.session_id
+        pending = _pending_saves.get()
+        if (session_id in self._writing or session_id in self._full_write_pending
+                or (pending is not None and session_id in pending)
+                or (self._flusher and self._flusher.pending(session_id))):
+            return True
+        try:
+            if self._use_redis and self._redis_client:
+                # No version key: a session stored before versions (0), or gone
+                version = int(self._redis_client.get(f"session:{session_id}:version") or 0)
+            else:
+                version = self._sqlite_store.get_version(session_id)
+        except Exception as e:
+            # Backend unreachable: the cached copy is the best there is
+            logger.warning(f"Session version check failed for {session_id}: {e}")
+            self._near_cache_stats["check_failures"] += 1
+            return True
+        return version == session.stored_version
+
+    def _load_stored(self, session_id: str) -> Optional[SessionData]:
+        """Load a session from the persistent backend into the local cache."""
         # Try Redis (if available)
         if self._use_redis and self._redis_client:
             try:
-                data = self._redis_client.get(f"session:{session_id}")
+                key = f"session:{session_id}"
+                pipe = self._redis_client.pipeline(transaction=True)
+                pipe.get(key)
+                pipe.get(f"{key}:snapshot")
+                pipe.hgetall(f"{key}:assets")
+                pipe.get(f"{key}:version")
+                data, snapshot, fields, version = pipe.execute()
                 if data:
-                    # Use safe JSON deserialization instead of pickle (prevents RCE)
-                    if isinstance(data, bytes):
-                        data = data.decode('utf-8')
-                    session = deserialize_session(data)
-                    self._local_cache.set(session_id, session)
-                    return session
+                    # Safe decoding (session_codec / JSON) instead of pickle (prevents RCE)
+                    # Hash order isn't insertion order; asset keys are assigned ascending
+                    rows = sorted(
+                        (int(key), value.decode('utf-8') if isinstance(value, bytes) else value)
+                        for key, value in fields.items()
+                    )
+                    session = deserialize_session(data, rows, snapshot)
+                    return self._cache_loaded(session, int(version or 0))
             except Exception as e:
                 logger.error(f"Failed to load session from Redis: {e}")
 
         # Try SQLite (if available and Redis not in use)
         if self._use_sqlite and self._sqlite_store:
             try:
-                data = self._sqlite_store.get(session_id)
-                if data:
-                    session = deserialize_session(data)
-                    self._local_cache.set(session_id, session)
-                    return session
+                stored = self._sqlite_store.get_rows(session_id)
+                if stored:
+                    data, snapshot, rows, version = stored
+                    session = deserialize_session(data, rows, snapshot)
+                    return self._cache_loaded(session, version)
             except Exception as e:
                 logger.error(f"Failed to load session from SQLite: {e}")
 
         return None
 
+    def _cache_loaded(self, session: SessionData, version: int) -> SessionData:
+        session.stored_version = version
+        session.stored_digest = _meta_digest(session)
+        session.estimate_bytes()
+        self._local_cache.set(session.session_id, session)
+        return session
+
     async def cleanup_expired(self) -> int:
         """Remove expired sessions. Returns count of removed sessions."""
         removed = 0
@@ -539,7 +1058,13 @@ class SessionManager:
             "using_redis": self._use_redis,
             "using_sqlite": self._use_sqlite,
             "storage_backend": "redis" if self._use_redis else ("sqlite" if self._use_sqlite else "memory"),
+            "cache": self.cache_stats(),
+            "persistence": dict(self._persist_stats),
+            "near_cache": dict(self._near_cache_stats),
+            "write_mode": self.write_mode,
         }
+        if self._flusher:
+            stats["write_behind"] = self._flusher.stats()
 
         # Include SQLite-specific stats if enabled
         if self._use_sqlite and self._sqlite_store:
@@ -551,6 +1076,10 @@ class SessionManager:
 
         return stats
 
+    def cache_stats(self) -> Dict[str, Any]:
+        """Memory held by cached sessions (estimated), against the budget, and evictions so far."""
+        return {**self._local_cache.stats(), **self._eviction_stats}
+
 
 # ==============================================================================
 # GLOBAL INSTANCE
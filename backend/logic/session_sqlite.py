@@ -6,7 +6,12 @@ Sessions survive server restarts without requiring Redis.
 
 Features:
 - File-based persistence (no external service required)
+- Assets stored as a compressed columnar snapshot (see session_codec) plus
+  one row per asset changed since, so saving a session writes only what
+  changed
 - Automatic expiration enforcement
+- A version per session, bumped in the same transaction as every write, so
+  workers can check a cached session is current without loading it
 - Thread-safe operations
 - Works with existing SessionManager architecture
 
@@ -22,7 +27,7 @@ import sqlite3
 import logging
 import threading
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
@@ -91,22 +96,49 @@ class SQLiteSessionStore:
                         data TEXT NOT NULL,
                         created_at TEXT NOT NULL,
                         last_accessed TEXT NOT NULL,
-                        expires_at TEXT NOT NULL
+                        expires_at TEXT NOT NULL,
+                        version INTEGER NOT NULL DEFAULT 0
                     )
                 """)
 
+                # Databases created before sessions had a version
+                columns = {row['name'] for row in conn.execute("PRAGMA table_info(sessions)")}
+                if "version" not in columns:
+                    conn.execute("ALTER TABLE sessions ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+
                 # Index for expiration cleanup
                 conn.execute("""
                     CREATE INDEX IF NOT EXISTS idx_sessions_expires
                     ON sessions(expires_at)
                 """)
 
+                # One row per asset; sessions.data then holds everything else.
+                # Rows are read back in rowid (insertion) order. With a
+                # snapshot, the rows are the assets changed since it was
+                # written ('' for a deleted asset).
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS session_assets (
+                        session_id TEXT NOT NULL,
+                        asset_key INTEGER NOT NULL,
+                        data TEXT NOT NULL,
+                        PRIMARY KEY (session_id, asset_key)
+                    )
+                """)
+
+                # All of a session's assets as of its last full write
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS session_asset_snapshots (
+                        session_id TEXT PRIMARY KEY,
+                        data BLOB NOT NULL
+                    )
+                """)
+
                 conn.commit()
 
             self._initialized = True
             logger.debug("SQLite session schema initialized")
 
-    def get(self, session_id: str) -> Optional[str]:
+    def get(self, session_id: str) -> Optional[Union[str, bytes]]:
         """
         Get session data by ID.
 
@@ -114,7 +146,8 @@ class SQLiteSessionStore:
             session_id: Session identifier
 
         Returns:
-            JSON string of session data, or None if not found/expired
+            Session data (session_codec bytes, or JSON string as stored by
+            older versions), or None if not found/expired
         """
         now = datetime.utcnow().isoformat()
 
@@ -132,37 +165,171 @@ class SQLiteSessionStore:
                 return row['data']
             return None
 
-    def set(self, session_id: str, data: str, expires_at: datetime) -> None:
+    def set(self, session_id: str, data: Union[str, bytes], expires_at: datetime) -> int:
         """
         Store or update session data.
 
         Args:
             session_id: Session identifier
-            data: JSON string of session data
+            data: Session data, including its assets
             expires_at: Expiration datetime
+
+        Returns:
+            The session's new version
         """
+        with self._get_connection() as conn:
+            version = self._upsert_session(conn, session_id, data, expires_at)
+            # data holds the whole session; any asset rows are stale
+            conn.execute("DELETE FROM session_assets WHERE session_id = ?", (session_id,))
+            conn.execute("DELETE FROM session_asset_snapshots WHERE session_id = ?", (session_id,))
+            conn.commit()
+            return version
+
+    def _upsert_session(self, conn, session_id: str, data: Union[str, bytes], expires_at: datetime) -> int:
+        """Write the sessions row and bump its version (caller commits); returns the version."""
         now = datetime.utcnow()
+        # Use INSERT ... ON CONFLICT to preserve created_at on updates
+        conn.execute(
+            """
+            INSERT INTO sessions (session_id, data, created_at, last_accessed, expires_at, version)
+            VALUES (?, ?, ?, ?, ?, 1)
+            ON CONFLICT(session_id) DO UPDATE SET
+                data = excluded.data,
+                last_accessed = excluded.last_accessed,
+                expires_at = excluded.expires_at,
+                version = sessions.version + 1
+            """,
+            (
+                session_id,
+                data,
+                now.isoformat(),
+                now.isoformat(),
+                expires_at.isoformat()
+            )
+        )
+        return conn.execute(
+            "SELECT version FROM sessions WHERE session_id = ?",
+            (session_id,)
+        ).fetchone()['version']
+
+    def get_version(self, session_id: str) -> Optional[int]:
+        """
+        Get a session's version (bumped by every write), without loading it.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Version, or None if not found/expired
+        """
+        now = datetime.utcnow().isoformat()
 
         with self._get_connection() as conn:
-            # Use INSERT ... ON CONFLICT to preserve created_at on updates
-            conn.execute(
+            row = conn.execute(
+                """
+                SELECT version FROM sessions
+                WHERE session_id = ? AND expires_at > ?
+                """,
+                (session_id, now)
+            ).fetchone()
+            return row['version'] if row else None
+
+    def get_rows(
+        self, session_id: str
+    ) -> Optional[Tuple[Union[str, bytes], Optional[bytes], List[Tuple[int, str]], int]]:
+        """
+        Get session data, asset snapshot, asset rows and version by ID.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            (session data, snapshot or None, [(asset key, JSON string of
+            asset, '' if deleted)] in insertion order, version), or None if
+            not found/expired
+        """
+        now = datetime.utcnow().isoformat()
+
+        with self._get_connection() as conn:
+            row = conn.execute(
                 """
-                INSERT INTO sessions (session_id, data, created_at, last_accessed, expires_at)
-                VALUES (?, ?, ?, ?, ?)
-                ON CONFLICT(session_id) DO UPDATE SET
-                    data = excluded.data,
-                    last_accessed = excluded.last_accessed,
-                    expires_at = excluded.expires_at
+                SELECT data, version FROM sessions
+                WHERE session_id = ? AND expires_at > ?
                 """,
-                (
-                    session_id,
-                    data,
-                    now.isoformat(),
-                    now.isoformat(),
-                    expires_at.isoformat()
+                (session_id, now)
+            ).fetchone()
+
+            if not row:
+                return None
+
+            snapshot = conn.execute(
+                "SELECT data FROM session_asset_snapshots WHERE session_id = ?",
+                (session_id,)
+            ).fetchone()
+            assets = conn.execute(
+                """
+                SELECT asset_key, data FROM session_assets
+                WHERE session_id = ?
+                ORDER BY rowid
+                """,
+                (session_id,)
+            ).fetchall()
+            return (
+                row['data'],
+                snapshot['data'] if snapshot else None,
+                [(r['asset_key'], r['data']) for r in assets],
+                row['version'],
+            )
+
+    def set_rows(
+        self,
+        session_id: str,
+        data: Union[str, bytes],
+        expires_at: datetime,
+        assets: Iterable[Tuple[int, str]] = (),
+        deleted: Sequence[int] = (),
+        snapshot: Optional[bytes] = None,
+    ) -> int:
+        """
+        Store session data and changed assets in one transaction.
+
+        Args:
+            session_id: Session identifier
+            data: Session data (without assets)
+            expires_at: Expiration datetime
+            assets: (asset key, JSON string) rows to insert or update
+            deleted: Asset keys to record as deleted
+            snapshot: All assets; replaces the stored snapshot and rows
+
+        Returns:
+            The session's new version
+        """
+        with self._get_connection() as conn:
+            version = self._upsert_session(conn, session_id, data, expires_at)
+            if snapshot is not None:
+                conn.execute("DELETE FROM session_assets WHERE session_id = ?", (session_id,))
+                conn.execute(
+                    """
+                    INSERT INTO session_asset_snapshots (session_id, data)
+                    VALUES (?, ?)
+                    ON CONFLICT(session_id) DO UPDATE SET
+                        data = excluded.data
+                    """,
+                    (session_id, snapshot)
                 )
+            # A deleted asset may be in the snapshot: keep an empty row for it
+            assets = list(assets) + [(key, "") for key in deleted]
+            conn.executemany(
+                """
+                INSERT INTO session_assets (session_id, asset_key, data)
+                VALUES (?, ?, ?)
+                ON CONFLICT(session_id, asset_key) DO UPDATE SET
+                    data = excluded.data
+                """,
+                ((session_id, key, asset_data) for key, asset_data in assets)
             )
             conn.commit()
+            return version
 
     def delete(self, session_id: str) -> bool:
         """
@@ -175,6 +342,14 @@ class SQLiteSessionStore:
             True if session was deleted, False if not found
         """
         with self._get_connection() as conn:
+            conn.execute(
+                "DELETE FROM session_assets WHERE session_id = ?",
+                (session_id,)
+            )
+            conn.execute(
+                "DELETE FROM session_asset_snapshots WHERE session_id = ?",
+                (session_id,)
+            )
             cursor = conn.execute(
                 "DELETE FROM sessions WHERE session_id = ?",
                 (session_id,)
@@ -192,6 +367,15 @@ class SQLiteSessionStore:
         now = datetime.utcnow().isoformat()
 
         with self._get_connection() as conn:
+            for table in ("session_assets", "session_asset_snapshots"):
+                conn.execute(
+                    f"""
+                    DELETE FROM {table} WHERE session_id IN (
+                        SELECT session_id FROM sessions WHERE expires_at <= ?
+                    )
+                    """,
+                    (now,)
+                )
             cursor = conn.execute(
                 "DELETE FROM sessions WHERE expires_at <= ?",
                 (now,)
@@ -224,6 +408,14 @@ class SQLiteSessionStore:
                 (now,)
             ).fetchone()['cnt']
 
+            asset_rows = conn.execute(
+                "SELECT COUNT(*) as cnt FROM session_assets"
+            ).fetchone()['cnt']
+
+            snapshots = conn.execute(
+                "SELECT COUNT(*) as cnt, COALESCE(SUM(LENGTH(data)), 0) as size FROM session_asset_snapshots"
+            ).fetchone()
+
             # Get database file size
             db_size = 0
             if self.db_path != ":memory:":
@@ -238,6 +430,9 @@ class SQLiteSessionStore:
                 "total_sessions": total,
                 "active_sessions": active,
                 "expired_sessions": total - active,
+                "asset_rows": asset_rows,
+                "asset_snapshots": snapshots['cnt'],
+                "asset_snapshot_bytes": snapshots['size'],
                 "db_size_bytes": db_size,
             }
 
@@ -23,13 +23,19 @@ Author: Fixed Asset AI Team
 from __future__ import annotations
 
 import os
+import json
+import hashlib
 import logging
 import warnings
+import multiprocessing
 from datetime import datetime
-from typing import Dict, Optional, List, Tuple, Set, Any
-from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass, field as dc_field
 from enum import Enum
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
+import numpy as np
 import pandas as pd
 import re
 from rapidfuzz import fuzz
@@ -86,6 +92,18 @@ HEADER_SCAN_MAX_ROWS = 100  # Increased from 50 to handle extreme cases
 HEADER_NUMERIC_PENALTY_THRESHOLD = 0.4
 HEADER_REPETITION_MAX_LENGTH = 30
 
+# Parallel sheet processing in build_unified_dataframe (0 or 1 = serial).
+# Each worker is a fresh process, so only workbooks with at least
+# PARALLEL_SHEET_MIN_ROWS rows across 2+ sheets are processed in parallel.
+SHEET_LOADER_MAX_WORKERS = int(os.environ.get("SHEET_LOADER_MAX_WORKERS", "0"))
+PARALLEL_SHEET_MIN_ROWS = 20000
+
+# Reuse header row / column map / sheet role detected for a previous upload
+# with the same sheet layout (see _sheet_structure_key). Bump the version
+# whenever header detection or column mapping changes, so old entries miss.
+SHEET_STRUCTURE_CACHE_ENABLED = os.environ.get("SHEET_STRUCTURE_CACHE", "1") != "0"
+SHEET_STRUCTURE_CACHE_VERSION = 1
+
 # Scoring weights for header detection
 class HeaderScore:
     """Scoring weights for header row detection"""
@@ -1575,6 +1593,24 @@ def _extract_fiscal_year_from_sheet(sheet_name: str) -> Optional[int]:
     return None
 
 
+def _fiscal_year_bounds(target_tax_year: int, fy_start_month: int = 1) -> Tuple[pd.Timestamp, pd.Timestamp]:
+    """First and last day (midnight) of the fiscal year ending in target_tax_year."""
+    if fy_start_month == 1:
+        # Calendar year: Jan 1 to Dec 31
+        fy_start = pd.Timestamp(year=target_tax_year, month=1, day=1)
+        fy_end = pd.Timestamp(year=target_tax_year, month=12, day=31)
+    else:
+        # Fiscal year: e.g., Apr 1, 2024 to Mar 31, 2025 for FY 2025
+        # The fiscal year ENDS in the target_tax_year
+        fy_start = pd.Timestamp(year=target_tax_year - 1, month=fy_start_month, day=1)
+        # End is last day of month before fy_start_month in target_tax_year
+        end_month = fy_start_month - 1 if fy_start_month > 1 else 12
+        end_year = target_tax_year if fy_start_month > 1 else target_tax_year
+        # Get last day of end month
+        fy_end = pd.Timestamp(year=end_year, month=end_month, day=1) + pd.offsets.MonthEnd(0)
+    return fy_start, fy_end
+
+
 def _is_date_in_fiscal_year(
     date_val,
     target_tax_year: int,
@@ -1614,21 +1650,7 @@ def _is_date_in_fiscal_year(
         if pd.isna(dt):
             return False
 
-        # Calculate fiscal year boundaries
-        if fy_start_month == 1:
-            # Calendar year: Jan 1 to Dec 31
-            fy_start = pd.Timestamp(year=target_tax_year, month=1, day=1)
-            fy_end = pd.Timestamp(year=target_tax_year, month=12, day=31)
-        else:
-            # Fiscal year: e.g., Apr 1, 2024 to Mar 31, 2025 for FY 2025
-            # The fiscal year ENDS in the target_tax_year
-            fy_start = pd.Timestamp(year=target_tax_year - 1, month=fy_start_month, day=1)
-            # End is last day of month before fy_start_month in target_tax_year
-            end_month = fy_start_month - 1 if fy_start_month > 1 else 12
-            end_year = target_tax_year if fy_start_month > 1 else target_tax_year
-            # Get last day of end month
-            fy_end = pd.Timestamp(year=end_year, month=end_month, day=1) + pd.offsets.MonthEnd(0)
-
+        fy_start, fy_end = _fiscal_year_bounds(target_tax_year, fy_start_month)
         return fy_start <= dt <= fy_end
 
     except Exception:
@@ -1691,6 +1713,23 @@ def _detect_sheet_role(sheet_name: str, df: pd.DataFrame) -> SheetRole:
 # TRANSACTION TYPE DETECTION
 # ====================================================================================
 
+# Transaction type column values, checked in order
+TRANSACTION_TYPE_VALUES = [
+    # NOTE: Removed "delete" (matches "delete key"), "sale" (matches "sales")
+    ("disposal", ["dispos", "sold", "retire", "scrap", "writeoff"]),
+    # NOTE: Removed "move" (matches "removal", "movement"), "relocate" (too broad)
+    ("transfer", ["transfer", "xfer", "reclass"]),
+    # NOTE: Removed "add" (matches "address", "additional")
+    ("addition", ["addition", "new asset", "purchase", "acquisition"]),
+]
+
+# Description words that indicate a transaction type, checked in order
+TRANSACTION_DESCRIPTION_WORDS = [
+    ("disposal", ["disposed", "sold", "retired", "scrapped", "writeoff", "write-off", "disposal"]),
+    ("transfer", ["transfer", "xfer", "reclass", "reclassify", "reclassification", "moved", "relocated"]),
+]
+
+
 def _detect_transaction_type(
     row: pd.Series,
     description_col: Optional[str],
@@ -1715,18 +1754,9 @@ def _detect_transaction_type(
     if transaction_type_col:
         trans_val = str(row.get(transaction_type_col, "")).lower().strip()
         if trans_val:
-            # Check for disposal indicators
-            # NOTE: Removed "delete" (matches "delete key"), "sale" (matches "sales")
-            if any(x in trans_val for x in ["dispos", "sold", "retire", "scrap", "writeoff"]):
-                return "disposal"
-            # Check for transfer indicators
-            # NOTE: Removed "move" (matches "removal", "movement"), "relocate" (too broad)
-            if any(x in trans_val for x in ["transfer", "xfer", "reclass"]):
-                return "transfer"
-            # Check for addition indicators
-            # NOTE: Removed "add" (matches "address", "additional")
-            if any(x in trans_val for x in ["addition", "new asset", "purchase", "acquisition"]):
-                return "addition"
+            for trans_type, indicators in TRANSACTION_TYPE_VALUES:
+                if any(x in trans_val for x in indicators):
+                    return trans_type
 
     # Check if disposal date is present (strong indicator of disposal)
     if disposal_date_col:
@@ -1738,17 +1768,10 @@ def _detect_transaction_type(
     if description_col:
         desc = str(row.get(description_col, "")).lower()
 
-        # Check for disposal indicators
-        disposal_words = ["disposed", "sold", "retired", "scrapped", "writeoff", "write-off", "disposal"]
-        for word in disposal_words:
-            if word in desc:
-                return "disposal"
-
-        # Check for transfer indicators
-        transfer_words = ["transfer", "xfer", "reclass", "reclassify", "reclassification", "moved", "relocated"]
-        for word in transfer_words:
-            if word in desc:
-                return "transfer"
+        for trans_type, words in TRANSACTION_DESCRIPTION_WORDS:
+            for word in words:
+                if word in desc:
+                    return trans_type
 
     # Check for negative cost (disposal)
     if cost_col:
@@ -1767,6 +1790,13 @@ def _detect_transaction_type(
 # DATA CLEANING & VALIDATION
 # ====================================================================================
 
+# Header column names that show up again as data when Excel repeats headers
+HEADER_REPETITION_KEYWORDS = [
+    "description", "asset description", "property", "item",
+    "equipment", "asset id", "asset #", "asset no"
+]
+
+
 def _is_header_repetition(desc: str) -> bool:
     """
     Check if a description value is actually a repeated header or category label
@@ -1779,13 +1809,7 @@ def _is_header_repetition(desc: str) -> bool:
     """
     desc_lower = desc.lower().strip()
 
-    # Header column names
-    header_keywords = [
-        "description", "asset description", "property", "item",
-        "equipment", "asset id", "asset #", "asset no"
-    ]
-
-    if any(keyword in desc_lower for keyword in header_keywords):
+    if any(keyword in desc_lower for keyword in HEADER_REPETITION_KEYWORDS):
         if len(desc) < HEADER_REPETITION_MAX_LENGTH:
             return True
 
@@ -1893,6 +1917,18 @@ NON_ASSET_ID_PATTERNS = [
     r'^\*+$',       # Just asterisks
 ]
 
+# Generic descriptions that, without an Asset ID, indicate a planning row
+GENERIC_PLANNING_DESCRIPTIONS = [
+    "office space", "office expansion", "new office",
+    "building", "new building", "facility",
+    "equipment", "new equipment", "additional equipment",
+    "furniture", "new furniture",
+    "warehouse", "warehouse expansion",
+    "renovation", "remodel", "improvements",
+    "expansion", "upgrade", "upgrades",
+    "capital project", "capex", "cap ex",
+]
+
 # Accounting adjustment row patterns - these are NOT actual fixed assets
 # They are journal entry descriptions or period adjustments
 ACCOUNTING_ADJUSTMENT_KEYWORDS = [
@@ -2031,18 +2067,7 @@ def _is_budget_or_planning_row(desc: str, asset_id: str = "", cost: float = None
 
     if no_asset_id:
         # Generic planning descriptions (no specific details = likely not real)
-        generic_planning_descriptions = [
-            "office space", "office expansion", "new office",
-            "building", "new building", "facility",
-            "equipment", "new equipment", "additional equipment",
-            "furniture", "new furniture",
-            "warehouse", "warehouse expansion",
-            "renovation", "remodel", "improvements",
-            "expansion", "upgrade", "upgrades",
-            "capital project", "capex", "cap ex",
-        ]
-
-        for pattern in generic_planning_descriptions:
+        for pattern in GENERIC_PLANNING_DESCRIPTIONS:
             if pattern in desc_lower:
                 logger.debug(f"Skipping planning row (no Asset ID + generic desc): {desc}")
                 return True
@@ -2509,6 +2534,358 @@ def _clean_row_data(row: pd.Series, col_map: Dict[str, str]) -> Optional[Dict[st
     }
 
 
+# ====================================================================================
+# VECTORIZED ROW CLEANING
+# ====================================================================================
+# Whole-sheet equivalent of _clean_row_data, _is_date_in_fiscal_year and
+# _detect_transaction_type. Skip predicates run as boolean masks with the
+# patterns below compiled once; numbers and dates are parsed once per
+# distinct cell value. The row functions above stay the reference: each
+# row must be kept or skipped exactly as they would decide.
+
+# Skip reasons recorded by _clean_sheet_frame, in the order rows are checked
+SKIP_EMPTY_ROW = "Empty row"
+SKIP_HEADER_REPETITION = "Header repetition"
+SKIP_CATEGORY_LABEL = "Category label"
+SKIP_TOTALS_ROW = "Totals row"
+SKIP_ACCOUNTING_ADJUSTMENT = "Accounting adjustment"
+SKIP_BUDGET_PLANNING = "Budget/planning row"
+SKIP_INVALID_DESCRIPTION = "Invalid description"
+SKIP_PLACEHOLDER = "$0 placeholder"
+SKIP_NEGATIVE_COST = "Negative cost"
+SKIP_OUTSIDE_FISCAL_YEAR = "Outside target fiscal year"
+
+
+def _alternation(keywords: List[str]) -> str:
+    return "|".join(re.escape(k) for k in keywords)
+
+
+def _whole_word_regex(keywords: List[str]) -> re.Pattern:
+    """Matches if any keyword is a whole whitespace-separated word."""
+    return re.compile(r"(?:^|\s)(?:" + _alternation(keywords) + r")(?=\s|$)")
+
+
+_HEADER_REPETITION_RE = re.compile(_alternation(HEADER_REPETITION_KEYWORDS))
+_CATEGORY_LABEL_RE = re.compile("|".join(f"(?:{p})" for p in CATEGORY_LABEL_PATTERNS))
+# keyword at the start or after a space (f" {keyword}" in f" {desc_lower}")
+_TOTALS_KEYWORD_RE = re.compile(r"(?:^| )(?:" + _alternation(TOTALS_ROW_KEYWORDS) + ")")
+_TOTALS_PATTERN_RE = re.compile(r"(?:^(?:total|subtotal|sum)\s*[-:]\s*)|(?:^[\*\=\-\s]*(?:total|subtotal)[\*\=\-\s]*$)")
+_ADJUSTMENT_KEYWORD_RE = re.compile(_alternation(ACCOUNTING_ADJUSTMENT_KEYWORDS))
+# first word starts with a month name, a later word contains an accounting keyword
+_MONTH_ADJUSTMENT_RE = re.compile(
+    r"^(?:" + _alternation(MONTH_NAMES) + r")\S*\s.*?(?:" + _alternation(ACCOUNTING_ADJUSTMENT_KEYWORDS) + ")",
+    re.DOTALL,
+)
+_ADJUSTMENT_WORD_RE = _whole_word_regex(ACCOUNTING_ADJUSTMENT_KEYWORDS)
+_NON_ASSET_ID_RE = re.compile("|".join(f"(?:{p})" for p in NON_ASSET_ID_PATTERNS))
+_BUDGET_PREFIX_RE = re.compile(r"^(?:" + _alternation(BUDGET_PLANNING_KEYWORDS) + ")")
+_BUDGET_WORD_RE = _whole_word_regex(BUDGET_PLANNING_KEYWORDS)
+_GENERIC_PLANNING_RE = re.compile(_alternation(GENERIC_PLANNING_DESCRIPTIONS))
+_INVALID_DESCRIPTION_RE = re.compile("|".join(f"(?:{p})" for p in INVALID_DESCRIPTION_PATTERNS))
+_NUMERIC_PLACEHOLDER_RE = re.compile(r'^[\d\-\.]+$')
+_WORD_RE = re.compile(r"\S+")
+_LETTER_WORD_RE = re.compile(r"\S*[a-zA-Z]\S*")
+_DESC_COLLAPSE_SPACE_RE = re.compile(r"\s+")
+_DESC_CORRUPT_CHARS_RE = re.compile(r"[^\w\s\-\.,/()]")
+
+
+def _column_values(df: pd.DataFrame, col: Optional[str]) -> Optional[np.ndarray]:
+    """Raw cell values of a mapped column as Python objects, or None if unmapped."""
+    if not col or col not in df.columns:
+        return None
+    return df[col].to_numpy(dtype=object)
+
+
+def _text_column(values: Optional[np.ndarray], n: int) -> pd.Series:
+    """str(value).strip() for every cell ("" if the column is unmapped)."""
+    if values is None:
+        return pd.Series([""] * n, dtype=object)
+    return pd.Series([str(v) for v in values], dtype=object).str.strip()
+
+
+def _optional_text_column(values: Optional[np.ndarray], n: int, empty=""):
+    """str(value).strip() for non-null cells, `empty` otherwise."""
+    out = np.full(n, empty, dtype=object)
+    if values is not None:
+        notna = pd.notna(values)
+        text = _text_column(values[notna], int(notna.sum())).to_numpy()
+        if empty is not None:
+            out[notna] = text
+        else:
+            out[notna] = np.where(text == "", None, text)
+    return out
+
+
+def _map_distinct(values: np.ndarray, func: Callable[[Any], Any], passthrough: Optional[type] = None) -> np.ndarray:
+    """
+    Apply func once per distinct non-null value (None for nulls).
+
+    Values are keyed by (type, value) so 1, 1.0 and True stay distinct.
+    Instances of passthrough are returned unchanged.
+    """
+    out = np.full(len(values), None, dtype=object)
+    cache: Dict[Any, Any] = {}
+    for i in np.flatnonzero(pd.notna(values)):
+        v = values[i]
+        if passthrough is not None and type(v) is passthrough:
+            out[i] = v
+            continue
+        try:
+            key = (type(v), v)
+            if key not in cache:
+                cache[key] = func(v)
+            out[i] = cache[key]
+        except TypeError:  # unhashable cell value
+            out[i] = func(v)
+    return out
+
+
+def _parse_number_column(values: Optional[np.ndarray], n: int, as_text: bool = False) -> np.ndarray:
+    """
+    parse_number over a column (as_text parses str(value), like the life columns).
+
+    int/float cells convert directly; text is parsed once per distinct value.
+    """
+    if values is None:
+        return np.full(n, None, dtype=object)
+    out = np.full(n, None, dtype=object)
+    types = pd.Series(values, dtype=object).map(type).to_numpy()
+    numeric = ((types == float) | (types == int)) & pd.notna(values)
+    out[numeric] = values[numeric].astype(float).astype(object)
+    other = ~numeric
+    if other.any():
+        parse = (lambda v: parse_number(str(v))) if as_text else parse_number
+        out[other] = _map_distinct(values[other], parse)
+    return out
+
+
+def _parse_date_column(values: Optional[np.ndarray], n: int) -> np.ndarray:
+    """parse_date over a column; Timestamps pass through, others parse once per value."""
+    if values is None:
+        return np.full(n, None, dtype=object)
+    return _map_distinct(values, parse_date, passthrough=pd.Timestamp)
+
+
+def _fiscal_year_mask(dates: np.ndarray, target_tax_year: int, fy_start_month: int = 1) -> np.ndarray:
+    """Vectorized _is_date_in_fiscal_year over an array of Timestamps/None."""
+    fy_start, fy_end = _fiscal_year_bounds(target_tax_year, fy_start_month)
+    try:
+        dt = pd.to_datetime(pd.Series(dates, dtype=object), errors="coerce")
+        return ((dt >= fy_start) & (dt <= fy_end)).to_numpy()
+    except (TypeError, ValueError):
+        # e.g. timezone-aware dates, which never compare to the naive bounds
+        return np.array([_is_date_in_fiscal_year(d, target_tax_year, fy_start_month) for d in dates], dtype=bool)
+
+
+def _clean_sheet_frame(
+    df: pd.DataFrame,
+    col_map: Dict[str, str],
+    target_tax_year: Optional[int] = None,
+    fy_start_month: int = 1
+) -> pd.DataFrame:
+    """
+    Clean and validate every row of a sheet at once.
+
+    Columnar equivalent of calling _clean_row_data on each row, followed by
+    the fiscal year filter when target_tax_year is given.
+
+    Args:
+        df: Sheet data with normalized column headers
+        col_map: Dictionary mapping logical field names to Excel column names
+        target_tax_year: If given, rows dated outside this fiscal year are skipped
+        fy_start_month: First month of fiscal year (1=Jan, 4=Apr)
+
+    Returns:
+        DataFrame aligned with df: the _clean_row_data fields (object
+        columns, None where missing) plus "skip_reason", which is None for
+        kept rows and one of the SKIP_* reasons otherwise
+    """
+    n = len(df)
+    values = {field: _column_values(df, col) for field, col in col_map.items()}
+    reasons = np.full(n, None, dtype=object)
+    live = np.ones(n, dtype=bool)
+
+    def skip(mask, reason):
+        hit = live & np.asarray(mask, dtype=bool)
+        reasons[hit] = reason
+        live[hit] = False
+
+    asset_id = _text_column(values.get("asset_id"), n)
+    desc_raw = _text_column(values.get("description"), n)
+    desc_lower = desc_raw.str.lower().str.strip()
+    has_desc = (desc_raw != "").to_numpy()
+    desc_len = desc_raw.str.len().to_numpy()
+    desc_words = desc_lower.str.count(_WORD_RE).to_numpy()
+
+    skip((asset_id == "") & ~has_desc, SKIP_EMPTY_ROW)
+    skip(desc_lower.str.contains(_HEADER_REPETITION_RE) & (desc_len < HEADER_REPETITION_MAX_LENGTH),
+         SKIP_HEADER_REPETITION)
+    skip(has_desc & desc_lower.str.match(_CATEGORY_LABEL_RE), SKIP_CATEGORY_LABEL)
+    skip(has_desc & ((desc_lower.str.contains(_TOTALS_KEYWORD_RE) & (desc_len < 80))
+                     | desc_lower.str.contains(_TOTALS_PATTERN_RE)), SKIP_TOTALS_ROW)
+    skip(has_desc & (((desc_words <= 3) & desc_lower.str.contains(_ADJUSTMENT_KEYWORD_RE))
+                     | desc_lower.str.contains(_MONTH_ADJUSTMENT_RE)
+                     | ((desc_words <= 2) & desc_lower.str.contains(_ADJUSTMENT_WORD_RE))),
+         SKIP_ACCOUNTING_ADJUSTMENT)
+
+    cost = _parse_number_column(values.get("cost"), n)
+    cost_f = cost.astype(float)  # None -> NaN; NaN fails every comparison
+
+    id_lower = asset_id.str.lower().str.strip()
+    no_asset_id = id_lower.isin(["none", "nan", "", "null"]).to_numpy()
+    with np.errstate(invalid="ignore"):  # inf % x
+        round_cost = ((cost_f >= 50000) & (cost_f % 10000 == 0)) | ((cost_f >= 25000) & (cost_f % 25000 == 0))
+    skip(((id_lower != "") & id_lower.str.match(_NON_ASSET_ID_RE))
+         | desc_lower.str.contains(_BUDGET_PREFIX_RE) | id_lower.str.contains(_BUDGET_PREFIX_RE)
+         | ((desc_words <= 5) & desc_lower.str.contains(_BUDGET_WORD_RE))
+         | (no_asset_id & (desc_lower.str.contains(_GENERIC_PLANNING_RE).to_numpy()
+                           | ((desc_words <= 2) & (desc_lower.str.len() < 20).to_numpy())
+                           | round_cost)),
+         SKIP_BUDGET_PLANNING)
+
+    # typo_engine.correct_description
+    description = (desc_raw.str.strip()
+                   .str.replace(_DESC_COLLAPSE_SPACE_RE, " ", regex=True)
+                   .str.replace(_DESC_CORRUPT_CHARS_RE, "", regex=True)
+                   .str.replace("–", "-", regex=False).str.replace("—", "-", regex=False))
+    description = description.where(has_desc, "")
+    desc_clean = description.str.strip()
+    clean_len = desc_clean.str.len().to_numpy()
+    skip((description == "").to_numpy()
+         | (clean_len < MIN_DESCRIPTION_LENGTH)
+         | desc_clean.str.lower().str.match(_INVALID_DESCRIPTION_RE).to_numpy()
+         | ~desc_clean.str.contains(r"[a-zA-Z]").to_numpy()
+         | (desc_clean.str.count(_LETTER_WORD_RE).to_numpy() < MIN_DESCRIPTION_WORDS)
+         | ((cost_f == 0) & (desc_clean.str.count(_LETTER_WORD_RE).to_numpy() < 2) & (clean_len < 8)),
+         SKIP_INVALID_DESCRIPTION)
+    skip((cost_f == 0) & ((clean_len < 5) | desc_clean.str.match(_NUMERIC_PLACEHOLDER_RE).to_numpy()),
+         SKIP_PLACEHOLDER)
+    skip(cost_f < 0, SKIP_NEGATIVE_COST)
+
+    # Remaining fields are only parsed for rows that survived the checks
+    def kept(field_values):
+        return None if field_values is None else field_values[live]
+
+    k = int(live.sum())
+    acq_date = _parse_date_column(kept(values.get("acquisition_date")), k)
+    pis_date = _parse_date_column(kept(values.get("in_service_date")), k)
+
+    if target_tax_year:
+        # in_service_date first, then acquisition_date; undated rows are kept
+        row_date = np.where(pis_date == None, acq_date, pis_date)  # noqa: E711
+        dated = row_date != None  # noqa: E711
+        outside = np.zeros(n, dtype=bool)
+        outside[np.flatnonzero(live)] = dated & ~_fiscal_year_mask(row_date, target_tax_year, fy_start_month)
+        kept_before = live.copy()
+        skip(outside, SKIP_OUTSIDE_FISCAL_YEAR)
+        still = live[kept_before]
+        acq_date, pis_date, k = acq_date[still], pis_date[still], int(live.sum())
+
+    def number(field, as_text=False):
+        return _parse_number_column(kept(values.get(field)), k, as_text=as_text)
+
+    category = np.full(k, "", dtype=object)
+    cat_values = kept(values.get("category"))
+    if cat_values is not None:
+        notna = pd.notna(cat_values)
+        category[notna] = _map_distinct(cat_values[notna], lambda v: typo_engine.correct_category(str(v)))
+
+    business_use_pct = number("business_use_pct")
+    over_one = business_use_pct.astype(float) > 1
+    business_use_pct[over_one] = business_use_pct[over_one].astype(float) / 100.0
+
+    cost = cost[live]
+    accumulated_depreciation = number("accumulated_depreciation")
+    proceeds = number("proceeds")
+    net_book_value = number("net_book_value")
+    gain_loss = number("gain_loss")
+    # Auto-calculate NBV, then gain/loss, when the client left them out
+    calc = (net_book_value == None) & (cost != None) & (accumulated_depreciation != None)  # noqa: E711
+    net_book_value[calc] = cost[calc].astype(float) - accumulated_depreciation[calc].astype(float)
+    calc = (gain_loss == None) & (net_book_value != None) & (proceeds != None)  # noqa: E711
+    gain_loss[calc] = proceeds[calc].astype(float) - net_book_value[calc].astype(float)
+
+    life_field = "tax_life" if col_map.get("tax_life") else "life"
+    method_field = "tax_method" if col_map.get("tax_method") else "method"
+
+    cleaned = pd.DataFrame({
+        "asset_id": asset_id.to_numpy()[live],
+        "description": description.to_numpy()[live],
+        "client_category": category,
+        "cost": cost,
+        "acquisition_date": acq_date,
+        "in_service_date": pis_date,
+        "disposal_date": _parse_date_column(kept(values.get("disposal_date")), k),
+        # Transfer fields
+        "transfer_date": _parse_date_column(kept(values.get("transfer_date")), k),
+        "from_location": _optional_text_column(kept(values.get("from_location")), k),
+        "to_location": _optional_text_column(kept(values.get("to_location")), k),
+        # Location/Department
+        "location": _optional_text_column(kept(values.get("location")), k),
+        "department": _optional_text_column(kept(values.get("department")), k),
+        "business_use_pct": business_use_pct,
+        "proceeds": proceeds,
+        "accumulated_depreciation": accumulated_depreciation,
+        "section_179_taken": number("section_179_taken"),
+        "bonus_taken": number("bonus_taken"),
+        "net_book_value": net_book_value,
+        "gain_loss": gain_loss,
+        # Book vs Tax specific
+        "tax_life": number(life_field, as_text=True),
+        "book_life": number("book_life", as_text=True),
+        "tax_method": _optional_text_column(kept(values.get(method_field)), k, empty=None),
+        "book_method": _optional_text_column(kept(values.get("book_method")), k, empty=None),
+    }, index=df.index[live], dtype=object)
+
+    cleaned = cleaned.reindex(df.index)
+    cleaned["skip_reason"] = reasons
+    return cleaned
+
+
+def _detect_transaction_types(df: pd.DataFrame, col_map: Dict[str, str]) -> pd.Series:
+    """
+    Vectorized _detect_transaction_type for rows that passed cleaning.
+
+    Returns:
+        Series of "addition", "disposal" or "transfer" aligned with df
+    """
+    n = len(df)
+    result = np.full(n, "addition", dtype=object)
+    decided = np.zeros(n, dtype=bool)
+
+    def assign(mask, trans_type):
+        hit = ~decided & np.asarray(mask, dtype=bool)
+        result[hit] = trans_type
+        decided[hit] = True
+
+    # Explicit transaction type column ("nan" for blank cells, as str() gives)
+    trans_values = _column_values(df, col_map.get("transaction_type"))
+    if trans_values is not None:
+        trans_val = _text_column(trans_values, n).str.lower().str.strip()
+        for trans_type, indicators in TRANSACTION_TYPE_VALUES:
+            assign((trans_val != "") & trans_val.str.contains(_alternation(indicators)), trans_type)
+
+    # A populated disposal date
+    disposal_values = _column_values(df, col_map.get("disposal_date"))
+    if disposal_values is not None:
+        assign(pd.notna(disposal_values) & ~pd.Series(disposal_values, dtype=object).isin(["", 0]).to_numpy(),
+               "disposal")
+
+    # Description keywords
+    desc_values = _column_values(df, col_map.get("description"))
+    if desc_values is not None:
+        desc = pd.Series([str(v) for v in desc_values], dtype=object).str.lower()
+        for trans_type, words in TRANSACTION_DESCRIPTION_WORDS:
+            assign(desc.str.contains(_alternation(words)), trans_type)
+
+    # Negative cost
+    cost_values = _column_values(df, col_map.get("cost"))
+    if cost_values is not None:
+        assign(_parse_number_column(cost_values, n).astype(float) < 0, "disposal")
+
+    return pd.Series(result, index=df.index)
+
+
 # ====================================================================================
 # COLUMN MAPPING WITH VALIDATION
 # ====================================================================================
@@ -2881,17 +3258,460 @@ def _is_numeric_value(val) -> bool:
         return False
 
 
+# ====================================================================================
+# SHEET STRUCTURE CACHE
+# ====================================================================================
+
+_STRUCTURE_DIGITS_RE = re.compile(r"\d+")
+
+
+def _normalize_structure_text(value) -> str:
+    """Cell or sheet name text for fingerprints; digits are collapsed so FY2024 matches FY2025"""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return ""
+    return _STRUCTURE_DIGITS_RE.sub("#", " ".join(str(value).split()).lower())
+
+
+def _sheet_structure_key(sheet_name: str, df_raw: pd.DataFrame, options: _SheetLoadOptions) -> str:
+    """
+    Cache key for a sheet layout: normalized sheet name, column count, and
+    the client settings that feed header detection and column mapping.
+    """
+    key = [
+        SHEET_STRUCTURE_CACHE_VERSION,
+        _normalize_structure_text(sheet_name),
+        int(df_raw.shape[1]),
+        options.client_col_mappings,
+        options.additional_keywords,
+        options.client_header_row,
+    ]
+    return hashlib.sha256(json.dumps(key, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _header_region_hash(df_raw: pd.DataFrame, n_rows: int) -> str:
+    """Hash of the normalized cells in the first n_rows rows (titles + header rows)"""
+    digest = hashlib.sha256()
+    for row in df_raw.iloc[:n_rows].itertuples(index=False, name=None):
+        digest.update("\x1f".join(_normalize_structure_text(v) for v in row).encode("utf-8"))
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+def _sheet_structure_entry(
+    sheet_name: str,
+    df_raw: pd.DataFrame,
+    df: pd.DataFrame,
+    header_idx: int,
+    use_multi_row: bool,
+    col_map: Dict[str, str],
+    sheet_role: SheetRole
+) -> Dict[str, Any]:
+    """Cache entry for a sheet whose structure was just detected"""
+    region_rows = header_idx + (2 if use_multi_row else 1)
+    return {
+        "sheet_name": sheet_name,
+        "header_idx": header_idx,
+        "region_rows": region_rows,
+        "region_hash": _header_region_hash(df_raw, region_rows),
+        "headers": list(df.columns),
+        "col_map": col_map,
+        "sheet_role": sheet_role.value,
+    }
+
+
+def _apply_sheet_structure(
+    df_raw: pd.DataFrame,
+    entry: Dict[str, Any]
+) -> Optional[Tuple[pd.DataFrame, int, Dict[str, str], SheetRole]]:
+    """
+    Rebuild a sheet's data frame from a cached structure entry.
+
+    Returns (df, header_idx, col_map, sheet_role), or None if the title and
+    header rows differ from the cached ones or the cached column map no
+    longer fits the headers.
+    """
+    region_rows = entry["region_rows"]
+    if len(df_raw) < region_rows or _header_region_hash(df_raw, region_rows) != entry["region_hash"]:
+        return None
+
+    headers = entry["headers"]
+    col_map = entry["col_map"]
+    if len(headers) != df_raw.shape[1] or not col_map.get("description"):
+        return None
+    if any(col not in headers for col in col_map.values()):
+        return None
+
+    df = df_raw.iloc[region_rows:].copy()
+    df.columns = headers
+    df = df.reset_index(drop=True)
+    return df, entry["header_idx"], dict(col_map), SheetRole(entry["sheet_role"])
+
+
+def _detect_sheet_layout(
+    sheet_name: str,
+    df_raw: pd.DataFrame,
+    options: _SheetLoadOptions,
+    sheet_role: Optional[SheetRole]
+) -> Tuple[Optional[pd.DataFrame], int, Dict[str, str], bool]:
+    """
+    Detect the header row(s) and map columns for one sheet.
+
+    Returns (df, header_idx, col_map, use_multi_row); df is None if there
+    are no rows after the detected header.
+    """
+    client_col_mappings = options.client_col_mappings
+    additional_keywords = options.additional_keywords
+    client_header_row = options.client_header_row
+
+    # STEP 2: Detect header row (use client override if provided)
+    if client_header_row is not None:
+        header_idx = client_header_row - 1  # Convert to 0-indexed
+        logger.info(f"[{sheet_name}] Using client-specified header row: {client_header_row}")
+        use_multi_row = False
+    else:
+        header_idx = _detect_header_row(df_raw, max_scan=HEADER_SCAN_MAX_ROWS)
+        use_multi_row = False
+
+    # Extract data starting from header
+    df = df_raw.iloc[header_idx:].copy()
+
+    # SAFETY: Check for empty DataFrame after header extraction
+    if df.empty or len(df) < 1:
+        logger.warning(f"[{sheet_name}] No data rows after header detection at row {header_idx}")
+        return None, header_idx, {}, use_multi_row
+
+    # Set column names from header row
+    df.columns = [_normalize_header(x) for x in df.iloc[0]]
+
+    # Handle duplicate column names from merged cells (NaN → "" → duplicates)
+    # Pandas will auto-rename duplicates to "col", "col.1", "col.2" etc.
+    seen_cols = {}
+    new_cols = []
+    for col in df.columns:
+        if col in seen_cols:
+            seen_cols[col] += 1
+            new_cols.append(f"{col}_{seen_cols[col]}" if col else f"unnamed_{seen_cols[col]}")
+        else:
+            seen_cols[col] = 0
+            new_cols.append(col if col else "unnamed_0")
+    df.columns = new_cols
+
+    df = df.iloc[1:].reset_index(drop=True)
+
+    logger.info(f"[{sheet_name}] Header detected at row {header_idx}, {len(df)} data rows")
+    logger.info(f"[{sheet_name}] Columns found: {list(df.columns)[:8]}")
+
+    # STEP 3: Map columns with validation (using client mappings and sheet role)
+    col_map, column_mappings, warnings_list = _map_columns_with_validation(
+        df, sheet_name,
+        client_mappings=client_col_mappings,
+        additional_keywords=additional_keywords,
+        sheet_role=sheet_role.value if sheet_role else None
+    )
+
+    # STEP 3b: MULTI-ROW HEADER FALLBACK
+    # If critical columns not found, try multi-row header detection
+    if not col_map.get("description") or not col_map.get("cost"):
+        multi_start, multi_headers, is_multi = _detect_multi_row_headers(df_raw)
+
+        if is_multi and multi_headers:
+            logger.info(f"[{sheet_name}] Trying multi-row header detection...")
+            # Rebuild DataFrame with combined headers
+            df_multi = df_raw.iloc[multi_start + 2:].copy()  # Skip both header rows
+            df_multi.columns = [_normalize_header(h) for h in multi_headers]
+            df_multi = df_multi.reset_index(drop=True)
+
+            # Re-run column mapping with combined headers
+            col_map_multi, mappings_multi, warnings_multi = _map_columns_with_validation(
+                df_multi, sheet_name,
+                client_mappings=client_col_mappings,
+                additional_keywords=additional_keywords,
+                sheet_role=sheet_role.value if sheet_role else None
+            )
+
+            # Use multi-row results if better
+            multi_critical = sum(1 for f in ["description", "cost", "in_service_date"]
+                                if col_map_multi.get(f))
+            orig_critical = sum(1 for f in ["description", "cost", "in_service_date"]
+                               if col_map.get(f))
+
+            if multi_critical > orig_critical:
+                logger.info(f"[{sheet_name}] Multi-row headers improved detection: {orig_critical} -> {multi_critical} critical fields")
+                col_map = col_map_multi
+                column_mappings = mappings_multi
+                warnings_list = warnings_multi
+                df = df_multi
+                header_idx = multi_start
+                use_multi_row = True
+                warnings_list.append("Multi-row header detection applied")
+
+    # Log column mapping results
+    critical_mappings = {k: v for k, v in col_map.items() if k in ["description", "cost", "in_service_date", "asset_id"]}
+    logger.info(f"[{sheet_name}] Column mapping: {critical_mappings}")
+
+    # Log warnings
+    for warning in warnings_list:
+        logger.warning(f"[{sheet_name}] {warning}")
+
+    return df, header_idx, col_map, use_multi_row
+
+
 # ====================================================================================
 # MAIN SHEET LOADER
 # ====================================================================================
 
+@dataclass
+class _SheetLoadOptions:
+    """Per-call settings shared by every sheet in build_unified_dataframe"""
+    target_tax_year: Optional[int]
+    fy_start_month: int
+    filter_by_date: bool
+    client_col_mappings: Dict[str, str]
+    additional_keywords: Dict[str, List[str]]
+    client_skip_sheets: List[str]
+    client_header_row: Optional[int]
+    precomputed_skip_map: Optional[Dict[str, str]]  # None = no tab analysis available
+    structure_cache: Optional[Dict[str, Dict[str, Any]]] = None  # None = structure cache disabled
+
+
+@dataclass
+class _SheetResult:
+    """Output of processing one sheet; merged in sheet order"""
+    rows: List[Dict[str, Any]] = dc_field(default_factory=list)
+    processed: bool = False
+    skip_reason: Optional[str] = None  # Shown in the skipped-sheets summary
+    rows_filtered_by_date: int = 0
+    rows_skipped_by_reason: Dict[str, int] = dc_field(default_factory=dict)
+    structure_key: Optional[str] = None
+    structure_entry: Optional[Dict[str, Any]] = None  # Newly detected structure to cache
+    structure_cache_hit: bool = False
+
+
+def _process_sheet(sheet_name: str, df_raw: pd.DataFrame, options: _SheetLoadOptions) -> _SheetResult:
+    """
+    Skip checks, header detection, column mapping and row cleaning for one sheet.
+
+    Depends only on its arguments, so it can run in a worker process.
+    """
+    target_tax_year = options.target_tax_year
+    fy_start_month = options.fy_start_month
+    filter_by_date = options.filter_by_date
+    client_skip_sheets = options.client_skip_sheets
+    use_precomputed_skips = options.precomputed_skip_map is not None
+    precomputed_skip_map = options.precomputed_skip_map or {}
+
+    # Check if this is a disposal sheet (for special JE format handling)
+    sheet_name_lower_check = sheet_name.lower()
+    is_disposal_sheet = 'disposal' in sheet_name_lower_check or 'disposed' in sheet_name_lower_check
+
+    # FAST PATH: Use pre-computed skip decision from smart tab analyzer
+    # The analyzer already handles year-based filtering correctly
+    if use_precomputed_skips and sheet_name in precomputed_skip_map:
+        skip_reason = precomputed_skip_map[sheet_name]
+        logger.info(f"⏭️  Skipping sheet '{sheet_name}': {skip_reason}")
+        return _SheetResult(skip_reason=f"'{sheet_name}': {skip_reason}")
+
+    logger.info(f"Processing sheet: {sheet_name}")
+
+    # SLOW PATH: Full analysis if no pre-computed result available
+    if not use_precomputed_skips:
+        should_skip, skip_reason = _should_skip_sheet(sheet_name, target_tax_year)
+        if should_skip:
+            logger.info(f"⏭️  Skipping sheet '{sheet_name}': {skip_reason}")
+            return _SheetResult(skip_reason=f"'{sheet_name}': {skip_reason}")
+
+    # CLIENT-SPECIFIC SKIP: Check client's skip_sheets patterns
+    if client_skip_sheets:
+        import fnmatch
+        sheet_lower = sheet_name.lower()
+        for pattern in client_skip_sheets:
+            if fnmatch.fnmatch(sheet_lower, pattern.lower()):
+                logger.info(f"⏭️  Skipping sheet '{sheet_name}': Client skip pattern '{pattern}'")
+                return _SheetResult(skip_reason=f"'{sheet_name}': Client skip pattern")
+
+    if df_raw is None or df_raw.empty:
+        logger.warning(f"Skipping empty sheet: {sheet_name}")
+        return _SheetResult()
+
+    # CONTENT-BASED SKIP: Check if sheet is a rollforward/summary by examining content
+    # Skip this expensive check if we already have pre-computed analysis
+    # Don't skip disposal sheets based on rollforward detection
+    if not use_precomputed_skips and not is_disposal_sheet:
+        is_rollforward, rollforward_reason = _is_rollforward_sheet(df_raw, sheet_name)
+        if is_rollforward:
+            logger.info(f"⏭️  Skipping sheet '{sheet_name}': {rollforward_reason}")
+            return _SheetResult(skip_reason=f"'{sheet_name}': {rollforward_reason}")
+
+    # SPECIAL HANDLING: Disposal sheets in JE (Journal Entry) format
+    # These have a non-standard format and need special parsing
+    # Note: Prior year disposal sheets were already filtered by smart tab analyzer
+    if is_disposal_sheet:
+        logger.info(f"[{sheet_name}] *** CURRENT YEAR DISPOSAL SHEET *** Processing JE format")
+        logger.info(f"[{sheet_name}] Raw DataFrame shape: {df_raw.shape if df_raw is not None else 'None'}")
+        # Log first 5 rows of raw data for debugging
+        if df_raw is not None and not df_raw.empty:
+            logger.info(f"[{sheet_name}] Raw columns: {list(df_raw.columns)[:10]}")
+            for row_idx in range(min(5, len(df_raw))):
+                row_values = [str(df_raw.iloc[row_idx, col_idx])[:50] for col_idx in range(min(5, len(df_raw.columns)))]
+                logger.info(f"[{sheet_name}] Raw row {row_idx}: {row_values}")
+        is_je = _is_disposal_je_format(df_raw)
+        logger.info(f"[{sheet_name}] JE format detection result: {is_je}")
+
+        if is_je:
+            logger.info(f"[{sheet_name}] Using JE format parser")
+            je_disposals = _parse_disposal_je_format(df_raw, sheet_name)
+            rows = []
+            for idx, disposal in enumerate(je_disposals):
+                row_data = {
+                    'description': disposal.get('description', ''),
+                    'asset_id': disposal.get('asset_id'),
+                    'cost': disposal.get('cost'),
+                    'accumulated_depreciation': disposal.get('accum_dep'),
+                    'disposal_date': disposal.get('disposal_date'),
+                    'in_service_date': disposal.get('disposal_date'),  # Use disposal_date as in_service for consistency
+                    'proceeds': disposal.get('proceeds'),
+                    'sheet_name': sheet_name,  # Match regular row field name
+                    'sheet_role': 'disposals',
+                    'source_row': idx + 1,  # Track row position for sorting
+                    'transaction_type': 'Disposal',
+                }
+                rows.append(row_data)
+            logger.info(f"[{sheet_name}] Added {len(je_disposals)} disposals from JE format")
+            return _SheetResult(rows=rows, processed=True)
+        else:
+            # Not JE format - let it fall through to standard processing
+            # The standard processing will set transaction_type based on sheet_role
+            logger.info(f"[{sheet_name}] Not JE format - will use standard processing with disposal role")
+
+    try:
+        # STEP 1: Detect sheet role FIRST (for contextual column mapping)
+        # Pre-detect role from sheet name before we have column data
+        sheet_role = _detect_sheet_role_from_name(sheet_name)
+        logger.debug(f"[{sheet_name}] Initial sheet role from name: {sheet_role}")
+
+        # STEPS 2-3: Header row and column map, from the structure cache when
+        # this layout was seen before, otherwise detected
+        structure_key = None
+        structure_entry = None
+        cached = None
+        if options.structure_cache is not None:
+            structure_key = _sheet_structure_key(sheet_name, df_raw, options)
+            entry = options.structure_cache.get(structure_key)
+            if entry is not None:
+                cached = _apply_sheet_structure(df_raw, entry)
+
+        if cached is not None:
+            df, header_idx, col_map, sheet_role = cached
+            logger.info(f"[{sheet_name}] Reusing cached sheet structure: header at row {header_idx}, {len(df)} data rows")
+        else:
+            df, header_idx, col_map, use_multi_row = _detect_sheet_layout(sheet_name, df_raw, options, sheet_role)
+            if df is None:
+                return _SheetResult(skip_reason=f"'{sheet_name}': No data rows after header")
+
+            # Must have at least description to be useful
+            if not col_map.get("description"):
+                logger.error(f"Skipping sheet {sheet_name}: No description column found")
+                return _SheetResult()
+
+            # STEP 4: Refine sheet role with column data
+            sheet_role = _detect_sheet_role(sheet_name, df)
+
+            if structure_key is not None:
+                structure_entry = _sheet_structure_entry(
+                    sheet_name, df_raw, df, header_idx, use_multi_row, col_map, sheet_role
+                )
+
+        # STEP 4: Clean all rows column-wise; skipped rows carry a skip_reason
+        cleaned = _clean_sheet_frame(
+            df, col_map,
+            target_tax_year=target_tax_year if filter_by_date else None,  # ROW-LEVEL DATE FILTERING
+            fy_start_month=fy_start_month
+        )
+        skip_reasons = cleaned.pop("skip_reason")
+        skip_counts = {str(reason): int(count) for reason, count in skip_reasons.value_counts().items()}
+        rows_filtered_date_sheet = skip_counts.get(SKIP_OUTSIDE_FISCAL_YEAR, 0)
+        rows_skipped = int(skip_reasons.notna().sum()) - rows_filtered_date_sheet
+        keep = skip_reasons.isna().to_numpy()
+        cleaned = cleaned[keep]
+
+        # Detect transaction type, overridden by the sheet role if it's more specific
+        if sheet_role == SheetRole.DISPOSALS:
+            trans_types = "disposal"
+        elif sheet_role == SheetRole.TRANSFERS:
+            trans_types = "transfer"
+        else:
+            trans_types = _detect_transaction_types(df[keep], col_map).to_numpy()
+
+        row_info = pd.DataFrame({
+            "sheet_name": sheet_name,
+            "sheet_role": sheet_role.value,
+            "source_row": header_idx + cleaned.index + 2,  # Excel row number (1-indexed)
+            "transaction_type": trans_types,
+        }, index=cleaned.index)
+        rows = pd.concat([row_info, cleaned], axis=1).to_dict("records")
+        rows_processed = len(rows)
+
+        # Log rows with recent dates (potential current year additions)
+        recent = pd.to_datetime(cleaned["in_service_date"], errors="coerce").dt.year >= 2024
+        if recent.any():
+            logger.info(f"[{sheet_name}] {int(recent.sum())} rows placed in service in 2024 or later")
+        if skip_counts:
+            logger.debug(f"[{sheet_name}] Skipped rows by reason: {skip_counts}")
+
+        # Log with date filtering info
+        if rows_filtered_date_sheet > 0:
+            logger.info(f"[{sheet_name}] Processed {rows_processed} rows, skipped {rows_skipped} empty, filtered {rows_filtered_date_sheet} by date (prior years)")
+        else:
+            logger.info(f"[{sheet_name}] Processed {rows_processed} rows, skipped {rows_skipped} rows")
+        return _SheetResult(rows=rows, processed=True, rows_filtered_by_date=rows_filtered_date_sheet,
+                            rows_skipped_by_reason=skip_counts, structure_key=structure_key,
+                            structure_entry=structure_entry, structure_cache_hit=cached is not None)
+
+    except Exception as e:
+        logger.error(f"Error processing sheet {sheet_name}: {e}", exc_info=True)
+        return _SheetResult()
+
+
+def _process_sheets(
+    sheets: Dict[str, pd.DataFrame],
+    options: _SheetLoadOptions,
+    max_workers: Optional[int] = None
+) -> List[_SheetResult]:
+    """
+    Process every sheet, in a process pool when it is worth the startup cost.
+
+    Results are returned in sheet order in both modes, so the unified
+    dataframe does not depend on how the sheets were processed.
+    """
+    workers = SHEET_LOADER_MAX_WORKERS if max_workers is None else max_workers
+    skip_map = options.precomputed_skip_map or {}
+    # Sheets the tab analysis already skipped return immediately; keep them local
+    pending = [name for name, df in sheets.items()
+               if name not in skip_map and df is not None and not df.empty]
+    pending_rows = sum(len(sheets[name]) for name in pending)
+
+    if workers > 1 and len(pending) > 1 and pending_rows >= PARALLEL_SHEET_MIN_ROWS:
+        workers = min(workers, len(pending))
+        logger.info(f"Processing {len(pending)} sheets ({pending_rows} rows) in {workers} worker processes")
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                futures = {name: executor.submit(_process_sheet, name, sheets[name], options) for name in pending}
+                return [futures[name].result() if name in futures else _process_sheet(name, df, options)
+                        for name, df in sheets.items()]
+        except BrokenProcessPool as e:
+            logger.warning(f"Parallel sheet processing failed ({e}) - processing sheets serially")
+
+    return [_process_sheet(name, df, options) for name, df in sheets.items()]
+
+
 def build_unified_dataframe(
     sheets: Dict[str, pd.DataFrame],
     target_tax_year: Optional[int] = None,
     fy_start_month: int = 1,
     filter_by_date: bool = True,
     client_id: Optional[str] = None,
-    tab_analysis_result: Optional[Any] = None
+    tab_analysis_result: Optional[Any] = None,
+    max_workers: Optional[int] = None
 ) -> pd.DataFrame:
     """
     Build unified dataframe from multiple Excel sheets
@@ -2927,6 +3747,10 @@ def build_unified_dataframe(
                   If provided, mappings from client_input_mappings.json will be used.
         tab_analysis_result: Optional pre-computed tab analysis from smart_tab_analyzer.
                             If provided, uses cached skip decisions for faster processing.
+        max_workers: Worker processes for per-sheet processing (default:
+                    SHEET_LOADER_MAX_WORKERS). 0 or 1 processes sheets serially;
+                    small workbooks are always processed serially. Output is
+                    identical in both modes.
 
     Returns:
         Unified DataFrame with standardized column names
@@ -2948,6 +3772,7 @@ def build_unified_dataframe(
     skipped_sheets = 0
     skipped_sheet_reasons = []
     rows_filtered_by_date = 0  # Track how many rows filtered out by date
+    rows_skipped_by_reason: Dict[str, int] = {}
 
     # Load client-specific mappings if client_id provided
     client_col_mappings: Dict[str, str] = {}
@@ -2996,281 +3821,48 @@ def build_unified_dataframe(
             logger.warning(f"Could not use tab_analysis_result: {e}, falling back to full analysis")
             use_precomputed_skips = False
 
-    for sheet_name, df_raw in sheets.items():
-        # Check if this is a disposal sheet (for special JE format handling)
-        sheet_name_lower_check = sheet_name.lower()
-        is_disposal_sheet = 'disposal' in sheet_name_lower_check or 'disposed' in sheet_name_lower_check
-
-        # FAST PATH: Use pre-computed skip decision from smart tab analyzer
-        # The analyzer already handles year-based filtering correctly
-        if use_precomputed_skips and sheet_name in precomputed_skip_map:
-            skip_reason = precomputed_skip_map[sheet_name]
-            logger.info(f"⏭️  Skipping sheet '{sheet_name}': {skip_reason}")
-            skipped_sheet_reasons.append(f"'{sheet_name}': {skip_reason}")
-            skipped_sheets += 1
-            continue
-
-        logger.info(f"Processing sheet: {sheet_name}")
-
-        # SLOW PATH: Full analysis if no pre-computed result available
-        if not use_precomputed_skips:
-            should_skip, skip_reason = _should_skip_sheet(sheet_name, target_tax_year)
-            if should_skip:
-                logger.info(f"⏭️  Skipping sheet '{sheet_name}': {skip_reason}")
-                skipped_sheet_reasons.append(f"'{sheet_name}': {skip_reason}")
-                skipped_sheets += 1
-                continue
-
-        # CLIENT-SPECIFIC SKIP: Check client's skip_sheets patterns
-        if client_skip_sheets:
-            import fnmatch
-            sheet_lower = sheet_name.lower()
-            skip_this_sheet = False
-            for pattern in client_skip_sheets:
-                if fnmatch.fnmatch(sheet_lower, pattern.lower()):
-                    logger.info(f"⏭️  Skipping sheet '{sheet_name}': Client skip pattern '{pattern}'")
-                    skipped_sheet_reasons.append(f"'{sheet_name}': Client skip pattern")
-                    skipped_sheets += 1
-                    skip_this_sheet = True
-                    break
-            if skip_this_sheet:
-                continue
-
-        if df_raw is None or df_raw.empty:
-            logger.warning(f"Skipping empty sheet: {sheet_name}")
-            skipped_sheets += 1
-            continue
-
-        # CONTENT-BASED SKIP: Check if sheet is a rollforward/summary by examining content
-        # Skip this expensive check if we already have pre-computed analysis
-        # Don't skip disposal sheets based on rollforward detection
-        if not use_precomputed_skips and not is_disposal_sheet:
-            is_rollforward, rollforward_reason = _is_rollforward_sheet(df_raw, sheet_name)
-            if is_rollforward:
-                logger.info(f"⏭️  Skipping sheet '{sheet_name}': {rollforward_reason}")
-                skipped_sheet_reasons.append(f"'{sheet_name}': {rollforward_reason}")
-                skipped_sheets += 1
-                continue
+    options = _SheetLoadOptions(
+        target_tax_year=target_tax_year,
+        fy_start_month=fy_start_month,
+        filter_by_date=filter_by_date,
+        client_col_mappings=client_col_mappings,
+        additional_keywords=additional_keywords,
+        client_skip_sheets=client_skip_sheets,
+        client_header_row=client_header_row,
+        precomputed_skip_map=precomputed_skip_map if use_precomputed_skips else None,
+    )
 
-        # SPECIAL HANDLING: Disposal sheets in JE (Journal Entry) format
-        # These have a non-standard format and need special parsing
-        # Note: Prior year disposal sheets were already filtered by smart tab analyzer
-        if is_disposal_sheet:
-            logger.info(f"[{sheet_name}] *** CURRENT YEAR DISPOSAL SHEET *** Processing JE format")
-            logger.info(f"[{sheet_name}] Raw DataFrame shape: {df_raw.shape if df_raw is not None else 'None'}")
-            # Log first 5 rows of raw data for debugging
+    # Ship only the cached structures these sheets could use to the workers
+    if SHEET_STRUCTURE_CACHE_ENABLED:
+        known_structures = manager.get_sheet_structures()
+        options.structure_cache = {}
+        for sheet_name, df_raw in sheets.items():
             if df_raw is not None and not df_raw.empty:
-                logger.info(f"[{sheet_name}] Raw columns: {list(df_raw.columns)[:10]}")
-                for row_idx in range(min(5, len(df_raw))):
-                    row_values = [str(df_raw.iloc[row_idx, col_idx])[:50] for col_idx in range(min(5, len(df_raw.columns)))]
-                    logger.info(f"[{sheet_name}] Raw row {row_idx}: {row_values}")
-            is_je = _is_disposal_je_format(df_raw)
-            logger.info(f"[{sheet_name}] JE format detection result: {is_je}")
-
-            if is_je:
-                logger.info(f"[{sheet_name}] Using JE format parser")
-                je_disposals = _parse_disposal_je_format(df_raw, sheet_name)
-                for idx, disposal in enumerate(je_disposals):
-                    row_data = {
-                        'description': disposal.get('description', ''),
-                        'asset_id': disposal.get('asset_id'),
-                        'cost': disposal.get('cost'),
-                        'accumulated_depreciation': disposal.get('accum_dep'),
-                        'disposal_date': disposal.get('disposal_date'),
-                        'in_service_date': disposal.get('disposal_date'),  # Use disposal_date as in_service for consistency
-                        'proceeds': disposal.get('proceeds'),
-                        'sheet_name': sheet_name,  # Match regular row field name
-                        'sheet_role': 'disposals',
-                        'source_row': idx + 1,  # Track row position for sorting
-                        'transaction_type': 'Disposal',
-                    }
-                    all_rows.append(row_data)
-                processed_sheets += 1
-                logger.info(f"[{sheet_name}] Added {len(je_disposals)} disposals from JE format")
-                continue
-            else:
-                # Not JE format - let it fall through to standard processing
-                # The standard processing will set transaction_type based on sheet_role
-                logger.info(f"[{sheet_name}] Not JE format - will use standard processing with disposal role")
-
-        try:
-            # STEP 1: Detect sheet role FIRST (for contextual column mapping)
-            # Pre-detect role from sheet name before we have column data
-            sheet_role = _detect_sheet_role_from_name(sheet_name)
-            logger.debug(f"[{sheet_name}] Initial sheet role from name: {sheet_role}")
-
-            # STEP 2: Detect header row (use client override if provided)
-            if client_header_row is not None:
-                header_idx = client_header_row - 1  # Convert to 0-indexed
-                logger.info(f"[{sheet_name}] Using client-specified header row: {client_header_row}")
-                use_multi_row = False
-            else:
-                header_idx = _detect_header_row(df_raw, max_scan=HEADER_SCAN_MAX_ROWS)
-                use_multi_row = False
-
-            # Extract data starting from header
-            df = df_raw.iloc[header_idx:].copy()
-
-            # SAFETY: Check for empty DataFrame after header extraction
-            if df.empty or len(df) < 1:
-                logger.warning(f"[{sheet_name}] No data rows after header detection at row {header_idx}")
-                skipped_sheets += 1
-                skipped_sheet_reasons.append(f"'{sheet_name}': No data rows after header")
-                continue
-
-            # Set column names from header row
-            df.columns = [_normalize_header(x) for x in df.iloc[0]]
-
-            # Handle duplicate column names from merged cells (NaN → "" → duplicates)
-            # Pandas will auto-rename duplicates to "col", "col.1", "col.2" etc.
-            seen_cols = {}
-            new_cols = []
-            for col in df.columns:
-                if col in seen_cols:
-                    seen_cols[col] += 1
-                    new_cols.append(f"{col}_{seen_cols[col]}" if col else f"unnamed_{seen_cols[col]}")
-                else:
-                    seen_cols[col] = 0
-                    new_cols.append(col if col else "unnamed_0")
-            df.columns = new_cols
-
-            df = df.iloc[1:].reset_index(drop=True)
-
-            logger.info(f"[{sheet_name}] Header detected at row {header_idx}, {len(df)} data rows")
-            logger.info(f"[{sheet_name}] Columns found: {list(df.columns)[:8]}")
-
-            # STEP 3: Map columns with validation (using client mappings and sheet role)
-            col_map, column_mappings, warnings_list = _map_columns_with_validation(
-                df, sheet_name,
-                client_mappings=client_col_mappings,
-                additional_keywords=additional_keywords,
-                sheet_role=sheet_role.value if sheet_role else None
-            )
-
-            # STEP 3b: MULTI-ROW HEADER FALLBACK
-            # If critical columns not found, try multi-row header detection
-            if not col_map.get("description") or not col_map.get("cost"):
-                multi_start, multi_headers, is_multi = _detect_multi_row_headers(df_raw)
-
-                if is_multi and multi_headers:
-                    logger.info(f"[{sheet_name}] Trying multi-row header detection...")
-                    # Rebuild DataFrame with combined headers
-                    df_multi = df_raw.iloc[multi_start + 2:].copy()  # Skip both header rows
-                    df_multi.columns = [_normalize_header(h) for h in multi_headers]
-                    df_multi = df_multi.reset_index(drop=True)
-
-                    # Re-run column mapping with combined headers
-                    col_map_multi, mappings_multi, warnings_multi = _map_columns_with_validation(
-                        df_multi, sheet_name,
-                        client_mappings=client_col_mappings,
-                        additional_keywords=additional_keywords,
-                        sheet_role=sheet_role.value if sheet_role else None
-                    )
-
-                    # Use multi-row results if better
-                    multi_critical = sum(1 for f in ["description", "cost", "in_service_date"]
-                                        if col_map_multi.get(f))
-                    orig_critical = sum(1 for f in ["description", "cost", "in_service_date"]
-                                       if col_map.get(f))
-
-                    if multi_critical > orig_critical:
-                        logger.info(f"[{sheet_name}] Multi-row headers improved detection: {orig_critical} -> {multi_critical} critical fields")
-                        col_map = col_map_multi
-                        column_mappings = mappings_multi
-                        warnings_list = warnings_multi
-                        df = df_multi
-                        header_idx = multi_start
-                        use_multi_row = True
-                        warnings_list.append("Multi-row header detection applied")
-
-            # Log column mapping results
-            critical_mappings = {k: v for k, v in col_map.items() if k in ["description", "cost", "in_service_date", "asset_id"]}
-            logger.info(f"[{sheet_name}] Column mapping: {critical_mappings}")
-
-            # Log warnings
-            for warning in warnings_list:
-                logger.warning(f"[{sheet_name}] {warning}")
-
-            # Must have at least description to be useful
-            if not col_map.get("description"):
-                logger.error(f"Skipping sheet {sheet_name}: No description column found")
-                skipped_sheets += 1
-                continue
-
-            # STEP 4: Refine sheet role with column data
-            sheet_role = _detect_sheet_role(sheet_name, df)
-
-            # STEP 4: Process each row
-            rows_processed = 0
-            rows_skipped = 0
-            rows_filtered_date_sheet = 0  # Date-filtered rows for this sheet
-
-            for idx, row in df.iterrows():
-                excel_row_num = header_idx + idx + 2  # Excel row number (1-indexed)
-                cleaned = _clean_row_data(row, col_map)
-                if not cleaned:
-                    rows_skipped += 1
-                    continue
-
-                # ROW-LEVEL DATE FILTERING
-                # Only include rows with dates in the target fiscal year
-                # This dramatically reduces data when category tabs have years of history
-                if filter_by_date and target_tax_year:
-                    # Check in_service_date first, then acquisition_date
-                    row_date = cleaned.get("in_service_date") or cleaned.get("acquisition_date")
-
-                    if row_date and not _is_date_in_fiscal_year(row_date, target_tax_year, fy_start_month):
-                        rows_filtered_date_sheet += 1
-                        rows_filtered_by_date += 1
-                        continue  # Skip this row - not in target fiscal year
-
-                # Detect transaction type
-                trans_type = _detect_transaction_type(
-                    row,
-                    col_map.get("description"),
-                    col_map.get("cost"),
-                    col_map.get("transaction_type"),
-                    col_map.get("disposal_date")
-                )
-
-                # Override with sheet role if it's more specific
-                if sheet_role == SheetRole.DISPOSALS:
-                    trans_type = "disposal"
-                elif sheet_role == SheetRole.TRANSFERS:
-                    trans_type = "transfer"
-
-                row_data = {
-                    "sheet_name": sheet_name,
-                    "sheet_role": sheet_role.value,
-                    "source_row": excel_row_num,  # Excel row number (1-indexed)
-                    "transaction_type": trans_type,
-                    **cleaned
-                }
-                all_rows.append(row_data)
-
-                # Log rows with recent dates (potential current year additions)
-                row_date = cleaned.get("in_service_date")
-                if row_date:
-                    try:
-                        dt = pd.to_datetime(row_date)
-                        if dt.year >= 2024:
-                            logger.info(f"[{sheet_name}] Row {excel_row_num}: {cleaned.get('description', '')[:40]} - Date: {row_date}, Cost: {cleaned.get('cost')}")
-                    except:
-                        pass
-
-                rows_processed += 1
-
-            # Log with date filtering info
-            if rows_filtered_date_sheet > 0:
-                logger.info(f"[{sheet_name}] Processed {rows_processed} rows, skipped {rows_skipped} empty, filtered {rows_filtered_date_sheet} by date (prior years)")
-            else:
-                logger.info(f"[{sheet_name}] Processed {rows_processed} rows, skipped {rows_skipped} rows")
+                key = _sheet_structure_key(sheet_name, df_raw, options)
+                if key in known_structures:
+                    options.structure_cache[key] = known_structures[key]
+
+    sheet_results = _process_sheets(sheets, options, max_workers)
+
+    if options.structure_cache is not None:
+        new_structures = {r.structure_key: r.structure_entry for r in sheet_results if r.structure_entry}
+        reused_structures = [r.structure_key for r in sheet_results if r.structure_cache_hit]
+        if new_structures or reused_structures:
+            manager.save_sheet_structures(new_structures, reused_structures)
+            logger.info(f"Sheet structure cache: {len(reused_structures)} reused, {len(new_structures)} detected")
+
+    # Sheets are independent until the final concat; merge in sheet order
+    for sheet_result in sheet_results:
+        all_rows.extend(sheet_result.rows)
+        rows_filtered_by_date += sheet_result.rows_filtered_by_date
+        for reason, count in sheet_result.rows_skipped_by_reason.items():
+            rows_skipped_by_reason[reason] = rows_skipped_by_reason.get(reason, 0) + count
+        if sheet_result.processed:
             processed_sheets += 1
-
-        except Exception as e:
-            logger.error(f"Error processing sheet {sheet_name}: {e}", exc_info=True)
+        else:
             skipped_sheets += 1
-            continue
+            if sheet_result.skip_reason:
+                skipped_sheet_reasons.append(sheet_result.skip_reason)
 
     # Build final dataframe
     if not all_rows:
@@ -3314,6 +3906,7 @@ def build_unified_dataframe(
 
     # Store filtering stats in dataframe attrs for UI display
     df_final.attrs['rows_filtered_by_date'] = rows_filtered_by_date
+    df_final.attrs['rows_skipped_by_reason'] = rows_skipped_by_reason
     df_final.attrs['sheets_skipped'] = skipped_sheets
     df_final.attrs['sheets_processed'] = processed_sheets
     df_final.attrs['client_id'] = client_id  # Store client_id for reference
@@ -23,13 +23,18 @@ from __future__ import annotations
 import re
 import logging
 from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from enum import Enum
 
 import pandas as pd
 
+from .workbook_reader import read_workbook_sheets
+
 logger = logging.getLogger(__name__)
 
+# Rows read per sheet in the preview pass of analyze_workbook()
+TAB_PREVIEW_ROWS = 500
+
 
 # ====================================================================================
 # TAB ROLE DEFINITIONS
@@ -61,6 +66,7 @@ class TabAnalysis:
     skip_reason: Optional[str]  # Why it should be skipped
     confidence: float           # Confidence in role detection (0.0-1.0)
     detection_notes: List[str] = field(default_factory=list)
+    preview_only: bool = False  # Analyzed from a row preview; sheet never fully loaded
 
     @property
     def icon(self) -> str:
@@ -147,6 +153,20 @@ class TabAnalysisResult:
             "reduction_percent": reduction_pct,
         }
 
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe form (roles as their string values); see from_dict()"""
+        data = asdict(self)
+        for tab in data["tabs"]:
+            tab["role"] = tab["role"].value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TabAnalysisResult":
+        """Rebuild a result saved with to_dict()"""
+        data = dict(data)
+        data["tabs"] = [TabAnalysis(**dict(tab, role=TabRole(tab["role"]))) for tab in data.get("tabs", [])]
+        return cls(**data)
+
 
 # ====================================================================================
 # PATTERN DEFINITIONS
@@ -852,6 +872,67 @@ def analyze_tabs(
     return result
 
 
+def analyze_workbook(
+    file_path: str,
+    target_tax_year: Optional[int] = None,
+    fy_start_month: int = 1,
+    preview_rows: int = TAB_PREVIEW_ROWS,
+    warnings: Optional[List[str]] = None,
+) -> Tuple[TabAnalysisResult, Dict[str, pd.DataFrame]]:
+    """
+    Analyze a workbook's tabs, fully loading only the tabs to process.
+
+    Phase one reads the first preview_rows rows of every sheet and runs
+    analyze_tabs() on those previews (tab role, fiscal year headers and
+    header detection only need the top of a sheet). Phase two fully loads
+    the tabs recommended for processing and re-runs the analysis so their
+    row counts and content checks see the whole sheet. If that changes the
+    recommendation for a tab that was only previewed, it is loaded too.
+
+    Skipped tabs that are longer than the preview are judged from their
+    first preview_rows rows; they are marked preview_only and their row
+    counts are lower bounds.
+
+    Args:
+        file_path: Path to the .xlsx/.xlsm file
+        target_tax_year: Target tax year (e.g., 2025)
+        fy_start_month: First month of fiscal year (1=Jan, 4=Apr)
+        preview_rows: Rows read per sheet in phase one
+        warnings: If given, sheet read failures are appended here
+
+    Returns:
+        Tuple of (TabAnalysisResult, sheets). sheets holds the full frame
+        for every tab to process and the preview frame for the others.
+    """
+    sheets = read_workbook_sheets(file_path, nrows=preview_rows, warnings=warnings)
+    # Sheets that filled the preview may have more rows
+    partial = {name for name, df in sheets.items() if len(df) >= preview_rows}
+    logger.info(f"Tab preview: {len(sheets)} tabs, {len(partial)} longer than {preview_rows} rows")
+
+    result = analyze_tabs(sheets, target_tax_year, fy_start_month)
+    while True:
+        to_load = [t.tab_name for t in result.tabs if t.should_process and t.tab_name in partial]
+        if not to_load:
+            break
+        loaded = read_workbook_sheets(file_path, sheet_names=to_load, warnings=warnings)
+        for name in to_load:
+            partial.discard(name)
+            if name in loaded:
+                sheets[name] = loaded[name]
+            else:
+                # Unreadable in full: drop it, as a full read would have
+                del sheets[name]
+        logger.info(f"Loaded {len(loaded)} of {len(result.tabs)} tabs in full")
+        result = analyze_tabs(sheets, target_tax_year, fy_start_month)
+
+    for tab in result.tabs:
+        if tab.tab_name in partial:
+            tab.preview_only = True
+            tab.detection_notes.append(f"Analyzed from the first {preview_rows} rows (not loaded in full)")
+
+    return result, sheets
+
+
 def _detect_data_anomalies(result: TabAnalysisResult, sheets: Dict[str, pd.DataFrame]) -> List[str]:
     """
     Detect data anomalies that might indicate misconfigured tabs.
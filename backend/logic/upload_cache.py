@@ -0,0 +1,398 @@
+"""
+Upload Result Cache for FA CS Automator
+
+Content-addressed, size-bounded on-disk cache of parsed and classified
+uploads.
+
+CPAs often re-upload the exact same workbook (browser refresh, switching
+the tax year back and forth); each upload used to re-parse the workbook,
+re-analyze its tabs and reclassify every asset. Results are keyed by a
+SHA-256 of the file bytes plus everything else that shapes them (upload
+path, effective tax config, classification rule files, tax rules version,
+parsing/classification code, cache format version), so a repeat upload
+rehydrates the session straight from disk.
+
+- Entries are one compact blob per upload: asset fields stored column by
+  column (JSON, zlib-compressed) plus the tab analysis and parse report
+- Files are written to a temp name and renamed into place (never partial)
+- Least recently used entries are evicted once the cache exceeds its byte
+  budget; FileCleanupManager also runs eviction on its schedule
+- Unreadable or stale-format entries count as misses and are removed
+"""
+
+import os
+import json
+import zlib
+import hashlib
+import functools
+import logging
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .export_cache import user_cache_dir
+
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Runtime data, kept out of the checkout
+UPLOAD_CACHE_DIR = os.environ.get("UPLOAD_CACHE_DIR", "")  # Default: <user cache dir>/upload_cache
+UPLOAD_CACHE_MAX_BYTES = int(os.environ.get("UPLOAD_CACHE_MAX_BYTES", str(128 * 1024 * 1024)))  # 128MB
+UPLOAD_CACHE_RETENTION_HOURS = int(os.environ.get("UPLOAD_CACHE_RETENTION_HOURS", "168"))  # 7 days
+
+# Bump when parsing or classification output changes shape, so old entries miss
+UPLOAD_CACHE_FORMAT_VERSION = 1
+
+_SUFFIX = ".upload"
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# Classification rules, overrides and client mappings live here; editing
+# any of them changes the upload key
+RULES_CONFIG_DIR = Path(__file__).resolve().parent / "config"
+
+# Parsing and classification code (rules and tables in code, the Asset
+# model); a deploy that changes any of it changes the upload key
+CODE_SOURCE_DIRS = [
+    Path(__file__).resolve().parent,
+    Path(__file__).resolve().parent.parent / "services",
+    Path(__file__).resolve().parent.parent / "models",
+]
+
+
+def file_sha256(source: Union[str, BinaryIO]) -> str:
+    """
+    Stream a file through SHA-256 without loading it into memory.
+
+    Args:
+        source: Path, or a binary file object (read from its current
+            position to the end)
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    else:
+        for chunk in iter(lambda: source.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _rules_signature() -> List[Tuple[str, int, int]]:
+    """(name, size, mtime_ns) of the JSON rule/mapping files under RULES_CONFIG_DIR."""
+    # Sheet structure cache only speeds up detection; it never changes output
+    from .client_mapping_manager import SHEET_STRUCTURE_CACHE_FILE
+
+    signature = []
+    try:
+        paths = sorted(RULES_CONFIG_DIR.glob("*.json"))
+    except OSError:
+        return signature
+    for path in paths:
+        if SHEET_STRUCTURE_CACHE_FILE and path.name == Path(SHEET_STRUCTURE_CACHE_FILE).name:
+            continue
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        signature.append((path.name, st.st_size, st.st_mtime_ns))
+    return signature
+
+
+@functools.lru_cache(maxsize=None)
+def _code_version() -> str:
+    """SHA-256 of the .py files under CODE_SOURCE_DIRS (read once per process)."""
+    digest = hashlib.sha256()
+    for directory in CODE_SOURCE_DIRS:
+        for path in sorted(directory.glob("*.py")):
+            try:
+                source = path.read_bytes()
+            except OSError:
+                continue
+            digest.update(f"{directory.name}/{path.name}\0".encode("utf-8"))
+            digest.update(source)
+    return digest.hexdigest()
+
+
+def upload_cache_key(
+    kind: str,
+    file_digest: str,
+    tax_config: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Hash everything that determines an upload's parse + classify result.
+
+    Args:
+        kind: Upload path (e.g. "upload", "job_upload"); the paths parse
+            differently, so they never share entries
+        file_digest: file_sha256() of the uploaded workbook
+        tax_config: Effective tax settings at upload time
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    # Read at call time: a tax config reload can change it
+    from . import tax_year_config
+
+    header = {
+        "kind": kind,
+        "format_version": UPLOAD_CACHE_FORMAT_VERSION,
+        "file": file_digest,
+        "tax_config": tax_config or {},
+        "rules": _rules_signature(),
+        "rules_version": tax_year_config.CONFIG_VERSION,
+        "code_version": _code_version(),
+    }
+    return hashlib.sha256(json.dumps(header, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+# ==============================================================================
+# BLOB FORMAT
+# ==============================================================================
+
+def encode_upload_result(
+    assets: Iterable[Any],
+    tab_analysis: Optional[Dict[str, Any]] = None,
+    parse_warnings: Optional[List[str]] = None,
+    parse_stats: Optional[Dict[str, Any]] = None,
+    fy_start_month: Optional[int] = None,
+) -> bytes:
+    """
+    Pack classified assets and the upload's side results into one blob.
+
+    Asset fields are stored column by column, so repeated values (class,
+    method, sheet name, ...) compress well.
+    """
+    rows = [asset.model_dump(mode="json") for asset in assets]
+    fields = list(rows[0]) if rows else []
+    payload = {
+        "format_version": UPLOAD_CACHE_FORMAT_VERSION,
+        "count": len(rows),
+        "columns": {name: [row.get(name) for row in rows] for name in fields},
+        "tab_analysis": tab_analysis,
+        "parse_warnings": parse_warnings or [],
+        "parse_stats": parse_stats or {},
+        "fy_start_month": fy_start_month,
+    }
+    return zlib.compress(json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8"), 6)
+
+
+def decode_upload_result(blob: bytes) -> Dict[str, Any]:
+    """
+    Unpack a blob from encode_upload_result().
+
+    Returns the payload with "assets" (Asset models, in upload order) in
+    place of "columns".
+
+    Raises:
+        ValueError: If the blob is corrupt or from another format version
+    """
+    from backend.models.asset import Asset
+
+    try:
+        payload = json.loads(zlib.decompress(blob))
+    except (zlib.error, ValueError) as e:
+        raise ValueError(f"Corrupt upload cache entry: {e}") from e
+    if payload.get("format_version") != UPLOAD_CACHE_FORMAT_VERSION:
+        raise ValueError(f"Upload cache entry format {payload.get('format_version')} is not {UPLOAD_CACHE_FORMAT_VERSION}")
+
+    columns = payload.pop("columns")
+    names = list(columns)
+    payload["assets"] = [
+        Asset.model_validate(dict(zip(names, values)))
+        for values in zip(*(columns[name] for name in names))
+    ]
+    return payload
+
+
+# ==============================================================================
+# CACHE
+# ==============================================================================
+
+class UploadResultCache:
+    """
+    On-disk upload result cache with a byte budget.
+
+    Usage:
+        cache = get_upload_cache()
+        key = upload_cache_key("upload", file_sha256(path), session.tax_config)
+        result = cache.get(key)
+        if result is None:
+            ...parse and classify...
+            cache.put(key, encode_upload_result(assets, ...))
+    """
+
+    def __init__(self, directory: str = None, max_bytes: int = UPLOAD_CACHE_MAX_BYTES,
+                 retention_hours: float = UPLOAD_CACHE_RETENTION_HOURS):
+        self.directory = directory or UPLOAD_CACHE_DIR or os.path.join(user_cache_dir(), "upload_cache")
+        self.max_bytes = max_bytes
+        self.retention_hours = retention_hours
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._forced = 0
+        self._stores = 0
+        self._evictions = 0
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{_SUFFIX}")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Load and decode a cached upload result, or None on a miss."""
+        path = self.path_for(key)
+        try:
+            with open(path, "rb") as f:
+                blob = f.read()
+            result = decode_upload_result(blob)
+        except FileNotFoundError:
+            result = None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable upload cache entry {key[:12]}: {e}")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            result = None
+
+        with self._lock:
+            if result is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        if result is not None:
+            try:
+                # Eviction is least-recently-used first
+                os.utime(path)
+            except OSError:
+                pass
+        return result
+
+    def record_forced(self) -> None:
+        """Count an upload that bypassed the cache (force_reprocess)."""
+        with self._lock:
+            self._forced += 1
+
+    def put(self, key: str, blob: bytes) -> bool:
+        """
+        Store an encoded upload result.
+
+        Returns False (after logging) if the cache can't be written; the
+        upload itself is unaffected.
+        """
+        path = self.path_for(key)
+        partial_path = f"{path}.{uuid.uuid4().hex}.partial"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(partial_path, "wb") as out:
+                out.write(blob)
+            os.replace(partial_path, path)
+        except OSError as e:
+            logger.warning(f"Upload cache write failed for {key[:12]}: {e}")
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            return False
+
+        with self._lock:
+            self._stores += 1
+        self.evict()
+        return True
+
+    def _entries(self):
+        """(path, size, mtime) for cached results, oldest first."""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            if not name.endswith(_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((path, st.st_size, st.st_mtime))
+        entries.sort(key=lambda e: e[2])
+        return entries
+
+    def evict(self, max_bytes: Optional[int] = None, dry_run: bool = False,
+              is_active: Optional[Callable[[str], bool]] = None) -> Tuple[int, int]:
+        """
+        Drop expired results, then oldest ones until under the byte budget.
+
+        Args:
+            max_bytes: Budget override (0 empties the cache)
+            dry_run: Report what would be removed without deleting
+            is_active: Predicate for files that must be kept (in use)
+
+        Returns:
+            (files removed, bytes freed)
+        """
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        cutoff = time.time() - self.retention_hours * 3600
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        removed = freed = 0
+
+        for path, size, mtime in entries:
+            if mtime >= cutoff and total <= budget:
+                break
+            if is_active and is_active(path):
+                continue
+            if not dry_run:
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    logger.debug(f"Upload cache could not evict {path}: {e}")
+                    continue
+            total -= size
+            removed += 1
+            freed += size
+
+        if removed and not dry_run:
+            with self._lock:
+                self._evictions += removed
+            logger.info(f"Upload cache evicted {removed} result(s), {freed} bytes")
+        return removed, freed
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._entries()
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "directory": self.directory,
+                "entries": len(entries),
+                "bytes": sum(size for _, size, _ in entries),
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else None,
+                "forced_reprocess": self._forced,
+                "stores": self._stores,
+                "evictions": self._evictions,
+            }
+
+
+# ==============================================================================
+# GLOBAL INSTANCE
+# ==============================================================================
+
+_upload_cache: Optional[UploadResultCache] = None
+
+
+def get_upload_cache() -> UploadResultCache:
+    """Get or create global upload result cache."""
+    global _upload_cache
+    if _upload_cache is None:
+        _upload_cache = UploadResultCache()
+    return _upload_cache
@@ -0,0 +1,152 @@
+# fixed_asset_ai/logic/workbook_reader.py
+"""
+Workbook Reader for Fixed Asset Schedules
+
+Single ingestion layer for Excel uploads. Each workbook is opened once in
+openpyxl read-only (streaming) mode and every requested sheet comes back
+as a raw DataFrame (header=None layout: positional rows and columns,
+exactly as the cells appear).
+
+Key Features:
+- One open per workbook; the zip is not re-parsed per sheet
+- Rows are streamed and packed into object blocks, so the workbook's cell
+  objects are never all held in memory
+- Optional row limit per sheet for cheap previews (header detection)
+- Per-sheet failures are reported and skipped, not fatal
+
+CSV/TSV files (by extension) are read by delimited_reader as a one-sheet
+workbook in the same layout.
+
+Used by /upload (tab analysis) and ImporterService so both work from the
+same frames.
+
+Author: Fixed Asset AI Team
+"""
+
+from __future__ import annotations
+
+import logging
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .delimited_reader import is_delimited_file, read_delimited_sheets
+
+logger = logging.getLogger(__name__)
+
+
+# Rows packed into each object block while streaming a sheet
+READ_BLOCK_ROWS = 10000
+
+
+def _rows_to_block(rows: List[tuple]) -> np.ndarray:
+    """Pack streamed rows (possibly ragged) into a 2-D object array."""
+    width = max((len(r) for r in rows), default=0)
+    block = np.full((len(rows), width), None, dtype=object)
+    for i, row in enumerate(rows):
+        if row:
+            block[i, :len(row)] = row
+    return block
+
+
+def _sheet_frame(ws, nrows: Optional[int] = None) -> pd.DataFrame:
+    """
+    Stream one read-only worksheet into a raw DataFrame.
+
+    Column dtypes are inferred once over the whole sheet, matching
+    pd.DataFrame(list(ws.iter_rows(values_only=True))).
+    """
+    # Dimensions written by some tools are wrong ("A1"); read what's there
+    ws.reset_dimensions()
+    rows = ws.iter_rows(values_only=True)
+    if nrows is not None:
+        rows = islice(rows, nrows)
+
+    blocks = []
+    total_rows = 0
+    last_row = 0  # rows after the last one with any cells are dropped
+    while True:
+        chunk = list(islice(rows, READ_BLOCK_ROWS))
+        if not chunk:
+            break
+        for i in range(len(chunk) - 1, -1, -1):
+            if chunk[i]:
+                last_row = total_rows + i + 1
+                break
+        blocks.append(_rows_to_block(chunk))
+        total_rows += len(chunk)
+
+    if last_row == 0:
+        return pd.DataFrame()
+
+    width = max(b.shape[1] for b in blocks)
+    for i, block in enumerate(blocks):
+        if block.shape[1] < width:
+            padded = np.full((block.shape[0], width), None, dtype=object)
+            padded[:, :block.shape[1]] = block
+            blocks[i] = padded
+
+    values = blocks[0] if len(blocks) == 1 else np.concatenate(blocks)
+    return pd.DataFrame(values[:last_row]).infer_objects()
+
+
+def iter_workbook_sheets(
+    file_path: str,
+    sheet_names: Optional[Sequence[str]] = None,
+    nrows: Optional[int] = None,
+    warnings: Optional[List[str]] = None,
+) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """
+    Yield (sheet name, raw DataFrame) for a workbook, opening it once.
+
+    Args:
+        file_path: Path to the .xlsx/.xlsm file, or a CSV/TSV file
+        sheet_names: Sheets to read, in workbook order (default: all)
+        nrows: Read at most this many rows per sheet (default: all)
+        warnings: If given, per-sheet read failures are appended here and
+            the sheet is skipped; otherwise they are only logged
+
+    Raises:
+        Exception: If the workbook itself cannot be opened
+    """
+    if is_delimited_file(file_path):
+        for name, df in read_delimited_sheets(file_path, nrows, warnings).items():
+            if sheet_names is None or name in sheet_names:
+                yield name, df
+        return
+
+    import openpyxl
+
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        wanted = None if sheet_names is None else set(sheet_names)
+        for name in wb.sheetnames:
+            if wanted is not None and name not in wanted:
+                continue
+            try:
+                df = _sheet_frame(wb[name], nrows)
+            except Exception as e:
+                message = f"Could not read sheet '{name}': {e}"
+                logger.warning(message)
+                if warnings is not None:
+                    warnings.append(message)
+                continue
+            yield name, df
+    finally:
+        wb.close()
+
+
+def read_workbook_sheets(
+    file_path: str,
+    sheet_names: Optional[Sequence[str]] = None,
+    nrows: Optional[int] = None,
+    warnings: Optional[List[str]] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Read sheets into {sheet name: raw DataFrame}, in workbook order.
+
+    See iter_workbook_sheets for arguments.
+    """
+    return dict(iter_workbook_sheets(file_path, sheet_names, nrows, warnings))
@@ -2,6 +2,10 @@ from pydantic import BaseModel, Field, validator
 from typing import Optional, List
 from datetime import date, datetime
 
+# Asset.from_normalized: (static defaults, default factories) per model class
+_NORMALIZED_DEFAULTS = {}
+
+
 class Asset(BaseModel):
     """
     Represents a single fixed asset with flexible validation.
@@ -128,6 +132,44 @@ class Asset(BaseModel):
         except (ValueError, TypeError):
             return 0.0
 
+    @classmethod
+    def from_normalized(cls, **fields) -> "Asset":
+        """
+        Build an Asset from values already in their validated form, skipping
+        pydantic validation (bulk imports).
+
+        Callers must pass what validation would produce: dates as date,
+        numbers as float, text as str, cost >= 0. Anything that might not
+        validate has to go through the normal constructor instead.
+
+        Equivalent to model_construct(**fields), without its per-field
+        alias and default_factory handling (which costs more than the
+        construction itself).
+        """
+        defaults = _NORMALIZED_DEFAULTS.get(cls)
+        if defaults is None:
+            defaults = _NORMALIZED_DEFAULTS[cls] = (
+                # every field, in declaration order
+                {name: (None if f.is_required() or f.default_factory else f.default)
+                 for name, f in cls.model_fields.items()},
+                [(name, f.default_factory) for name, f in cls.model_fields.items() if f.default_factory],
+            )
+        template, factories = defaults
+        if len(fields) == len(template):
+            values = fields  # every field given; **fields is already a new dict
+        else:
+            values = dict(template)
+            for name, factory in factories:
+                values[name] = factory()
+            values.update(fields)
+
+        asset = cls.__new__(cls)
+        object.__setattr__(asset, "__dict__", values)
+        object.__setattr__(asset, "__pydantic_fields_set__", set(fields))
+        object.__setattr__(asset, "__pydantic_extra__", None)
+        object.__setattr__(asset, "__pydantic_private__", None)
+        return asset
+
     def check_validity(self, tax_year: int = None):
         """
         Runs business rules and populates validation_errors and validation_warnings.
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Session Codec Benchmark
+
+Times encoding and decoding a synthetic session's assets, and reports the
+stored size, for:
+
+- JSON (serialize_session / deserialize_session, the format used before
+  session_codec)
+- session_codec snapshot, zlib-compressed (default)
+- session_codec snapshot, lzma-compressed
+- session_codec snapshot, uncompressed
+
+Usage:
+    python benchmark_session_codec.py
+    python benchmark_session_codec.py --sizes 1000 10000 100000 --repeat 3
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+from datetime import date, datetime, timedelta
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.models.asset import Asset, AuditEvent
+from backend.logic.session_asset_store import ColumnarAssetStore
+from backend.logic.session_codec import asset_columns, encode_payload
+from backend.logic.session_manager import (
+    SessionData,
+    serialize_session,
+    deserialize_session,
+    serialize_session_meta,
+    _deserialize_asset_snapshot,
+)
+
+CLASSES = [
+    ("Computer Equipment", 5, "200DB"), ("Office Furniture", 7, "200DB"),
+    ("Machinery & Equipment", 7, "200DB"), ("Vehicles", 5, "200DB"),
+    ("Leasehold Improvements", 15, "SL"), ("Land Improvements", 15, "150DB"),
+]
+
+
+def make_session(n_assets: int) -> SessionData:
+    """A session with n_assets classified assets, like one after upload."""
+    start = date(2015, 1, 1)
+    assets = {}
+    for i in range(n_assets):
+        macrs_class, life, method = CLASSES[i % len(CLASSES)]
+        in_service = start + timedelta(days=(i * 7) % 3650)
+        asset = Asset.from_normalized(
+            row_index=i + 2,
+            unique_id=i,
+            asset_id=f"FA-{i:07d}",
+            description=f"{macrs_class} item serial {i:07d}",
+            cost=1200.0 + (i % 500),
+            acquisition_date=in_service,
+            in_service_date=in_service,
+            macrs_class=macrs_class,
+            macrs_life=life,
+            macrs_method=method,
+            macrs_convention="HY",
+            confidence_score=0.5 + (i % 50) / 100,
+            source_sheet=f"FY{2025 - i % 4} Detail",
+            transaction_type="Current Year Addition" if i % 3 == 0 else "Existing Asset",
+            validation_warnings=["Low confidence - consider manual review."] if i % 10 == 0 else [],
+            audit_trail=[AuditEvent(timestamp=datetime(2025, 1, 6, 9, 30), user="cpa", action="approve")]
+            if i % 25 == 0 else [],
+        )
+        assets[i] = asset
+    now = datetime.utcnow()
+    return SessionData(
+        session_id="benchmark", user_id=None, created_at=now, last_accessed=now,
+        expires_at=now + timedelta(hours=24), assets=ColumnarAssetStore(assets),
+    )
+
+
+def _best(func, repeat: int):
+    """(fastest time over repeat runs, last result)."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def measure(label: str, encode, decode, repeat: int) -> None:
+    encode_time, data = _best(encode, repeat)
+    decode_time, _ = _best(lambda: decode(data), repeat)
+    print(f"  {label:<22} encode {encode_time * 1000:>8.1f}ms  decode {decode_time * 1000:>8.1f}ms  "
+          f"size {len(data) / 1024:>9.1f}KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark session encoding")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Session sizes (assets) to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (fastest is reported)")
+    args = parser.parse_args()
+
+    for n_assets in args.sizes:
+        session = make_session(n_assets)
+        print(f"{n_assets:,} assets")
+
+        measure("JSON (legacy)",
+                lambda: serialize_session(session).encode("utf-8"),
+                deserialize_session, args.repeat)
+
+        for compression in ("zlib", "lzma", "none"):
+            def encode(compression=compression):
+                keys, columns = asset_columns(session.assets)
+                return encode_payload(keys=keys, columns=columns, compression=compression)
+            measure(f"codec ({compression})", encode, _deserialize_asset_snapshot, args.repeat)
+
+        meta = serialize_session_meta(session)
+        print(f"  {'metadata (codec)':<22} size {len(meta):,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Workbook Ingestion Benchmark
+
+Times reading every sheet of a synthetic client workbook into raw
+DataFrames, and reports peak process memory (RSS) for each strategy.
+Each strategy runs in a fresh process so peaks don't mask each other:
+
+- openpyxl full mode + per-row DataFrame build (old /upload path)
+- pd.read_excel once per sheet (old ImporterService path)
+- read_workbook_sheets (single read-only pass)
+
+Usage:
+    python benchmark_workbook_ingestion.py --rows 1000000 --sheets 4
+    python benchmark_workbook_ingestion.py --file client.xlsx
+
+About 100k rows per 5MB of workbook at the default column set; use
+--rows 1000000 for a ~50MB file.
+"""
+
+import sys
+import time
+import argparse
+import multiprocessing
+from pathlib import Path
+from datetime import datetime, timedelta
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import openpyxl
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.logic.workbook_reader import read_workbook_sheets
+
+
+HEADER = ["Asset ID", "Description", "Category", "Cost", "Acquisition Date",
+          "In Service Date", "Method", "Life", "Accumulated Depreciation", "Location"]
+
+
+def make_workbook(path: str, n_rows: int, n_sheets: int) -> None:
+    """Write a synthetic asset schedule split across n_sheets tabs."""
+    wb = openpyxl.Workbook(write_only=True)
+    start = datetime(2015, 1, 1)
+    per_sheet = max(n_rows // n_sheets, 1)
+    for s in range(n_sheets):
+        ws = wb.create_sheet(f"FY{2025 - s} Detail")
+        ws.append([f"Fixed Asset Schedule - FY{2025 - s}"])
+        ws.append([])
+        ws.append(HEADER)
+        for i in range(per_sheet):
+            in_service = start + timedelta(days=(i * 7) % 3650)
+            ws.append([
+                f"FA-{s:02d}-{i:07d}", f"Dell Latitude laptop serial {i:07d}", "Computer Equipment",
+                1200.0 + (i % 500), in_service, in_service, "200DB", 5, (i % 900) * 1.5,
+                f"Office {i % 40}",
+            ])
+    wb.save(path)
+
+
+def read_full_mode(path: str) -> dict:
+    wb = openpyxl.load_workbook(path, data_only=True)
+    sheets = {}
+    for name in wb.sheetnames:
+        sheets[name] = pd.DataFrame([row for row in wb[name].iter_rows(values_only=True)])
+    wb.close()
+    return sheets
+
+
+def read_per_sheet(path: str) -> dict:
+    xl = pd.ExcelFile(path)
+    names = xl.sheet_names
+    xl.close()
+    return {name: pd.read_excel(path, sheet_name=name, header=None) for name in names}
+
+
+def _peak_rss_mb() -> float:
+    if resource is not None:
+        # ru_maxrss is KB on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    import psutil
+    return psutil.Process().memory_info().peak_wset / 1024 / 1024
+
+
+def _run(func, path: str, results) -> None:
+    baseline = _peak_rss_mb()
+    start = time.perf_counter()
+    sheets = func(path)
+    elapsed = time.perf_counter() - start
+    rows = sum(len(df) for df in sheets.values())
+    results.put((elapsed, _peak_rss_mb() - baseline, rows))
+
+
+def measure(label: str, func, path: str) -> None:
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    proc = ctx.Process(target=_run, args=(func, path, results))
+    proc.start()
+    proc.join()
+    if proc.exitcode != 0:
+        # e.g. killed for running out of memory
+        print(f"  {label:<28} failed (exit code {proc.exitcode})")
+        return
+    elapsed, peak, rows = results.get()
+    print(f"  {label:<28} {elapsed:>7.1f}s  peak +{peak:>7.0f}MB  rows {rows:,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark workbook ingestion")
+    parser.add_argument("--file", help="Existing workbook to read (skips generation)")
+    parser.add_argument("--rows", type=int, default=100000, help="Total data rows to generate")
+    parser.add_argument("--sheets", type=int, default=4, help="Tabs to spread rows across")
+    parser.add_argument("--skip-old", action="store_true", help="Only time read_workbook_sheets")
+    args = parser.parse_args()
+
+    path = args.file
+    if not path:
+        path = str(Path.cwd() / f"ingestion_bench_{args.rows}x{args.sheets}.xlsx")
+        if not Path(path).exists():
+            print(f"Generating {path} ...")
+            make_workbook(path, args.rows, args.sheets)
+    print(f"Workbook: {path} ({Path(path).stat().st_size / 1024 / 1024:.1f}MB)")
+
+    measure("read_workbook_sheets", read_workbook_sheets, path)
+    if not args.skip_old:
+        measure("openpyxl full mode", read_full_mode, path)
+        measure("pd.read_excel per sheet", read_per_sheet, path)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,57 @@
+import hashlib
+import logging
+import time
 import pandas as pd
+from collections import OrderedDict
+from dataclasses import dataclass
 from io import BytesIO
-from typing import List
+from tempfile import SpooledTemporaryFile
+from threading import Lock
+from typing import Iterator, List, Optional
 from datetime import date, datetime
 from openpyxl.styles import Font
 from backend.models.asset import Asset
-from backend.logic.fa_export import build_fa, export_fa_excel
+from backend.logic.fa_export import export_fa_excel, export_fa_ascii_stream, attach_audit_columns
+from backend.logic.fa_export_incremental import IncrementalFABuilder
 from backend.logic.fa_export_formatters import _apply_professional_formatting
+from backend.logic.fa_export_streaming import StreamingWorkbook
+
+logger = logging.getLogger(__name__)
+
+# Part of every export cache key: bump when workpaper layout or
+# calculations change so cached artifacts from older builds are not served
+EXPORT_FORMAT_VERSION = "2025.3"
+
+
+@dataclass
+class ExportArtifacts:
+    """
+    build_fa input and output for one asset state, shared by every workpaper.
+
+    Workpapers read frames through the accessors, which return copies, so
+    one export can't leak edits into the next.
+    """
+    version: Optional[str]
+    engine_df: pd.DataFrame
+    fa_df: Optional[pd.DataFrame] = None  # None if build_fa failed
+
+    @property
+    def built(self) -> bool:
+        return self.fa_df is not None
+
+    def engine_frame(self) -> pd.DataFrame:
+        return self.engine_df.copy()
+
+    def export_frame(self, audit_columns: bool = False) -> pd.DataFrame:
+        """
+        build_fa output, optionally with the audit text columns attached.
+
+        Audit columns are attached per call, so AuditTimestamp is the time
+        of this export, not of the first one served from these artifacts.
+        """
+        if not audit_columns:
+            return self.fa_df.copy()
+        return attach_audit_columns(self.fa_df)
 
 
 class ExporterService:
@@ -40,6 +86,119 @@ class ExporterService:
     The CPA reviews and decides what to do - the system doesn't exclude anything.
     """
 
+    # Incremental build_fa state kept for this many asset lists (LRU)
+    MAX_CACHED_BUILDERS = 8
+
+    # Finished build_fa results kept for this many asset states (LRU)
+    MAX_CACHED_ARTIFACTS = 8
+
+    def __init__(self):
+        self._builders: OrderedDict = OrderedDict()
+        self._builders_lock = Lock()
+        self._artifacts: OrderedDict = OrderedDict()
+        self._artifacts_lock = Lock()
+
+    def _engine_frame(self, assets: List[Asset], tax_year: int) -> pd.DataFrame:
+        """Build the build_fa input frame (one engine row per asset)."""
+        engine_data = []
+        for asset in assets:
+            # Detect transaction type first (with date-based classification)
+            trans_type = self._detect_transaction_type(asset, tax_year)
+            engine_data.append(self._build_engine_row(asset, trans_type, tax_year))
+        return pd.DataFrame(engine_data)
+
+    @staticmethod
+    def _content_version(df: pd.DataFrame) -> Optional[str]:
+        """Fingerprint of the engine frame, or None if it can't be hashed."""
+        try:
+            row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        except TypeError:
+            return None
+        digest = hashlib.sha256(repr(list(df.columns)).encode("utf-8"))
+        digest.update(row_hashes.tobytes())
+        return digest.hexdigest()[:16]
+
+    def _export_artifacts(self, assets: List[Asset], tax_year: int,
+                          de_minimis_limit: float = 0.0) -> ExportArtifacts:
+        """
+        Return the shared build_fa result for this asset state.
+
+        The engine frame is fingerprinted, so /export followed by
+        /export/audit (or generate_both_workpapers) on unchanged assets
+        reuses one build_fa run. Any edit changes the fingerprint; the new
+        state then goes through the incremental builder.
+        """
+        engine_df = self._engine_frame(assets, tax_year)
+        version = self._content_version(engine_df)
+        key = (version, tax_year, de_minimis_limit)
+
+        if version is not None:
+            with self._artifacts_lock:
+                artifacts = self._artifacts.get(key)
+                if artifacts is not None:
+                    self._artifacts.move_to_end(key)
+                    logger.info(f"Export artifacts cache hit: version {version}, "
+                                f"{len(engine_df)} assets, tax year {tax_year}")
+                    return artifacts
+
+        artifacts = ExportArtifacts(version=version, engine_df=engine_df)
+        start = time.perf_counter()
+        try:
+            artifacts.fa_df = self._build_fa(
+                engine_df,
+                tax_year=tax_year,
+                de_minimis_limit=de_minimis_limit,  # Pass de minimis threshold for safe harbor expensing
+                strategy="Balanced (Bonus Only)",
+                taxable_income=10000000.0,  # High default to avoid limits
+            )
+        except Exception as e:
+            # Callers fall back to the raw engine data; don't cache the failure
+            print(f"Warning: build_fa failed ({e}), using raw data")
+            return artifacts
+
+        logger.info(f"Export artifacts cache miss: version {version}, {len(engine_df)} assets, "
+                    f"built in {time.perf_counter() - start:.2f}s")
+        if version is not None:
+            with self._artifacts_lock:
+                self._artifacts[key] = artifacts
+                while len(self._artifacts) > self.MAX_CACHED_ARTIFACTS:
+                    self._artifacts.popitem(last=False)
+        return artifacts
+
+    def _build_fa(self, df: pd.DataFrame, tax_year: int, de_minimis_limit: float = 0.0,
+                  strategy: str = "Balanced (Bonus Only)",
+                  taxable_income: float = 10000000.0) -> pd.DataFrame:
+        """
+        Run build_fa through an incremental builder cached per asset list.
+
+        Re-exporting after a few edits only recomputes the edited assets (and
+        any whose Section 179 allocation or convention they change); output
+        is the same as calling build_fa directly.
+        """
+        asset_ids = tuple(df["Client Asset ID"]) if "Client Asset ID" in df.columns else len(df)
+        key = (tax_year, de_minimis_limit, strategy, taxable_income, tuple(df.columns), asset_ids)
+
+        with self._builders_lock:
+            entry = self._builders.pop(key, None)
+            if entry is None:
+                entry = (
+                    IncrementalFABuilder(
+                        tax_year=tax_year,
+                        strategy=strategy,
+                        taxable_income=taxable_income,
+                        use_acq_if_missing=True,
+                        de_minimis_limit=de_minimis_limit,
+                    ),
+                    Lock(),
+                )
+            self._builders[key] = entry
+            while len(self._builders) > self.MAX_CACHED_BUILDERS:
+                self._builders.popitem(last=False)
+
+        builder, builder_lock = entry
+        with builder_lock:
+            return builder.build(df)
+
     def _format_asset_number(self, asset: Asset) -> int:
         """
         Format Asset # for FA CS - must be numeric.
@@ -160,94 +319,17 @@ class ExporterService:
         # Determine effective tax year FIRST (needed for transaction type classification)
         effective_tax_year = tax_year if tax_year else date.today().year
 
-        # Prepare data for build_fa engine (uses specific column names)
-        engine_data = []
-        for asset in assets:
-            # Detect transaction type first (with date-based classification)
-            trans_type = self._detect_transaction_type(asset, effective_tax_year)
-
-            row = {
-                "Asset #": self._format_asset_number(asset),
-                "Client Asset ID": str(asset.asset_id) if asset.asset_id else f"Row-{asset.row_index}",
-                "Description": asset.description,
-
-                # Dates - FA CS requires "Date In Service" column name
-                "Acquisition Date": asset.acquisition_date,
-                "In Service Date": asset.in_service_date if asset.in_service_date else asset.acquisition_date,
-
-                # Cost and depreciation
-                "Cost": asset.cost if asset.cost else 0.0,
-
-                # Classification (from AI/rules)
-                "Final Category": asset.macrs_class if asset.macrs_class else "Unclassified",
-                "MACRS Life": asset.macrs_life,
-                "Recovery Period": asset.macrs_life,  # Alias for build_fa
-                "Method": asset.macrs_method,
-                "Convention": asset.macrs_convention,
-
-                # FA CS Wizard Category - the exact dropdown text for RPA automation
-                # This is the category shown in FA CS software's asset wizard
-                "FA_CS_Wizard_Category": getattr(asset, 'fa_cs_wizard_category', None),
-
-                # Disposal fields (if present on asset)
-                "Disposal Date": getattr(asset, 'disposal_date', None),
-                "Proceeds": getattr(asset, 'proceeds', None) or getattr(asset, 'sale_price', None),
-                "Accumulated Depreciation": getattr(asset, 'accumulated_depreciation', 0.0) or 0.0,
-                "Net Book Value": getattr(asset, 'net_book_value', None),
-                "Gain/Loss": getattr(asset, 'gain_loss', None),
-
-                # Transfer fields (if present on asset)
-                "From Location": getattr(asset, 'from_location', None),
-                "To Location": getattr(asset, 'to_location', None),
-                "Transfer Date": getattr(asset, 'transfer_date', None),
-
-                # Transaction type - detect from asset attributes
-                "Transaction Type": trans_type,
-
-                # Metadata for tracking
-                "Confidence": asset.confidence_score,
-                "Source": "rules",
-                "Business Use %": 1.0,
-                "Tax Year": date.today().year,
-
-                # Depreciation Election (CPA decision for tax treatment)
-                "Depreciation Election": getattr(asset, 'depreciation_election', 'MACRS') or 'MACRS',
-                "Election Reason": getattr(asset, 'election_reason', '') or '',
-
-                # Additional columns required by build_fa for recapture calculations
-                # These are initialized and will be computed by build_fa
-                "Section 179 Amount": 0.0,
-                "Bonus Amount": 0.0,
-                "Bonus Percentage Used": 0.0,
-                "MACRS Year 1 Depreciation": 0.0,
-                "Auto Limit Notes": "",
-                "Uses ADS": False,
-                "§1245 Recapture (Ordinary Income)": 0.0,
-                "§1250 Recapture (Ordinary Income)": 0.0,
-                "Unrecaptured §1250 Gain (25% rate)": 0.0,
-                "Capital Gain": 0.0,
-                "Capital Loss": 0.0,
-                "Adjusted Basis at Disposal": 0.0,
-            }
-            engine_data.append(row)
-
-        df = pd.DataFrame(engine_data)
-
-        # Call the advanced export builder for full processing
+        # Prepare data for build_fa engine and run it (shared with the workpapers)
         # This applies: FA_CS_Wizard_Category mapping, disposal recapture calculations,
         # transfer handling, Section 179/Bonus depreciation, de minimis safe harbor, etc.
-        try:
-            export_df = build_fa(
-                df=df,
-                tax_year=effective_tax_year,
-                strategy="Balanced (Bonus Only)",
-                taxable_income=10000000.0,  # High default to avoid limits
-                use_acq_if_missing=True,
-                de_minimis_limit=de_minimis_limit  # Pass de minimis threshold for safe harbor expensing
-            )
-        except Exception as e:
+        artifacts = self._export_artifacts(assets, effective_tax_year, de_minimis_limit)
+        df = artifacts.engine_frame()
+
+        if artifacts.built:
+            # Change Log reasons read ClassificationExplanation
+            export_df = artifacts.export_frame(audit_columns=True)
+        else:
             # If build_fa fails, use the raw data with basic formatting
-            print(f"Warning: build_fa failed ({e}), using raw data")
             export_df = df.copy()
             # Normalize column names to match what FA CS expects
             # build_fa renames these columns, so we need to do it manually in fallback
@@ -566,12 +648,40 @@ class ExporterService:
         output.seek(0)
         return output
 
+    def generate_fa_cs_ascii(self, assets: List[Asset], tax_year: int = None,
+                             de_minimis_limit: float = 0.0, delimiter: str = "\t") -> Iterator[bytes]:
+        """
+        Generate the FA CS ASCII import file (tab- or comma-delimited).
+
+        Holds the same assets as the "FA CS Entry" sheet: De Minimis items
+        are expensed, not imported. build_fa runs (or is reused) before this
+        returns; the iterator then formats rows a chunk at a time so the
+        file can be streamed to the client.
+        """
+        effective_tax_year = tax_year if tax_year else date.today().year
+
+        artifacts = self._export_artifacts(assets, effective_tax_year, de_minimis_limit)
+        df = artifacts.engine_frame()
+
+        if artifacts.built:
+            export_df = artifacts.export_frame()
+        else:
+            export_df = df.copy()
+            self._normalize_columns(export_df)
+
+        if "Depreciation Election" in df.columns and "Depreciation Election" not in export_df.columns:
+            export_df["Depreciation Election"] = df["Depreciation Election"].values
+        if "Depreciation Election" in export_df.columns:
+            export_df = export_df[export_df["Depreciation Election"] != "DeMinimis"]
+
+        return export_fa_ascii_stream(export_df, delimiter=delimiter)
+
     # ========================================================================
     # OPTION B: TWO SEPARATE EXPORTS (Industry Standard)
     # ========================================================================
 
     def generate_fa_cs_prep_workpaper(self, assets: List[Asset], tax_year: int = None,
-                                       de_minimis_limit: float = 0.0) -> BytesIO:
+                                       de_minimis_limit: float = 0.0) -> SpooledTemporaryFile:
         """
         Generate FA CS PREP WORKPAPER - for data entry prep and review.
 
@@ -586,30 +696,19 @@ class ExporterService:
         3. Transfer Entry - Transfers with From/To locations
         4. De Minimis Expenses - Items to expense immediately (not add to FA CS)
         5. Items Requiring Review - Low confidence, missing data, warnings
+
+        Returns a spooled temp file positioned at 0 (caller closes it) so
+        large workbooks can be streamed without holding them in memory.
         """
         effective_tax_year = tax_year if tax_year else date.today().year
 
-        # Prepare data using build_fa engine
-        engine_data = []
-        for asset in assets:
-            trans_type = self._detect_transaction_type(asset, effective_tax_year)
-            row = self._build_engine_row(asset, trans_type, effective_tax_year)
-            engine_data.append(row)
-
-        df = pd.DataFrame(engine_data)
+        # Prepare data using build_fa engine (shared across workpapers)
+        artifacts = self._export_artifacts(assets, effective_tax_year, de_minimis_limit)
+        df = artifacts.engine_frame()
 
-        # Process through build_fa for full calculations
-        try:
-            export_df = build_fa(
-                df=df,
-                tax_year=effective_tax_year,
-                strategy="Balanced (Bonus Only)",
-                taxable_income=10000000.0,
-                use_acq_if_missing=True,
-                de_minimis_limit=de_minimis_limit
-            )
-        except Exception as e:
-            print(f"Warning: build_fa failed ({e}), using raw data")
+        if artifacts.built:
+            export_df = artifacts.export_frame()
+        else:
             export_df = df.copy()
             self._normalize_columns(export_df)
 
@@ -733,79 +832,57 @@ class ExporterService:
             de_minimis_df, disposal_entry_df, effective_tax_year
         )
 
-        # Generate Excel workbook
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            # Sheet 1: Addition Entry (Current Year Additions ONLY)
-            if not addition_entry_df.empty:
-                addition_entry_df.to_excel(writer, sheet_name='Addition Entry', index=False)
-                ws_entry = writer.sheets['Addition Entry']
-                _apply_professional_formatting(ws_entry, addition_entry_df)
-            else:
-                # Create placeholder sheet if no additions
-                pd.DataFrame([{"Note": "No Current Year Additions"}]).to_excel(
-                    writer, sheet_name='Addition Entry', index=False)
-
-            # Sheet 2: Disposal Entry
-            if disposal_entry_df is not None and not disposal_entry_df.empty:
-                disposal_entry_df.to_excel(writer, sheet_name='Disposal Entry', index=False)
-                ws_disposal = writer.sheets['Disposal Entry']
-                _apply_professional_formatting(ws_disposal, disposal_entry_df)
-                # Add gain/loss total
-                if 'Gain/Loss' in disposal_entry_df.columns:
-                    total_row = len(disposal_entry_df) + 2
-                    ws_disposal.cell(row=total_row, column=1, value="TOTAL GAIN/(LOSS):")
-                    gain_loss_col = list(disposal_entry_df.columns).index('Gain/Loss') + 1
-                    total_gain_loss = disposal_entry_df['Gain/Loss'].sum()
-                    ws_disposal.cell(row=total_row, column=gain_loss_col, value=total_gain_loss)
-                    ws_disposal.cell(row=total_row, column=1).font = Font(bold=True)
-
-            # Sheet 3: Transfer Entry
-            if transfer_entry_df is not None and not transfer_entry_df.empty:
-                transfer_entry_df.to_excel(writer, sheet_name='Transfer Entry', index=False)
-                ws_transfer = writer.sheets['Transfer Entry']
-                _apply_professional_formatting(ws_transfer, transfer_entry_df)
-
-            # Sheet 4: De Minimis Expenses
-            if de_minimis_expenses_df is not None and not de_minimis_expenses_df.empty:
-                de_minimis_expenses_df.to_excel(writer, sheet_name='De Minimis Expenses', index=False)
-                ws_deminimis = writer.sheets['De Minimis Expenses']
-                _apply_professional_formatting(ws_deminimis, de_minimis_expenses_df)
-                # Add total row
-                total_row = len(de_minimis_expenses_df) + 2
-                ws_deminimis.cell(row=total_row, column=1, value="TOTAL TO EXPENSE:")
-                ws_deminimis.cell(row=total_row, column=2, value=de_minimis_expenses_df['Cost'].sum())
-                ws_deminimis.cell(row=total_row, column=1).font = Font(bold=True)
-
-            # Sheet 5: Existing Assets (for FA CS tie-out)
-            if existing_assets_df is not None and not existing_assets_df.empty:
-                existing_assets_df.to_excel(writer, sheet_name='Existing Assets', index=False)
-                ws_existing = writer.sheets['Existing Assets']
-                _apply_professional_formatting(ws_existing, existing_assets_df)
-                # Add totals row
-                total_row = len(existing_assets_df) + 2
-                ws_existing.cell(row=total_row, column=1, value="TOTALS:")
-                if 'Tax Cost' in existing_assets_df.columns:
-                    cost_col = list(existing_assets_df.columns).index('Tax Cost') + 1
-                    ws_existing.cell(row=total_row, column=cost_col, value=existing_assets_df['Tax Cost'].sum())
-                if 'Accum. Depreciation' in existing_assets_df.columns:
-                    accum_col = list(existing_assets_df.columns).index('Accum. Depreciation') + 1
-                    ws_existing.cell(row=total_row, column=accum_col, value=existing_assets_df['Accum. Depreciation'].sum())
-                ws_existing.cell(row=total_row, column=1).font = Font(bold=True)
-
-            # Sheet 6: Items Requiring Review
-            if items_requiring_review_df is not None and not items_requiring_review_df.empty:
-                items_requiring_review_df.to_excel(writer, sheet_name='Items Requiring Review', index=False)
-                ws_review = writer.sheets['Items Requiring Review']
-                _apply_professional_formatting(ws_review, items_requiring_review_df)
-
-            # Sheet 7: Summary (for FA CS reconciliation)
-            summary_df.to_excel(writer, sheet_name='Summary', index=False)
-            ws_summary = writer.sheets['Summary']
-            _apply_professional_formatting(ws_summary, summary_df)
+        # Generate Excel workbook (streamed to a spooled temp file)
+        book = StreamingWorkbook()
 
-        output.seek(0)
-        return output
+        # Sheet 1: Addition Entry (Current Year Additions ONLY)
+        if not addition_entry_df.empty:
+            book.add_sheet('Addition Entry', addition_entry_df)
+        else:
+            # Create placeholder sheet if no additions
+            book.add_sheet('Addition Entry', pd.DataFrame([{"Note": "No Current Year Additions"}]),
+                           formatted=False)
+
+        # Sheet 2: Disposal Entry
+        if disposal_entry_df is not None and not disposal_entry_df.empty:
+            footer = None
+            # Add gain/loss total
+            if 'Gain/Loss' in disposal_entry_df.columns:
+                footer = {disposal_entry_df.columns[0]: "TOTAL GAIN/(LOSS):",
+                          'Gain/Loss': disposal_entry_df['Gain/Loss'].sum()}
+            book.add_sheet('Disposal Entry', disposal_entry_df, footer=footer)
+
+        # Sheet 3: Transfer Entry
+        if transfer_entry_df is not None and not transfer_entry_df.empty:
+            book.add_sheet('Transfer Entry', transfer_entry_df)
+
+        # Sheet 4: De Minimis Expenses
+        if de_minimis_expenses_df is not None and not de_minimis_expenses_df.empty:
+            columns = list(de_minimis_expenses_df.columns)
+            # Add total row
+            footer = {columns[0]: "TOTAL TO EXPENSE:"}
+            if len(columns) > 1:
+                footer[columns[1]] = de_minimis_expenses_df['Cost'].sum()
+            book.add_sheet('De Minimis Expenses', de_minimis_expenses_df, footer=footer)
+
+        # Sheet 5: Existing Assets (for FA CS tie-out)
+        if existing_assets_df is not None and not existing_assets_df.empty:
+            # Add totals row
+            footer = {existing_assets_df.columns[0]: "TOTALS:"}
+            if 'Tax Cost' in existing_assets_df.columns:
+                footer['Tax Cost'] = existing_assets_df['Tax Cost'].sum()
+            if 'Accum. Depreciation' in existing_assets_df.columns:
+                footer['Accum. Depreciation'] = existing_assets_df['Accum. Depreciation'].sum()
+            book.add_sheet('Existing Assets', existing_assets_df, footer=footer)
+
+        # Sheet 6: Items Requiring Review
+        if items_requiring_review_df is not None and not items_requiring_review_df.empty:
+            book.add_sheet('Items Requiring Review', items_requiring_review_df)
+
+        # Sheet 7: Summary (for FA CS reconciliation)
+        book.add_sheet('Summary', summary_df)
+
+        return book.save()
 
     def generate_audit_workpaper(self, assets: List[Asset], tax_year: int = None,
                                   de_minimis_limit: float = 0.0) -> BytesIO:
@@ -824,27 +901,14 @@ class ExporterService:
         """
         effective_tax_year = tax_year if tax_year else date.today().year
 
-        # Prepare data using build_fa engine
-        engine_data = []
-        for asset in assets:
-            trans_type = self._detect_transaction_type(asset, effective_tax_year)
-            row = self._build_engine_row(asset, trans_type, effective_tax_year)
-            engine_data.append(row)
-
-        df = pd.DataFrame(engine_data)
+        # Prepare data using build_fa engine (shared across workpapers)
+        artifacts = self._export_artifacts(assets, effective_tax_year, de_minimis_limit)
+        df = artifacts.engine_frame()
 
-        # Process through build_fa for full calculations
-        try:
-            export_df = build_fa(
-                df=df,
-                tax_year=effective_tax_year,
-                strategy="Balanced (Bonus Only)",
-                taxable_income=10000000.0,
-                use_acq_if_missing=True,
-                de_minimis_limit=de_minimis_limit
-            )
-        except Exception as e:
-            print(f"Warning: build_fa failed ({e}), using raw data")
+        if artifacts.built:
+            # Change Log reasons read ClassificationExplanation
+            export_df = artifacts.export_frame(audit_columns=True)
+        else:
             export_df = df.copy()
             self._normalize_columns(export_df)
 
@@ -896,9 +960,12 @@ class ExporterService:
         """
         Generate BOTH workpapers (convenience method).
 
+        build_fa runs once; the second workpaper reuses the shared export
+        artifacts.
+
         Returns:
             dict with keys:
-            - 'prep_workpaper': BytesIO of FA CS Prep Workpaper
+            - 'prep_workpaper': SpooledTemporaryFile of FA CS Prep Workpaper
             - 'audit_workpaper': BytesIO of Audit Documentation
         """
         return {
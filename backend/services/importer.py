@@ -1,9 +1,14 @@
+import gc
+import numpy as np
 import pandas as pd
+from datetime import date, datetime
 from typing import List, Dict, Optional, Tuple, Any
 from dataclasses import dataclass, field
 from threading import local
 from backend.models.asset import Asset
 from backend.logic import sheet_loader
+from backend.logic.workbook_reader import read_workbook_sheets
+from backend.logic.delimited_reader import is_delimited_file
 from backend.logic.sheet_loader import (
     infer_macrs_class_from_sheet_name,
     _is_valid_asset_description,
@@ -37,6 +42,29 @@ class ParseResult:
 # Thread-local storage for per-request parse results
 _thread_local = local()
 
+# Cells _row_to_asset can't treat as a single value (pd.isna() returns an array)
+_NON_SCALAR_TYPES = (list, tuple, dict, set, np.ndarray)
+_NUMBER_TYPES = (int, float, np.integer, np.floating)
+
+
+def _normalized_date(v):
+    """
+    A date cell as Asset validation would store it: (True, date or None).
+
+    (False, None) for values only full validation can judge (text dates,
+    datetimes with a time of day, timezone-aware datetimes, ...).
+    """
+    if v is None or (not isinstance(v, _NON_SCALAR_TYPES) and pd.isna(v)):
+        return True, None
+    if isinstance(v, datetime):
+        if (v.tzinfo is None and not (v.hour or v.minute or v.second or v.microsecond)
+                and not getattr(v, "nanosecond", 0)):
+            return True, v.date()
+        return False, None
+    if isinstance(v, date):
+        return True, v
+    return False, None
+
 
 class ImporterService:
     """
@@ -131,25 +159,16 @@ class ImporterService:
             sheets = preloaded_sheets
             print(f"Using pre-loaded sheets: {len(sheets)} sheets (skipping file I/O)")
         else:
+            # Open the workbook once and stream every sheet (read-only mode);
+            # unreadable sheets are skipped with a warning
             try:
-                xl = pd.ExcelFile(file_path)
+                sheets = read_workbook_sheets(file_path, warnings=result.warnings)
             except Exception as e:
                 error = f"Could not open Excel file: {e}"
                 result.errors.append(error)
                 print(f"Error: {error}")
                 return []
 
-            sheets = {}
-            for sheet_name in xl.sheet_names:
-                try:
-                    df = pd.read_excel(file_path, sheet_name=sheet_name, header=None)
-                    sheets[sheet_name] = df
-                except Exception as e:
-                    warning = f"Could not read sheet '{sheet_name}': {e}"
-                    result.warnings.append(warning)
-                    print(f"Warning: {warning}")
-            xl.close()
-
         if not sheets:
             error = "No readable sheets found in file"
             result.errors.append(error)
@@ -193,17 +212,7 @@ class ImporterService:
         print(f"Processed {result.stats['total_rows']} assets from {result.stats['sheets_processed']} sheets")
 
         # 3. Convert DataFrame rows to Asset objects
-        assets = []
-        row_errors = []
-        for idx, row in df_unified.iterrows():
-            try:
-                asset = self._row_to_asset(row, idx)
-                if asset:
-                    assets.append(asset)
-            except Exception as e:
-                error_msg = f"Row {idx}: {e}"
-                row_errors.append(error_msg)
-                print(f"Warning: Could not process row {idx}: {e}")
+        assets, row_errors = self._frame_to_assets(df_unified)
 
         # Track row-level errors (limit to prevent memory issues)
         if row_errors:
@@ -227,6 +236,191 @@ class ImporterService:
         print(f"Successfully created {len(assets)} Asset objects")
         return assets
 
+    def _frame_to_assets(self, df: pd.DataFrame) -> Tuple[List[Asset], List[str]]:
+        """
+        Convert the unified DataFrame to Asset objects, column by column.
+
+        Same result as calling _row_to_asset on every row. Fields are
+        normalized per column, and rows whose values are already in their
+        validated form are built with Asset.from_normalized (no pydantic
+        validation). Other rows (negative cost, text dates, dates with a
+        time of day, non-text locations, ...) are dirty: they go through
+        _row_to_asset, so they coerce or fail exactly as before.
+
+        Returns:
+            Tuple of (assets in row order, row error messages)
+        """
+        n = len(df)
+        labels = df.index.tolist()
+        dirty = np.zeros(n, dtype=bool)
+
+        def column(name, default=None) -> np.ndarray:
+            """Cells as objects; non-scalar cells mark their row dirty."""
+            if name not in df.columns:
+                return np.full(n, default, dtype=object)
+            values = df[name].to_numpy(dtype=object)
+            if df[name].dtype == object:
+                for i, v in enumerate(values):
+                    if isinstance(v, _NON_SCALAR_TYPES):
+                        dirty[i] = True
+            return values
+
+        def text(values, keep_empty: bool = True) -> List[Optional[str]]:
+            """str(v).strip(), None for nulls (and for "" unless keep_empty)."""
+            out = [None if null else str(v).strip() for v, null in zip(values, pd.isna(values))]
+            return out if keep_empty else [v or None for v in out]
+
+        def numbers(name, default=None) -> List[Optional[float]]:
+            """float(v), default for nulls; non-numeric cells mark their row dirty."""
+            if name in df.columns and df[name].dtype.kind in "fiu":
+                values = df[name].to_numpy(dtype=float)
+                out = values.astype(object)
+                out[np.isnan(values)] = default
+                return out.tolist()
+            values = column(name)
+            out = [default] * n
+            for i, (v, null) in enumerate(zip(values, pd.isna(values))):
+                if null:
+                    continue
+                if isinstance(v, _NUMBER_TYPES) and not isinstance(v, (bool, np.bool_)):
+                    out[i] = float(v)
+                else:
+                    dirty[i] = True  # text etc.: _is_valid_number decides
+            return out
+
+        def dates(name) -> List[Optional[date]]:
+            """Dates as validation stores them; anything else marks its row dirty."""
+            if name in df.columns and df[name].dtype.kind == "M" and getattr(df[name].dtype, "tz", None) is None:
+                stamps = df[name]
+                null = stamps.isna().to_numpy()
+                dirty[~null & (stamps.dt.normalize() != stamps).to_numpy()] = True
+                out = stamps.dt.date.to_numpy(dtype=object)
+                out[null] = None
+                return out.tolist()
+            out = [None] * n
+            for i, v in enumerate(column(name)):
+                ok, out[i] = _normalized_date(v)
+                if not ok:
+                    dirty[i] = True
+            return out
+
+        def optional_text(values) -> List[Any]:
+            """NaN -> None; other values must already be text."""
+            out = [None] * n
+            for i, (v, null) in enumerate(zip(values, pd.isna(values))):
+                if not null:
+                    out[i] = v
+                    if not isinstance(v, str):
+                        dirty[i] = True
+            return out
+
+        descriptions = text(column('description', ''), keep_empty=False)
+        asset_ids = text(column('asset_id', ''), keep_empty=False)
+
+        costs = numbers('cost', default=0.0)
+        with np.errstate(invalid="ignore"):
+            cost_values = np.array(costs, dtype=float)
+            dirty[~((cost_values >= 0) & np.isfinite(cost_values))] = True  # fails cost >= 0
+
+        acquisition_dates = dates('acquisition_date')
+        in_service_dates = dates('in_service_date')
+        disposal_dates = dates('disposal_date')
+        transfer_dates = dates('transfer_date')
+
+        tax_lives = numbers('tax_life')
+        tax_methods = text(column('tax_method'))
+        proceeds = numbers('proceeds')
+        accumulated_depreciation = numbers('accumulated_depreciation')
+        from_locations = optional_text(column('from_location', ''))
+        to_locations = optional_text(column('to_location', ''))
+
+        if 'source_row' in df.columns:
+            row_indexes = [None] * n
+            source_rows = column('source_row')
+            for i, (v, null) in enumerate(zip(source_rows, pd.isna(source_rows))):
+                if null:
+                    row_indexes[i] = labels[i] + 2
+                elif isinstance(v, _NUMBER_TYPES):
+                    row_indexes[i] = int(v)
+                else:
+                    dirty[i] = True
+        else:
+            row_indexes = [idx + 2 for idx in labels]
+
+        sheet_names = column('sheet_name', 'Unknown').tolist()
+        for i, v in enumerate(sheet_names):
+            if v is not None and not isinstance(v, str):
+                dirty[i] = True
+        transaction_types = [
+            v.strip() if isinstance(v, str) else 'addition'
+            for v in column('transaction_type', 'addition')
+        ]
+
+        # Infer MACRS class/life/method from sheet name (once per sheet)
+        inferred: Dict[Any, Tuple] = {}
+        for v in set(v for v in sheet_names if isinstance(v, str)):
+            inferred[v] = infer_macrs_class_from_sheet_name(v) if v and v != 'Unknown' else (None, None, None)
+
+        assets = []
+        row_errors = []
+        # Tens of thousands of new models would otherwise set off repeated
+        # full GC passes over everything allocated so far; none are cyclic
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for i in range(n):
+                if dirty[i]:
+                    idx = labels[i]
+                    try:
+                        asset = self._row_to_asset(df.iloc[i], idx)
+                        if asset:
+                            assets.append(asset)
+                    except Exception as e:
+                        error_msg = f"Row {idx}: {e}"
+                        row_errors.append(error_msg)
+                        print(f"Warning: Could not process row {idx}: {e}")
+                    continue
+
+                description = descriptions[i]
+                if description is None:
+                    continue  # Must have description
+
+                sheet_name = sheet_names[i]
+                macrs_class, inferred_life, inferred_method = inferred.get(sheet_name, (None, None, None))
+                tax_life = tax_lives[i]
+                if tax_life is None and inferred_life is not None and inferred_life > 0:
+                    tax_life = float(inferred_life)
+                tax_method = tax_methods[i]
+                if tax_method is None and inferred_method is not None:
+                    tax_method = inferred_method
+
+                asset = Asset.from_normalized(
+                    row_index=row_indexes[i],
+                    asset_id=asset_ids[i],
+                    description=description,
+                    cost=costs[i],
+                    acquisition_date=acquisition_dates[i],
+                    in_service_date=in_service_dates[i],
+                    macrs_class=macrs_class,
+                    macrs_life=tax_life,
+                    macrs_method=tax_method,
+                    disposal_date=disposal_dates[i],
+                    proceeds=proceeds[i],
+                    accumulated_depreciation=accumulated_depreciation[i],
+                    transfer_date=transfer_dates[i],
+                    from_location=from_locations[i],
+                    to_location=to_locations[i],
+                    source_sheet=sheet_name,
+                    transaction_type=transaction_types[i],
+                )
+                asset.check_validity()
+                assets.append(asset)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+        return assets, row_errors
+
     def _row_to_asset(self, row: pd.Series, idx: int) -> Optional[Asset]:
         """
         Convert a DataFrame row to an Asset object.
@@ -369,6 +563,14 @@ class ImporterService:
             result = getattr(_thread_local, 'last_parse_result', ParseResult())
             _thread_local.last_parse_result = result
 
+        # CSV/TSV has a single sheet that build_unified_dataframe has
+        # already seen in full; there is no workbook to fall back on
+        if is_delimited_file(file_path):
+            error = "No asset rows found in delimited file"
+            result.errors.append(error)
+            print(f"Error: {error}")
+            return []
+
         xl = pd.ExcelFile(file_path)
         sheet_names = xl.sheet_names
         xl.close()
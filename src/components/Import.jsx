@@ -61,8 +61,8 @@ function Import({ onUploadSuccess }) {
     };
 
     const handleFiles = async (file) => {
-        if (!file.name.endsWith('.xlsx') && !file.name.endsWith('.xls')) {
-            setError("Please upload a valid Excel file (.xlsx or .xls)");
+        if (!/\.(xlsx|xls|csv|tsv|txt)$/i.test(file.name)) {
+            setError("Please upload a valid Excel (.xlsx or .xls) or CSV/TSV file");
             return;
         }
 
@@ -140,7 +140,7 @@ function Import({ onUploadSuccess }) {
                             type="file"
                             ref={fileInputRef}
                             className="hidden"
-                            accept=".xlsx,.xls"
+                            accept=".xlsx,.xls,.csv,.tsv,.txt"
                             onChange={(e) => e.target.files.length > 0 && handleFiles(e.target.files[0])}
                         />
 
@@ -156,7 +156,7 @@ function Import({ onUploadSuccess }) {
                             {isUploading ? "Analyzing Assets..." : "Drag & Drop Excel File"}
                         </h3>
                         <p className="text-slate-500 text-center max-w-sm mb-6">
-                            {isUploading ? "Our AI is classifying your assets. This may take a moment." : "Or click to browse from your computer. Supported formats: .xlsx, .xls"}
+                            {isUploading ? "Our AI is classifying your assets. This may take a moment." : "Or click to browse from your computer. Supported formats: .xlsx, .xls, .csv, .tsv"}
                         </p>
 
                         <Button disabled={isUploading}>
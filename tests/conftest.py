@@ -0,0 +1,47 @@
+"""
+Shared pytest fixtures.
+"""
+
+import sys
+
+import pytest
+
+
+def _patch_module(monkeypatch, module, **attrs):
+    """Set attributes on a backend.logic module under both names tests import it by."""
+    for name in (f"logic.{module}", f"backend.logic.{module}"):
+        loaded = sys.modules.get(name)
+        if loaded is not None:
+            for attr, value in attrs.items():
+                monkeypatch.setattr(loaded, attr, value)
+
+
+@pytest.fixture(autouse=True)
+def sheet_structure_cache(tmp_path, monkeypatch):
+    """
+    Give every test its own sheet structure cache file, so loading a
+    workbook writes nothing into the checkout and no test reads structures
+    an earlier one detected.
+    """
+    path = str(tmp_path / "sheet_structure_cache.json")
+    monkeypatch.setenv("SHEET_STRUCTURE_CACHE_FILE", path)
+    _patch_module(monkeypatch, "client_mapping_manager", SHEET_STRUCTURE_CACHE_FILE=path, _manager_instance=None)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def export_cache_dir(tmp_path, monkeypatch):
+    """Give every test its own export cache directory, outside the checkout and the user's cache."""
+    path = str(tmp_path / "export_cache")
+    monkeypatch.setenv("EXPORT_CACHE_DIR", path)
+    _patch_module(monkeypatch, "export_cache", EXPORT_CACHE_DIR=path, _export_cache=None)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def upload_cache_dir(tmp_path, monkeypatch):
+    """Give every test its own upload cache directory, outside the checkout and the user's cache."""
+    path = str(tmp_path / "upload_cache")
+    monkeypatch.setenv("UPLOAD_CACHE_DIR", path)
+    _patch_module(monkeypatch, "upload_cache", UPLOAD_CACHE_DIR=path, _upload_cache=None)
+    return path
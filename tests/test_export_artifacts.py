@@ -0,0 +1,175 @@
+"""
+Tests for Export Artifacts
+
+ExporterService workpapers sharing one build_fa result, and the on-disk
+export cache keyed by content hash.
+Run with: pytest tests/test_export_artifacts.py -v
+"""
+
+import pytest
+import sys
+import os
+from datetime import date, datetime
+from io import BytesIO
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+try:
+    from backend.models.asset import Asset
+    from backend.services.exporter import ExporterService
+    from backend.logic.export_cache import ExportArtifactCache, export_content_key
+    EXPORTER_AVAILABLE = True
+except ImportError:
+    EXPORTER_AVAILABLE = False
+
+
+@pytest.mark.skipif(not EXPORTER_AVAILABLE, reason="exporter service not available")
+class TestExportArtifacts:
+    """Workpapers for the same asset state must share one build_fa run."""
+
+    @pytest.fixture
+    def assets(self):
+        return [
+            Asset(row_index=i + 2, asset_id=f"A-{i}", description=f"Dell Laptop {i}",
+                  cost=1500.0 + i, acquisition_date=date(2025, 3, 1),
+                  in_service_date=date(2025, 3, 1), macrs_class="Computer Equipment",
+                  macrs_life=5.0, macrs_method="200DB", macrs_convention="HY",
+                  transaction_type="Addition")
+            for i in range(4)
+        ]
+
+    @pytest.fixture
+    def exporter(self):
+        exporter = ExporterService()
+        exporter.build_calls = 0
+        build_fa = exporter._build_fa
+
+        def counting_build_fa(*args, **kwargs):
+            exporter.build_calls += 1
+            return build_fa(*args, **kwargs)
+
+        exporter._build_fa = counting_build_fa
+        return exporter
+
+    def test_workpapers_share_one_build(self, exporter, assets, caplog):
+        with caplog.at_level("INFO", logger="backend.services.exporter"):
+            exporter.generate_both_workpapers(assets, tax_year=2025)
+            exporter.generate_fa_cs_export(assets, tax_year=2025)
+
+        assert exporter.build_calls == 1
+        assert sum("cache hit" in r.message for r in caplog.records) == 2
+
+    def test_edit_rebuilds(self, exporter, assets):
+        exporter.generate_audit_workpaper(assets, tax_year=2025)
+        assets[0].cost = 9000.0
+        exporter.generate_audit_workpaper(assets, tax_year=2025)
+        assert exporter.build_calls == 2
+
+    def test_frames_are_copies(self, exporter, assets):
+        artifacts = exporter._export_artifacts(assets, 2025)
+        artifacts.export_frame()["Tax Cost"] = 0.0
+        artifacts.engine_frame()["Cost"] = 0.0
+
+        again = exporter._export_artifacts(assets, 2025)
+        assert again is artifacts
+        assert (again.export_frame()["Tax Cost"] > 0).all()
+        assert (again.engine_frame()["Cost"] > 0).all()
+
+
+    def test_audit_timestamp_is_per_export(self, exporter, assets, monkeypatch):
+        from backend.logic import fa_export
+        artifacts = exporter._export_artifacts(assets, 2025)
+        stamps = iter([datetime(2025, 1, 6, 9, 0), datetime(2025, 1, 6, 9, 5)])
+
+        class Clock(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return next(stamps)
+
+        monkeypatch.setattr(fa_export, "datetime", Clock)
+        first = artifacts.export_frame(audit_columns=True)
+        second = artifacts.export_frame(audit_columns=True)
+
+        assert (first["AuditTimestamp"] == "2025-01-06 09:00:00").all()
+        assert (second["AuditTimestamp"] == "2025-01-06 09:05:00").all()
+
+
+@pytest.mark.skipif(not EXPORTER_AVAILABLE, reason="Exporter not available")
+class TestExportArtifactCache:
+    """Unchanged exports must be served from disk, keyed by content."""
+
+    @pytest.fixture
+    def assets(self):
+        return [
+            Asset(row_index=i + 2, asset_id=f"A-{i}", description=f"Dell Laptop {i}",
+                  cost=1500.0 + i, in_service_date=date(2025, 3, 1),
+                  transaction_type="Addition")
+            for i in range(3)
+        ]
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return ExportArtifactCache(directory=str(tmp_path / "cache"), max_bytes=1024)
+
+    def test_store_then_open(self, cache):
+        assert cache.open("k1", ".xlsx") is None
+        cache.store("k1", ".xlsx", BytesIO(b"workbook")).close()
+
+        cached = cache.open("k1", ".xlsx")
+        assert cached.read() == b"workbook"
+        cached.close()
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_handoff_is_linked_not_rewritten(self, cache, tmp_path):
+        cached = cache.store("k1", ".xlsx", BytesIO(b"workbook"))
+        dest = tmp_path / "handoff.xlsx"
+        method = cache.link(cached, str(dest))
+        cached.close()
+
+        assert method == "hardlink"
+        assert dest.read_bytes() == b"workbook"
+        assert os.stat(dest).st_ino == os.stat(cache.path_for("k1", ".xlsx")).st_ino
+
+    def test_streamed_artifact_committed_when_complete(self, cache):
+        assert b"".join(cache.store_stream("k1", ".csv", iter([b"a,b\n", b"1,2\n"]))) == b"a,b\n1,2\n"
+        with cache.open("k1", ".csv") as cached:
+            assert cached.read() == b"a,b\n1,2\n"
+
+        # Client disconnects after the first chunk: nothing is cached
+        stream = cache.store_stream("k2", ".csv", iter([b"a,b\n", b"1,2\n"]))
+        next(stream)
+        stream.close()
+        assert cache.open("k2", ".csv") is None
+        assert os.listdir(cache.directory) == ["k1.csv"]
+
+    def test_evicts_oldest_over_budget(self, cache):
+        cache.max_bytes = 10 ** 6
+        for i, age in enumerate((300, 200, 100)):
+            cache.store(f"k{i}", ".xlsx", BytesIO(b"x" * 400)).close()
+            path = cache.path_for(f"k{i}", ".xlsx")
+            os.utime(path, (os.path.getmtime(path) - age,) * 2)
+
+        removed, freed = cache.evict(max_bytes=1024)
+        assert (removed, freed) == (1, 400)
+        assert not os.path.exists(cache.path_for("k0", ".xlsx"))
+
+        keep = cache.path_for("k1", ".xlsx")
+        cache.evict(max_bytes=0, is_active=lambda path: path == keep)
+        assert os.listdir(cache.directory) == ["k1.xlsx"]
+
+    def test_key_tracks_export_inputs(self, assets):
+        base = export_content_key("prep_workpaper", assets, ["x"], {"tax_year": 2025}, "1")
+        assert base == export_content_key("prep_workpaper", assets, ["x"], {"tax_year": 2025}, "1")
+
+        assert base != export_content_key("audit_documentation", assets, ["x"], {"tax_year": 2025}, "1")
+        assert base != export_content_key("prep_workpaper", assets, ["x", "y"], {"tax_year": 2025}, "1")
+        assert base != export_content_key("prep_workpaper", assets, ["x"], {"tax_year": 2024}, "1")
+        assert base != export_content_key("prep_workpaper", assets, ["x"], {"tax_year": 2025}, "2")
+
+        assets[1].cost = 99.0
+        assert base != export_content_key("prep_workpaper", assets, ["x"], {"tax_year": 2025}, "1")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,540 @@
+"""
+Tests for the FA CS Export Builder
+
+Column-wise build_fa derivations, incremental rebuilds, streamed Excel
+and CSV/ASCII output, disposal matching and worksheet formatting.
+Run with: pytest tests/test_fa_export.py -v
+"""
+
+import pytest
+import pandas as pd
+import sys
+import os
+import json
+from datetime import date
+from io import BytesIO
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+try:
+    from logic.fa_export import (
+        build_fa,
+        _is_disposal,
+        _is_transfer,
+        attach_audit_columns,
+        _get_fa_cs_wizard_category,
+        _fa_cs_wizard_categories,
+        _transaction_masks,
+        _category_lookup,
+        _macrs_reason_code,
+        _confidence_grade,
+        _confidence_grades,
+        _recapture_frame,
+        _row_recapture,
+        _is_passenger_auto,
+        _is_heavy_suv,
+        _passenger_auto_mask,
+        _heavy_suv_mask,
+        _apply_luxury_auto_caps,
+        _apply_luxury_auto_caps_frame,
+        MACRS_REASON_CODES,
+        RECAPTURE_COLUMNS,
+    )
+    from logic.fa_export import export_fa_excel, export_fa_ascii, export_fa_ascii_stream
+    from logic.fa_export import build_fa_cs_asset_lookup, match_disposals_to_fa_cs
+    from logic.fa_export_incremental import IncrementalFABuilder
+    from logic import fa_export_vehicles, tax_year_config
+    from logic.fa_export_streaming import StreamingWorkbook, iter_file_chunks
+    from logic.fa_export_formatters import (
+        _apply_professional_formatting,
+        _apply_conditional_formatting,
+    )
+    FA_EXPORT_AVAILABLE = True
+except ImportError:
+    FA_EXPORT_AVAILABLE = False
+
+
+@pytest.mark.skipif(not FA_EXPORT_AVAILABLE, reason="fa_export module not available")
+class TestVectorizedDerivations:
+    """Column-wise derivations must match the row-wise helpers they replace."""
+
+    @pytest.fixture
+    def rows(self):
+        return pd.DataFrame([
+            {"Description": "Dell Laptop", "Final Category": "Computer Equipment",
+             "Recovery Period": 5, "Transaction Type": "Current Year Addition", "Confidence": 0.95},
+            {"Description": "Heavy truck F-250", "Final Category": "Trucks & Trailers",
+             "Recovery Period": 5, "Transaction Type": "Existing Asset", "Confidence": 80},
+            {"Description": "Leasehold buildout", "Final Category": "QIP - Qualified Improvement Property",
+             "Recovery Period": 15, "Transaction Type": "Current Year Addition", "Confidence": None},
+            {"Description": "Old copier", "Final Category": "Office Equipment",
+             "Recovery Period": 7, "Transaction Type": "Disposal", "Confidence": "n/a"},
+            {"Description": "Reclass", "Final Category": "Land (Non-Depreciable)",
+             "Recovery Period": 0, "Transaction Type": "", "Sheet Role": "transfer", "Confidence": 0.5},
+            {"Description": "Misc item", "Final Category": "Unknown",
+             "Recovery Period": 39, "Transaction Type": "Current Year Addition", "Confidence": 0.7},
+        ])
+
+    def test_transaction_masks_match_row_helpers(self, rows):
+        disposal, transfer = _transaction_masks(rows)
+        records = [r for _, r in rows.iterrows()]
+        assert disposal.tolist() == [_is_disposal(r) for r in records]
+        assert transfer.tolist() == [_is_transfer(r) for r in records]
+
+    def test_wizard_categories_match_row_helper(self, rows):
+        disposal, transfer = _transaction_masks(rows)
+        wizard = _fa_cs_wizard_categories(rows, ~(disposal | transfer))
+        assert wizard.tolist() == [_get_fa_cs_wizard_category(r) for _, r in rows.iterrows()]
+
+    def test_reason_codes_and_grades_match_row_helpers(self, rows):
+        codes = _category_lookup(rows["Final Category"], MACRS_REASON_CODES, "PP7")
+        assert codes.tolist() == [_macrs_reason_code(r) for _, r in rows.iterrows()]
+        assert _confidence_grades(rows).tolist() == [_confidence_grade(r) for _, r in rows.iterrows()]
+
+    def test_recapture_frame_matches_row_helper(self):
+        disposals = pd.DataFrame([
+            {"Transaction Type": "Disposal", "Final Category": "Machinery & Equipment",
+             "Cost": 10000.0, "Proceeds": 8000.0, "Accumulated Depreciation": 6000.0},
+            {"Transaction Type": "Sold", "Final Category": "Nonresidential Real Property",
+             "Cost": 500000.0, "Proceeds": 450000.0, "Accumulated Depreciation": 120000.0},
+            {"Transaction Type": "Disposal", "Final Category": "Land (Non-Depreciable)",
+             "Cost": 80000.0, "Proceeds": 0.0, "proceeds": 95000.0, "Accumulated Depreciation": 0.0},
+            {"Transaction Type": "Disposal", "Final Category": "Computer Equipment",
+             "Cost": 2200.0, "Proceeds": 100.0, "Accumulated Depreciation": 700.25},
+            {"Transaction Type": "Existing Asset", "Final Category": "Office Furniture",
+             "Cost": 3000.0, "Proceeds": 5000.0, "Accumulated Depreciation": 1000.0},
+        ])
+        expected = [_row_recapture(r) for _, r in disposals.iterrows()]
+
+        result = _recapture_frame(disposals)
+
+        assert list(result.columns) == RECAPTURE_COLUMNS
+        assert [tuple(r) for r in result.itertuples(index=False)] == expected
+
+    def test_vehicle_masks_match_row_helpers(self):
+        vehicles = pd.DataFrame({
+            "Description": ["Chevy Tahoe 4x4", "BMW sedan", "Ford F-250 super duty", "card reader",
+                            "Suburban gvwr 7000", "F150 pickup truck", "ambulance", None, "Toyota Camry car"],
+            "Final Category": ["Trucks & Trailers", "Passenger Auto", "Vehicles", "Computer Equipment",
+                               "Vehicles", "Trucks & Trailers", "Vehicles", "Passenger Auto", None],
+        })
+        records = [r for _, r in vehicles.iterrows()]
+
+        assert _passenger_auto_mask(vehicles).tolist() == [_is_passenger_auto(r) for r in records]
+        assert _heavy_suv_mask(vehicles).tolist() == [_is_heavy_suv(r) for r in records]
+        for mask, helper in [
+            (fa_export_vehicles._passenger_auto_mask, fa_export_vehicles._is_passenger_auto),
+            (fa_export_vehicles._heavy_suv_mask, fa_export_vehicles._is_heavy_suv),
+            (fa_export_vehicles._heavy_truck_mask, fa_export_vehicles._is_heavy_truck),
+        ]:
+            assert mask(vehicles).tolist() == [helper(r) for r in records]
+
+    def test_luxury_auto_caps_frame_matches_row_helper(self):
+        cars = pd.DataFrame({
+            "Description": ["BMW sedan", "Audi sedan", "Honda car ", "Dell laptop", "Lexus sedan"],
+            "Final Category": ["Passenger Auto"] * 3 + ["Computer Equipment", "Vehicles"],
+            "Cost": [70000.0, 60000.0, 9000.0, 70000.0, 65000.0],
+            "In Service Date": [date(2025, 3, 1), date(2025, 5, 1), date(2025, 6, 1),
+                                date(2025, 3, 1), date(2024, 3, 1)],
+        })
+        sec179 = [70000.0, 0.0, 9000.0, 70000.0, 65000.0]
+        bonus = [0.0, 60000.0, 0.0, 0.0, 0.0]
+        expected = [
+            _apply_luxury_auto_caps(r, s179, b, 2025)
+            for (_, r), s179, b in zip(cars.iterrows(), sec179, bonus)
+        ]
+
+        capped_179, capped_bonus, notes = _apply_luxury_auto_caps_frame(
+            cars, sec179, bonus, [""] * len(cars), 2025
+        )
+
+        assert list(zip(capped_179, capped_bonus, notes)) == expected
+        assert capped_179[0] < 70000.0 and capped_bonus[1] < 60000.0
+
+        # Existing notes follow the cap note
+        _, _, notes = _apply_luxury_auto_caps_frame(cars, sec179, bonus, ["WARNING"] * len(cars), 2025)
+        assert notes[0] == f"{expected[0][2]} | WARNING"
+        assert notes[3] == "WARNING"
+
+    def test_heavy_suv_note_kept(self):
+        suv = pd.DataFrame([{
+            "Asset ID": "V-1", "Description": "Ford F-250 pickup truck, GVWR 8,500 lbs", "Cost": 80000,
+            "Acquisition Date": "03/01/2025", "In Service Date": "03/15/2025",
+            "Transaction Type": "Addition", "Final Category": "Trucks & Trailers",
+            "Recovery Period": 5, "Method": "200DB",
+        }])
+        fa_df = build_fa(suv, tax_year=2025, strategy="Aggressive (179 + Bonus)", taxable_income=500000)
+
+        limit = tax_year_config.get_heavy_suv_179_limit(2025)
+        assert fa_df["Tax Sec 179 Expensed"].iloc[0] == limit
+        assert fa_df["Auto Limit Notes"].iloc[0].startswith(
+            f"Heavy SUV §179 limit applied: ${limit:,.0f} (IRC §179(b)(5)) | "
+        )
+
+    def test_vehicle_limits_follow_config_reload(self, monkeypatch):
+        config = json.loads(json.dumps(tax_year_config._JSON_CONFIG or {}))
+        config.setdefault("luxury_auto_limits", {})["2024"] = {
+            "year_1_without_bonus": 1000, "year_1_with_bonus": 2000,
+            "year_2": 3000, "year_3": 4000, "year_4_plus": 5000,
+        }
+        config.setdefault("heavy_suv_179_limits", {})["2024"] = 6000
+
+        assert tax_year_config.get_luxury_auto_limits(2024, 2) != 3000
+        monkeypatch.setattr(tax_year_config, "_load_json_config", lambda: config)
+        try:
+            assert tax_year_config.reload_config()
+            assert tax_year_config.get_luxury_auto_limits(2024, 2) == 3000
+            assert tax_year_config.get_luxury_auto_limits(2024, 1)["year_1_with_bonus"] == 2000
+            assert tax_year_config.get_heavy_suv_179_limit(2024) == 6000
+        finally:
+            monkeypatch.undo()
+            tax_year_config.reload_config()
+
+    def test_audit_columns_attached_on_demand(self):
+        fa = pd.DataFrame([
+            {"Asset #": 1, "Final Category": "Computers", "Tax Life": 5, "Tax Method": "MACRS",
+             "Convention": "HY", "Source": "rules", "NBV_Reco": "CHECK", "Uses ADS": True},
+            {"Asset #": 2, "Final Category": "Office Furniture", "Tax Life": 7, "Tax Method": "MACRS",
+             "Convention": "HY", "Source": "gpt-4", "NBV_Reco": "OK", "Uses ADS": False},
+        ])
+        result = attach_audit_columns(fa)
+
+        assert "ClassificationExplanation" not in fa.columns
+        assert result["AuditSource"].tolist() == ["Rule Engine", "GPT Classifier"]
+        assert result["AuditWarnings"].tolist() == [
+            "NBV out of balance; ADS required per IRC §168(g)", "None"
+        ]
+        assert result["ClassificationExplanation"].iloc[0] == (
+            "Classified as Computers (5-year) because computers are 5-year MACRS GDS."
+        )
+        assert result["ClassificationHash"].str.len().eq(64).all()
+        assert attach_audit_columns(result)["ClassificationHash"].equals(result["ClassificationHash"])
+
+
+@pytest.mark.skipif(not FA_EXPORT_AVAILABLE, reason="fa_export module not available")
+class TestIncrementalFABuilder:
+    """Incremental rebuilds must match a fresh build_fa on the edited data."""
+
+    STRATEGY = "Aggressive (179 + Bonus)"
+
+    @pytest.fixture
+    def assets(self):
+        rows = [
+            {"Asset ID": f"M-{i}", "Description": f"CNC machine {i}", "Cost": cost,
+             "Acquisition Date": f"0{i + 1}/01/2025", "In Service Date": f"0{i + 1}/10/2025",
+             "Transaction Type": "Addition", "Final Category": "Machinery & Equipment",
+             "Recovery Period": 7, "Method": "200DB"}
+            for i, cost in enumerate([400000, 300000, 200000, 100000])
+        ]
+        rows.append({
+            "Asset ID": "E-1", "Description": "Office desk", "Cost": 5000,
+            "Acquisition Date": "05/01/2021", "In Service Date": "05/01/2021",
+            "Transaction Type": "Existing Asset", "Final Category": "Office Furniture",
+            "Recovery Period": 7, "Method": "200DB",
+        })
+        return pd.DataFrame(rows)
+
+    def _build(self, df, **kwargs):
+        return build_fa(df, tax_year=2025, strategy=self.STRATEGY, taxable_income=500000, **kwargs)
+
+    def _builder(self, **kwargs):
+        return IncrementalFABuilder(tax_year=2025, strategy=self.STRATEGY, taxable_income=500000, **kwargs)
+
+    def test_full_build_matches_build_fa(self, assets):
+        builder = self._builder()
+        pd.testing.assert_frame_equal(builder.build(assets), self._build(assets))
+        assert builder.last_build["mode"] == "full"
+
+    def test_unchanged_data_reuses_result(self, assets):
+        builder = self._builder()
+        first = builder.build(assets)
+        pd.testing.assert_frame_equal(builder.build(assets.copy()), first)
+        assert builder.last_build["mode"] == "unchanged"
+
+    def test_edit_outside_section_179_recomputes_one_row(self, assets):
+        builder = self._builder()
+        builder.build(assets)
+
+        assets.loc[4, "Description"] = "Office desk - walnut"
+        result = builder.build(assets)
+
+        pd.testing.assert_frame_equal(result, self._build(assets))
+        assert builder.last_build["mode"] == "incremental"
+        assert builder.last_build["rows_recomputed"]["incentives"] == 1
+
+    def test_cost_edit_reallocates_section_179(self, assets):
+        builder = self._builder()
+        builder.build(assets)
+
+        # Frees $300k of the $500k income-limited balance for later assets
+        assets.loc[0, "Cost"] = 100000
+        result = builder.build(assets)
+
+        pd.testing.assert_frame_equal(result, self._build(assets))
+        assert builder.last_build["rows_recomputed"]["incentives"] == 3
+
+    def test_mid_quarter_flip_reaches_every_asset(self, assets):
+        builder = self._builder()
+        builder.build(assets)
+
+        assets.loc[3, "In Service Date"] = "12/01/2025"
+        assets.loc[3, "Cost"] = 2000000
+        result = builder.build(assets)
+
+        pd.testing.assert_frame_equal(result, self._build(assets))
+        assert result["Convention"].iloc[0] == "MQ"
+
+    def test_generated_asset_ids_survive_edits(self, assets):
+        assets = assets.drop(columns=["Asset ID"])
+        builder = self._builder(de_minimis_limit=2500)
+        first = builder.build(assets)
+
+        assets.loc[2, "Cost"] = 2000
+        result = builder.build(assets)
+
+        assert result["Original Asset ID"].tolist() == first["Original Asset ID"].tolist()
+        assert result["De Minimis Expensed"].iloc[2] == 2000
+
+    def test_new_column_forces_full_build(self, assets):
+        builder = self._builder()
+        builder.build(assets)
+
+        assets["Proceeds"] = 0.0
+        pd.testing.assert_frame_equal(builder.build(assets), self._build(assets))
+        assert builder.last_build["mode"] == "full"
+
+
+@pytest.mark.skipif(not FA_EXPORT_AVAILABLE, reason="fa_export not available")
+class TestStreamingWorkbook:
+    """The write-only export writer must keep the workbook formatting."""
+
+    @pytest.fixture
+    def review_df(self):
+        return pd.DataFrame({
+            "Asset #": [1, 2, 3],
+            "Description": ["Dell Computer", "A very long description " * 4, None],
+            "Date In Service": pd.to_datetime(["2025-03-15", "2025-04-01", None]),
+            "Tax Cost": [2000.0, 800.5, 0.0],
+            "ReviewPriority": ["High", "Low", "Medium"],
+        })
+
+    def _load(self, book):
+        from openpyxl import load_workbook
+        with book.save() as spooled:
+            return load_workbook(BytesIO(spooled.read()))
+
+    def test_column_formats_and_widths(self, review_df):
+        book = StreamingWorkbook()
+        book.add_sheet("Review", review_df, freeze_header=True, auto_filter=True,
+                       highlight_status=True)
+        ws = self._load(book)["Review"]
+
+        assert ws["A1"].font.b and ws["A1"].fill.fgColor.rgb.endswith("366092")
+        assert ws["C2"].number_format == "M/D/YYYY"
+        assert ws["D3"].number_format == "$#,##0.00" and ws["D3"].value == 800.5
+        assert ws["B4"].value is None and ws["B4"].border.left.style == "thin"
+        assert ws.column_dimensions["A"].width == 12
+        assert ws.column_dimensions["B"].width == 50
+        assert ws.freeze_panes == "A2"
+        assert ws.auto_filter.ref == "A1:E4"
+        ranges = [str(cf.sqref) for cf in ws.conditional_formatting]
+        assert ranges == ["E2:E4"]
+
+    def test_footer_follows_data(self, review_df):
+        book = StreamingWorkbook()
+        book.add_sheet("Totals", review_df, footer={"Asset #": "TOTALS:", "Tax Cost": 2800.5})
+        ws = self._load(book)["Totals"]
+
+        assert ws.max_row == 5
+        assert ws["A5"].value == "TOTALS:" and ws["A5"].font.b
+        assert ws["D5"].value == 2800.5
+
+    def test_summary_sheet_highlights(self):
+        book = StreamingWorkbook()
+        book.add_summary_sheet("Summary", [["BONUS DEPRECIATION", ""], ["Total Bonus", "$1.00"],
+                                           ["TOTAL YEAR 1 DEDUCTION", "$1.00"]])
+        ws = self._load(book)["Summary"]
+
+        assert ws["A1"].font.b and not ws["A2"].font.b
+        assert ws["B3"].fill.fgColor.rgb.endswith("FFD966") and ws["B3"].font.sz == 14
+        assert ws.column_dimensions["A"].width == 40
+
+    def test_chunks_close_file(self, review_df):
+        book = StreamingWorkbook()
+        book.add_sheet("Data", review_df)
+        spooled = book.save()
+        data = b"".join(iter_file_chunks(spooled, chunk_size=1024))
+        assert spooled.closed and data.startswith(b"PK")
+
+    def test_export_fa_excel_sheets(self):
+        assets = pd.DataFrame([
+            {"Asset ID": "A-1", "Description": "Dell Computer", "Cost": 2000,
+             "Acquisition Date": "03/01/2025", "In Service Date": "03/15/2025",
+             "Transaction Type": "Addition", "Final Category": "Computer Equipment",
+             "Recovery Period": 5, "Method": "200DB"},
+            {"Asset ID": "A-2", "Description": "Office Desk", "Cost": 800,
+             "Acquisition Date": "03/01/2025", "In Service Date": "03/15/2025",
+             "Transaction Type": "Addition", "Final Category": "Office Furniture",
+             "Recovery Period": 7, "Method": "200DB"},
+        ])
+        fa_df = build_fa(assets, tax_year=2025, strategy="Balanced (Bonus Only)", taxable_income=500000)
+
+        xls = pd.ExcelFile(BytesIO(export_fa_excel(fa_df)))
+        assert xls.sheet_names[:4] == ["FA_CS_Data", "RPA_Input", "Review", "Summary"]
+        assert len(pd.read_excel(xls, sheet_name="FA_CS_Data")) == 2
+
+
+@pytest.mark.skipif(not FA_EXPORT_AVAILABLE, reason="fa_export not available")
+class TestDelimitedExport:
+    """Chunked CSV/TSV export must match the row-by-row output format."""
+
+    @pytest.fixture
+    def fa_df(self):
+        return pd.DataFrame({
+            "Asset #": [1, 2, 3],
+            "Description": ['Desk, "oak"', "Tab\there", None],
+            "Date In Service": pd.to_datetime(["2025-03-15", None, "2024-01-02"]),
+            "Tax Cost": [1500.0, float("nan"), 0.1],
+            "Tax Cur Depreciation": [300.0, 0.0, 0.0],
+            "FA_CS_Wizard_Category": ["Office Furniture", "Computer Equipment", "Land"],
+        })
+
+    def test_fields_and_quoting(self, fa_df):
+        lines = export_fa_ascii(fa_df, delimiter=",").decode("utf-8").split("\n")
+
+        assert lines[0] == ("Asset #,Description,Date In Service,Tax Cost,Tax Cur Depreciation,"
+                            "Date Disposed,Gross Proceeds,FA_CS_Wizard_Category")
+        assert lines[1] == '1,"Desk, ""oak""",2025-03-15 00:00:00,1500.0,,,,Office Furniture'
+        assert lines[2] == "2,Tab\there,,,,,,Computer Equipment"
+        assert lines[3] == "3,,2024-01-02 00:00:00,0.1,,,,Land"
+        assert lines[4] == "" and len(lines) == 5
+
+        tsv = export_fa_ascii(fa_df, delimiter="\t").decode("utf-8").split("\n")
+        assert tsv[2] == '2\t"Tab\there"\t\t\t\t\t\tComputer Equipment'
+
+    def test_chunks_stream_same_bytes(self, fa_df):
+        chunks = list(export_fa_ascii_stream(fa_df, delimiter=",", chunk_size=2))
+
+        assert len(chunks) == 3  # header + two row blocks
+        assert b"".join(chunks) == export_fa_ascii(fa_df, delimiter=",")
+        # Caller's frame is not modified
+        assert "Date Disposed" not in fa_df.columns
+        assert fa_df["Tax Cur Depreciation"].iloc[0] == 300.0
+
+
+@pytest.mark.skipif(not FA_EXPORT_AVAILABLE, reason="fa_export not available")
+class TestFACSMatching:
+    """Disposals resolve to existing FA CS Asset #s through staged joins."""
+
+    @pytest.fixture
+    def fa_cs_df(self):
+        return pd.DataFrame({
+            "Asset #": [1, 2, 3, 4, 5, 6],
+            "Original Asset ID": ["FA-001", "FA-002", None, "FA-004", "FA-005", "FA-006"],
+            "Description": ["Dell Laptop", "Office Desk", "Forklift Toyota 8000",
+                            "Office Chair", "Office Chair", "Parking Lot Paving"],
+            "Date In Service": ["1/5/2020", "2/1/2021", "3/1/2019", "4/1/2022", "4/1/2022", "5/1/2018"],
+            "FA_CS_Wizard_Category": ["Computer", "Furniture", "Machinery",
+                                      "Furniture", "Furniture", "Land Improvement"],
+        })
+
+    def _match(self, disposals, reference):
+        result = match_disposals_to_fa_cs(pd.DataFrame(disposals), reference)
+        return result["FA CS Asset #"].tolist(), result["Match Status"].tolist()
+
+    def test_lookup_skips_missing_ids(self, fa_cs_df):
+        lookup = build_fa_cs_asset_lookup(fa_cs_df)
+        assert lookup == {"FA-001": 1, "FA-002": 2, "FA-004": 4, "FA-005": 5, "FA-006": 6}
+
+    def test_id_stages_with_dict_lookup(self, fa_cs_df):
+        nums, statuses = self._match({
+            "Original Asset ID": ["FA-002", "fa 1", "FA-999"],
+            "Description": ["Office Desk", "Dell Laptop", "Unknown"],
+        }, build_fa_cs_asset_lookup(fa_cs_df))
+
+        assert nums[:2] == [2, 1] and pd.isna(nums[2])
+        assert statuses == ["Matched", "Matched (normalized ID: FA-001)",
+                            "NOT FOUND - 'FA-999' not in FA CS"]
+
+    def test_ids_colliding_after_normalization_are_not_matched(self):
+        reference = pd.DataFrame({
+            "Asset #": [1, 2, 3, 4],
+            "Original Asset ID": ["FA-1-01", "FA-10-1", "FA 10 1", "12-3"],
+        })
+        nums, statuses = self._match({
+            "Original Asset ID": ["fa 10 01", "fa 1 1", "123", "12 03"],
+            "Description": ["A", "B", "C", "D"],
+        }, build_fa_cs_asset_lookup(reference))
+
+        # "FA-10-1" and "FA 10 1" are the same ID once normalized: ambiguous
+        assert pd.isna(nums[0]) and nums[1] == 1
+        assert statuses[1] == "Matched (normalized ID: FA-1-01)"
+        # Digit groups are kept apart: "123" is not "12-3"
+        assert pd.isna(nums[2]) and nums[3] == 4
+
+    def test_description_stages_need_export_frame(self, fa_cs_df):
+        nums, statuses = self._match({
+            "Original Asset ID": [None, None, None, None],
+            "Description": ["FORKLIFT toyota 8000", "Paving parking lot", "Office Chair", "Office Desk"],
+            "Date In Service": pd.to_datetime(["2019-03-01", "2018-05-01", "2022-04-01", None]),
+            "FA_CS_Wizard_Category": ["Machinery", "Land Improvement", "Furniture", "Machinery"],
+        }, fa_cs_df)
+
+        assert nums[:2] == [3, 6]
+        assert statuses[0] == "Matched (description + date: Asset #3)"
+        assert statuses[1] == "Matched (fuzzy 100%: FA-006)"
+        # Two FA CS chairs share description and date: ambiguous, not guessed
+        assert pd.isna(nums[2])
+        # Same description as asset 2, but in a different category block
+        assert pd.isna(nums[3])
+
+    def test_matched_asset_not_reused(self, fa_cs_df):
+        nums, _ = self._match({
+            "Original Asset ID": ["FA-006", None],
+            "Description": ["Parking Lot Paving", "Parking Lot Paving"],
+            "FA_CS_Wizard_Category": ["Land Improvement", "Land Improvement"],
+        }, fa_cs_df)
+        assert nums[0] == 6 and pd.isna(nums[1])
+
+
+@pytest.mark.skipif(not FA_EXPORT_AVAILABLE, reason="fa_export not available")
+class TestProfessionalFormatting:
+    """In-place formatting must cover every written row, not just the first 10k."""
+
+    N_ROWS = 12000
+
+    @pytest.fixture
+    def sheet(self):
+        df = pd.DataFrame({
+            "Asset #": range(self.N_ROWS),
+            "Description": ["Forklift"] * self.N_ROWS,
+            "Transfer Date": pd.Timestamp("2025-06-30"),
+            "Tax Cost": 1234.5,
+            "NBV_Reco": ["OK", "CHECK"] * (self.N_ROWS // 2),
+        })
+        writer = pd.ExcelWriter(BytesIO(), engine="openpyxl")
+        df.to_excel(writer, sheet_name="Data", index=False)
+        return writer.sheets["Data"], df
+
+    def test_formats_cover_all_rows(self, sheet):
+        ws, df = sheet
+        _apply_professional_formatting(ws, df)
+        last = self.N_ROWS + 1
+
+        assert ws["A1"].font.b and ws["A1"].border.left.style == "thin"
+        assert ws[f"D{last}"].number_format == "$#,##0.00"
+        assert ws[f"B{last}"].border.bottom.style == "thin"
+        # Plain columns keep the datetime format pandas wrote
+        assert ws[f"C{last}"].number_format != "General"
+        assert ws.column_dimensions["B"].width == 13
+        assert ws.column_dimensions["A"].width == 12
+
+    def test_conditional_ranges_match_rows(self, sheet):
+        ws, df = sheet
+        _apply_conditional_formatting(ws, df)
+        ranges = {str(cf.sqref) for cf in ws.conditional_formatting}
+        assert ranges == {f"E2:E{self.N_ROWS + 1}"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -27,6 +27,9 @@ from logic.tax_year_config import (
 )
 from logic.recapture import (
     calculate_section_1245_recapture,
+    calculate_section_1250_recapture,
+    calculate_section_1245_recapture_array,
+    calculate_section_1250_recapture_array,
 )
 
 
@@ -259,6 +262,42 @@ class TestRecaptureCalculations:
         assert result["section_1245_recapture"] == 0
         assert result["capital_loss"] == 2000
 
+    def test_array_recapture_matches_scalar(self):
+        """Array recapture should equal the scalar functions element by element."""
+        cases = [
+            # (cost, accumulated depreciation, proceeds)
+            (10000, 6000, 8000),      # full recapture
+            (10000, 8000, 5000),      # partial recapture
+            (10000, 5000, 3000),      # loss
+            (10000, 5000, 5000),      # break-even
+            (10000, 2000, 15000),     # gain above depreciation
+            (0.1, 0.07, 0.3),         # float rounding
+            (450000.1, 1000.5, 0),    # no proceeds
+        ]
+        costs, accums, proceeds = (list(col) for col in zip(*cases))
+
+        r1245 = calculate_section_1245_recapture_array(costs, accums, proceeds)
+        r1250 = calculate_section_1250_recapture_array(costs, accums, proceeds)
+
+        for i, (cost, accum, sale) in enumerate(cases):
+            expected_1245 = calculate_section_1245_recapture(cost, accum, sale)
+            expected_1250 = calculate_section_1250_recapture(cost, accum, sale)
+            for key, value in expected_1245.items():
+                assert r1245[key][i] == value, f"1245 {key} case {i}"
+            for key, value in expected_1250.items():
+                assert r1250[key][i] == value, f"1250 {key} case {i}"
+
+    def test_array_recapture_adds_179_bonus_when_macrs_only(self):
+        """Array §1245 should add 179/bonus when accumulated depreciation is MACRS-only."""
+        result = calculate_section_1245_recapture_array(
+            [10000], [2000], [9000], [3000], [1000], accum_includes_179_bonus=False
+        )
+        expected = calculate_section_1245_recapture(
+            10000, 2000, 9000, 3000, 1000, accum_includes_179_bonus=False
+        )
+        assert result["total_depreciation"][0] == expected["total_depreciation"] == 6000
+        assert result["section_1245_recapture"][0] == expected["section_1245_recapture"]
+
 
 class TestEdgeCases:
     """Test edge cases and boundary conditions."""
@@ -0,0 +1,517 @@
+"""
+Tests for Session Storage
+
+Columnar session assets, row-level SQLite persistence, the write-behind
+flusher, the version-checked near cache, byte-budgeted eviction and the
+binary session codec.
+Run with: pytest tests/test_session_store.py -v
+"""
+
+import pytest
+import sys
+import os
+import json
+import sqlite3
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+try:
+    from backend.models.asset import Asset, AuditEvent
+    from backend.logic.session_asset_store import ColumnarAssetStore, assets_frame
+    from backend.logic.session_codec import encode_payload, decode_payload, is_encoded
+    from backend.logic.session_manager import (
+        LRUCache, SessionData, SessionManager, serialize_session, deserialize_session,
+        serialize_session_meta, serialize_asset_snapshot, serialize_asset_rows,
+    )
+    from backend.logic.session_sqlite import SQLiteSessionStore
+    from backend.logic.session_flusher import SessionFlusher
+    SESSION_STORE_AVAILABLE = True
+except ImportError:
+    SESSION_STORE_AVAILABLE = False
+
+
+@pytest.mark.skipif(not SESSION_STORE_AVAILABLE, reason="Session asset store not available")
+class TestColumnarAssetStore:
+    """The columnar store must behave like the Dict[int, Asset] it replaces."""
+
+    @staticmethod
+    def _assets(n=5):
+        return [
+            Asset(row_index=i + 2, unique_id=i, asset_id=f"A{i}", description=f"Asset {i}",
+                  cost=100.0 * i, macrs_life=7.0, macrs_class="Furniture",
+                  in_service_date=date(2024, 1, i + 1), transaction_type="Current Year Addition",
+                  validation_warnings=["Missing tag"] if i % 2 else [])
+            for i in range(n)
+        ]
+
+    def _store(self, n=5):
+        store = ColumnarAssetStore()
+        store.update((a.unique_id, a) for a in self._assets(n))
+        return store
+
+    def test_dict_semantics(self):
+        assets = self._assets()
+        store = self._store()
+
+        assert len(store) == 5 and list(store) == [0, 1, 2, 3, 4]
+        assert [a.model_dump() for a in store.values()] == [a.model_dump() for a in assets]
+        assert 3 in store and 9 not in store
+        del store[1]
+        store[9] = assets[1]
+        assert list(store) == [0, 2, 3, 4, 9]
+        assert store.get(1) is None
+        with pytest.raises(KeyError):
+            store[1]
+        with pytest.raises(TypeError):
+            store[10] = {"description": "not an Asset"}
+
+    def test_mutations_are_written_back(self):
+        store = self._store()
+        store[2].macrs_class = "Computer Equipment"
+        asset = store[3]
+        asset.validation_warnings.append("Check cost")
+        asset.cost = 42.5
+
+        assert list(store.frame(["macrs_class"])["macrs_class"])[2] == "Computer Equipment"
+        assert store.frame(["cost"])["cost"][3] == 42.5
+        del asset
+        assert store[2].macrs_class == "Computer Equipment"
+        assert store[3].validation_warnings == ["Missing tag", "Check cost"]
+
+    def test_values_a_typed_column_cannot_hold(self):
+        from datetime import datetime
+        store = self._store()
+        store[0].in_service_date = datetime(2024, 1, 1, 9, 30)
+        store[1].macrs_life = "7"
+
+        assert store[0].in_service_date == datetime(2024, 1, 1, 9, 30)
+        assert store[1].macrs_life == "7"
+        assert store[2].in_service_date == date(2024, 1, 3)
+
+    def test_int_and_float_values_keep_their_type(self):
+        assets = self._assets(2)
+        assets[1].macrs_life = 5  # assignment is not validated, so stays int
+        store = ColumnarAssetStore({a.unique_id: a for a in assets})
+
+        assert [type(store[k].macrs_life) for k in range(2)] == [float, int]
+
+    def test_frame(self):
+        store = self._store()
+        df = store.frame({"cost": "Cost", "macrs_life": "Life", "in_service_date": "In Service"})
+
+        assert list(df.columns) == ["Cost", "Life", "In Service"]
+        assert df["Cost"].dtype == "float64" and df["Cost"].tolist() == [0.0, 100.0, 200.0, 300.0, 400.0]
+        assert str(df["In Service"].dtype).startswith("datetime64")
+        assert store.frame(["in_service_date"], date_objects=True)["in_service_date"][4] == date(2024, 1, 5)
+        assert assets_frame({a.unique_id: a for a in self._assets()}, ["cost"]).equals(store.frame(["cost"]))
+
+    def test_records_and_session_round_trip(self):
+        store = self._store()
+        assert [values for _, values in store.records()] == [a.model_dump() for a in self._assets()]
+
+        from datetime import datetime
+        now = datetime.now()
+        session = SessionData(session_id="s1", user_id=None, created_at=now, last_accessed=now, expires_at=now)
+        session.assets.update(store.items())
+        restored = deserialize_session(serialize_session(session))
+        assert [a.model_dump() for a in restored.assets.values()] == [a.model_dump() for a in self._assets()]
+
+    def test_deepcopy_is_independent(self):
+        import copy
+        store = self._store()
+        clone = copy.deepcopy(store)
+        clone[0].description = "Changed"
+        clone[1].validation_warnings.append("Changed")
+
+        assert store[0].description == "Asset 0"
+        assert store[1].validation_warnings == ["Missing tag"]
+        assert clone[0].description == "Changed"
+
+
+@pytest.mark.skipif(not SESSION_STORE_AVAILABLE, reason="Session asset store not available")
+class TestRowLevelSessionPersistence:
+    """Saves write session metadata plus only the asset rows that changed."""
+
+    @staticmethod
+    def _manager(tmp_path, write_mode="write_through"):
+        manager = SessionManager(use_redis=False, use_sqlite=False, write_mode=write_mode)
+        manager._sqlite_store = SQLiteSessionStore(str(tmp_path / "sessions.db"))
+        manager._use_sqlite = True
+        return manager
+
+    @staticmethod
+    def _reload(manager, session_id):
+        fresh = SessionManager(use_redis=False, use_sqlite=False, write_mode="write_through")
+        fresh._sqlite_store = manager._sqlite_store
+        fresh._use_sqlite = True
+        return fresh._load_session(session_id)
+
+    @staticmethod
+    def _dumps(session):
+        return [(key, asset.model_dump()) for key, asset in session.assets.items()]
+
+    def _uploaded(self, manager, n=20):
+        session = manager.create_session()
+        session.assets = ColumnarAssetStore()  # a plain dict is always rewritten whole
+        session.assets.update(
+            (i, Asset(row_index=i + 2, unique_id=i, description=f"Asset {i}", cost=10.0 * i,
+                      in_service_date=date(2024, 1, 2)))
+            for i in range(n)
+        )
+        manager._save_session(session)
+        return session
+
+    def test_single_edit_writes_one_row(self, tmp_path):
+        manager = self._manager(tmp_path)
+        session = self._uploaded(manager)
+        written = manager._persist_stats["asset_rows_written"]
+
+        asset = session.assets[3]
+        asset.macrs_class = "Computer Equipment"
+        asset.validation_warnings.append("Reviewed")
+        manager._save_session(session)
+        del session.assets[4]
+        manager._save_session(session)
+
+        assert manager._persist_stats["asset_rows_written"] == written + 1
+        assert manager._persist_stats["asset_rows_deleted"] == 1
+        assert self._dumps(self._reload(manager, session.session_id)) == self._dumps(session)
+
+    def test_batch_persists_once(self, tmp_path):
+        manager = self._manager(tmp_path)
+        with manager.batch():
+            session = self._uploaded(manager)
+            session.last_upload_filename = "assets.xlsx"
+            manager._save_session(session)
+
+        assert manager._persist_stats["saves"] == 1
+        restored = self._reload(manager, session.session_id)
+        assert restored.last_upload_filename == "assets.xlsx"
+        assert self._dumps(restored) == self._dumps(session)
+
+    def test_legacy_blob_is_rewritten_as_snapshot(self, tmp_path):
+        manager = self._manager(tmp_path)
+        session = self._uploaded(manager)
+        manager._sqlite_store.set(session.session_id, serialize_session(session), session.expires_at)
+
+        restored = self._reload(manager, session.session_id)
+        assert self._dumps(restored) == self._dumps(session)
+        manager._save_session(restored)
+        stats = manager._sqlite_store.get_stats()
+        assert (stats["asset_snapshots"], stats["asset_rows"]) == (1, 0)
+        assert self._dumps(self._reload(manager, session.session_id)) == self._dumps(session)
+
+    def test_legacy_json_rows_load_and_migrate(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("backend.logic.session_manager.SNAPSHOT_MIN_DELTA_ROWS", 5)
+        manager = self._manager(tmp_path)
+        session = self._uploaded(manager)
+        # Stored before session_codec: JSON metadata plus a JSON row per asset
+        store = manager._sqlite_store
+        session_meta = json.loads(serialize_session(session))
+        del session_meta["assets"]
+        store.set_rows(session.session_id, json.dumps(session_meta), session.expires_at,
+                       assets=serialize_asset_rows(session.assets))
+
+        restored = self._reload(manager, session.session_id)
+        assert self._dumps(restored) == self._dumps(session)
+        manager._save_session(restored)
+        assert is_encoded(store.get(session.session_id))
+        assert store.get_stats()["asset_snapshots"] == 1
+        assert self._dumps(self._reload(manager, session.session_id)) == self._dumps(session)
+
+    def test_delta_rows_on_top_of_snapshot(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("backend.logic.session_manager.SNAPSHOT_MIN_DELTA_ROWS", 3)
+        monkeypatch.setattr("backend.logic.session_manager.SNAPSHOT_DELTA_RATIO", 0.1)
+        manager = self._manager(tmp_path)
+        session = self._uploaded(manager)
+        full_writes = manager._persist_stats["full_writes"]
+
+        session.assets[2].description = "Edited"
+        del session.assets[5]
+        session.assets[99] = Asset(row_index=101, unique_id=99, description="Added", cost=1.0)
+        manager._save_session(session)
+        assert manager._persist_stats["full_writes"] == full_writes
+        assert manager._sqlite_store.get_stats()["asset_rows"] == 3
+        restored = self._reload(manager, session.session_id)
+        assert self._dumps(restored) == self._dumps(session)
+        assert 5 not in restored.assets
+
+        # Past max(SNAPSHOT_MIN_DELTA_ROWS, 10% of the assets) the next save rewrites the snapshot
+        session.assets[3].description = "Edited"
+        manager._save_session(session)
+        assert manager._persist_stats["full_writes"] == full_writes + 1
+        assert manager._sqlite_store.get_stats()["asset_rows"] == 0
+        assert self._dumps(self._reload(manager, session.session_id)) == self._dumps(session)
+
+    def test_failed_save_rewrites_everything_next_time(self, tmp_path, monkeypatch):
+        manager = self._manager(tmp_path)
+        session = self._uploaded(manager)
+        store = manager._sqlite_store
+
+        def fail(*args, **kwargs):
+            raise sqlite3.OperationalError("database is locked")
+
+        monkeypatch.setattr(store, "set_rows", fail)
+        session.assets[0].description = "Lost unless retried"
+        manager._save_session(session)
+        monkeypatch.undo()
+        manager._save_session(session)
+
+        assert manager._persist_stats["failures"] == 1
+        assert self._reload(manager, session.session_id).assets[0].description == "Lost unless retried"
+
+
+@pytest.mark.skipif(not SESSION_STORE_AVAILABLE, reason="Session asset store not available")
+class TestWriteBehindSessionFlusher:
+    """Write-behind saves are coalesced and written off the request path."""
+
+    _manager = staticmethod(TestRowLevelSessionPersistence._manager)
+    _reload = staticmethod(TestRowLevelSessionPersistence._reload)
+
+    @staticmethod
+    def _wait_for(condition, timeout=5.0):
+        import time
+        deadline = time.monotonic() + timeout
+        while not condition():
+            assert time.monotonic() < deadline, "timed out"
+            time.sleep(0.01)
+
+    def test_saves_coalesce_until_flushed(self, tmp_path):
+        manager = self._manager(tmp_path, write_mode="write_behind")
+        manager._flusher = SessionFlusher(manager._persist_session, delay=60)
+        session = manager.create_session()
+        for name in ("a.xlsx", "b.xlsx", "c.xlsx"):
+            session.last_upload_filename = name
+            manager._save_session(session)
+
+        assert manager._persist_stats["saves"] == 0
+        assert self._reload(manager, session.session_id) is None
+        assert manager.flush_pending() == 1
+        assert manager._flusher.stats()["coalesced"] == 3
+        assert self._reload(manager, session.session_id).last_upload_filename == "c.xlsx"
+
+    def test_background_thread_writes_after_delay(self, tmp_path):
+        manager = self._manager(tmp_path, write_mode="write_behind")
+        manager._flusher = SessionFlusher(manager._persist_session, delay=0.05)
+        session = manager.create_session()
+
+        self._wait_for(lambda: manager._persist_stats["saves"] == 1)
+        assert self._reload(manager, session.session_id) is not None
+
+    def test_failed_write_is_retried(self):
+        attempts = []
+        flusher = SessionFlusher(lambda session: attempts.append(session) or len(attempts) > 1,
+                                 delay=0.01, retry_delay=0.01)
+        flusher.mark(SessionData(session_id="s1", user_id=None, created_at=None,
+                                 last_accessed=None, expires_at=None))
+
+        self._wait_for(lambda: flusher.stats()["written"] == 1)
+        assert len(attempts) == 2 and flusher.stats()["failed"] == 1
+
+    def test_delete_drops_pending_write(self, tmp_path):
+        manager = self._manager(tmp_path, write_mode="write_behind")
+        manager._flusher = SessionFlusher(manager._persist_session, delay=60)
+        session = manager.create_session()
+        manager.delete_session(session.session_id)
+
+        assert manager.flush_pending() == 0
+        assert self._reload(manager, session.session_id) is None
+
+    def test_evicted_session_with_pending_write_is_not_reloaded_stale(self, tmp_path):
+        manager = self._manager(tmp_path, write_mode="write_behind")
+        manager._flusher = SessionFlusher(manager._persist_session, delay=60)
+        session = manager.create_session()
+        manager._local_cache.delete(session.session_id)
+
+        assert manager._load_session(session.session_id) is session
+
+
+@pytest.mark.skipif(not SESSION_STORE_AVAILABLE, reason="Session asset store not available")
+class TestSessionNearCache:
+    """Cached sessions are served after a version check, and reloaded when another worker wrote them."""
+
+    _manager = staticmethod(TestRowLevelSessionPersistence._manager)
+    _uploaded = TestRowLevelSessionPersistence._uploaded
+    _dumps = staticmethod(TestRowLevelSessionPersistence._dumps)
+
+    @staticmethod
+    def _worker(manager):
+        """A second process's manager on the same database."""
+        other = SessionManager(use_redis=False, use_sqlite=False, write_mode="write_through")
+        other._sqlite_store = manager._sqlite_store
+        other._use_sqlite = True
+        return other
+
+    def test_cached_session_served_until_written_elsewhere(self, tmp_path):
+        worker_a = self._manager(tmp_path)
+        session = self._uploaded(worker_a)
+        worker_b = self._worker(worker_a)
+        assert self._dumps(worker_b.get_session(session.session_id)) == self._dumps(session)
+
+        worker_b.get_session(session.session_id)
+        assert worker_b._near_cache_stats["hits"] == 1
+
+        session.assets[1].description = "Edited on worker A"
+        worker_a._save_session(session)
+        restored = worker_b.get_session(session.session_id)
+        assert worker_b._near_cache_stats["stale_reloads"] == 1
+        assert restored.assets[1].description == "Edited on worker A"
+
+        worker_a.delete_session(session.session_id)
+        assert worker_b.get_session(session.session_id) is None
+
+    def test_touch_only_saves_write_nothing(self, tmp_path):
+        manager = self._manager(tmp_path)
+        session = self._uploaded(manager)
+        version = manager._sqlite_store.get_version(session.session_id)
+
+        for _ in range(3):
+            manager.get_session(session.session_id)
+
+        assert manager._persist_stats["unchanged_skipped"] == 3
+        assert manager._sqlite_store.get_version(session.session_id) == version
+
+    def test_conflicting_write_stores_everything(self, tmp_path):
+        worker_a = self._manager(tmp_path)
+        session_a = self._uploaded(worker_a)
+        worker_b = self._worker(worker_a)
+        session_b = worker_b.get_session(session_a.session_id)
+
+        del session_a.assets[0]
+        worker_a._save_session(session_a)
+        session_b.assets[2].description = "Edited on worker B"
+        worker_b._save_session(session_b)
+
+        if isinstance(session_b.assets, ColumnarAssetStore):  # a plain dict is always written whole
+            assert worker_b._persist_stats["conflicts"] == 1
+        fresh = self._worker(worker_a)._load_session(session_a.session_id)
+        assert self._dumps(fresh) == self._dumps(session_b)
+
+    def test_version_column_added_to_existing_database(self, tmp_path):
+        path = str(tmp_path / "old.db")
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE sessions (session_id TEXT PRIMARY KEY, data TEXT NOT NULL, "
+                     "created_at TEXT NOT NULL, last_accessed TEXT NOT NULL, expires_at TEXT NOT NULL)")
+        conn.execute("INSERT INTO sessions VALUES ('s1', '{}', '2024-01-01', '2024-01-01', '2999-01-01')")
+        conn.commit()
+        conn.close()
+
+        store = SQLiteSessionStore(path)
+        assert store.get_version("s1") == 0
+        assert store.set("s1", "{}", datetime(2999, 1, 1)) == 1
+
+
+@pytest.mark.skipif(not SESSION_STORE_AVAILABLE, reason="Session asset store not available")
+class TestByteBudgetedSessionCache:
+    """Cached sessions are evicted by estimated footprint, and written out before they are dropped."""
+
+    _manager = staticmethod(TestRowLevelSessionPersistence._manager)
+    _reload = staticmethod(TestRowLevelSessionPersistence._reload)
+    _uploaded = TestRowLevelSessionPersistence._uploaded
+    _dumps = staticmethod(TestRowLevelSessionPersistence._dumps)
+
+    def test_footprint_follows_assets(self, tmp_path):
+        manager = self._manager(tmp_path)
+        small = self._uploaded(manager, n=10).estimated_bytes
+        session = self._uploaded(manager, n=1000)
+        assert session.estimated_bytes > small
+
+        session.assets.update((i, session.assets[0].model_copy()) for i in range(1000, 3000))
+        manager._save_session(session)
+        assert session.estimated_bytes > 2 * small
+        assert manager.cache_stats()["bytes"] == sum(s.estimated_bytes for s in manager._local_cache.values())
+
+    def test_evicts_by_bytes_never_the_newest(self):
+        evicted = []
+        cache = LRUCache(100, max_bytes=10, sizeof=len, on_evict=lambda key, value: evicted.append(key))
+        cache.set("a", "xxxx")
+        cache.set("b", "xxxx")
+        cache.get("a")
+        cache.set("c", "xxxx")
+        assert evicted == ["b"] and cache.keys() == ["a", "c"]
+
+        cache.set("huge", "x" * 50)
+        assert cache.keys() == ["huge"]
+        assert cache.stats()["bytes"] == 50 and cache.stats()["evictions"] == 3
+
+    def test_evicted_pending_session_is_written_first(self, tmp_path):
+        manager = self._manager(tmp_path, write_mode="write_behind")
+        manager._flusher = SessionFlusher(manager._persist_session, delay=60)
+        session = self._uploaded(manager)
+        session.assets[3].description = "Unwritten edit"
+        manager._save_session(session)
+
+        manager._local_cache.max_bytes = session.estimated_bytes
+        manager.create_session()
+
+        assert manager._local_cache.get(session.session_id) is None
+        assert manager.cache_stats()["spilled"] == 1
+        assert manager._flusher.pending(session.session_id) is None
+        assert self._dumps(self._reload(manager, session.session_id)) == self._dumps(session)
+
+
+@pytest.mark.skipif(not SESSION_STORE_AVAILABLE, reason="Session asset store not available")
+class TestSessionCodec:
+    """Sessions persist in a versioned, compressed columnar binary format."""
+
+    COLUMNS = {
+        "floats": [1.5, 7, None, 0.0],
+        "ints": [1, None, -(2 ** 40), 3],
+        "flags": [True, False, None, True],
+        "dates": [date(2024, 1, 2), None, date(1999, 12, 31), date(2024, 1, 2)],
+        "stamps": [datetime(2024, 5, 6, 7, 8, 9, 123456), None, datetime(2000, 1, 1), datetime(2024, 5, 6)],
+        "text": ["Laptop", None, "Laptop", "Desk \u00e9"],
+        "lists": [["a", "b"], [], None, ["a"]],
+        "records": [[{"at": datetime(2024, 1, 1), "who": "cpa"}], [], [], []],
+        "mixed": [date(2024, 1, 1), "text", 2 ** 70, {"k": 1}],
+        "empty": [None, None, None, None],
+    }
+
+    @pytest.mark.parametrize("compression", ["zlib", "lzma", "none"])
+    def test_round_trip_keeps_exact_values(self, compression):
+        blob = encode_payload(meta={"user_id": "u1", "at": date(2024, 3, 4)}, keys=[4, 1, 9, 2],
+                              columns=self.COLUMNS, compression=compression)
+        decoded = decode_payload(blob)
+
+        assert is_encoded(blob)
+        assert decoded["meta"] == {"user_id": "u1", "at": date(2024, 3, 4)}
+        assert decoded["keys"] == [4, 1, 9, 2]
+        assert decoded["columns"] == self.COLUMNS
+        assert [type(v) for v in decoded["columns"]["floats"]] == [float, int, type(None), float]
+
+    def test_rejects_newer_version_and_corrupt_data(self):
+        blob = encode_payload(meta={})
+        with pytest.raises(ValueError):
+            decode_payload(blob[:4] + bytes([99]) + blob[5:])
+        with pytest.raises(ValueError):
+            decode_payload(blob[:6] + b"garbage")
+        assert not is_encoded('{"session_id": "legacy"}')
+
+    @pytest.mark.parametrize("columnar", [True, False])
+    def test_asset_snapshot_round_trip(self, columnar):
+        assets = {
+            i: Asset(row_index=i + 2, unique_id=i, description=f"Asset {i}", cost=12.5 * i,
+                     in_service_date=date(2023, 1, 1 + i),
+                     validation_warnings=["Missing tag"] if i == 1 else [],
+                     audit_trail=[AuditEvent(timestamp=datetime(2024, 1, 1), user="cpa", action="override",
+                                             field="macrs_life", old_value="7", new_value="5")] if i == 2 else [])
+            for i in range(5)
+        }
+        for i, asset in assets.items():
+            asset.macrs_life = 5 if i % 2 else 7.5  # classification sets whole-number lives as int
+        assets[3].acquisition_date = datetime(2023, 5, 1, 12, 0)  # not a date: stored as an object column
+        session = SessionData(session_id="s1", user_id=None, created_at=datetime(2024, 1, 1),
+                              last_accessed=datetime(2024, 1, 1), expires_at=datetime(2099, 1, 1),
+                              assets=ColumnarAssetStore(assets) if columnar else assets)
+
+        restored = deserialize_session(serialize_session_meta(session), [], serialize_asset_snapshot(session.assets))
+
+        assert [(k, a.model_dump()) for k, a in restored.assets.items()] == \
+            [(k, a.model_dump()) for k, a in assets.items()]
+        assert restored.assets[1].macrs_life == 5 and type(restored.assets[1].macrs_life) is int
+        assert isinstance(restored.assets[2].audit_trail[0], AuditEvent)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,208 @@
+"""
+Tests for the Sheet Loader
+
+Parallel sheet processing, column-wise row cleaning and the detected
+sheet structure cache in build_unified_dataframe.
+Run with: pytest tests/test_sheet_loader.py -v
+"""
+
+import pytest
+import pandas as pd
+import sys
+import os
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+try:
+    from logic import sheet_loader, client_mapping_manager
+    SHEET_LOADER_AVAILABLE = True
+except ImportError:
+    SHEET_LOADER_AVAILABLE = False
+
+
+@pytest.mark.skipif(not SHEET_LOADER_AVAILABLE, reason="Sheet loader not available")
+class TestParallelSheetLoading:
+    """Parallel per-sheet processing must produce the serial output."""
+
+    @staticmethod
+    def _sheet(prefix, n, year):
+        rows = [["Fixed Asset Schedule", None, None, None], [None] * 4,
+                ["Asset ID", "Description", "Cost", "In Service Date"]]
+        for i in range(n):
+            if i % 9 == 4:
+                rows.append([None, "Total Computer Equipment", 99999, None])
+            elif i % 9 == 7:
+                rows.append([None] * 4)
+            else:
+                rows.append([f"{prefix}-{i}", f"Dell laptop {i}", 1000.0 + i, date(year - i % 2, 1 + i % 12, 1)])
+        return pd.DataFrame(rows)
+
+    def test_matches_serial(self, monkeypatch):
+        sheets = {
+            "FY2025 Additions": self._sheet("A", 40, 2025),
+            "Disposals 2025": self._sheet("D", 12, 2025),
+            "Furniture": self._sheet("F", 30, 2025),
+            "Empty": pd.DataFrame(),
+        }
+        monkeypatch.setattr(sheet_loader, "PARALLEL_SHEET_MIN_ROWS", 0)
+
+        serial = sheet_loader.build_unified_dataframe(sheets, 2025, filter_by_date=True, max_workers=0)
+        parallel = sheet_loader.build_unified_dataframe(sheets, 2025, filter_by_date=True, max_workers=2)
+
+        pd.testing.assert_frame_equal(parallel, serial)
+        assert parallel.attrs == serial.attrs
+        assert serial.attrs["sheets_processed"] == 3
+        assert serial.attrs["rows_filtered_by_date"] > 0
+        assert list(serial.drop_duplicates("sheet_name")["sheet_name"]) == ["Disposals 2025", "FY2025 Additions", "Furniture"]
+
+
+@pytest.mark.skipif(not SHEET_LOADER_AVAILABLE, reason="Sheet loader not available")
+class TestVectorizedRowCleaning:
+    """Column-wise cleaning must keep and clean exactly the rows the row path does."""
+
+    COL_MAP = {
+        "asset_id": "Asset ID",
+        "description": "Description",
+        "cost": "Cost",
+        "in_service_date": "In Service Date",
+        "transaction_type": "Type",
+        "life": "Life",
+    }
+
+    @staticmethod
+    def _frame():
+        return pd.DataFrame({
+            "Asset ID": ["A-1", "A-2", None, "A-4", "Budget", "A-6", "A-7", "A-8", "A-9", "A-10", ""],
+            "Description": ["Dell laptop", "Office chair", "Grand Total", "May depr adj", "Forklift",
+                            "N/A", "Server rack", "Desk", "Old truck", "Printer", ""],
+            "Cost": [1200.0, "$1,500", 50000, 300, 20000, 100, "(400)", "$2,500", 8000, "n/a", None],
+            "In Service Date": [date(2025, 3, 1), "2025-06-15", None, date(2025, 1, 1), date(2025, 2, 1),
+                                date(2025, 2, 1), date(2025, 2, 1), date(2023, 5, 1), 45700, "garbage", None],
+            "Type": [None, "Addition", None, None, None, None, None, "Disposal", "sold", None, None],
+            "Life": [5, "7", None, None, None, None, None, 5.0, None, None, None],
+        })
+
+    @staticmethod
+    def _same(a, b):
+        if a is None or b is None or a is pd.NaT or b is pd.NaT:
+            return a is b
+        return type(a) is type(b) and a == b
+
+    @pytest.mark.parametrize("target_year", [None, 2025])
+    def test_matches_row_path(self, target_year):
+        df = self._frame()
+        cleaned = sheet_loader._clean_sheet_frame(df, self.COL_MAP, target_year)
+
+        for idx, row in df.iterrows():
+            expected = sheet_loader._clean_row_data(row, self.COL_MAP)
+            if expected and target_year:
+                row_date = expected.get("in_service_date") or expected.get("acquisition_date")
+                if row_date and not sheet_loader._is_date_in_fiscal_year(row_date, target_year, 1):
+                    expected = None
+            reason = cleaned.at[idx, "skip_reason"]
+            assert (expected is None) == (reason is not None), (idx, reason)
+            if expected:
+                for key, value in expected.items():
+                    assert self._same(value, cleaned.at[idx, key]), (idx, key, value, cleaned.at[idx, key])
+
+    def test_skip_reasons(self):
+        cleaned = sheet_loader._clean_sheet_frame(self._frame(), self.COL_MAP, 2025)
+        reasons = cleaned["skip_reason"]
+
+        assert reasons[0] is None and reasons[1] is None
+        assert reasons[2] == sheet_loader.SKIP_TOTALS_ROW
+        assert reasons[3] == sheet_loader.SKIP_ACCOUNTING_ADJUSTMENT
+        assert reasons[4] == sheet_loader.SKIP_BUDGET_PLANNING
+        assert reasons[5] == sheet_loader.SKIP_INVALID_DESCRIPTION
+        assert reasons[6] == sheet_loader.SKIP_NEGATIVE_COST
+        assert reasons[7] == sheet_loader.SKIP_OUTSIDE_FISCAL_YEAR
+        assert reasons[10] == sheet_loader.SKIP_EMPTY_ROW
+
+    def test_transaction_types_match_row_path(self):
+        df = self._frame()
+        detected = sheet_loader._detect_transaction_types(df, self.COL_MAP)
+
+        for idx, row in df.iterrows():
+            assert detected[idx] == sheet_loader._detect_transaction_type(row, "Description", "Cost", "Type", None)
+
+    def test_skip_counts_reported(self):
+        rows = [["Asset ID", "Description", "Cost", "In Service Date"]]
+        rows += [[f"A-{i}", f"Dell laptop {i}", 1000.0 + i, date(2025 - i % 2, 3, 1)] for i in range(10)]
+        rows.append([None, "Grand Total", 10045.0, None])
+        result = sheet_loader.build_unified_dataframe({"FY2025 Additions": pd.DataFrame(rows)}, 2025, filter_by_date=True)
+
+        assert len(result) == 5
+        assert result.attrs["rows_filtered_by_date"] == 5
+        assert result.attrs["rows_skipped_by_reason"] == {
+            sheet_loader.SKIP_OUTSIDE_FISCAL_YEAR: 5,
+            sheet_loader.SKIP_TOTALS_ROW: 1,
+        }
+
+
+@pytest.mark.skipif(not SHEET_LOADER_AVAILABLE, reason="Sheet loader not available")
+class TestSheetStructureCache:
+    """Repeat uploads of the same layout reuse the detected sheet structure."""
+
+    @staticmethod
+    def _sheet(year, header=("Asset ID", "Description", "Cost", "In Service Date")):
+        rows = [[f"Acme Fixed Asset Register FY{year}", None, None, None], [None] * 4, list(header)]
+        rows += [[f"A-{i}", f"Dell laptop {i}", 1000.0 + i, date(year, 1 + i % 12, 1)] for i in range(20)]
+        return pd.DataFrame(rows)
+
+    @pytest.fixture
+    def manager(self, tmp_path, monkeypatch):
+        manager = client_mapping_manager.ClientMappingManager(
+            structure_cache_path=tmp_path / "sheet_structure_cache.json"
+        )
+        monkeypatch.setattr(client_mapping_manager, "_manager_instance", manager)
+        monkeypatch.setattr(sheet_loader, "SHEET_STRUCTURE_CACHE_ENABLED", True)
+        return manager
+
+    def test_repeat_layout_skips_detection(self, manager, monkeypatch):
+        sheet_loader.build_unified_dataframe({"Register": self._sheet(2024)}, 2025, filter_by_date=False)
+        assert len(manager.get_sheet_structures()) == 1
+
+        monkeypatch.setattr(sheet_loader, "SHEET_STRUCTURE_CACHE_ENABLED", False)
+        expected = sheet_loader.build_unified_dataframe({"Register": self._sheet(2025)}, 2025, filter_by_date=False)
+        monkeypatch.setattr(sheet_loader, "SHEET_STRUCTURE_CACHE_ENABLED", True)
+
+        def no_detection(*args, **kwargs):
+            raise AssertionError("header detection should be skipped")
+        monkeypatch.setattr(sheet_loader, "_detect_header_row", no_detection)
+        monkeypatch.setattr(sheet_loader, "_map_columns_with_validation", no_detection)
+
+        # Next year's workbook: same layout, different title year and data
+        result = sheet_loader.build_unified_dataframe({"Register": self._sheet(2025)}, 2025, filter_by_date=False)
+
+        pd.testing.assert_frame_equal(result, expected)
+        assert result["source_row"].iloc[0] == 4
+
+    def test_changed_headers_are_detected_again(self, manager, monkeypatch):
+        sheet_loader.build_unified_dataframe({"Register": self._sheet(2024)}, 2025, filter_by_date=False)
+
+        calls = []
+        detect = sheet_loader._detect_header_row
+        monkeypatch.setattr(sheet_loader, "_detect_header_row", lambda *a, **k: calls.append(1) or detect(*a, **k))
+
+        renamed = self._sheet(2025, header=("Asset ID", "Asset Description", "Original Cost", "Date In Service"))
+        result = sheet_loader.build_unified_dataframe({"Register": renamed}, 2025, filter_by_date=False)
+
+        assert calls == [1]
+        assert len(result) == 20
+        # The new layout replaces the old one for this sheet
+        [entry] = manager.get_sheet_structures().values()
+        assert entry["col_map"]["description"] == "asset description"
+
+    def test_unreadable_cache_is_ignored(self, tmp_path):
+        path = tmp_path / "sheet_structure_cache.json"
+        path.write_text("{not json", encoding="utf-8")
+        manager = client_mapping_manager.ClientMappingManager(structure_cache_path=path)
+
+        assert manager.get_sheet_structures() == {}
+        assert manager.save_sheet_structures({"k": {"header_idx": 0}})
+        assert client_mapping_manager.ClientMappingManager(structure_cache_path=path).get_sheet_structures()["k"]["header_idx"] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
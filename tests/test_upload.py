@@ -0,0 +1,214 @@
+"""
+Tests for the Upload Path
+
+Duplicate uploads served from the content-hash result cache, uploads
+spooled to disk in chunks, and bulk Asset construction in the importer.
+Run with: pytest tests/test_upload.py -v
+"""
+
+import pytest
+import pandas as pd
+import sys
+import os
+import asyncio
+import hashlib
+import tempfile
+from datetime import date
+from io import BytesIO
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+try:
+    from backend.models.asset import Asset
+    from backend.services.importer import ImporterService
+    from backend.logic.upload_cache import (
+        UploadResultCache,
+        upload_cache_key,
+        file_sha256,
+        encode_upload_result,
+    )
+    from logic.smart_tab_analyzer import analyze_tabs
+    UPLOAD_AVAILABLE = True
+except ImportError:
+    UPLOAD_AVAILABLE = False
+
+try:
+    from starlette.datastructures import UploadFile
+    from fastapi import HTTPException
+    from backend.api import spool_upload
+    API_AVAILABLE = True
+except ImportError:
+    API_AVAILABLE = False
+
+
+@pytest.mark.skipif(not UPLOAD_AVAILABLE, reason="Upload path not available")
+class TestUploadResultCache:
+    """Identical uploads are answered from the stored parse + classify result."""
+
+    @pytest.fixture
+    def assets(self):
+        return [
+            Asset(row_index=i + 2, asset_id=f"A-{i}", description=f"Dell Laptop {i}",
+                  cost=1500.0 + i, in_service_date=date(2025, 3, 1) if i else None,
+                  macrs_class="Computer Equipment", macrs_life=5.0, confidence_score=0.9,
+                  transaction_type="Current Year Addition", validation_errors=["Missing date"] if not i else [])
+            for i in range(3)
+        ]
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return UploadResultCache(directory=str(tmp_path / "cache"))
+
+    def test_round_trip(self, cache, assets):
+        assert cache.get("k1") is None
+        tabs = {"tabs": [], "target_fiscal_year": 2025}
+        cache.put("k1", encode_upload_result(assets, tab_analysis=tabs, parse_warnings=["w"],
+                                             parse_stats={"rows": 3}, fy_start_month=4))
+
+        result = cache.get("k1")
+        assert [a.model_dump() for a in result["assets"]] == [a.model_dump() for a in assets]
+        assert result["tab_analysis"] == tabs
+        assert (result["parse_warnings"], result["parse_stats"], result["fy_start_month"]) == (["w"], {"rows": 3}, 4)
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_corrupt_entry_is_a_miss(self, cache, assets):
+        cache.put("k1", b"not a blob")
+
+        assert cache.get("k1") is None
+        assert not os.path.exists(cache.path_for("k1"))
+
+    def test_key_tracks_upload_inputs(self, tmp_path):
+        path = tmp_path / "client.xlsx"
+        path.write_bytes(b"x" * 3_000_000)
+        digest = file_sha256(str(path))
+        with open(path, "rb") as f:
+            assert file_sha256(f) == digest
+
+        base = upload_cache_key("upload", digest, {"tax_year": 2025, "fy_start_month": 1})
+        assert base == upload_cache_key("upload", digest, {"fy_start_month": 1, "tax_year": 2025})
+        assert base != upload_cache_key("job_upload", digest, {"tax_year": 2025, "fy_start_month": 1})
+        assert base != upload_cache_key("upload", digest, {"tax_year": 2024, "fy_start_month": 1})
+        assert base != upload_cache_key("upload", file_sha256(BytesIO(b"y")), {"tax_year": 2025, "fy_start_month": 1})
+
+    def test_key_follows_tax_rules_and_code_version(self, monkeypatch):
+        from backend.logic import tax_year_config, upload_cache
+        digest = file_sha256(BytesIO(b"x"))
+        base = upload_cache_key("upload", digest, {"tax_year": 2025})
+
+        monkeypatch.setattr(tax_year_config, "CONFIG_VERSION", "new-rules")
+        assert upload_cache_key("upload", digest, {"tax_year": 2025}) != base
+        monkeypatch.undo()
+
+        monkeypatch.setattr(upload_cache, "_code_version", lambda: "new-code")
+        assert upload_cache_key("upload", digest, {"tax_year": 2025}) != base
+
+    def test_tab_analysis_round_trip(self):
+        from logic.smart_tab_analyzer import TabAnalysisResult
+        result = analyze_tabs({
+            "FY2025 Additions": pd.DataFrame([["Description", "Cost"], ["Laptop", 1200]]),
+            "FY2023": pd.DataFrame([["Description", "Cost"], ["Desk", 300]]),
+        }, 2025)
+
+        restored = TabAnalysisResult.from_dict(result.to_dict())
+        assert restored == result
+        assert restored.get_efficiency_stats() == result.get_efficiency_stats()
+
+
+@pytest.mark.skipif(not API_AVAILABLE, reason="API not available")
+class TestStreamingUploadSpool:
+    """Uploads are streamed to disk chunk by chunk, hashed and size-checked on the way."""
+
+    @staticmethod
+    def _spool(content, size=None, **kwargs):
+        upload = UploadFile(BytesIO(content), size=size, filename="client.xlsx")
+        return asyncio.run(spool_upload(upload, prefix="facs_test_", **kwargs))
+
+    @staticmethod
+    def _leftovers():
+        return [n for n in os.listdir(tempfile.gettempdir()) if n.startswith("facs_test_")]
+
+    def test_spooled_file_and_digest(self):
+        content = os.urandom(2_500_000)
+        temp_file, size, digest = self._spool(content)
+        try:
+            with open(temp_file, "rb") as f:
+                assert f.read() == content
+            assert size == len(content)
+            assert digest == hashlib.sha256(content).hexdigest()
+        finally:
+            os.remove(temp_file)
+
+    def test_oversized_upload_aborts_and_cleans_up(self):
+        with pytest.raises(HTTPException) as exc:
+            self._spool(b"x" * 3_000_000, max_bytes=2 * 1024 * 1024)
+        assert exc.value.status_code == 413
+        assert not self._leftovers()
+
+    def test_declared_size_rejected_before_reading(self):
+        with pytest.raises(HTTPException) as exc:
+            self._spool(b"x", size=60 * 1024 * 1024)
+        assert exc.value.detail["details"]["file_size_mb"] == 60.0
+        assert not self._leftovers()
+
+
+@pytest.mark.skipif(not UPLOAD_AVAILABLE, reason="Upload path not available")
+class TestBulkAssetConstruction:
+    """Bulk conversion must produce exactly what _row_to_asset does, row by row."""
+
+    @staticmethod
+    def _frame():
+        from datetime import datetime
+        return pd.DataFrame({
+            "description": ["Desk", "", None, "Laptop", "Truck", "Van", "Chair", "Forklift", "Table", "Shelf"],
+            "asset_id": ["A1", None, "A3", 7, " ", "A6", "A7", "A9", "A10", "A12"],
+            "cost": [100.0, 5.0, None, -50.0, "1,200", float("inf"), 3.5, True, float("nan"), 10],
+            "in_service_date": [pd.Timestamp("2024-01-05"), None, pd.NaT, "2024-02-01",
+                                pd.Timestamp("2024-01-05 10:00"), date(2023, 1, 1), datetime(2023, 5, 1),
+                                None, None, pd.Timestamp("2024-01-05", tz="UTC")],
+            "tax_life": [5, None, "7", 5.0, None, None, None, None, None, None],
+            "tax_method": [None, "SL", "", float("nan"), None, None, None, None, None, None],
+            "from_location": [None, "HQ", 5, "", None, None, None, None, None, None],
+            "source_row": [3, None, 5.0, "6", 7, 8, 9, 11, 12, 14],
+            "sheet_name": ["Vehicles", "Unknown", None, float("nan"), "Computers", "Furniture", "", "y", "z",
+                           "Vehicles"],
+            "transaction_type": ["Addition ", None, 3, "disposal", None, None, None, None, None, None],
+        })
+
+    @staticmethod
+    def _row_by_row(importer, df):
+        assets, errors = [], []
+        for idx, row in df.iterrows():
+            try:
+                asset = importer._row_to_asset(row, idx)
+                if asset:
+                    assets.append(asset)
+            except Exception as e:
+                errors.append(f"Row {idx}: {e}")
+        return assets, errors
+
+    @pytest.mark.parametrize("drop", [[], ["source_row", "sheet_name", "from_location"]])
+    def test_matches_row_by_row(self, drop):
+        importer = ImporterService()
+        df = self._frame().drop(columns=drop)
+        expected, expected_errors = self._row_by_row(importer, df)
+        assets, errors = importer._frame_to_assets(df)
+
+        assert errors == expected_errors
+        assert [a.model_dump() for a in assets] == [a.model_dump() for a in expected]
+        assert [a.model_fields_set for a in assets] == [a.model_fields_set for a in expected]
+
+    def test_from_normalized_matches_constructor(self):
+        fields = dict(row_index=3, asset_id="A1", description="Desk", cost=100.0,
+                      in_service_date=date(2024, 1, 5), macrs_life=7.0, source_sheet="Furniture")
+        first = Asset.from_normalized(**fields)
+        second = Asset.from_normalized(**fields)
+
+        assert first == Asset(**fields)
+        assert first.model_fields_set == set(fields)
+        first.validation_errors.append("x")
+        assert second.validation_errors == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
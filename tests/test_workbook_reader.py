@@ -0,0 +1,198 @@
+"""
+Tests for Workbook Reading
+
+Single-pass read-only workbook reading, CSV/TSV asset registers and
+loading only the tabs picked after a tab-analysis preview.
+Run with: pytest tests/test_workbook_reader.py -v
+"""
+
+import pytest
+import pandas as pd
+import sys
+import os
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+try:
+    import openpyxl
+    from logic import workbook_reader, delimited_reader, sheet_loader
+    from logic.workbook_reader import read_workbook_sheets
+    from logic.smart_tab_analyzer import analyze_tabs, analyze_workbook
+    WORKBOOK_READER_AVAILABLE = True
+except ImportError:
+    WORKBOOK_READER_AVAILABLE = False
+
+
+@pytest.mark.skipif(not WORKBOOK_READER_AVAILABLE, reason="workbook reader not available")
+class TestWorkbookReader:
+    """Streaming workbook reads must match the full-mode openpyxl frames."""
+
+    @pytest.fixture
+    def workbook(self, tmp_path):
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = "FY2025 Additions"
+        ws["C2"] = "Fixed Asset Schedule"
+        ws.append([None, "Asset ID", "Description", "Cost", "In Service"])
+        for i in range(25):
+            ws.append([None, f"A{i}" if i % 4 else i, "Laptop",
+                       1000.0 + i if i % 5 else None, date(2025, 1 + i % 12, 1)])
+        ws["G30"] = "=SUM(D1:D29)"  # formula without a cached value
+        disposals = wb.create_sheet("Disposals")
+        disposals.append(["ID", "Proceeds", "Sold"])
+        disposals.append([1, 500, True])
+        wb.create_sheet("Empty")
+        path = tmp_path / "schedule.xlsx"
+        wb.save(path)
+        return str(path)
+
+    @staticmethod
+    def _full_mode(path):
+        wb = openpyxl.load_workbook(path, data_only=True)
+        sheets = {name: pd.DataFrame(list(wb[name].iter_rows(values_only=True))) for name in wb.sheetnames}
+        wb.close()
+        return sheets
+
+    def test_matches_full_mode_across_blocks(self, workbook, monkeypatch):
+        expected = self._full_mode(workbook)
+        monkeypatch.setattr(workbook_reader, "READ_BLOCK_ROWS", 7)
+
+        sheets = read_workbook_sheets(workbook)
+
+        assert list(sheets) == list(expected)
+        for name, df in expected.items():
+            pd.testing.assert_frame_equal(sheets[name], df)
+
+    def test_row_limit_and_sheet_selection(self, workbook):
+        sheets = read_workbook_sheets(workbook, sheet_names=["Disposals", "FY2025 Additions"], nrows=3)
+
+        assert list(sheets) == ["FY2025 Additions", "Disposals"]
+        assert len(sheets["FY2025 Additions"]) == 3
+        assert sheets["FY2025 Additions"].iloc[2, 1] == "Asset ID"
+        assert sheets["Disposals"].iloc[1].tolist() == [1, 500, True]
+
+
+@pytest.mark.skipif(not WORKBOOK_READER_AVAILABLE, reason="Workbook reader not available")
+class TestDelimitedImport:
+    """CSV/TSV files read as a one-sheet workbook and parse like the same cells in .xlsx."""
+
+    ROWS = [
+        ["Acme Corp Fixed Asset Register"],
+        [],
+        ["Asset ID", "Description", "Cost", "In Service Date", "Location"],
+    ] + [
+        [f"FA-{i:03d}", f"Dell Laptop {i}", f"{1000 + i * 7.25}" if i % 9 else "", f"{1 + i % 12:02d}/15/2024", f"Plant {i % 3}"]
+        for i in range(150)
+    ]
+
+    @staticmethod
+    def _write_csv(path, rows, delimiter=",", encoding="utf-8"):
+        with open(path, "w", newline="", encoding=encoding) as f:
+            for row in rows:
+                f.write(delimiter.join(row) + "\n")
+        return str(path)
+
+    @staticmethod
+    def _write_xlsx(path, rows):
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = delimited_reader.DELIMITED_SHEET_NAME
+        for row in rows:
+            ws.append([v if v != "" else None for v in row])
+        wb.save(path)
+        return str(path)
+
+    def test_raw_layout(self, tmp_path):
+        rows = self.ROWS[:3] + [
+            ["FA-1", "Café Table", "1250.5", "03/15/2025", ""],
+            ["FA-2", "Forklift", "$1,250.00", "15/03/2025", "Plant 2"],
+            [], [],
+        ]
+        path = self._write_csv(tmp_path / "register.csv", rows, delimiter=";", encoding="cp1252")
+
+        sheets = read_workbook_sheets(path)
+
+        df = sheets["Sheet1"]
+        assert list(sheets) == ["Sheet1"]
+        assert df.shape == (5, 5)
+        assert df.iloc[0].tolist() == ["Acme Corp Fixed Asset Register", None, None, None, None]
+        assert df.iloc[3].tolist() == ["FA-1", "Café Table", 1250.5, pd.Timestamp(2025, 3, 15), None]
+        # Left for parse_number / parse_date
+        assert df.iloc[4].tolist() == ["FA-2", "Forklift", "$1,250.00", "15/03/2025", "Plant 2"]
+
+    @pytest.mark.parametrize("money", [False, True])
+    def test_matches_xlsx_pipeline(self, tmp_path, monkeypatch, money):
+        rows = [list(r) for r in self.ROWS]
+        if money:
+            rows[40][2] = "$1,250.00"
+        monkeypatch.setattr(sheet_loader, "HEADER_SCAN_MAX_ROWS", 20)  # data read with C parser dtypes
+        csv_path = self._write_csv(tmp_path / "register.tsv", rows, delimiter="\t")
+        xlsx_path = self._write_xlsx(tmp_path / "register.xlsx", rows)
+
+        from_csv = sheet_loader.build_unified_dataframe(read_workbook_sheets(csv_path), target_tax_year=2024)
+        from_xlsx = sheet_loader.build_unified_dataframe(read_workbook_sheets(xlsx_path), target_tax_year=2024)
+
+        assert len(from_csv) == 150
+        pd.testing.assert_frame_equal(from_csv, from_xlsx)
+
+    def test_row_wider_than_sample(self, tmp_path, monkeypatch):
+        rows = self.ROWS[:3] + [["FA-1", "Desk", "500", "01/15/2024", "Plant 1", "extra"]]
+        path = self._write_csv(tmp_path / "register.csv", rows)
+        monkeypatch.setattr(delimited_reader, "SNIFF_BYTES", 40)
+
+        df = read_workbook_sheets(path)["Sheet1"]
+
+        assert df.shape == (4, 6)
+        assert df.iloc[3, 5] == "extra"
+
+
+@pytest.mark.skipif(not WORKBOOK_READER_AVAILABLE, reason="Workbook reader not available")
+class TestLazyTabLoading:
+    """Two-phase tab analysis must fully load exactly the tabs to process."""
+
+    @pytest.fixture
+    def workbook(self, tmp_path):
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = "FY2025 Additions"
+        ws.append(["Asset ID", "Description", "Cost", "In Service"])
+        for i in range(40):
+            ws.append([f"FA-{i:04d}", f"Dell laptop serial {i}", 1500.0 + i, date(2025, 1 + i % 12, 1)])
+        summary = wb.create_sheet("FY 2024 2025")
+        summary.append(["Category", "Beg Balance 4/1/2024", "Additions", "End Balance 3/31/2025"])
+        for category in ["Computer Equipment", "Furniture", "Vehicles"]:
+            summary.append([category, 10000, 500, 10500])
+        summary.append(["Total", 30000, 1500, 31500])
+        disposals = wb.create_sheet("Disposals FY2021")
+        disposals.append(["Asset ID", "Description", "Proceeds", "Date"])
+        for i in range(60):
+            disposals.append([f"FA-{i:04d}", f"Old desk {i}", 50.0, date(2021, 3, 1)])
+        path = tmp_path / "multi_year.xlsx"
+        wb.save(path)
+        return str(path)
+
+    def test_matches_full_analysis(self, workbook):
+        full = read_workbook_sheets(workbook)
+        expected = analyze_tabs(full, 2025)
+
+        result, sheets = analyze_workbook(workbook, 2025, preview_rows=10)
+
+        assert [(t.tab_name, t.role, t.should_process) for t in result.tabs] == \
+            [(t.tab_name, t.role, t.should_process) for t in expected.tabs]
+        assert result.detected_fy_start_month == expected.detected_fy_start_month == 4
+        for tab in result.tabs_to_process:
+            assert not tab.preview_only
+            pd.testing.assert_frame_equal(sheets[tab.tab_name], full[tab.tab_name])
+
+    def test_skipped_long_tab_is_only_previewed(self, workbook):
+        result, sheets = analyze_workbook(workbook, 2025, preview_rows=10)
+
+        tab = next(t for t in result.tabs if t.tab_name == "Disposals FY2021")
+        assert not tab.should_process
+        assert tab.preview_only
+        assert len(sheets["Disposals FY2021"]) == 10
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])